@@ -91,6 +91,7 @@ class BigQueryClient:
         where_clauses: typing.List[BinaryExpression] = None,
         order_by_clause: typing.Optional[UnaryExpression] = None,
         limit=None,
+        first_per: typing.Optional[str] = None,
     ) -> RowIterator:
         """
         Execute a SELECT statement and return a generator object with the results.
@@ -101,6 +102,9 @@ class BigQueryClient:
         order_by_clause is an optional sqlalchemy.UnaryExpression that translates into '"start_time" DESC' or the like
 
         limit is an optional value to include in a LIMIT clause
+
+        first_per is an optional column name; only the first row (in the order of order_by_clause) of each value
+        of that column is returned
         """
 
         query = f"SELECT * FROM `{self.table_ref}`"
@@ -114,8 +118,17 @@ class BigQueryClient:
             )
             query += f' WHERE {where_conditions}'
 
+        order_by_string = None
         if order_by_clause is not None:
             order_by_string = order_by_clause.compile(dialect=mysql.dialect(), compile_kwargs={'literal_binds': True})
+
+        if first_per:
+            window = f'PARTITION BY `{first_per}`'
+            if order_by_string is not None:
+                window += f' ORDER BY {order_by_string}'
+            query += f' QUALIFY ROW_NUMBER() OVER ({window}) = 1'
+
+        if order_by_string is not None:
             query += f' ORDER BY {order_by_string}'
 
         if limit is not None:
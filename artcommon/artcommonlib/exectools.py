@@ -358,6 +358,21 @@ async def to_thread(func, *args, **kwargs):
     return await loop.run_in_executor(to_thread_executor, func_call)
 
 
+def run_coroutine(coro):
+    """Run a coroutine to completion from synchronous code and return its result.
+
+    If the calling thread already runs an event loop (e.g. a sync helper called from an async command),
+    the coroutine is run on a new event loop in a separate thread, since the running loop can't be reentered.
+    """
+    try:
+        asyncio.get_running_loop()
+    except RuntimeError:
+        return asyncio.run(coro)
+    ctx = contextvars.copy_context()
+    with concurrent.futures.ThreadPoolExecutor(max_workers=1) as executor:
+        return executor.submit(ctx.run, asyncio.run, coro).result()
+
+
 def limit_concurrency(limit=5):
     """A decorator to limit the number of parallel tasks with asyncio.
 
@@ -500,6 +515,22 @@ async def manifest_tool(options, dry_run=False):
     await cmd_assert_async(cmd)
 
 
+async def terminate_process(proc: asyncio.subprocess.Process, grace_period: float = 10):
+    """Terminate a child process, escalating to SIGKILL if it does not exit within grace_period seconds.
+    SIGTERM is sent first so that wrappers like `timeout` get a chance to forward it to their own children.
+    """
+    if proc.returncode is not None:
+        return
+    try:
+        proc.terminate()
+        await asyncio.wait_for(proc.wait(), timeout=grace_period)
+    except ProcessLookupError:
+        pass
+    except asyncio.TimeoutError:
+        proc.kill()
+        await proc.wait()
+
+
 @start_as_current_span_async(TRACER, "cmd_gather_async")
 async def cmd_gather_async(cmd: Union[List[str], str], check: bool = True, **kwargs) -> Tuple[Optional[int], str, str]:
     """Runs a command asynchronously and returns rc,stdout,stderr as a tuple
@@ -539,7 +570,12 @@ async def cmd_gather_async(cmd: Union[List[str], str], check: bool = True, **kwa
 
     logger.info(f"Executing:cmd_gather_async: {' '.join(cmd_list)}")
     proc = await asyncio.subprocess.create_subprocess_exec(cmd_list[0], *cmd_list[1:], **kwargs)
-    stdout, stderr = await proc.communicate()
+    try:
+        stdout, stderr = await proc.communicate()
+    except asyncio.CancelledError:
+        # Don't leave the child running after the awaiting task has gone away
+        await terminate_process(proc)
+        raise
     stdout = stdout.decode() if stdout else ""
     stderr = stderr.decode() if stderr else ""
     span.set_attribute("pyartcd.result.exit_code", str(proc.returncode))
@@ -585,7 +621,11 @@ async def cmd_assert_async(cmd: Union[List[str], str], check: bool = True, **kwa
 
     logger.info(f"Executing:cmd_assert_async: {' '.join(cmd_list)}")
     proc = await asyncio.subprocess.create_subprocess_exec(cmd_list[0], *cmd_list[1:], **kwargs)
-    returncode = await proc.wait()
+    try:
+        returncode = await proc.wait()
+    except asyncio.CancelledError:
+        await terminate_process(proc)
+        raise
     span.set_attribute("pyartcd.result.exit_code", str(returncode))
     if returncode != 0:
         msg = f"Process {cmd_list!r} exited with code {returncode}."
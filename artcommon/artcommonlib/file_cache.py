@@ -0,0 +1,110 @@
+"""
+On-disk caches shared by all processes using the same cache root.
+
+Each cache is a subdirectory of the cache root, which is set with configure() or with the ART_CACHE_DIR environment
+variable. Without a cache root nothing is cached. Files are written atomically, so that concurrent processes never see
+a partial file.
+"""
+
+import json
+import logging
+import os
+import tempfile
+import time
+from contextlib import contextmanager
+from pathlib import Path
+from typing import IO, Any, Iterator, Optional, Union
+
+LOGGER = logging.getLogger(__name__)
+
+CACHE_DIR_ENV = "ART_CACHE_DIR"
+
+_cache_root: Optional[Path] = None
+
+
+def configure(cache_root: Optional[Union[str, Path]]):
+    """Set the cache root, overriding ART_CACHE_DIR.
+    :param cache_root: Directory to keep caches in. If None, ART_CACHE_DIR is used again.
+    """
+    global _cache_root
+    _cache_root = Path(cache_root) if cache_root else None
+
+
+def cache_dir(name: str) -> Optional[Path]:
+    """:return: The directory of the named cache in the cache root, or None if no cache root is set"""
+    root = _cache_root or os.environ.get(CACHE_DIR_ENV)
+    return Path(root, name) if root else None
+
+
+@contextmanager
+def atomic_write(path: Union[str, Path], mode: str = "w") -> Iterator[IO]:
+    """Write a file atomically: the content is written to a temporary file that replaces path once it is complete.
+    :param path: The file to write
+    :param mode: "w" or "wb"
+    """
+    path = Path(path)
+    path.parent.mkdir(parents=True, exist_ok=True)
+    f = tempfile.NamedTemporaryFile(mode, dir=path.parent, prefix=f".{path.name}-", suffix=".tmp", delete=False)
+    try:
+        with f:
+            yield f
+        os.replace(f.name, path)
+    except BaseException:
+        os.unlink(f.name)
+        raise
+
+
+def read_json(path: Union[str, Path], max_age: Optional[float] = None) -> Optional[Any]:
+    """:return: The content of a JSON file, or None if it is missing, unreadable or older than max_age seconds"""
+    try:
+        if max_age is not None and time.time() - os.path.getmtime(path) >= max_age:
+            return None
+        with open(path) as f:
+            return json.load(f)
+    except (OSError, ValueError):
+        return None
+
+
+def write_json(path: Union[str, Path], data: Any, **kwargs):
+    """Write a JSON file atomically. kwargs are passed to json.dump.
+    :raises OSError: If the file couldn't be written
+    """
+    with atomic_write(path) as f:
+        json.dump(data, f, **kwargs)
+
+
+class JsonFileCache:
+    """A cache of JSON documents, one file per key. A cache without a directory caches nothing."""
+
+    def __init__(self, directory: Optional[Union[str, Path]], version: int = 1, max_age: Optional[float] = None):
+        """
+        :param directory: Directory to store documents in
+        :param version: Version of the format of the documents; bump it when the format changes
+        :param max_age: Seconds after which a document is no longer used. If None, documents never expire.
+        """
+        self.directory = Path(directory, f"v{version}") if directory else None
+        self.max_age = max_age
+
+    @classmethod
+    def named(cls, name: str, version: int = 1, max_age: Optional[float] = None) -> "JsonFileCache":
+        """:return: The cache with the given name in the cache root"""
+        return cls(cache_dir(name), version, max_age)
+
+    def path(self, key: str) -> Optional[Path]:
+        """:return: The file a document is stored in, or None if nothing is cached"""
+        return self.directory / f"{key}.json" if self.directory else None
+
+    def get(self, key: str) -> Optional[Any]:
+        """:return: The cached document, or None if it isn't cached"""
+        path = self.path(key)
+        return read_json(path, self.max_age) if path else None
+
+    def put(self, key: str, document: Any):
+        """Store a document. Failures are logged, since the cache is only an optimization."""
+        path = self.path(key)
+        if not path:
+            return
+        try:
+            write_json(path, document)
+        except OSError as e:
+            LOGGER.warning("Couldn't cache %s in %s: %s", key, path, e)
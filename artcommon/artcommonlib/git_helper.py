@@ -1,6 +1,7 @@
 import copy
 import logging
 import os
+import shutil
 import tempfile
 from pathlib import Path
 from typing import Dict, Optional, Sequence
@@ -12,47 +13,53 @@ from artcommonlib.lock import get_named_semaphore
 LOGGER = logging.getLogger(__name__)
 
 
-def git_clone(remote_url: str, target_dir: str, gitargs=[], set_env={}, timeout=0, git_cache_dir: Optional[str] = None):
+def _prepare_git_cache(remote_url: str, git_cache_dir: str) -> str:
+    """Make sure a bare cache repository exists for remote_url under git_cache_dir and return its path."""
+    Path(git_cache_dir).mkdir(parents=True, exist_ok=True)
+    normalized_url = art_util.convert_remote_git_to_https(remote_url)
+    # Strip special chars out of normalized url to create a human friendly, but unique filename
+    file_friendly_url = normalized_url.split('//')[-1].replace('/', '_')
+    repo_dir = os.path.join(git_cache_dir, file_friendly_url)
+    LOGGER.info(f'Cache for {remote_url} going to {repo_dir}')
+
+    if not os.path.exists(repo_dir):
+        LOGGER.info(f'Initializing cache directory for git remote: {remote_url}')
+
+        # If the cache directory for this repo does not exist yet, we will create one.
+        # But we must do so carefully to minimize races with any other doozer instance
+        # running on the machine.
+        with get_named_semaphore(
+            repo_dir, is_dir=True
+        ):  # also make sure we cooperate with other threads in this process.
+            tmp_repo_dir = tempfile.mkdtemp(dir=git_cache_dir)
+            exectools.cmd_assert(f'git init --bare {tmp_repo_dir}')
+            with exectools.Dir(tmp_repo_dir):
+                exectools.cmd_assert(f'git remote add origin {remote_url}')
+
+            try:
+                os.rename(tmp_repo_dir, repo_dir)
+            except:
+                # There are two categories of failure
+                # 1. Another doozer instance already created the directory, in which case we are good to go.
+                # 2. Something unexpected is preventing the rename.
+                if not os.path.exists(repo_dir):
+                    # Not sure why the rename failed. Raise to user.
+                    raise
+
+    # If we get here, we have a bare repo with a remote set
+    # Pull content to update the cache. This should be safe for multiple doozer instances to perform.
+    LOGGER.info(f'Updating cache directory for git remote: {remote_url}')
+    # Fire and forget this fetch -- just used to keep cache as fresh as possible
+    exectools.fire_and_forget(repo_dir, 'git fetch --all')
+    return repo_dir
+
+
+def _git_clone_cmd(remote_url: str, target_dir: str, gitargs, timeout, git_cache_dir: Optional[str]):
     # Do not change the outer scope param list
     gitargs = copy.copy(gitargs)
 
     if git_cache_dir:
-        Path(git_cache_dir).mkdir(parents=True, exist_ok=True)
-        normalized_url = art_util.convert_remote_git_to_https(remote_url)
-        # Strip special chars out of normalized url to create a human friendly, but unique filename
-        file_friendly_url = normalized_url.split('//')[-1].replace('/', '_')
-        repo_dir = os.path.join(git_cache_dir, file_friendly_url)
-        LOGGER.info(f'Cache for {remote_url} going to {repo_dir}')
-
-        if not os.path.exists(repo_dir):
-            LOGGER.info(f'Initializing cache directory for git remote: {remote_url}')
-
-            # If the cache directory for this repo does not exist yet, we will create one.
-            # But we must do so carefully to minimize races with any other doozer instance
-            # running on the machine.
-            with get_named_semaphore(
-                repo_dir, is_dir=True
-            ):  # also make sure we cooperate with other threads in this process.
-                tmp_repo_dir = tempfile.mkdtemp(dir=git_cache_dir)
-                exectools.cmd_assert(f'git init --bare {tmp_repo_dir}')
-                with exectools.Dir(tmp_repo_dir):
-                    exectools.cmd_assert(f'git remote add origin {remote_url}')
-
-                try:
-                    os.rename(tmp_repo_dir, repo_dir)
-                except:
-                    # There are two categories of failure
-                    # 1. Another doozer instance already created the directory, in which case we are good to go.
-                    # 2. Something unexpected is preventing the rename.
-                    if not os.path.exists(repo_dir):
-                        # Not sure why the rename failed. Raise to user.
-                        raise
-
-        # If we get here, we have a bare repo with a remote set
-        # Pull content to update the cache. This should be safe for multiple doozer instances to perform.
-        LOGGER.info(f'Updating cache directory for git remote: {remote_url}')
-        # Fire and forget this fetch -- just used to keep cache as fresh as possible
-        exectools.fire_and_forget(repo_dir, 'git fetch --all')
+        repo_dir = _prepare_git_cache(remote_url, git_cache_dir)
         gitargs.extend(['--dissociate', '--reference-if-able', repo_dir])
 
     gitargs.append('--recurse-submodules')
@@ -66,9 +73,31 @@ def git_clone(remote_url: str, target_dir: str, gitargs=[], set_env={}, timeout=
     cmd.extend(['git', 'clone', remote_url])
     cmd.extend(gitargs)
     cmd.append(target_dir)
+    return cmd
+
+
+def git_clone(remote_url: str, target_dir: str, gitargs=[], set_env={}, timeout=0, git_cache_dir: Optional[str] = None):
+    cmd = _git_clone_cmd(remote_url, target_dir, gitargs, timeout, git_cache_dir)
     exectools.cmd_assert(cmd, retries=3, on_retry=["rm", "-rf", target_dir], set_env=set_env)
 
 
+async def git_clone_async(
+    remote_url: str, target_dir: str, gitargs=[], set_env={}, timeout=0, git_cache_dir: Optional[str] = None
+):
+    """Asynchronous counterpart of git_clone().
+    The clone is attempted only once; on failure target_dir is removed so that the caller can retry it.
+    :raises ChildProcessError: If git clone fails. The message includes git's stderr.
+    """
+    cmd = _git_clone_cmd(remote_url, target_dir, gitargs, timeout, git_cache_dir)
+    env = os.environ.copy()
+    env.update(set_env)
+    try:
+        await exectools.cmd_gather_async(cmd, env=env)
+    except BaseException:
+        shutil.rmtree(target_dir, ignore_errors=True)
+        raise
+
+
 async def run_git_async(args: Sequence[str], env: Optional[Dict[str, str]] = None, check: bool = True, **kwargs):
     """Run a git command and optionally raises an exception if the return code of the command indicates failure.
     :param args: List of arguments to pass to git
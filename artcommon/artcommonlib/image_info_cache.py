@@ -0,0 +1,126 @@
+"""
+An on-disk cache of image metadata such as the output of `oc image info`, shared by all processes using the same
+cache directory.
+
+The content behind a digest-pinned pullspec never changes, so its metadata is cached indefinitely, keyed by the
+repository, the digest and the options that affect the output (e.g. --filter-by-os). Tag-based pullspecs can move at
+any time; they bypass the cache unless a tag TTL is set, in which case their entries expire after that many seconds.
+
+The cache is used when a cache directory is configured, either with configure() or in the cache root (see
+artcommonlib.file_cache). The tag TTL can be set with the ART_IMAGE_INFO_CACHE_TAG_TTL environment variable.
+"""
+
+import hashlib
+import json
+import logging
+import os
+import threading
+import time
+from pathlib import Path
+from typing import Any, Dict, Iterable, Optional, Union
+
+from artcommonlib import file_cache
+from artcommonlib.registry_client import parse_pullspec
+
+LOGGER = logging.getLogger(__name__)
+
+TAG_TTL_ENV = "ART_IMAGE_INFO_CACHE_TAG_TTL"
+
+
+class ImageInfoCache:
+    """Cache of image metadata keyed by (kind, pullspec, options).
+
+    Entries of digest-pinned pullspecs are kept in memory for the life of the process. All entries are kept on disk.
+    A cache without a directory caches nothing.
+    """
+
+    def __init__(self, cache_dir: Optional[Union[str, Path]] = None, tag_ttl: float = 0):
+        """
+        :param cache_dir: Directory to store entries in. If not set, nothing is cached.
+        :param tag_ttl: Seconds for which entries of tag-based pullspecs are valid. If 0, they are not cached.
+        """
+        self.cache_dir = Path(cache_dir) if cache_dir else None
+        self.tag_ttl = tag_ttl
+        self._disk = file_cache.JsonFileCache(cache_dir)
+        self._entries: Dict[str, Dict[str, Any]] = {}
+        self._lock = threading.Lock()
+
+    def _key(self, kind: str, pullspec: str, options: Iterable[str]) -> Optional[str]:
+        """Get the cache key of a lookup, or None if it must not be cached."""
+        if not self.cache_dir:
+            return None
+        ref = parse_pullspec(pullspec)
+        if ref.digest:
+            # A tag alongside the digest doesn't change what is pulled
+            name = f"{ref.registry}/{ref.repository}@{ref.digest}"
+        elif self.tag_ttl > 0:
+            name = str(ref)
+        else:
+            return None
+        key = json.dumps([kind, name, sorted(options)])
+        return hashlib.sha256(key.encode()).hexdigest()
+
+    @staticmethod
+    def _is_fresh(entry: Dict[str, Any]) -> bool:
+        return "expires" not in entry or entry["expires"] > time.time()
+
+    def get(self, kind: str, pullspec: str, options: Iterable[str] = ()) -> Optional[Any]:
+        """Look up cached metadata.
+        :param kind: What the metadata is, e.g. "image-info" for `oc image info` output
+        :param pullspec: The image pullspec
+        :param options: Options that affect the metadata, e.g. ["--filter-by-os=amd64"]
+        :return: The cached metadata, or None if it is not cached
+        """
+        key = self._key(kind, pullspec, options)
+        if not key:
+            return None
+        with self._lock:
+            entry = self._entries.get(key)
+        if entry is None:
+            entry = self._disk.get(key)
+            if not isinstance(entry, dict) or "info" not in entry:
+                return None
+            if "expires" not in entry:
+                with self._lock:
+                    self._entries[key] = entry
+        if not self._is_fresh(entry):
+            return None
+        return entry["info"]
+
+    def put(self, kind: str, pullspec: str, options: Iterable[str], info: Any):
+        """Store metadata. Does nothing if the pullspec is not cacheable.
+        :param info: JSON serializable metadata
+        """
+        key = self._key(kind, pullspec, options)
+        if not key:
+            return
+        entry = {"pullspec": pullspec, "info": info}
+        if parse_pullspec(pullspec).digest:
+            with self._lock:
+                self._entries[key] = entry
+        else:
+            # Tag entries are always read from disk, where another process may have refreshed them
+            entry["expires"] = time.time() + self.tag_ttl
+        self._disk.put(key, entry)
+
+
+_default_cache: Optional[ImageInfoCache] = None
+
+
+def configure(cache_dir: Optional[Union[str, Path]], tag_ttl: Optional[float] = None) -> ImageInfoCache:
+    """Set the directory of the cache returned by get_cache().
+    :param cache_dir: Directory to store entries in. If None, caching is disabled.
+    :param tag_ttl: Seconds for which entries of tag-based pullspecs are valid; defaults to ART_IMAGE_INFO_CACHE_TAG_TTL or 0
+    """
+    global _default_cache
+    if tag_ttl is None:
+        tag_ttl = float(os.environ.get(TAG_TTL_ENV) or 0)
+    _default_cache = ImageInfoCache(cache_dir, tag_ttl)
+    return _default_cache
+
+
+def get_cache() -> ImageInfoCache:
+    """Get the process wide cache, in the cache root unless configure() has been called."""
+    if _default_cache is None:
+        return configure(file_cache.cache_dir("image-info"))
+    return _default_cache
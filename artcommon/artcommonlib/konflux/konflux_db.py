@@ -124,6 +124,7 @@ class KonfluxDb:
         sorting: str = 'DESC',
         limit: typing.Optional[int] = None,
         strict: bool = False,
+        first_per: typing.Optional[str] = None,
     ) -> typing.AsyncIterator[KonfluxRecord]:
         """
         Execute a SELECT * from the BigQuery table.
@@ -137,6 +138,7 @@ class KonfluxDb:
         "sorting" is the sorting order.
         "limit" is the maximum number of results to return. None for no limit.
         "strict" is a flag that raises an exception if no results are found.
+        "first_per" is an optional column name. In each window, only the first record of each value of that column is returned.
 
         Return a generator that yields KonfluxRecord objects.
         """
@@ -189,6 +191,7 @@ class KonfluxDb:
                     where_clauses=where_clauses,
                     order_by_clause=order_by_clause,
                     limit=limit - total_rows if limit is not None else None,
+                    first_per=first_per,
                 )
             except Exception as e:
                 self.logger.error('Failed executing query: %s', e)
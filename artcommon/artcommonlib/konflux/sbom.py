@@ -0,0 +1,151 @@
+"""
+Helpers for reading the CycloneDX SBOMs that Konflux attaches to the images it builds.
+
+SBOMs of large images are tens of MB per arch, so they are parsed as a stream: only the package URLs are
+extracted and the document itself is never held in memory. The source RPMs found in an SBOM are cached by
+image digest and arch, since the SBOM attached to a digest never changes.
+"""
+
+import asyncio
+import codecs
+import json
+import logging
+import re
+from pathlib import Path
+from typing import Dict, Iterable, List, Optional, Tuple, Union
+from urllib.parse import unquote
+
+from artcommonlib import exectools, file_cache
+
+LOGGER = logging.getLogger(__name__)
+
+# Matches a "purl" key and its JSON string value. Escapes in the value are decoded separately.
+_PURL_PATTERN = re.compile(r'"purl"\s*:\s*"((?:[^"\\]|\\.)*)"')
+_COMPONENTS_KEY = '"components"'
+
+_READ_CHUNK_SIZE = 1024 * 1024
+
+
+class SbomPurlExtractor:
+    """Incrementally extracts package URLs from a CycloneDX SBOM document fed in chunks."""
+
+    def __init__(self):
+        self._decoder = codecs.getincrementaldecoder("utf-8")()
+        self._buffer = ""
+        self.purls: List[str] = []
+        self.has_components = False
+
+    def feed(self, chunk: Union[bytes, str]):
+        if isinstance(chunk, bytes):
+            chunk = self._decoder.decode(chunk)
+        buffer = self._buffer + chunk
+        if not self.has_components and _COMPONENTS_KEY in buffer:
+            self.has_components = True
+        end = 0
+        for match in _PURL_PATTERN.finditer(buffer):
+            self.purls.append(json.loads(f'"{match.group(1)}"'))
+            end = match.end()
+        rest = buffer[end:]
+        # Keep a purl that may have been cut off by the end of the chunk;
+        # otherwise just enough to recognize a key that was.
+        pending = rest.rfind('"purl"')
+        self._buffer = rest[pending:] if pending >= 0 else rest[-len(_COMPONENTS_KEY) :]
+
+
+def iter_sbom_purls(chunks: Iterable[Union[bytes, str]]):
+    """Yield the package URLs found in an SBOM document given as an iterable of chunks."""
+    extractor = SbomPurlExtractor()
+    for chunk in chunks:
+        extractor.feed(chunk)
+        yield from extractor.purls
+        extractor.purls.clear()
+
+
+def source_rpm_from_purl(purl: str) -> Optional[str]:
+    """Get the source RPM NVR of an RPM package URL.
+
+    Konflux sets the source RPM in the "upstream" qualifier, e.g.
+    pkg:rpm/rhel/coreutils-single@8.32-35.el9?arch=x86_64&upstream=coreutils-8.32-35.el9.src.rpm&distro=rhel-9.4
+
+    :return: The source RPM NVR, or None if the package URL is not for an RPM or has no source RPM
+    """
+    if not purl.startswith("pkg:rpm/"):
+        return None
+    qualifiers = purl.partition("?")[2].partition("#")[0]
+    for qualifier in qualifiers.split("&"):
+        key, _, value = qualifier.partition("=")
+        if key.lower() == "upstream" and value:
+            return unquote(value).removesuffix(".src.rpm")
+    return None
+
+
+def image_digest(pullspec: str) -> Optional[str]:
+    """Get the digest of a pullspec that references an image by digest, e.g. quay.io/foo/bar@sha256:abc."""
+    _, sep, digest = pullspec.partition("@")
+    return digest if sep and digest.startswith("sha256:") else None
+
+
+class SbomCache:
+    """Cache of the source RPMs found in the SBOM of an image, keyed by image digest and arch.
+
+    Entries are kept in memory for the life of the process and, if cache_dir is set, on disk so that they can be
+    reused by later runs.
+    """
+
+    def __init__(self, cache_dir: Optional[Union[str, Path]] = None):
+        self._disk = file_cache.JsonFileCache(cache_dir)
+        self._entries: Dict[Tuple[str, str], List[str]] = {}
+
+    @staticmethod
+    def _key(digest: str, arch: str) -> str:
+        return f"{digest.replace(':', '-')}-{arch}"
+
+    def get(self, digest: str, arch: str) -> Optional[List[str]]:
+        key = (digest, arch)
+        if key not in self._entries:
+            source_rpms = self._disk.get(self._key(digest, arch))
+            if source_rpms is not None:
+                self._entries[key] = source_rpms
+        return self._entries.get(key)
+
+    def put(self, digest: str, arch: str, source_rpms: Iterable[str]):
+        source_rpms = sorted(source_rpms)
+        self._entries[(digest, arch)] = source_rpms
+        self._disk.put(self._key(digest, arch), source_rpms)
+
+
+async def download_sbom_source_rpms(cmd: List[str]) -> List[str]:
+    """Run a `cosign download sbom` command and extract source RPMs from its output as it is produced.
+
+    :param cmd: The cosign command
+    :return: Sorted source RPM NVRs
+    :raises ChildProcessError: If cosign fails or its output is not an SBOM with components
+    """
+    LOGGER.info("Executing:download_sbom_source_rpms: %s", " ".join(cmd[:5]))
+    proc = await asyncio.subprocess.create_subprocess_exec(
+        *cmd, stdout=asyncio.subprocess.PIPE, stderr=asyncio.subprocess.PIPE
+    )
+    extractor = SbomPurlExtractor()
+    source_rpms = set()
+    purl_count = 0
+    stderr_task = asyncio.ensure_future(proc.stderr.read())
+    try:
+        while chunk := await proc.stdout.read(_READ_CHUNK_SIZE):
+            extractor.feed(chunk)
+            purl_count += len(extractor.purls)
+            for purl in extractor.purls:
+                source_rpm = source_rpm_from_purl(purl)
+                if source_rpm:
+                    source_rpms.add(source_rpm)
+            extractor.purls.clear()
+        stderr = (await stderr_task).decode(errors="replace")
+        await proc.wait()
+    except asyncio.CancelledError:
+        stderr_task.cancel()
+        await exectools.terminate_process(proc)
+        raise
+    if proc.returncode != 0:
+        raise ChildProcessError(f"cosign command failed to download SBOM (exit code {proc.returncode}): {stderr}")
+    if not extractor.has_components or not purl_count:
+        raise ChildProcessError("cosign command returned invalid SBOM")
+    return sorted(source_rpms)
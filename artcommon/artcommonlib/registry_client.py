@@ -0,0 +1,353 @@
+"""
+An asynchronous client for the OCI distribution (docker registry v2) API.
+
+Credentials are read from the same auth files `oc`, `podman` and `skopeo` use, and bearer tokens are negotiated
+from the registry's WWW-Authenticate challenge. One keep-alive connection pool is shared by all requests, so
+inspecting many images costs a few connections per registry instead of an `oc` process and TLS handshake per image.
+
+RegistryClient.image_info() returns the same structure as `oc image info -o json`.
+"""
+
+import asyncio
+import base64
+import hashlib
+import json
+import logging
+import os
+import re
+from pathlib import Path
+from typing import Any, Dict, List, NamedTuple, Optional, Tuple, Union
+
+import aiohttp
+
+LOGGER = logging.getLogger(__name__)
+
+MANIFEST_LIST_MEDIA_TYPES = [
+    "application/vnd.oci.image.index.v1+json",
+    "application/vnd.docker.distribution.manifest.list.v2+json",
+]
+MANIFEST_MEDIA_TYPES = MANIFEST_LIST_MEDIA_TYPES + [
+    "application/vnd.oci.image.manifest.v1+json",
+    "application/vnd.docker.distribution.manifest.v2+json",
+]
+
+DOCKER_HUB_REGISTRY = "docker.io"
+_DOCKER_HUB_API_HOST = "registry-1.docker.io"
+
+_CHALLENGE_PARAM_PATTERN = re.compile(r'(\w+)="([^"]*)"')
+
+
+class RegistryError(Exception):
+    """Raised when a registry request fails."""
+
+    def __init__(self, message: str, status: Optional[int] = None):
+        super().__init__(message)
+        self.status = status
+
+
+class ImageReference(NamedTuple):
+    registry: str
+    repository: str
+    tag: Optional[str]
+    digest: Optional[str]
+
+    @property
+    def reference(self) -> str:
+        """The manifest reference: the digest if there is one, otherwise the tag."""
+        return self.digest or self.tag or "latest"
+
+    def __str__(self):
+        s = f"{self.registry}/{self.repository}"
+        if self.tag:
+            s += f":{self.tag}"
+        if self.digest:
+            s += f"@{self.digest}"
+        return s
+
+
+class Manifest(NamedTuple):
+    digest: str
+    media_type: str
+    content: Dict[str, Any]
+
+    @property
+    def is_list(self) -> bool:
+        return self.media_type in MANIFEST_LIST_MEDIA_TYPES
+
+
+def platform_string(platform: Dict[str, str]) -> str:
+    """Format a manifest list platform like oc does, e.g. linux/arm64/v8"""
+    parts = [platform.get("os", ""), platform.get("architecture", "")]
+    if platform.get("variant"):
+        parts.append(platform["variant"])
+    return "/".join(parts)
+
+
+def parse_pullspec(pullspec: str) -> ImageReference:
+    """Split a pullspec like quay.io/org/repo:tag or quay.io/org/repo@sha256:abc into its parts."""
+    name, _, digest = pullspec.partition("@")
+    tag = None
+    last_slash = name.rfind("/")
+    colon = name.rfind(":")
+    if colon > last_slash:
+        name, tag = name[:colon], name[colon + 1 :]
+    registry, _, repository = name.partition("/")
+    if not repository or not ("." in registry or ":" in registry or registry == "localhost"):
+        # No registry host in the pullspec
+        registry, repository = DOCKER_HUB_REGISTRY, name
+        if "/" not in repository:
+            repository = f"library/{repository}"
+    return ImageReference(registry, repository, tag, digest or None)
+
+
+def default_auth_files() -> List[Path]:
+    """Auth files in the order they are looked up by the container tools."""
+    paths = []
+    if os.environ.get("REGISTRY_AUTH_FILE"):
+        paths.append(Path(os.environ["REGISTRY_AUTH_FILE"]))
+    if os.environ.get("XDG_RUNTIME_DIR"):
+        paths.append(Path(os.environ["XDG_RUNTIME_DIR"], "containers", "auth.json"))
+    paths.append(Path(os.environ.get("DOCKER_CONFIG", Path.home().joinpath(".docker")), "config.json"))
+    return paths
+
+
+def load_auths(auth_file: Optional[str] = None) -> Dict[str, Tuple[str, str]]:
+    """Load registry credentials from a docker/containers auth file.
+    :param auth_file: Path to the auth file. If not set, the first of default_auth_files() that exists is used.
+    :return: A dict of registry (optionally with a repository path) -> (username, password)
+    """
+    paths = [Path(auth_file)] if auth_file else [p for p in default_auth_files() if p.is_file()]
+    if not paths:
+        return {}
+    with paths[0].open() as f:
+        config = json.load(f)
+    auths = {}
+    for key, entry in config.get("auths", {}).items():
+        encoded = entry.get("auth")
+        if not encoded:
+            continue
+        username, _, password = base64.b64decode(encoded).decode().partition(":")
+        key = re.sub(r"^https?://", "", key).rstrip("/")
+        auths[key.removesuffix("/v1").removesuffix("/v2")] = (username, password)
+    return auths
+
+
+class RegistryClient:
+    """Asynchronous client for the OCI distribution API. Use as an async context manager."""
+
+    def __init__(
+        self,
+        auth_file: Optional[str] = None,
+        credentials: Optional[Dict[str, Tuple[str, str]]] = None,
+        limit_per_host: int = 16,
+        timeout: float = 60,
+        insecure_registries: Tuple[str, ...] = ("localhost", "127.0.0.1"),
+    ):
+        """
+        :param auth_file: Auth file to read credentials from. See load_auths.
+        :param credentials: Credentials to use instead of reading an auth file; registry -> (username, password)
+        :param limit_per_host: Maximum number of concurrent connections per registry
+        :param timeout: Total timeout of a single request in seconds
+        :param insecure_registries: Registry hosts (without port) to talk to over plain HTTP
+        """
+        self._credentials = credentials if credentials is not None else load_auths(auth_file)
+        self._limit_per_host = limit_per_host
+        self._timeout = aiohttp.ClientTimeout(total=timeout)
+        self._insecure_registries = insecure_registries
+        self._session: Optional[aiohttp.ClientSession] = None
+        # (registry, scope) -> Authorization header value
+        self._authorizations: Dict[Tuple[str, str], str] = {}
+
+    async def __aenter__(self):
+        self._session = aiohttp.ClientSession(
+            connector=aiohttp.TCPConnector(limit_per_host=self._limit_per_host), timeout=self._timeout
+        )
+        return self
+
+    async def __aexit__(self, *_):
+        await self.close()
+
+    async def close(self):
+        if self._session:
+            await self._session.close()
+            self._session = None
+
+    def _base_url(self, registry: str) -> str:
+        if registry == DOCKER_HUB_REGISTRY:
+            return f"https://{_DOCKER_HUB_API_HOST}"
+        scheme = "http" if registry.partition(":")[0] in self._insecure_registries else "https"
+        return f"{scheme}://{registry}"
+
+    def _find_credentials(self, registry: str, repository: str) -> Optional[Tuple[str, str]]:
+        # The most specific entry wins, e.g. quay.io/org/repo over quay.io/org over quay.io
+        path = f"{registry}/{repository}"
+        while path:
+            if path in self._credentials:
+                return self._credentials[path]
+            path = path.rpartition("/")[0]
+        return None
+
+    async def _authorize(self, ref: ImageReference, challenge: str, scope: str) -> str:
+        scheme, _, params = challenge.partition(" ")
+        credentials = self._find_credentials(ref.registry, ref.repository)
+        basic = None
+        if credentials:
+            basic = "Basic " + base64.b64encode(f"{credentials[0]}:{credentials[1]}".encode()).decode()
+        if scheme.lower() == "basic":
+            if not basic:
+                raise RegistryError(f"No credentials for {ref.registry}", status=401)
+            return basic
+        if scheme.lower() != "bearer":
+            raise RegistryError(f"Unsupported authentication scheme from {ref.registry}: {scheme}", status=401)
+        params = dict(_CHALLENGE_PARAM_PATTERN.findall(params))
+        query = {"scope": scope}
+        if "service" in params:
+            query["service"] = params["service"]
+        headers = {"Authorization": basic} if basic else {}
+        async with self._session.get(params["realm"], params=query, headers=headers) as response:
+            if response.status != 200:
+                raise RegistryError(
+                    f"Failed to get a token for {scope} from {params['realm']}: HTTP {response.status}",
+                    status=response.status,
+                )
+            body = await response.json(content_type=None)
+        token = body.get("token") or body.get("access_token")
+        if not token:
+            raise RegistryError(f"No token in response from {params['realm']}")
+        return f"Bearer {token}"
+
+    async def request(
+        self, method: str, ref: ImageReference, path: str, headers: Optional[Dict[str, str]] = None
+    ) -> aiohttp.ClientResponse:
+        """Send a request to the repository of ref, authenticating if challenged.
+        The caller must release the returned response.
+        :param path: Path relative to /v2/<repository>/, e.g. "manifests/latest"
+        """
+        if self._session is None:
+            raise RuntimeError("RegistryClient must be used as an async context manager")
+        url = f"{self._base_url(ref.registry)}/v2/{ref.repository}/{path}"
+        scope = f"repository:{ref.repository}:pull"
+        headers = dict(headers or {})
+        key = (ref.registry, scope)
+        for attempt in range(2):
+            if key in self._authorizations:
+                headers["Authorization"] = self._authorizations[key]
+            response = await self._session.request(method, url, headers=headers)
+            if response.status != 401 or attempt > 0:
+                return response
+            challenge = response.headers.get("WWW-Authenticate", "")
+            response.release()
+            self._authorizations[key] = await self._authorize(ref, challenge, scope)
+        raise AssertionError("unreachable")
+
+    async def head_manifest(self, pullspec: str) -> Optional[str]:
+        """Check whether a manifest exists.
+        :return: The digest of the manifest, or None if it doesn't exist
+        :raises RegistryError: If the registry returns an unexpected response
+        """
+        ref = parse_pullspec(pullspec)
+        response = await self.request(
+            "HEAD", ref, f"manifests/{ref.reference}", headers={"Accept": ", ".join(MANIFEST_MEDIA_TYPES)}
+        )
+        async with response:
+            if response.status == 404:
+                return None
+            if response.status != 200:
+                raise RegistryError(f"HEAD {pullspec} failed: HTTP {response.status}", status=response.status)
+            return response.headers.get("Docker-Content-Digest") or ref.digest
+
+    async def _get_verified(self, ref: ImageReference, path: str, digest: Optional[str], headers=None):
+        """GET a manifest or blob, checking its content against digest if one is given.
+        :return: (response headers, body, digest of the body)
+        """
+        response = await self.request("GET", ref, path, headers=headers)
+        async with response:
+            if response.status == 404:
+                raise RegistryError(f"{ref.registry}/{ref.repository}/{path} was not found", status=404)
+            if response.status != 200:
+                raise RegistryError(
+                    f"GET {ref.registry}/{ref.repository}/{path} failed: HTTP {response.status}", status=response.status
+                )
+            body = await response.read()
+            response_headers = response.headers
+        actual = "sha256:" + hashlib.sha256(body).hexdigest()
+        if digest and digest.startswith("sha256:") and digest != actual:
+            raise RegistryError(f"{ref.registry}/{ref.repository}/{path} has digest {actual}, expected {digest}")
+        return response_headers, body, actual
+
+    async def get_manifest(self, pullspec: Union[str, ImageReference]) -> Manifest:
+        """Fetch the manifest or manifest list a pullspec refers to.
+        :raises RegistryError: If it doesn't exist (with status 404) or can't be fetched
+        """
+        ref = parse_pullspec(pullspec) if isinstance(pullspec, str) else pullspec
+        headers, body, digest = await self._get_verified(
+            ref, f"manifests/{ref.reference}", ref.digest, headers={"Accept": ", ".join(MANIFEST_MEDIA_TYPES)}
+        )
+        content = json.loads(body)
+        media_type = content.get("mediaType") or headers.get("Content-Type", "").split(";")[0]
+        return Manifest(headers.get("Docker-Content-Digest") or digest, media_type, content)
+
+    async def get_blob(self, pullspec: Union[str, ImageReference], digest: str) -> bytes:
+        """Fetch a blob from the repository of a pullspec, e.g. an image config."""
+        ref = parse_pullspec(pullspec) if isinstance(pullspec, str) else pullspec
+        _, body, _ = await self._get_verified(ref, f"blobs/{digest}", digest)
+        return body
+
+    async def _manifest_info(
+        self, pullspec: str, ref: ImageReference, manifest: Manifest, list_digest: Optional[str] = None
+    ) -> Dict[str, Any]:
+        if manifest.is_list:
+            raise RegistryError(f"{pullspec} is a manifest list nested in a manifest list, which is not supported")
+        config_descriptor = manifest.content.get("config")
+        if not config_descriptor:
+            raise RegistryError(
+                f"{pullspec} has a manifest without a config (schema version 1?), which is not supported"
+            )
+        config = json.loads(await self.get_blob(ref, config_descriptor["digest"]))
+        info = {
+            "name": pullspec,
+            "digest": manifest.digest,
+            "contentDigest": manifest.digest,
+            "mediaType": manifest.media_type,
+            "layers": manifest.content.get("layers", []),
+            "config": config,
+        }
+        if list_digest:
+            info["listDigest"] = list_digest
+        return info
+
+    async def image_info(
+        self, pullspec: str, filter_by_os: Optional[str] = None, show_multiarch: bool = False
+    ) -> Union[Dict[str, Any], List[Dict[str, Any]]]:
+        """Inspect an image, returning what `oc image info -o json` would.
+        :param pullspec: The image to inspect
+        :param filter_by_os: Like oc's --filter-by-os: a regular expression that selects the first matching image
+            of a manifest list by its platform, e.g. "amd64" or "linux/arm64"
+        :param show_multiarch: Like oc's --show-multiarch: return a list with the info of every image of a manifest
+            list
+        :return: The image info, or a list of image info if show_multiarch is set and pullspec is a manifest list
+        :raises RegistryError: If the image doesn't exist (with status 404) or can't be inspected
+        """
+        ref = parse_pullspec(pullspec)
+        manifest = await self.get_manifest(ref)
+        if not manifest.is_list:
+            return await self._manifest_info(pullspec, ref, manifest)
+
+        entries = manifest.content.get("manifests", [])
+        if filter_by_os:
+            pattern = re.compile(filter_by_os)
+            entries = [e for e in entries if pattern.search(platform_string(e.get("platform", {})))][:1]
+            if not entries:
+                raise RegistryError(f"{pullspec} has no image matching --filter-by-os={filter_by_os}")
+        elif not show_multiarch and len(entries) != 1:
+            raise RegistryError(
+                f"{pullspec} is a manifest list and contains multiple images - use filter_by_os or show_multiarch"
+            )
+
+        async def _entry_info(entry: Dict[str, Any]) -> Dict[str, Any]:
+            child_ref = ref._replace(tag=None, digest=entry["digest"])
+            child = await self.get_manifest(child_ref)
+            return await self._manifest_info(pullspec, child_ref, child, list_digest=manifest.digest)
+
+        infos = await asyncio.gather(*(_entry_info(entry) for entry in entries))
+        return list(infos) if show_multiarch and not filter_by_os else infos[0]
@@ -224,6 +224,13 @@ class TestExectools(IsolatedAsyncioTestCase):
             self.assertEqual(out, fake_stdout.decode("utf-8"))
             self.assertEqual(err, fake_stderr.decode("utf-8"))
 
+    async def test_cmd_gather_async_cancelled(self):
+        task = asyncio.create_task(exectools.cmd_gather_async(["sleep", "60"]))
+        await asyncio.sleep(0.5)
+        task.cancel()
+        with self.assertRaises(asyncio.CancelledError):
+            await asyncio.wait_for(task, timeout=5)
+
     async def test_cmd_assert_async(self):
         cmd = ["uname", "-a"]
         fake_cwd = "/foo/bar"
@@ -235,6 +242,16 @@ class TestExectools(IsolatedAsyncioTestCase):
             create_subprocess_exec.assert_awaited_once_with(*cmd, cwd=fake_cwd)
             self.assertEqual(rc, 0)
 
+    async def test_run_coroutine(self):
+        async def _add(a, b):
+            await asyncio.sleep(0)
+            return a + b
+
+        # from synchronous code without an event loop
+        self.assertEqual(await asyncio.to_thread(exectools.run_coroutine, _add(1, 2)), 3)
+        # from synchronous code called by a coroutine
+        self.assertEqual(exectools.run_coroutine(_add(3, 4)), 7)
+
     def test_parallel_exec(self):
         items = [1, 2, 3]
         results = exectools.parallel_exec(lambda k, v: k, items, n_threads=4)
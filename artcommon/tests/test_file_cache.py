@@ -0,0 +1,51 @@
+import os
+import tempfile
+from pathlib import Path
+from unittest import TestCase
+from unittest.mock import patch
+
+from artcommonlib import file_cache
+from artcommonlib.file_cache import JsonFileCache
+
+
+class TestFileCache(TestCase):
+    def setUp(self):
+        self.tmpdir = tempfile.TemporaryDirectory()
+        self.addCleanup(self.tmpdir.cleanup)
+        self.addCleanup(file_cache.configure, None)
+
+    def test_cache_dir(self):
+        with patch.dict(os.environ, {file_cache.CACHE_DIR_ENV: ""}):
+            self.assertIsNone(file_cache.cache_dir("foo"))
+        with patch.dict(os.environ, {file_cache.CACHE_DIR_ENV: self.tmpdir.name}):
+            self.assertEqual(file_cache.cache_dir("foo"), Path(self.tmpdir.name, "foo"))
+            file_cache.configure("/other")
+            self.assertEqual(file_cache.cache_dir("foo"), Path("/other/foo"))
+
+    def test_atomic_write_keeps_old_content_on_failure(self):
+        path = Path(self.tmpdir.name, "sub", "doc.json")
+        file_cache.write_json(path, {"a": 1})
+        with self.assertRaises(RuntimeError):
+            with file_cache.atomic_write(path) as f:
+                f.write("partial")
+                raise RuntimeError("interrupted")
+        self.assertEqual(file_cache.read_json(path), {"a": 1})
+        self.assertEqual(os.listdir(path.parent), ["doc.json"])
+
+    def test_json_file_cache(self):
+        cache = JsonFileCache(self.tmpdir.name, max_age=60)
+        cache.put("key", ["value"])
+        self.assertEqual(cache.path("key"), Path(self.tmpdir.name, "v1", "key.json"))
+        mtime = os.path.getmtime(cache.path("key"))
+        with patch("artcommonlib.file_cache.time.time", return_value=mtime + 59):
+            self.assertEqual(JsonFileCache(self.tmpdir.name, max_age=60).get("key"), ["value"])
+        with patch("artcommonlib.file_cache.time.time", return_value=mtime + 61):
+            self.assertIsNone(cache.get("key"))
+        # a new format version doesn't read documents of the old one
+        self.assertIsNone(JsonFileCache(self.tmpdir.name, version=2).get("key"))
+
+    def test_disabled_without_dir(self):
+        cache = JsonFileCache(None)
+        cache.put("key", ["value"])
+        self.assertIsNone(cache.get("key"))
+        self.assertIsNone(cache.path("key"))
@@ -0,0 +1,57 @@
+import os
+import tempfile
+from pathlib import Path
+from unittest import TestCase
+from unittest.mock import patch
+
+from artcommonlib import file_cache, image_info_cache
+from artcommonlib.image_info_cache import ImageInfoCache
+
+DIGEST = "sha256:" + "a" * 64
+
+
+class TestImageInfoCache(TestCase):
+    def setUp(self):
+        self.tmpdir = tempfile.TemporaryDirectory()
+        self.addCleanup(self.tmpdir.cleanup)
+
+    def test_digest_pullspecs_are_shared_across_instances(self):
+        cache = ImageInfoCache(self.tmpdir.name)
+        cache.put("image-info", f"quay.io/org/repo:tag@{DIGEST}", ["--filter-by-os=amd64"], {"digest": DIGEST})
+        # A new instance stands in for another process
+        other = ImageInfoCache(self.tmpdir.name)
+        self.assertEqual(
+            other.get("image-info", f"quay.io/org/repo@{DIGEST}", ["--filter-by-os=amd64"]), {"digest": DIGEST}
+        )
+        self.assertIsNone(other.get("image-info", f"quay.io/org/repo@{DIGEST}", ["--filter-by-os=arm64"]))
+        self.assertIsNone(other.get("release-info", f"quay.io/org/repo@{DIGEST}", ["--filter-by-os=amd64"]))
+        self.assertIsNone(other.get("image-info", f"quay.io/org/other@{DIGEST}", ["--filter-by-os=amd64"]))
+
+    def test_tags_bypass_cache_without_ttl(self):
+        cache = ImageInfoCache(self.tmpdir.name)
+        cache.put("image-info", "quay.io/org/repo:latest", [], {"digest": DIGEST})
+        self.assertIsNone(cache.get("image-info", "quay.io/org/repo:latest"))
+        self.assertEqual(os.listdir(self.tmpdir.name), [])
+
+    def test_tags_expire(self):
+        cache = ImageInfoCache(self.tmpdir.name, tag_ttl=60)
+        with patch("artcommonlib.image_info_cache.time.time", return_value=1000):
+            cache.put("image-info", "quay.io/org/repo:latest", [], {"digest": DIGEST})
+        with patch("artcommonlib.image_info_cache.time.time", return_value=1059):
+            self.assertEqual(cache.get("image-info", "quay.io/org/repo:latest"), {"digest": DIGEST})
+        with patch("artcommonlib.image_info_cache.time.time", return_value=1061):
+            self.assertIsNone(cache.get("image-info", "quay.io/org/repo:latest"))
+
+    def test_disabled_without_dir(self):
+        cache = ImageInfoCache()
+        cache.put("image-info", f"quay.io/org/repo@{DIGEST}", [], {"digest": DIGEST})
+        self.assertIsNone(cache.get("image-info", f"quay.io/org/repo@{DIGEST}"))
+
+    def test_get_cache_from_environment(self):
+        self.addCleanup(setattr, image_info_cache, "_default_cache", None)
+        image_info_cache._default_cache = None
+        with patch.dict(os.environ, {file_cache.CACHE_DIR_ENV: self.tmpdir.name, image_info_cache.TAG_TTL_ENV: "30"}):
+            cache = image_info_cache.get_cache()
+        self.assertEqual(cache.cache_dir, Path(self.tmpdir.name, "image-info"))
+        self.assertEqual(cache.tag_ttl, 30)
+        self.assertIs(image_info_cache.get_cache(), cache)
@@ -291,6 +291,25 @@ class TestKonfluxDB(IsolatedAsyncioTestCase):
         self.assertListEqual(actual_queries, expected_queries)
         self.assertEqual(len(records), 3)
 
+    @patch('artcommonlib.bigquery.BigQueryClient.query_async')
+    async def test_search_builds_by_fields_first_per(self, mock_query_async: AsyncMock):
+        mock_query_async.return_value = MagicMock(total_rows=0, __iter__=MagicMock(return_value=iter([])))
+        await anext(
+            self.db.search_builds_by_fields(
+                start_search=datetime(2024, 9, 23, 9, 0, 0, tzinfo=timezone.utc),
+                end_search=datetime(2024, 9, 30, 9, 0, 0, tzinfo=timezone.utc),
+                where={'name': ['ironic', 'ose-installer']},
+                first_per='name',
+            ),
+            None,
+        )
+        mock_query_async.assert_awaited_once_with(
+            "SELECT * FROM `builds` WHERE outcome IN ('success', 'failure') AND name IN ('ironic', 'ose-installer') "
+            "AND start_time >= '2024-09-23 09:00:00+00:00' AND start_time < '2024-09-30 09:00:00+00:00' "
+            "QUALIFY ROW_NUMBER() OVER (PARTITION BY `name` ORDER BY `start_time` DESC) = 1 "
+            "ORDER BY `start_time` DESC"
+        )
+
     @patch('artcommonlib.konflux.konflux_db.datetime')
     @patch('artcommonlib.bigquery.BigQueryClient.query_async')
     async def test_get_latest_build(self, query_mock, datetime_mock):
@@ -0,0 +1,194 @@
+import base64
+import hashlib
+import json
+import os
+import tempfile
+from unittest import IsolatedAsyncioTestCase, TestCase
+from unittest.mock import patch
+
+from aiohttp import web
+from artcommonlib.registry_client import ImageReference, RegistryClient, RegistryError, load_auths, parse_pullspec
+
+DIGEST = "sha256:" + "a" * 64
+
+
+class TestParsePullspec(TestCase):
+    def test_parse_pullspec(self):
+        self.assertEqual(parse_pullspec("quay.io/org/repo:tag"), ImageReference("quay.io", "org/repo", "tag", None))
+        self.assertEqual(
+            parse_pullspec(f"localhost:5000/repo@{DIGEST}"), ImageReference("localhost:5000", "repo", None, DIGEST)
+        )
+        self.assertEqual(
+            parse_pullspec(f"registry.io/a/b/c:tag@{DIGEST}"), ImageReference("registry.io", "a/b/c", "tag", DIGEST)
+        )
+        self.assertEqual(parse_pullspec("centos:7"), ImageReference("docker.io", "library/centos", "7", None))
+        self.assertEqual(parse_pullspec("quay.io/org/repo").reference, "latest")
+
+    def test_load_auths(self):
+        with tempfile.NamedTemporaryFile("w", suffix=".json") as f:
+            json.dump(
+                {
+                    "auths": {
+                        "https://quay.io/v1/": {"auth": base64.b64encode(b"user:pass:word").decode()},
+                        "quay.io/org": {"auth": base64.b64encode(b"org:secret").decode()},
+                        "registry.io": {},
+                    }
+                },
+                f,
+            )
+            f.flush()
+            self.assertEqual(load_auths(f.name), {"quay.io": ("user", "pass:word"), "quay.io/org": ("org", "secret")})
+
+    def test_load_auths_default(self):
+        with tempfile.TemporaryDirectory() as tmpdir:
+            with patch.dict(os.environ, {"REGISTRY_AUTH_FILE": "", "XDG_RUNTIME_DIR": "", "DOCKER_CONFIG": tmpdir}):
+                self.assertEqual(load_auths(), {})
+
+
+def _digest(body: bytes) -> str:
+    return "sha256:" + hashlib.sha256(body).hexdigest()
+
+
+class StubRegistry:
+    """Serves manifests and blobs of a single repository behind bearer token authentication."""
+
+    def __init__(self):
+        self.token_requests = []
+        self.manifest_requests = 0
+        # reference -> (media type, body)
+        self.manifests = {"latest": ("application/vnd.docker.distribution.manifest.v2+json", b"{}")}
+        self.manifests[DIGEST] = self.manifests["latest"]
+        self.blobs = {}
+        app = web.Application()
+        app.router.add_get("/token", self.token)
+        app.router.add_route("*", "/v2/{repo:.+}/manifests/{ref}", self.manifest)
+        app.router.add_get("/v2/{repo:.+}/blobs/{digest}", self.blob)
+        self.runner = web.AppRunner(app)
+
+    def add_image(self, arch: str, tag: str = None) -> str:
+        config = json.dumps({"architecture": arch, "os": "linux", "config": {"Labels": {"arch": arch}}}).encode()
+        self.blobs[_digest(config)] = config
+        layer = {"mediaType": "application/vnd.docker.image.rootfs.diff.tar.gzip", "size": 1, "digest": DIGEST}
+        return self.add_manifest(
+            "application/vnd.docker.distribution.manifest.v2+json",
+            {"schemaVersion": 2, "config": {"digest": _digest(config)}, "layers": [layer]},
+            tag,
+        )
+
+    def add_manifest(self, media_type: str, content: dict, tag: str = None) -> str:
+        body = json.dumps({"mediaType": media_type, **content}).encode()
+        digest = _digest(body)
+        self.manifests[digest] = (media_type, body)
+        if tag:
+            self.manifests[tag] = (media_type, body)
+        return digest
+
+    async def start(self) -> str:
+        await self.runner.setup()
+        site = web.TCPSite(self.runner, "127.0.0.1", 0)
+        await site.start()
+        port = site._server.sockets[0].getsockname()[1]
+        self.registry = f"127.0.0.1:{port}"
+        return self.registry
+
+    async def token(self, request: web.Request):
+        self.token_requests.append((request.query.get("scope"), request.headers.get("Authorization")))
+        return web.json_response({"token": "secret-token"})
+
+    def _unauthorized(self, request: web.Request):
+        if request.headers.get("Authorization") == "Bearer secret-token":
+            return None
+        return web.Response(
+            status=401,
+            headers={
+                "WWW-Authenticate": f'Bearer realm="http://{self.registry}/token",service="stub",scope="x"',
+            },
+        )
+
+    async def manifest(self, request: web.Request):
+        self.manifest_requests += 1
+        if response := self._unauthorized(request):
+            return response
+        if request.match_info["ref"] not in self.manifests:
+            return web.Response(status=404)
+        media_type, body = self.manifests[request.match_info["ref"]]
+        digest = DIGEST if body == b"{}" else _digest(body)
+        return web.Response(
+            status=200,
+            body=body if request.method == "GET" else None,
+            headers={"Docker-Content-Digest": digest, "Content-Type": media_type},
+        )
+
+    async def blob(self, request: web.Request):
+        if response := self._unauthorized(request):
+            return response
+        if request.match_info["digest"] not in self.blobs:
+            return web.Response(status=404)
+        return web.Response(body=self.blobs[request.match_info["digest"]])
+
+
+class TestRegistryClient(IsolatedAsyncioTestCase):
+    async def asyncSetUp(self):
+        self.stub = StubRegistry()
+        self.registry = await self.stub.start()
+
+    async def asyncTearDown(self):
+        await self.stub.runner.cleanup()
+
+    async def test_head_manifest(self):
+        credentials = {f"{self.registry}/org": ("user", "pass")}
+        async with RegistryClient(credentials=credentials) as client:
+            self.assertEqual(await client.head_manifest(f"{self.registry}/org/repo:latest"), DIGEST)
+            self.assertEqual(await client.head_manifest(f"{self.registry}/org/repo@{DIGEST}"), DIGEST)
+            self.assertIsNone(await client.head_manifest(f"{self.registry}/org/repo:missing"))
+        # The token is negotiated once and reused
+        expected_basic = "Basic " + base64.b64encode(b"user:pass").decode()
+        self.assertEqual(self.stub.token_requests, [("repository:org/repo:pull", expected_basic)])
+        self.assertEqual(self.stub.manifest_requests, 4)
+
+    async def test_image_info(self):
+        amd64 = self.stub.add_image("amd64", tag="amd64")
+        arm64 = self.stub.add_image("arm64")
+        manifest_list = self.stub.add_manifest(
+            "application/vnd.docker.distribution.manifest.list.v2+json",
+            {
+                "schemaVersion": 2,
+                "manifests": [
+                    {"digest": amd64, "platform": {"os": "linux", "architecture": "amd64"}},
+                    {"digest": arm64, "platform": {"os": "linux", "architecture": "arm64", "variant": "v8"}},
+                ],
+            },
+            tag="multi",
+        )
+        repo = f"{self.registry}/org/repo"
+        async with RegistryClient(credentials={}) as client:
+            info = await client.image_info(f"{repo}:amd64")
+            self.assertEqual(info["name"], f"{repo}:amd64")
+            self.assertEqual(info["digest"], amd64)
+            self.assertEqual(info["contentDigest"], amd64)
+            self.assertNotIn("listDigest", info)
+            self.assertEqual(info["config"]["config"]["Labels"], {"arch": "amd64"})
+            self.assertEqual(info["layers"][0]["digest"], DIGEST)
+
+            info = await client.image_info(f"{repo}:multi", filter_by_os="linux/arm64")
+            self.assertEqual(info["digest"], arm64)
+            self.assertEqual(info["listDigest"], manifest_list)
+
+            infos = await client.image_info(f"{repo}@{manifest_list}", show_multiarch=True)
+            self.assertEqual([i["digest"] for i in infos], [amd64, arm64])
+            self.assertEqual({i["listDigest"] for i in infos}, {manifest_list})
+            self.assertEqual([i["config"]["architecture"] for i in infos], ["amd64", "arm64"])
+
+            # A single manifest is returned as is, like oc does
+            self.assertEqual((await client.image_info(f"{repo}:amd64", show_multiarch=True))["digest"], amd64)
+
+            with self.assertRaisesRegex(RegistryError, "contains multiple images"):
+                await client.image_info(f"{repo}:multi")
+            with self.assertRaises(RegistryError) as cm:
+                await client.image_info(f"{repo}:missing")
+            self.assertEqual(cm.exception.status, 404)
+            # Content is verified against the digest it is pulled by
+            wrong = "sha256:" + "b" * 64
+            self.stub.manifests[wrong] = self.stub.manifests[amd64]
+            with self.assertRaisesRegex(RegistryError, "expected"):
+                await client.get_manifest(f"{repo}@{wrong}")
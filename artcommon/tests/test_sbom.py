@@ -0,0 +1,83 @@
+import json
+import tempfile
+from unittest import IsolatedAsyncioTestCase, TestCase
+from unittest.mock import patch
+
+from artcommonlib.konflux import sbom
+
+SBOM = {
+    "bomFormat": "CycloneDX",
+    "metadata": {"component": {"purl": "pkg:oci/foo@sha256:abc"}},
+    "components": [
+        {
+            "name": "coreutils-single",
+            "purl": "pkg:rpm/rhel/coreutils-single@8.32-35.el9?arch=x86_64&upstream=coreutils-8.32-35.el9.src.rpm&distro=rhel-9.4",
+        },
+        {
+            "name": "bash",
+            "purl": "pkg:rpm/rhel/bash@5.1.8-9.el9?arch=x86_64&upstream=bash-5.1.8-9.el9.src.rpm",
+        },
+        {"name": "no-upstream", "purl": "pkg:rpm/rhel/gpg-pubkey@fd431d51?arch=noarch"},
+        {"name": "golang.org/x/net", "purl": "pkg:golang/golang.org/x/net@v0.23.0"},
+        {"name": "nopurl"},
+    ],
+}
+
+
+class TestSbomPurlExtractor(TestCase):
+    def test_chunked(self):
+        # Go's encoder escapes "&" in strings; make sure escapes are decoded
+        document = json.dumps(SBOM, indent=2).replace("&", "\\u0026").encode()
+        expected = [c["purl"] for c in SBOM["components"] if "purl" in c]
+        for chunk_size in (1, 7, 64, len(document)):
+            chunks = [document[i : i + chunk_size] for i in range(0, len(document), chunk_size)]
+            purls = list(sbom.iter_sbom_purls(chunks))
+            self.assertEqual(purls, ["pkg:oci/foo@sha256:abc"] + expected, f"chunk_size={chunk_size}")
+
+    def test_has_components(self):
+        extractor = sbom.SbomPurlExtractor()
+        extractor.feed('{"bomFormat": "CycloneDX", "compo')
+        self.assertFalse(extractor.has_components)
+        extractor.feed('nents": []}')
+        self.assertTrue(extractor.has_components)
+
+
+class TestSourceRpmFromPurl(TestCase):
+    def test_source_rpm_from_purl(self):
+        self.assertEqual(sbom.source_rpm_from_purl(SBOM["components"][0]["purl"]), "coreutils-8.32-35.el9")
+        self.assertEqual(
+            sbom.source_rpm_from_purl("pkg:rpm/rhel/foo@1-1?upstream=foo%2Bbar-1-1.src.rpm#sub"), "foo+bar-1-1"
+        )
+        self.assertIsNone(sbom.source_rpm_from_purl(SBOM["components"][2]["purl"]))
+        self.assertIsNone(sbom.source_rpm_from_purl(SBOM["components"][3]["purl"]))
+
+    def test_image_digest(self):
+        self.assertEqual(sbom.image_digest("quay.io/foo/bar@sha256:abc"), "sha256:abc")
+        self.assertIsNone(sbom.image_digest("quay.io/foo/bar:tag"))
+
+
+class TestSbomCache(TestCase):
+    def test_memory(self):
+        cache = sbom.SbomCache()
+        self.assertIsNone(cache.get("sha256:abc", "x86_64"))
+        cache.put("sha256:abc", "x86_64", {"b-1-1", "a-1-1"})
+        self.assertEqual(cache.get("sha256:abc", "x86_64"), ["a-1-1", "b-1-1"])
+        self.assertIsNone(cache.get("sha256:abc", "aarch64"))
+
+    def test_disk(self):
+        with tempfile.TemporaryDirectory() as tmpdir:
+            sbom.SbomCache(tmpdir).put("sha256:abc", "x86_64", ["a-1-1"])
+            self.assertEqual(sbom.SbomCache(tmpdir).get("sha256:abc", "x86_64"), ["a-1-1"])
+
+
+class TestDownloadSbomSourceRpms(IsolatedAsyncioTestCase):
+    async def test_download(self):
+        cmd = ["python3", "-c", f"import sys; sys.stdout.write({json.dumps(json.dumps(SBOM))})"]
+        actual = await sbom.download_sbom_source_rpms(cmd)
+        self.assertEqual(actual, ["bash-5.1.8-9.el9", "coreutils-8.32-35.el9"])
+
+    async def test_download_invalid(self):
+        with self.assertRaisesRegex(ChildProcessError, "invalid SBOM"):
+            await sbom.download_sbom_source_rpms(["python3", "-c", "print('{}')"])
+        with self.assertRaisesRegex(ChildProcessError, "exit code 1"):
+            await sbom.download_sbom_source_rpms(["python3", "-c", "import sys; sys.exit(1)"])
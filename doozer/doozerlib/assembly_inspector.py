@@ -1,6 +1,8 @@
-from typing import Any, Dict, List, Optional, cast
+import asyncio
+from typing import Any, Dict, Iterable, List, Optional, Tuple, cast
 
 import artcommonlib.util as artutil
+from artcommonlib import exectools
 from artcommonlib.arch_util import brew_arch_for_go_arch
 from artcommonlib.assembly import (
     AssemblyIssue,
@@ -12,14 +14,15 @@ from artcommonlib.assembly import (
 )
 from artcommonlib.konflux.package_rpm_finder import PackageRpmFinder
 from artcommonlib.rhcos import RhcosMissingContainerException, get_container_configs
-from artcommonlib.rpm_utils import compare_nvr, parse_nvr
+from artcommonlib.rpm_utils import compare_nvr
 from koji import ClientSession
 
 from doozerlib import Runtime, brew, util
 from doozerlib.build_info import BuildRecordInspector
 from doozerlib.plashet import PlashetBuilder
-from doozerlib.rhcos import RHCOSBuildFinder, RHCOSBuildInspector
+from doozerlib.rhcos import RHCOSBuildFinder, RHCOSBuildInspector, RPMBuildResolver
 from doozerlib.rpm_delivery import RPMDeliveries, RPMDelivery
+from doozerlib.rpm_inventory import rpm_name
 from doozerlib.rpmcfg import RPMMetadata
 from doozerlib.source_resolver import SourceResolver
 
@@ -46,8 +49,11 @@ class AssemblyInspector:
         self._permits = assembly_permits(self.runtime.releases_config, self.runtime.assembly)
         self._rpm_deliveries: Dict[str, RPMDelivery] = {}  # Dict[package_name] => per package RpmDelivery config
         self._release_build_record_inspectors: Dict[str, Optional[BuildRecordInspector]] = dict()
+        # Shared by all RHCOS builds so that RPMs installed in several of them are looked up in Brew once
+        self._rpm_build_resolver = RPMBuildResolver(runtime)
+        self._rhcos_builds: Dict[Tuple[str, bool, bool], RHCOSBuildInspector] = {}  # (arch, private, custom) -> build
 
-    async def initialize(self, lookup_mode: Optional[str] = "both"):
+    async def initialize(self, lookup_mode: Optional[str] = "both", rhcos_arches: Optional[Iterable[str]] = None):
         """
         :param lookup_mode:
             None: Create a lite version without the ability to inspect Images; can be used to check
@@ -55,21 +61,21 @@ class AssemblyInspector:
             "images": Do the lookups to enable image inspection, but expect code touching group RPMs
                       to fail (limited use case)
             "both": Do the lookups for a full inspection
+        :param rhcos_arches: If set, RHCOS builds for these arches and the builds of their RPMs are looked up
+            concurrently with the image lookups.
         """
         if lookup_mode and self.runtime.mode != lookup_mode:
             raise ValueError(f'Runtime must be initialized with "{lookup_mode}"')
 
+        tasks = []
+        if rhcos_arches:
+            tasks.append(self.prefetch_rhcos_builds(rhcos_arches))
+        if lookup_mode:
+            tasks.append(self._find_release_build_record_inspectors())
+        await asyncio.gather(*tasks)
+
         if not lookup_mode:  # do no lookups
             return
-        # If an image component has a latest build, an ImageInspector associated with the image.
-        for image_meta in self.runtime.get_for_release_image_metas():
-            latest_build_obj = await image_meta.get_latest_build(default=None, el_target=image_meta.branch_el_target())
-            if latest_build_obj:
-                self._release_build_record_inspectors[image_meta.distgit_key] = (
-                    BuildRecordInspector.get_build_record_inspector(self.runtime, latest_build_obj)
-                )
-            else:
-                self._release_build_record_inspectors[image_meta.distgit_key] = None
 
         # Preprocess rpm_deliveries group config
         # This is mainly to support weekly kernel delivery
@@ -83,6 +89,51 @@ class AssemblyInspector:
                         raise ValueError(f"Duplicate package {package} defined in rpm_deliveries config")
                     self._rpm_deliveries[package] = entry
 
+    async def _find_release_build_record_inspectors(self):
+        """
+        If an image component has a latest build, an ImageInspector associated with the image.
+        """
+        semaphore = asyncio.Semaphore(32)
+
+        async def _find(image_meta):
+            async with semaphore:
+                latest_build_obj = await image_meta.get_latest_build(
+                    default=None, el_target=image_meta.branch_el_target()
+                )
+            if latest_build_obj:
+                return BuildRecordInspector.get_build_record_inspector(self.runtime, latest_build_obj)
+            return None
+
+        image_metas = list(self.runtime.get_for_release_image_metas())
+        inspectors = await asyncio.gather(*(_find(image_meta) for image_meta in image_metas))
+        for image_meta, inspector in zip(image_metas, inspectors):
+            self._release_build_record_inspectors[image_meta.distgit_key] = inspector
+
+    async def prefetch_rhcos_builds(self, arches: Iterable[str]):
+        """
+        Fetch the RHCOS build metadata for all arches concurrently, then look up the builds of the
+        RPMs installed in any of them together, so later calls to get_rhcos_build and
+        RHCOSBuildInspector.get_package_build_objects don't need to.
+        Failures are only logged; they are raised again when the build is used.
+        """
+        arches = list(arches)
+        results = await asyncio.gather(
+            *(exectools.to_thread(self.get_rhcos_build, arch) for arch in arches), return_exceptions=True
+        )
+        nvras = set()
+        for arch, result in zip(arches, results):
+            if isinstance(result, Exception):
+                self.runtime.logger.warning("Couldn't prefetch RHCOS build for %s: %s", arch, result)
+                continue
+            try:
+                nvras.update(result.get_rpm_nvras())
+            except Exception as e:
+                self.runtime.logger.warning("Couldn't list RPMs of RHCOS build %s: %s", result, e)
+        try:
+            await exectools.to_thread(self._rpm_build_resolver.resolve, nvras)
+        except Exception as e:
+            self.runtime.logger.warning("Couldn't prefetch builds of RHCOS RPMs: %s", e)
+
     def get_type(self) -> AssemblyTypes:
         return self.assembly_type
 
@@ -229,14 +280,14 @@ class AssemblyInspector:
         for package_entry in self.runtime.get_group_config().dependencies or []:
             if el_tag in package_entry:
                 nvr = package_entry[el_tag]
-                package_name = parse_nvr(nvr)['name']
+                package_name = rpm_name(nvr)
                 desired_packages[package_name] = nvr
 
         # Honor RHCOS dependencies
         for package_entry in self.assembly_rhcos_config.dependencies or []:
             if el_tag in package_entry:
                 nvr = package_entry[el_tag]
-                package_name = parse_nvr(nvr)['name']
+                package_name = rpm_name(nvr)
                 required_packages[package_name] = nvr
                 desired_packages[package_name] = nvr  # Override if something else was at the group level
 
@@ -604,6 +655,12 @@ class AssemblyInspector:
                  pinned in the assembly definition. For STREAM assemblies, it will be the latest RHCOS build in the latest
                  in the app.ci imagestream for ART's release/arch (e.g. ocp-s390x:is/4.7-art-latest-s390x).
         """
+        key = (arch, private, custom)
+        if key not in self._rhcos_builds:
+            self._rhcos_builds[key] = self._find_rhcos_build(arch, private, custom)
+        return self._rhcos_builds[key]
+
+    def _find_rhcos_build(self, arch: str, private: bool, custom: bool) -> RHCOSBuildInspector:
         runtime = self.runtime
         brew_arch = brew_arch_for_go_arch(arch)
         build_id = None
@@ -643,4 +700,6 @@ class AssemblyInspector:
                     # their absence will be noted when generating payloads anyway.
                     raise
 
-        return RHCOSBuildInspector(runtime, pullspec_for_tag, brew_arch, build_id)
+        return RHCOSBuildInspector(
+            runtime, pullspec_for_tag, brew_arch, build_id, rpm_build_resolver=self._rpm_build_resolver
+        )
@@ -0,0 +1,158 @@
+import asyncio
+import heapq
+import logging
+from typing import Any, Awaitable, Callable, Dict, List, Optional, Sequence, Set, Union
+
+from doozerlib.image import ImageMetadata
+
+LOGGER = logging.getLogger(__name__)
+
+
+class ParentBuildFailedError(IOError):
+    """Raised for an image that was not built because one or more of its parent members failed to build."""
+
+    def __init__(self, distgit_key: str, failed_parents: List[str]):
+        super().__init__(
+            f"Couldn't build {distgit_key} because the following parent images failed to build: {', '.join(failed_parents)}"
+        )
+        self.distgit_key = distgit_key
+        self.failed_parents = failed_parents
+
+
+class KonfluxBuildScheduler:
+    """Schedules Konflux image builds over the group's image dependency graph.
+
+    An image is submitted as soon as all of its parent members (from.member and builder members) in the
+    set being built have finished successfully; there is no polling. At most `max_concurrency` builds run at once.
+    When more images are ready than there are free slots, images on the critical path go first: those with the
+    longest chain of descendants, then those with the most descendants.
+    If a build fails, all of its descendants are skipped immediately instead of waiting for their turn.
+    """
+
+    def __init__(
+        self,
+        build: Callable[[ImageMetadata], Awaitable[Any]],
+        max_concurrency: int,
+        on_skip: Optional[Callable[[ImageMetadata, ParentBuildFailedError], None]] = None,
+        logger: Optional[logging.Logger] = None,
+    ):
+        """
+        :param build: Coroutine function that builds a single image. Raising an exception marks the build as failed.
+        :param max_concurrency: Maximum number of builds (PipelineRuns) in flight at any time
+        :param on_skip: Called for each image that is skipped because a parent failed
+        :param logger: Logger to use. Defaults to the module logger.
+        """
+        if max_concurrency < 1:
+            raise ValueError(f"max_concurrency must be a positive integer. Got {max_concurrency}")
+        self._build = build
+        self._max_concurrency = max_concurrency
+        self._on_skip = on_skip
+        self._logger = logger or LOGGER
+
+    @staticmethod
+    def dependency_graph(metas: Sequence[ImageMetadata]):
+        """Compute the parent and child relationships among the given images.
+        Parents that are not being built are ignored.
+        :return: (parents, children) dicts, both keyed by distgit_key
+        """
+        keys = {meta.distgit_key for meta in metas}
+        parents: Dict[str, Set[str]] = {key: set() for key in keys}
+        children: Dict[str, Set[str]] = {key: set() for key in keys}
+        for meta in metas:
+            for parent in meta.get_parent_members().values():
+                if parent is None or parent.distgit_key not in keys or parent.distgit_key == meta.distgit_key:
+                    continue
+                parents[meta.distgit_key].add(parent.distgit_key)
+                children[parent.distgit_key].add(meta.distgit_key)
+        return parents, children
+
+    @staticmethod
+    def critical_path_priorities(children: Dict[str, Set[str]]):
+        """Compute a priority for each image; lower sorts first.
+        :return: A dict of distgit_key -> (-length of the longest descendant chain, -number of descendants)
+        """
+        depth: Dict[str, int] = {}
+        descendants: Dict[str, Set[str]] = {}
+
+        def _visit(key: str):
+            if key in depth:
+                return
+            depth[key] = 0  # guards against cycles in malformed configs
+            descendants[key] = set()
+            for child in children[key]:
+                _visit(child)
+                depth[key] = max(depth[key], depth[child] + 1)
+                descendants[key] |= descendants[child] | {child}
+
+        for key in children:
+            _visit(key)
+        return {key: (-depth[key], -len(descendants[key])) for key in children}
+
+    async def run(self, metas: Sequence[ImageMetadata]) -> List[Union[Any, BaseException]]:
+        """Build all given images.
+        :return: The build result or exception of each image, in the same order as metas
+        """
+        metas = list(metas)
+        by_key = {meta.distgit_key: meta for meta in metas}
+        order = {meta.distgit_key: index for index, meta in enumerate(metas)}
+        parents, children = self.dependency_graph(metas)
+        priorities = self.critical_path_priorities(children)
+        results: Dict[str, Union[Any, BaseException]] = {}
+        pending_parents = {key: len(parents[key]) for key in by_key}
+        ready = [(priorities[key], order[key], key) for key, count in pending_parents.items() if count == 0]
+        heapq.heapify(ready)
+        running: Dict[asyncio.Task, str] = {}
+
+        def _skip_descendants(key: str):
+            stack = list(children[key])
+            while stack:
+                child = stack.pop()
+                if child in results:
+                    continue
+                failed_parents = sorted(
+                    p for p in parents[child] if p in results and isinstance(results[p], BaseException)
+                )
+                error = ParentBuildFailedError(child, failed_parents)
+                results[child] = error
+                meta = by_key[child]
+                meta.build_status = False
+                self._logger.warning("Skipping %s: %s", child, error)
+                if self._on_skip:
+                    self._on_skip(meta, error)
+                meta.build_event.set()
+                stack.extend(children[child])
+
+        try:
+            while ready or running:
+                while ready and len(running) < self._max_concurrency:
+                    _, _, key = heapq.heappop(ready)
+                    if key in results:
+                        continue  # already skipped
+                    self._logger.info(
+                        "Starting build of %s (%s running, %s waiting for a slot)", key, len(running) + 1, len(ready)
+                    )
+                    running[asyncio.create_task(self._build(by_key[key]))] = key
+                done, _ = await asyncio.wait(running, return_when=asyncio.FIRST_COMPLETED)
+                for task in done:
+                    key = running.pop(task)
+                    error = task.exception()
+                    results[key] = error if error is not None else task.result()
+                    if error is not None:
+                        self._logger.error("Build of %s failed: %s", key, error)
+                        _skip_descendants(key)
+                        continue
+                    for child in children[key]:
+                        pending_parents[child] -= 1
+                        if pending_parents[child] == 0 and child not in results:
+                            heapq.heappush(ready, (priorities[child], order[child], child))
+        finally:
+            for task in running:
+                task.cancel()
+            if running:
+                await asyncio.gather(*running, return_exceptions=True)
+
+        for key in by_key:
+            if key not in results:
+                # Only possible if the dependency graph has a cycle
+                results[key] = ValueError(f"Couldn't schedule {key}: its parent images form a dependency cycle")
+        return [results[meta.distgit_key] for meta in metas]
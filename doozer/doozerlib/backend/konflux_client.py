@@ -13,6 +13,7 @@ from artcommonlib import exectools
 from artcommonlib import util as art_util
 from async_lru import alru_cache
 from doozerlib import constants
+from doozerlib.backend.konflux_informer import KonfluxInformer
 from doozerlib.image import ImageMetadata
 from kubernetes import config, watch
 from kubernetes.client import ApiClient, Configuration, CoreV1Api
@@ -55,6 +56,7 @@ class KonfluxClient:
         self.default_namespace = default_namespace
         self.dry_run = dry_run
         self._logger = logger
+        self._informers: Dict[str, KonfluxInformer] = {}
 
     def verify_connection(self):
         try:
@@ -105,6 +107,28 @@ class KonfluxClient:
     async def _get_corev1(self):
         return self.corev1_client
 
+    async def _get_informer(self, namespace: str) -> KonfluxInformer:
+        """Get the shared PipelineRun/Pod informer for the given namespace.
+        A new informer is created if the existing one was started on a different (e.g. already closed) event loop.
+        """
+        pipelinerun_api = await self._get_api("tekton.dev/v1", "PipelineRun")
+        pod_api = await self._get_api("v1", "Pod")
+        corev1_client = await self._get_corev1()
+        informer = self._informers.get(namespace)
+        if informer is None or informer.loop not in (None, asyncio.get_running_loop()):
+            if informer is not None:
+                informer.stop()
+            informer = KonfluxInformer(
+                self.dyn_client,
+                corev1_client,
+                namespace,
+                pipelinerun_api=pipelinerun_api,
+                pod_api=pod_api,
+                logger=self._logger,
+            )
+            self._informers[namespace] = informer
+        return informer
+
     def _extract_manifest_metadata(self, manifest: dict):
         """Extract the metadata from a manifest.
 
@@ -663,201 +687,12 @@ class KonfluxClient:
                 self.dyn_client, api_version="v1", kind="Pod"
             )
 
-        api = await self._get_api("tekton.dev/v1", "PipelineRun")
-        pod_resource = await self._get_api("v1", "Pod")
-        corev1_client = await self._get_corev1()
-
-        def _inner():
-            watcher = watch.Watch()
-            succeeded_status = "Not Found"
-            succeeded_reason = "Not Found"
-            timeout_datetime = datetime.datetime.now() + overall_timeout_timedelta
-
-            # If a pipelinerun runs more than an hour, successful pods
-            # might be garbage collected. Keep track of pod state across
-            # the pipeline run so that we can record information in bigquery.
-            pod_history: Dict[str, Dict] = dict()
-
-            while True:
-                try:
-                    for event in watcher.stream(
-                        api.get,
-                        # Specifying resource_version=0 tells the API to pull the current
-                        # version of the object, give us an update, and then watch for new
-                        # events. Combined with timeout_seconds, it ensures we periodically print an
-                        # update about the current running pods for the pipeline
-                        resource_version=0,
-                        namespace=namespace,
-                        serialize=False,
-                        field_selector=f"metadata.name={pipelinerun_name}",
-                        # timeout_seconds specifies a server side timeout. If there
-                        # is no activity during this period, the for loop will exit
-                        # gracefully. This ensures we will at least log *something*
-                        # while waiting for a long pipelinerun. If we somehow miss
-                        # an event, it also ensures we will come back and check
-                        # the object with an explicit get at least once per period.
-                        timeout_seconds=5 * 60,
-                    ):
-                        assert isinstance(event, Dict)
-                        cancel_pipelinerun = (
-                            False  # If set to true, an attempt will be made to cancel the pipelinerun within the loop
-                        )
-                        obj = resource.ResourceInstance(api, event["object"])
-                        # status takes some time to appear
-                        try:
-                            succeeded_condition = art_util.KubeCondition.find_condition(obj, 'Succeeded')
-                            if succeeded_condition:
-                                succeeded_status = succeeded_condition.status
-                                succeeded_reason = succeeded_condition.reason
-                        except AttributeError:
-                            pass
-
-                        pod_desc = []
-                        pods = pod_resource.get(
-                            namespace=namespace, label_selector=f"tekton.dev/pipeline={pipelinerun_name}"
-                        )
-                        current_time = datetime.datetime.now()
-                        for pod_instance in pods.items:
-                            pod_name = pod_instance.metadata.name
-                            try:
-                                pod_history[pod_name] = pod_instance.to_dict()  # Convert to normal dict for pod_history
-                                pod_phase = pod_instance.status.phase
-                                if pod_phase == 'Succeeded':
-                                    # Cut down on log output. No need to see successful pods again and again.
-                                    continue
-                                # Calculate the pod age based on the creation timestamp
-                                creation_time_str = pod_instance.metadata.get('creationTimestamp')
-                                if creation_time_str:
-                                    creation_time = datetime.datetime.strptime(
-                                        creation_time_str, "%Y-%m-%dT%H:%M:%SZ"
-                                    ).replace(tzinfo=None)
-                                else:
-                                    creation_time = current_time
-                                age = current_time - creation_time
-
-                                if pod_phase == 'Pending' and age > pending_timeout_timedelta:
-                                    self._logger.error(
-                                        "PipelineRun %s pod %s pending beyond threshold %s; cancelling run",
-                                        pipelinerun_name,
-                                        pod_name,
-                                        str(pending_timeout_timedelta),
-                                    )
-                                    cancel_pipelinerun = True
-
-                                age_str = f"{age.days}d {age.seconds // 3600}h {(age.seconds // 60) % 60}m"
-                                pod_desc.append(f"\tPod {pod_name} [phase={pod_phase}][age={age_str}]")
-                            except:
-                                e_str = traceback.format_exc()
-                                pod_desc.append(f"\tPod {pod_name} - unable to report information: {e_str}")
-
-                        # Count all successful pods, not just ones that are still around.
-                        successful_pods = 0
-                        for _, pod in pod_history.items():
-                            if pod.get('status', {}).get('phase') == 'Succeeded':
-                                successful_pods += 1
-
-                        self._logger.info(
-                            "PipelineRun %s [status=%s][reason=%s]; pods[total=%d][successful=%d][extant=%d]\n%s",
-                            pipelinerun_name,
-                            succeeded_status,
-                            succeeded_reason,
-                            len(pod_history),
-                            successful_pods,
-                            len(pods.items),
-                            '\n'.join(pod_desc),
-                        )
-
-                        if succeeded_status not in ["Unknown", "Not Found"]:
-                            time.sleep(5)  # allow final pods to update their status if they can
-                            pods_instances = pod_resource.get(
-                                namespace=namespace, label_selector=f"tekton.dev/pipeline={pipelinerun_name}"
-                            )
-                            # We will convert ResourceInstances to Dicts so that they can be manipulated with
-                            # extra information.
-                            for pod_instance in pods_instances.items:
-                                pod = (
-                                    pod_instance.to_dict()
-                                )  # Convert to normal dict so that we can store log_output later.
-                                pod_name = pod.get('metadata').get('name')
-                                pod_status = pod.get('status', {})
-                                pod_phase = pod_status.get('phase')
-                                pod_history[pod_name] = pod  # Update pod history with the final snapshot
-                                if pod_phase != 'Succeeded':
-                                    self._logger.warning(
-                                        f'PipelineRun {pipelinerun_name} finished with pod {pod_name} in unexpected phase: {pod_phase}'
-                                    )
-
-                                    # Now iterate through containers and record logs for unexpected exit_code values
-                                    container_statuses = pod_status.get("containerStatuses", [])
-                                    for container_status in container_statuses:
-                                        container_name = container_status.get("name")
-                                        state = container_status.get("state", {})
-                                        terminated = state.get("terminated", {})
-                                        exit_code = terminated.get("exitCode")
-                                        if exit_code is None or exit_code != 0:
-                                            try:
-                                                log_response = corev1_client.read_namespaced_pod_log(
-                                                    name=pod_name,
-                                                    namespace=namespace,
-                                                    container=container_name,
-                                                )
-                                                # stuff log information into the container_status, so that it can be
-                                                # included in the bigquery database.
-                                                container_status['log_output'] = log_response
-                                                self._logger.warning(
-                                                    f'Pod {pod_name} container {container_name} exited with {exit_code}; logs:\n------START LOGS {pod_name}:{container_name}------\n{log_response}\n------END LOGS {pod_name}:{container_name}------\n'
-                                                )
-                                            except:
-                                                e_str = traceback.format_exc()
-                                                self._logger.warning(
-                                                    f'Failed to retrieve logs for pod {pod_name} container {container_name}: {e_str}'
-                                                )
-
-                            watcher.stop()
-                            return obj, list(pod_history.values())
-
-                        if datetime.datetime.now() > timeout_datetime:
-                            self._logger.error(
-                                "PipelineRun %s has run longer than timeout %s; cancelling run",
-                                pipelinerun_name,
-                                str(overall_timeout_timedelta),
-                            )
-                            cancel_pipelinerun = True
-
-                        if cancel_pipelinerun:
-                            self._logger.info("PipelineRun %s is being cancelled", pipelinerun_name)
-                            try:
-                                # Setting spec.status in the PipelineRun should cause tekton to start canceling the pipeline.
-                                # This includes terminating pods associated with the run.
-                                api.patch(
-                                    name=obj.metadata.name,
-                                    namespace=namespace,
-                                    body={
-                                        'spec': {
-                                            'status': 'Cancelled',
-                                        },
-                                    },
-                                    content_type="application/merge-patch+json",
-                                )
-                            except:
-                                self._logger.error('Error trying to cancel PipelineRun %s', pipelinerun_name)
-                                traceback.print_exc()
-
-                    self._logger.info(
-                        "No updates for PipelineRun %s during watch timeout period; requerying", pipelinerun_name
-                    )
-                except TimeoutError:
-                    self._logger.error("Timeout waiting for PipelineRun %s to complete", pipelinerun_name)
-                    continue
-                except exceptions.ApiException as e:
-                    if e.status == 410:
-                        # If the last result is too old, an `ApiException` exception will be thrown with
-                        # `code` 410. In that case we have to recover by retrying without resource_version.
-                        self._logger.debug("%s: Resource version is too old. Recovering...", pipelinerun_name)
-                        continue
-                    raise
-
-        return await exectools.to_thread(_inner)
+        informer = await self._get_informer(namespace)
+        return await informer.wait_for_pipelinerun(
+            pipelinerun_name,
+            overall_timeout_timedelta=overall_timeout_timedelta,
+            pending_timeout_timedelta=pending_timeout_timedelta,
+        )
 
     async def wait_for_release(
         self,
@@ -21,6 +21,7 @@ from doozerlib import constants, opm, util
 from doozerlib.backend.build_repo import BuildRepo
 from doozerlib.backend.konflux_client import KonfluxClient
 from doozerlib.image import ImageMetadata
+from doozerlib.opm_render_cache import OpmRenderCache, blob_package_name
 from doozerlib.record_logger import RecordLogger
 from kubernetes.dynamic import resource
 from tenacity import retry, stop_after_attempt, wait_fixed
@@ -46,6 +47,7 @@ class KonfluxFbcImporter:
         commit_message: Optional[str] = None,
         fbc_repo: str = constants.ART_FBC_GIT_REPO,
         auth: Optional[opm.OpmRegistryAuth] = None,
+        render_cache: Optional[OpmRenderCache] = None,
         logger: logging.Logger | None = None,
     ):
         self.base_dir = base_dir
@@ -58,6 +60,7 @@ class KonfluxFbcImporter:
         self.commit_message = commit_message
         self.fbc_git_repo = fbc_repo
         self.auth = auth
+        self.render_cache = render_cache
         self._logger = logger or LOGGER.getChild(self.__class__.__name__)
 
     async def import_from_index_image(self, metadata: ImageMetadata, index_image: str | None = None):
@@ -176,15 +179,7 @@ class KonfluxFbcImporter:
         """
         filtered: Dict[str, List[Dict[str, Any]]] = {}  # key is package name, value is blobs
         for blob in blobs:
-            schema = blob["schema"]
-            package_name = None
-            match schema:
-                case "olm.package":
-                    package_name = blob["name"]
-                case "olm.channel" | "olm.bundle" | "olm.deprecations":
-                    package_name = blob["package"]
-            if not package_name:
-                raise IOError(f"Couldn't determine package name for unknown schema: {schema}")
+            package_name = blob_package_name(blob)
             if package_name not in allowed_package_names:
                 continue  # filtered out; skipping
             if package_name not in filtered:
@@ -193,8 +188,13 @@ class KonfluxFbcImporter:
         return filtered
 
     async def _get_catalog_blobs_from_index_image(self, index_image: str, package_name):
-        blobs = await self._render_index_image(index_image)
-        filtered_blobs = self._filter_catalog_blobs(blobs, {package_name})
+        filtered_blobs = None
+        if self.render_cache:
+            # Only the blobs of this package are loaded from the cached catalog
+            filtered_blobs = await self.render_cache.get_package_blobs(index_image, {package_name}, auth=self.auth)
+        if filtered_blobs is None:
+            blobs = await self._render_index_image(index_image)
+            filtered_blobs = self._filter_catalog_blobs(blobs, {package_name})
         if package_name not in filtered_blobs:
             raise IOError(f"Package {package_name} not found in index image")
         return filtered_blobs[package_name]
@@ -237,6 +237,7 @@ class KonfluxFbcRebaser:
         fbc_repo: str,
         upcycle: bool,
         record_logger: Optional[RecordLogger] = None,
+        render_cache: Optional[OpmRenderCache] = None,
         logger: Optional[logging.Logger] = None,
     ) -> None:
         self.base_dir = Path(base_dir)
@@ -249,6 +250,7 @@ class KonfluxFbcRebaser:
         self.fbc_repo = fbc_repo or constants.ART_FBC_GIT_REPO
         self.upcycle = upcycle
         self._record_logger = record_logger
+        self.render_cache = render_cache
         self._logger = logger or LOGGER.getChild(self.__class__.__name__)
 
     async def rebase(self, metadata: ImageMetadata, bundle_build: KonfluxBundleBuildRecord, version: str, release: str):
@@ -521,7 +523,12 @@ class KonfluxFbcRebaser:
             username=os.environ.get("KONFLUX_ART_IMAGES_USERNAME"),
             password=os.environ.get("KONFLUX_ART_IMAGES_PASSWORD"),
         )
-        rendered_blobs = await opm.render(bundle_build.image_pullspec, migrate=True, auth=registry_auth)
+        if self.render_cache:
+            rendered_blobs = await self.render_cache.render(
+                bundle_build.image_pullspec, migrate=True, auth=registry_auth
+            )
+        else:
+            rendered_blobs = await opm.render(bundle_build.image_pullspec, migrate=True, auth=registry_auth)
         if not isinstance(rendered_blobs, list) or len(rendered_blobs) != 1:
             raise IOError(f"Expected exactly one rendered blob, but got {len(rendered_blobs)}")
         olm_bundle_blob = rendered_blobs[0]
@@ -1,5 +1,4 @@
 import asyncio
-import json
 import logging
 import os
 import pprint
@@ -13,9 +12,10 @@ from artcommonlib import bigquery, exectools
 from artcommonlib import constants as artlib_constants
 from artcommonlib import util as artlib_util
 from artcommonlib.arch_util import go_arch_for_brew_arch
-from artcommonlib.exectools import limit_concurrency
+from artcommonlib.konflux import sbom
 from artcommonlib.konflux.konflux_build_record import ArtifactType, Engine, KonfluxBuildOutcome, KonfluxBuildRecord
 from artcommonlib.model import Missing
+from artcommonlib.registry_client import parse_pullspec
 from artcommonlib.release_util import isolate_el_version_in_release
 from dockerfile_parse import DockerfileParser
 from doozerlib import constants
@@ -26,11 +26,13 @@ from doozerlib.image import ImageMetadata
 from doozerlib.record_logger import RecordLogger
 from doozerlib.source_resolver import SourceResolution
 from kubernetes.dynamic import resource
-from packageurl import PackageURL
 from tenacity import retry, stop_after_attempt, wait_fixed
 
 LOGGER = logging.getLogger(__name__)
 
+# SBOMs attached to an image digest never change, so their contents can be shared by all builders in a process
+_DEFAULT_SBOM_CACHE = sbom.SbomCache()
+
 
 class KonfluxImageBuildError(Exception):
     def __init__(self, message: str, pipelinerun_name: str, pipelinerun: Optional[resource.ResourceInstance]) -> None:
@@ -53,6 +55,7 @@ class KonfluxImageBuilderConfig:
     image_repo_creds: Optional[Dict[str, str]] = None
     skip_checks: bool = False
     dry_run: bool = False
+    sbom_cache_dir: Optional[Path] = None
 
 
 class KonfluxImageBuilder:
@@ -73,6 +76,7 @@ class KonfluxImageBuilder:
         self._config = config
         self._logger = logger or LOGGER
         self._record_logger = record_logger
+        self._sbom_cache = sbom.SbomCache(config.sbom_cache_dir) if config.sbom_cache_dir else _DEFAULT_SBOM_CACHE
         self._konflux_client = KonfluxClient.from_kubeconfig(
             default_namespace=config.namespace,
             config_file=config.kubeconfig,
@@ -90,14 +94,10 @@ class KonfluxImageBuilder:
                 "password": os.environ["KONFLUX_ART_IMAGES_PASSWORD"],
             }
 
-    @limit_concurrency(limit=constants.MAX_KONFLUX_BUILD_QUEUE_SIZE)
-    async def build(self, metadata: ImageMetadata):
-        """Build a container image with Konflux."""
-        logger = self._logger.getChild(f"[{metadata.distgit_key}]")
-        metadata.build_status = False
+    def _new_build_record(self, metadata: ImageMetadata):
         dest_dir = self._config.base_dir.joinpath(metadata.qualified_key)
         df_path = dest_dir.joinpath("Dockerfile")
-        record = {
+        return {
             "dir": str(dest_dir.absolute()),
             "dockerfile": str(df_path.absolute()),
             "name": metadata.distgit_key,
@@ -108,6 +108,25 @@ class KonfluxImageBuilder:
             "status": -1,  # Status defaults to failure until explicitly set by success. This handles raised exceptions.
             "has_olm_bundle": 1 if metadata.is_olm_operator else 0,
         }
+
+    def skip(self, metadata: ImageMetadata, reason: Exception):
+        """Record an image that will not be built, e.g. because one of its parents failed to build."""
+        metadata.build_status = False
+        if self._record_logger:
+            record = self._new_build_record(metadata)
+            record["message"] = str(reason)
+            self._record_logger.add_record("image_build_konflux", **record)
+        metadata.build_event.set()
+
+    async def build(self, metadata: ImageMetadata):
+        """Build a container image with Konflux.
+        Concurrency is not limited here; callers building many images should go through KonfluxBuildScheduler.
+        """
+        logger = self._logger.getChild(f"[{metadata.distgit_key}]")
+        metadata.build_status = False
+        dest_dir = self._config.base_dir.joinpath(metadata.qualified_key)
+        df_path = dest_dir.joinpath("Dockerfile")
+        record = self._new_build_record(metadata)
         try:
             if dest_dir.exists():
                 # Load exiting build source repository
@@ -148,9 +167,24 @@ class KonfluxImageBuilder:
             )
             build_records = [b for b in build_records if b]
             if build_records:
+                existing_build = build_records[0]
+                # An incremental rebase that found nothing changed keeps the commit and NVR of the previous rebase,
+                # which may have been done by an earlier run; the build of that commit is this image's build.
+                if metadata.rebase_reused or existing_build.rebase_commitish == build_repo.commit_hash:
+                    logger.info(
+                        "Rebase of %s was reused; %s has already been built: %s",
+                        metadata.distgit_key,
+                        nvr,
+                        existing_build.image_pullspec,
+                    )
+                    metadata.build_status = True
+                    record["nvrs"] = nvr
+                    record["message"] = "Already built"
+                    record["status"] = 0
+                    return None, None
                 raise ValueError(
                     f"Successful NVR build {nvr} already exists in DB! "
-                    f"pullspec: {build_records[0].image_pullspec}. "
+                    f"pullspec: {existing_build.image_pullspec}. "
                     "To rebuild, please do another rebase"
                 )
 
@@ -158,13 +192,8 @@ class KonfluxImageBuilder:
             output_image = f"{self._config.image_repo}:{uuid_tag}"
             additional_tags = [f"{metadata.image_name_short}-{version}-{release}"]
 
-            # Wait for parent members to be built
-            parent_members = await self._wait_for_parent_members(metadata)
-            failed_parents = [
-                parent_member.distgit_key
-                for parent_member in parent_members
-                if parent_member is not None and not parent_member.build_status
-            ]
+            # KonfluxBuildScheduler only starts a build once its parent members are built; check they succeeded
+            failed_parents = self._failed_parent_members(metadata)
             if failed_parents:
                 raise IOError(
                     f"Couldn't build {metadata.distgit_key} because the following parent images failed to build: {', '.join(failed_parents)}"
@@ -279,19 +308,14 @@ class KonfluxImageBuilder:
 
         return uuid_tag, component_name, version, release
 
-    async def _wait_for_parent_members(self, metadata: ImageMetadata):
-        # If this image is FROM another group member, we need to wait on that group member to be built
-        logger = self._logger.getChild(f"[{metadata.distgit_key}]")
-        parent_members = list(metadata.get_parent_members().values())
-        for parent_member in parent_members:
-            if parent_member is None:
-                continue  # Parent member is not included in the group; no need to wait
-            logger.info("Parent image %s is building; waiting...", parent_member.distgit_key)
-            # wait for parent member to be built
-            while not parent_member.build_event.is_set():
-                # asyncio.sleep instead of Event.wait since it's less CPU intensive
-                await asyncio.sleep(20)  # check every 20 seconds
-        return parent_members
+    @staticmethod
+    def _failed_parent_members(metadata: ImageMetadata) -> List[str]:
+        """:return: distgit keys of the parent members of an image in the group that weren't built successfully"""
+        return [
+            parent_member.distgit_key
+            for parent_member in metadata.get_parent_members().values()
+            if parent_member is not None and not (parent_member.build_event.is_set() and parent_member.build_status)
+        ]
 
     @staticmethod
     def get_application_name(group_name: str):
@@ -462,32 +486,38 @@ class KonfluxImageBuilder:
         return pipelinerun
 
     @staticmethod
-    async def get_installed_packages(image_pullspec: str, arches: list[str], image_repo_creds: dict, logger) -> list:
+    async def get_installed_packages(
+        image_pullspec: str,
+        arches: list[str],
+        image_repo_creds: dict,
+        logger,
+        sbom_cache: Optional[sbom.SbomCache] = None,
+    ) -> list:
         """
         Example sbom: https://gist.github.com/thegreyd/6718f4e4dae9253310c03b5d492fab68
+        :param image_pullspec: Image pullspec. Results for pullspecs that reference an image by digest are cached.
+        :param sbom_cache: Cache of source RPMs per image digest and arch. Defaults to a process-wide in-memory cache.
         :return: Returns list of installed rpms for an image pullspec, assumes that the sbom exists in registry
         """
+        if sbom_cache is None:
+            sbom_cache = _DEFAULT_SBOM_CACHE
+        digest = sbom.image_digest(image_pullspec)
 
         @retry(stop=stop_after_attempt(3), wait=wait_fixed(5))
         async def _get_sbom_with_retry(cmd):
-            rc, stdout, _ = await exectools.cmd_gather_async(cmd)
-            if rc != 0:
-                logger.warning("cosign command failed to download SBOM: %s", stdout)
-                raise ChildProcessError("cosign command failed to download SBOM")
-
-            content = json.loads(stdout)
-
-            # Check if the SBOM is valid
-            # The SBOM should be a JSON object with a "components" key that is a non-empty list
-            if not (
-                "components" in content and isinstance(content["components"], list) and len(content["components"]) > 0
-            ):
-                logger.warning("cosign command returned invalid SBOM: %s", content)
-                raise ChildProcessError("cosign command returned invalid SBOM")
-
-            return content
+            try:
+                return await sbom.download_sbom_source_rpms(cmd)
+            except ChildProcessError as e:
+                logger.warning("Failed to get SBOM: %s", e)
+                raise
 
         async def _get_for_arch(arch):
+            if digest:
+                source_rpms = sbom_cache.get(digest, arch)
+                if source_rpms:
+                    logger.debug("Using cached SBOM source RPMs for %s %s", digest, arch)
+                    return set(source_rpms)
+
             go_arch = go_arch_for_brew_arch(arch)
 
             cmd = [
@@ -507,28 +537,13 @@ class KonfluxImageBuilder:
                     image_repo_creds.get("password"),
                 ]
 
-            sbom_contents = await _get_sbom_with_retry(cmd)
-            source_rpms = set()
-            for x in sbom_contents["components"]:
-                # konflux generates sbom in cyclonedx schema: https://cyclonedx.org
-                # sbom uses purl or package-url convention https://github.com/package-url/purl-spec
-                # example: pkg:rpm/rhel/coreutils-single@8.32-35.el9?arch=x86_64&upstream=coreutils-8.32-35.el9.src.rpm&distro=rhel-9.4
-                # https://github.com/package-url/packageurl-python does not support purl schemes other than "pkg"
-                # so filter them out
-                if x.get("purl", '').startswith("pkg:"):
-                    try:
-                        purl = PackageURL.from_string(x["purl"])
-                        # right now, we only care about rpms
-                        if purl.type == "rpm":
-                            # get the source rpm
-                            source_rpm = purl.qualifiers.get("upstream", None)
-                            if source_rpm:
-                                source_rpms.add(source_rpm.removesuffix(".src.rpm"))
-                    except Exception as e:
-                        logger.warning(f"Failed to parse purl: {x['purl']} {e}")
-                        continue
+            # konflux generates sbom in cyclonedx schema: https://cyclonedx.org
+            # sbom uses purl or package-url convention https://github.com/package-url/purl-spec
+            source_rpms = set(await _get_sbom_with_retry(cmd))
             if not source_rpms:
                 logger.warning("No rpms found in sbom for arch %s. Please investigate", arch)
+            elif digest:
+                sbom_cache.put(digest, arch, source_rpms)
             return source_rpms
 
         results = await asyncio.gather(*(_get_for_arch(arch) for arch in arches))
@@ -609,15 +624,23 @@ class KonfluxImageBuilder:
                     f"pipelinerun {pipelinerun_name}"
                 )
 
+            image_ref = parse_pullspec(image_pullspec)
+            image_pullspec_by_digest = str(image_ref._replace(tag=None, digest=image_digest))
+
+            # Look up the SBOM by digest so that the result can be cached
             installed_packages = await self.get_installed_packages(
-                image_pullspec, building_arches, self._config.image_repo_creds, logger=logger
+                image_pullspec_by_digest,
+                building_arches,
+                self._config.image_repo_creds,
+                logger=logger,
+                sbom_cache=self._sbom_cache,
             )
 
             build_record_params.update(
                 {
-                    'image_pullspec': f"{image_pullspec.split(':')[0]}@{image_digest}",
+                    'image_pullspec': image_pullspec_by_digest,
                     'installed_packages': installed_packages,
-                    'image_tag': image_pullspec.split(':')[-1],
+                    'image_tag': image_ref.tag,
                 }
             )
         if pipelinerun.status:
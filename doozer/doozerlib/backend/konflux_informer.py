@@ -0,0 +1,381 @@
+import asyncio
+import datetime
+import logging
+import threading
+import traceback
+from dataclasses import dataclass, field
+from typing import Callable, Dict, List, Optional, Tuple
+
+from artcommonlib import exectools
+from artcommonlib import util as art_util
+from kubernetes import watch
+from kubernetes.client import CoreV1Api
+from kubernetes.dynamic import DynamicClient, exceptions, resource
+
+LOGGER = logging.getLogger(__name__)
+
+# Label Tekton puts on every pod of a PipelineRun. For Konflux PipelineRuns with an embedded pipeline spec,
+# its value is the PipelineRun name.
+PIPELINE_LABEL = "tekton.dev/pipeline"
+
+# Server side watch timeout. Also bounds how long a waiter can go without re-evaluating its timeouts.
+WATCH_TIMEOUT_SECONDS = 5 * 60
+
+# How long to let the pods of a finished PipelineRun update their final status before taking a snapshot
+COMPLETION_SETTLE_SECONDS = 5
+
+
+def _slim_pod(pod: Dict) -> Dict:
+    """Keep only the parts of a pod that are needed to report on a build. The spec is by far the largest part."""
+    metadata = {k: v for k, v in pod.get('metadata', {}).items() if k != 'managedFields'}
+    return {'metadata': metadata, 'status': pod.get('status', {})}
+
+
+def _to_dict(obj) -> Dict:
+    return obj if isinstance(obj, dict) else obj.to_dict()
+
+
+@dataclass
+class _Subscription:
+    changed: asyncio.Event = field(default_factory=asyncio.Event)
+    pipelinerun: Optional[Dict] = None
+    deleted: bool = False
+    # pod name -> slimmed pod. Pods are kept after they are deleted (garbage collected) from the cluster
+    # so that the whole run can be recorded once it finishes.
+    pods: Dict[str, Dict] = field(default_factory=dict)
+
+
+class KonfluxInformer:
+    """Namespace-level informer for PipelineRuns and their Pods.
+
+    A single watch stream per kind is shared by every PipelineRun being waited on, so that waiting on N runs
+    costs two watches instead of N watches plus a pod LIST on every event. State for subscribed PipelineRuns
+    is cached locally and waiters are woken through per-run asyncio events.
+    Watch streams run in two daemon threads because the kubernetes client is synchronous.
+    """
+
+    def __init__(
+        self,
+        dyn_client: DynamicClient,
+        corev1_client: CoreV1Api,
+        namespace: str,
+        pipelinerun_api,
+        pod_api,
+        logger: logging.Logger = LOGGER,
+        watch_factory: Callable[[], watch.Watch] = watch.Watch,
+    ):
+        self.dyn_client = dyn_client
+        self.corev1_client = corev1_client
+        self.namespace = namespace
+        self._pipelinerun_api = pipelinerun_api
+        self._pod_api = pod_api
+        self._logger = logger
+        self._watch_factory = watch_factory
+        self._subscriptions: Dict[str, _Subscription] = {}
+        self._loop: Optional[asyncio.AbstractEventLoop] = None
+        self._threads: List[threading.Thread] = []
+        self._stopped = threading.Event()
+
+    @property
+    def loop(self):
+        return self._loop
+
+    def start(self):
+        """Start the watch threads. Must be called from the event loop that waiters run in."""
+        if self._threads:
+            return
+        self._loop = asyncio.get_running_loop()
+        self._threads = [
+            threading.Thread(
+                target=self._watch_loop,
+                args=(self._pipelinerun_api, None, self._on_pipelinerun_event),
+                name=f"konflux-informer-pipelineruns-{self.namespace}",
+                daemon=True,
+            ),
+            threading.Thread(
+                target=self._watch_loop,
+                args=(self._pod_api, PIPELINE_LABEL, self._on_pod_event),
+                name=f"konflux-informer-pods-{self.namespace}",
+                daemon=True,
+            ),
+        ]
+        for thread in self._threads:
+            thread.start()
+
+    def stop(self):
+        """Ask the watch threads to exit. They do so at the latest after the current watch times out."""
+        self._stopped.set()
+
+    def _watch_loop(self, api, label_selector: Optional[str], handler: Callable[[str, Dict], None]):
+        # resource_version=0 asks the API server for the current state (as synthetic ADDED events) and then
+        # changes. Reconnecting with the last seen resource version avoids replaying that state on every timeout.
+        resource_version = 0
+        while not self._stopped.is_set() and not self._loop.is_closed():
+            watcher = self._watch_factory()
+            kwargs = dict(
+                namespace=self.namespace,
+                serialize=False,
+                resource_version=resource_version,
+                timeout_seconds=WATCH_TIMEOUT_SECONDS,
+            )
+            if label_selector:
+                kwargs["label_selector"] = label_selector
+            try:
+                for event in watcher.stream(api.get, **kwargs):
+                    if self._stopped.is_set():
+                        watcher.stop()
+                        return
+                    obj = _to_dict(event["object"])
+                    if event["type"] == "ERROR":
+                        if obj.get("code") == 410:
+                            raise exceptions.ApiException(status=410)
+                        self._logger.warning("Watch error event: %s", obj)
+                        continue
+                    resource_version = obj.get("metadata", {}).get("resourceVersion", resource_version)
+                    self._loop.call_soon_threadsafe(handler, event["type"], obj)
+            except exceptions.ApiException as e:
+                if e.status == 410:
+                    # The last seen resource version is too old; start over from the current state
+                    self._logger.debug("Resource version is too old. Recovering...")
+                    resource_version = 0
+                    continue
+                self._logger.warning("Watch failed; restarting: %s", e)
+            except Exception:
+                if self._loop.is_closed():
+                    return
+                self._logger.warning("Watch failed; restarting: %s", traceback.format_exc())
+            finally:
+                watcher.stop()
+
+    def _on_pipelinerun_event(self, event_type: str, obj: Dict):
+        name = obj.get("metadata", {}).get("name")
+        sub = self._subscriptions.get(name)
+        if not sub:
+            return
+        if event_type == "DELETED":
+            sub.deleted = True
+        else:
+            sub.pipelinerun = obj
+        sub.changed.set()
+
+    def _on_pod_event(self, event_type: str, obj: Dict):
+        plr_name = obj.get("metadata", {}).get("labels", {}).get(PIPELINE_LABEL)
+        sub = self._subscriptions.get(plr_name)
+        if not sub:
+            return
+        if event_type != "DELETED":
+            sub.pods[obj["metadata"]["name"]] = _slim_pod(obj)
+        sub.changed.set()
+
+    async def _seed(self, name: str, sub: _Subscription):
+        """Fetch the current state of a newly subscribed PipelineRun. Events that arrived in the meantime win."""
+        try:
+            plr = await exectools.to_thread(self._pipelinerun_api.get, name=name, namespace=self.namespace)
+            if sub.pipelinerun is None:
+                sub.pipelinerun = _to_dict(plr)
+        except exceptions.NotFoundError:
+            pass
+        await self._refresh_pods(name, sub)
+
+    async def _refresh_pods(self, name: str, sub: _Subscription):
+        pods = await exectools.to_thread(
+            self._pod_api.get, namespace=self.namespace, label_selector=f"{PIPELINE_LABEL}={name}"
+        )
+        for pod in pods.items:
+            pod = _slim_pod(_to_dict(pod))
+            sub.pods[pod["metadata"]["name"]] = pod
+
+    async def wait_for_pipelinerun(
+        self,
+        pipelinerun_name: str,
+        overall_timeout_timedelta: datetime.timedelta,
+        pending_timeout_timedelta: datetime.timedelta,
+    ) -> Tuple[resource.ResourceInstance, List[Dict]]:
+        """
+        Wait for a PipelineRun to complete. See KonfluxClient.wait_for_pipelinerun.
+        A PipelineRun that runs past overall_timeout_timedelta, or has a pod pending for longer than
+        pending_timeout_timedelta, is cancelled and waited on until it reports completion.
+        """
+        if pipelinerun_name in self._subscriptions:
+            raise ValueError(f"PipelineRun {pipelinerun_name} is already being waited on")
+        self.start()
+        sub = self._subscriptions[pipelinerun_name] = _Subscription()
+        try:
+            return await self._wait(pipelinerun_name, sub, overall_timeout_timedelta, pending_timeout_timedelta)
+        finally:
+            del self._subscriptions[pipelinerun_name]
+
+    async def _wait(
+        self,
+        pipelinerun_name: str,
+        sub: _Subscription,
+        overall_timeout_timedelta: datetime.timedelta,
+        pending_timeout_timedelta: datetime.timedelta,
+    ):
+        await self._seed(pipelinerun_name, sub)
+        timeout_datetime = datetime.datetime.now() + overall_timeout_timedelta
+        cancel_requested = False
+        last_status = None
+
+        while True:
+            if sub.deleted:
+                raise IOError(f"PipelineRun {pipelinerun_name} was deleted before it completed")
+
+            succeeded_status = "Not Found"
+            succeeded_reason = "Not Found"
+            succeeded_condition = art_util.KubeCondition.find_condition(sub.pipelinerun or {}, 'Succeeded')
+            if succeeded_condition:
+                succeeded_status = succeeded_condition.status
+                succeeded_reason = succeeded_condition.reason
+
+            if succeeded_status not in ["Unknown", "Not Found"]:
+                await asyncio.sleep(COMPLETION_SETTLE_SECONDS)  # allow final pods to update their status if they can
+                await self._refresh_pods(pipelinerun_name, sub)
+                await self._collect_failed_container_logs(pipelinerun_name, sub)
+                return (
+                    resource.ResourceInstance(self._pipelinerun_api, sub.pipelinerun),
+                    list(sub.pods.values()),
+                )
+
+            cancel_pipelinerun = self._log_progress(
+                pipelinerun_name,
+                sub,
+                succeeded_status,
+                succeeded_reason,
+                pending_timeout_timedelta,
+                verbose=(succeeded_status, succeeded_reason) != last_status,
+            )
+            last_status = (succeeded_status, succeeded_reason)
+
+            if datetime.datetime.now() > timeout_datetime:
+                self._logger.error(
+                    "PipelineRun %s has run longer than timeout %s; cancelling run",
+                    pipelinerun_name,
+                    str(overall_timeout_timedelta),
+                )
+                cancel_pipelinerun = True
+
+            if cancel_pipelinerun and not cancel_requested:
+                cancel_requested = await self._cancel(pipelinerun_name)
+
+            sub.changed.clear()
+            try:
+                await asyncio.wait_for(sub.changed.wait(), timeout=WATCH_TIMEOUT_SECONDS)
+            except asyncio.TimeoutError:
+                self._logger.info("No updates for PipelineRun %s during watch timeout period", pipelinerun_name)
+                last_status = None  # log the full pod listing again
+
+    def _log_progress(
+        self,
+        pipelinerun_name: str,
+        sub: _Subscription,
+        succeeded_status: str,
+        succeeded_reason: str,
+        pending_timeout_timedelta: datetime.timedelta,
+        verbose: bool,
+    ) -> bool:
+        """Log the state of a running PipelineRun.
+        :return: True if a pod has been pending for longer than pending_timeout_timedelta
+        """
+        cancel_pipelinerun = False
+        pod_desc = []
+        current_time = datetime.datetime.now()
+        extant = 0
+        successful_pods = 0
+        for pod_name, pod in sub.pods.items():
+            extant += 1
+            try:
+                pod_phase = pod.get('status', {}).get('phase')
+                if pod_phase == 'Succeeded':
+                    # Cut down on log output. No need to see successful pods again and again.
+                    successful_pods += 1
+                    continue
+                creation_time_str = pod['metadata'].get('creationTimestamp')
+                if creation_time_str:
+                    creation_time = datetime.datetime.strptime(creation_time_str, "%Y-%m-%dT%H:%M:%SZ")
+                else:
+                    creation_time = current_time
+                age = current_time - creation_time
+
+                if pod_phase == 'Pending' and age > pending_timeout_timedelta:
+                    self._logger.error(
+                        "PipelineRun %s pod %s pending beyond threshold %s; cancelling run",
+                        pipelinerun_name,
+                        pod_name,
+                        str(pending_timeout_timedelta),
+                    )
+                    cancel_pipelinerun = True
+
+                age_str = f"{age.days}d {age.seconds // 3600}h {(age.seconds // 60) % 60}m"
+                pod_desc.append(f"\tPod {pod_name} [phase={pod_phase}][age={age_str}]")
+            except:
+                e_str = traceback.format_exc()
+                pod_desc.append(f"\tPod {pod_name} - unable to report information: {e_str}")
+
+        self._logger.log(
+            logging.INFO if verbose else logging.DEBUG,
+            "PipelineRun %s [status=%s][reason=%s]; pods[total=%d][successful=%d]\n%s",
+            pipelinerun_name,
+            succeeded_status,
+            succeeded_reason,
+            extant,
+            successful_pods,
+            '\n'.join(pod_desc),
+        )
+        return cancel_pipelinerun
+
+    async def _cancel(self, pipelinerun_name: str) -> bool:
+        self._logger.info("PipelineRun %s is being cancelled", pipelinerun_name)
+        try:
+            # Setting spec.status in the PipelineRun should cause tekton to start canceling the pipeline.
+            # This includes terminating pods associated with the run.
+            await exectools.to_thread(
+                self._pipelinerun_api.patch,
+                name=pipelinerun_name,
+                namespace=self.namespace,
+                body={
+                    'spec': {
+                        'status': 'Cancelled',
+                    },
+                },
+                content_type="application/merge-patch+json",
+            )
+            return True
+        except:
+            self._logger.error('Error trying to cancel PipelineRun %s: %s', pipelinerun_name, traceback.format_exc())
+            return False
+
+    async def _collect_failed_container_logs(self, pipelinerun_name: str, sub: _Subscription):
+        for pod_name, pod in sub.pods.items():
+            pod_status = pod.get('status', {})
+            pod_phase = pod_status.get('phase')
+            if pod_phase == 'Succeeded':
+                continue
+            self._logger.warning(
+                f'PipelineRun {pipelinerun_name} finished with pod {pod_name} in unexpected phase: {pod_phase}'
+            )
+
+            # Now iterate through containers and record logs for unexpected exit_code values
+            for container_status in pod_status.get("containerStatuses", []):
+                container_name = container_status.get("name")
+                exit_code = container_status.get("state", {}).get("terminated", {}).get("exitCode")
+                if exit_code is not None and exit_code == 0:
+                    continue
+                try:
+                    log_response = await exectools.to_thread(
+                        self.corev1_client.read_namespaced_pod_log,
+                        name=pod_name,
+                        namespace=self.namespace,
+                        container=container_name,
+                    )
+                    # stuff log information into the container_status, so that it can be
+                    # included in the bigquery database.
+                    container_status['log_output'] = log_response
+                    self._logger.warning(
+                        f'Pod {pod_name} container {container_name} exited with {exit_code}; logs:\n------START LOGS {pod_name}:{container_name}------\n{log_response}\n------END LOGS {pod_name}:{container_name}------\n'
+                    )
+                except:
+                    e_str = traceback.format_exc()
+                    self._logger.warning(
+                        f'Failed to retrieve logs for pod {pod_name} container {container_name}: {e_str}'
+                    )
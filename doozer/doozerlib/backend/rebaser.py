@@ -52,6 +52,9 @@ OIT_COMMENT_PREFIX = '#oit##'
 OIT_BEGIN = '##OIT_BEGIN'
 OIT_END = '##OIT_END'
 
+# Bump when the rebase logic changes in a way that should invalidate previously computed rebase input digests
+REBASE_INPUT_DIGEST_VERSION = 1
+
 
 class KonfluxRebaser:
     """Rebase images to a new branch in the build source repository.
@@ -72,7 +75,12 @@ class KonfluxRebaser:
         record_logger: Optional[RecordLogger] = None,
         source_modifier_factory=SourceModifierFactory(),
         logger: Optional[logging.Logger] = None,
+        incremental: bool = False,
     ) -> None:
+        """
+        :param incremental: If True, skip rebasing images whose rebase inputs haven't changed since the last rebase
+            and reuse the commit on their build branch instead. See calculate_input_digest.
+        """
         self._runtime = runtime
         self._base_dir = base_dir
         self._source_resolver = source_resolver
@@ -82,6 +90,7 @@ class KonfluxRebaser:
         self._record_logger = record_logger
         self._source_modifier_factory = source_modifier_factory
         self.should_match_upstream = False  # FIXME: Matching upstream is not supported yet
+        self.incremental = incremental
         self._logger = logger or LOGGER
 
         self.konflux_db = self._runtime.konflux_db
@@ -130,11 +139,30 @@ class KonfluxRebaser:
             build_repo = BuildRepo(url=source.url, branch=dest_branch, local_dir=dest_dir, logger=self._logger)
             await build_repo.ensure_source(upcycle=self.upcycle)
 
+            input_digest = await exectools.to_thread(
+                self.calculate_input_digest, metadata, source, version, force_yum_updates, image_repo
+            )
+            if self.incremental and build_repo.commit_hash:
+                previous_digest = self._read_input_digest(dest_dir)
+                if previous_digest == input_digest:
+                    self._logger.info(
+                        "Rebase inputs of %s haven't changed (%s); reusing commit %s on %s",
+                        metadata.distgit_key,
+                        input_digest,
+                        build_repo.commit_hash,
+                        dest_branch,
+                    )
+                    self._reuse_rebase(metadata, dest_dir, input_digest)
+                    metadata.rebase_status = True
+                    return
+
             # Rebase the image in the build repository
             self._logger.info("Rebasing image %s to %s in %s...", metadata.distgit_key, dest_branch, dest_dir)
             actual_version, actual_release, _ = await exectools.to_thread(
                 self._rebase_dir, metadata, source, build_repo, version, input_release, force_yum_updates, image_repo
             )
+            self._write_input_digest(dest_dir, input_digest)
+            metadata.rebase_input_digest = input_digest
 
             # Commit changes
             await build_repo.commit(commit_message, allow_empty=True, force=True)
@@ -168,6 +196,97 @@ class KonfluxRebaser:
             # notify child images
             metadata.rebase_event.set()
 
+    def calculate_input_digest(
+        self,
+        metadata: ImageMetadata,
+        source: Optional[SourceResolution],
+        version: str,
+        force_yum_updates: bool,
+        image_repo: str,
+    ) -> str:
+        """Calculate a digest of everything that feeds the rebased build source of an image.
+
+        The inputs are the upstream commit, the image config (including the group repos and streams it uses,
+        see ImageMetadata.calculate_config_digest), the modification scripts it runs, its parents, and the rebase
+        options. Loaded member parents contribute their own input digest rather than their per-run pullspec,
+        so an image is only considered changed if a parent's inputs changed. Member parents that aren't loaded
+        contribute the pullspec they resolve to, e.g. their latest build.
+        The release string is intentionally not an input: it changes on every run.
+        Blocks until parent members have been rebased.
+        """
+        parents = []
+        if "from" in metadata.config:
+            self._wait_for_parent_members(metadata)
+            image_from = metadata.config["from"].primitive()
+            for parent in image_from.get("builder", []) + [image_from]:
+                parent_metadata = None
+                if "member" in parent:
+                    parent_metadata = self._runtime.resolve_image(parent["member"], required=False)
+                if parent_metadata is not None:
+                    parents.append({"member": parent["member"], "digest": parent_metadata.rebase_input_digest})
+                    continue
+                entry = {k: v for k, v in parent.items() if k != "builder"}
+                if "member" in parent:
+                    # A member that isn't loaded may resolve to its latest build, which changes between runs
+                    entry["pullspec"], _ = self._resolve_member_parent(parent["member"], None, image_repo, None)
+                parents.append(entry)
+
+        message = {
+            "version": REBASE_INPUT_DIGEST_VERSION,
+            "commit": source.commit_hash if source else None,
+            "config": metadata.calculate_config_digest(self._runtime.group_config, self._runtime.streams),
+            "modifications": self._modification_script_digests(metadata),
+            "parents": parents,
+            "options": {
+                "version": version,
+                "force_yum_updates": force_yum_updates,
+                "image_repo": image_repo,
+                "repo_type": self.repo_type,
+                "force_private_bit": self.force_private_bit,
+            },
+        }
+        digest = hashlib.sha256(json.dumps(message, sort_keys=True, default=str).encode("utf-8")).hexdigest()
+        return "sha256:" + digest
+
+    def _modification_script_digests(self, metadata: ImageMetadata) -> Dict[str, str]:
+        """Hash the scripts in the modifications directory that the source modifications of an image refer to."""
+        modifications = metadata.config.content.source.modifications
+        if not modifications:
+            return {}
+        scripts_dir = Path(self._runtime.data_dir, "modifications")
+        if not scripts_dir.is_dir():
+            return {}
+        serialized = json.dumps(modifications.primitive(), default=str)
+        digests = {}
+        for script in sorted(scripts_dir.iterdir()):
+            if script.is_file() and script.name in serialized:
+                digests[script.name] = hashlib.sha256(script.read_bytes()).hexdigest()
+        return digests
+
+    @staticmethod
+    def _read_input_digest(dest_dir: Path) -> Optional[str]:
+        path = dest_dir.joinpath(".oit", "rebase_input_digest")
+        if not path.is_file():
+            return None
+        return path.read_text().strip()
+
+    def _write_input_digest(self, dest_dir: Path, digest: str):
+        # Committed along with the rebase, so that the next incremental rebase can tell whether anything changed
+        os.makedirs(f"{dest_dir}/.oit", exist_ok=True)
+        with dest_dir.joinpath(".oit", "rebase_input_digest").open('w') as f:
+            f.write(digest)
+        self._logger.info("Saved rebase input digest %s to .oit/rebase_input_digest", digest)
+
+    def _reuse_rebase(self, metadata: ImageMetadata, dest_dir: Path, input_digest: str):
+        """Populate metadata from a previous rebase, as if the image had been rebased in this run."""
+        dfp = DockerfileParser(str(dest_dir.joinpath("Dockerfile")))
+        _, _, private_fix = self.extract_version_release_private_fix(dfp)
+        metadata.private_fix = bool(private_fix)
+        # Children must refer to the image that will be (or was) built from the reused commit
+        metadata.rebase_uuid_tag = dfp.envs.get("__doozer_uuid_tag")
+        metadata.rebase_input_digest = input_digest
+        metadata.rebase_reused = True
+
     def _rebase_dir(
         self,
         metadata: ImageMetadata,
@@ -274,6 +393,7 @@ class KonfluxRebaser:
             metadata, dest_dir, source, version, release, downstream_parents, force_yum_updates, image_repo, uuid_tag
         )
         metadata.private_fix = private_fix
+        metadata.rebase_uuid_tag = f"{metadata.image_name_short}-{uuid_tag}"
 
         self._update_dockerignore(build_repo.local_dir)
         return version, release, private_fix
@@ -347,7 +467,8 @@ class KonfluxRebaser:
                     "This indicates a bug in Doozer. Please report this issue.",
                 )
             private_fix = parent_metadata.private_fix
-            return f"{image_repo}:{parent_metadata.image_name_short}-{uuid_tag}", private_fix
+            parent_tag = parent_metadata.rebase_uuid_tag or f"{parent_metadata.image_name_short}-{uuid_tag}"
+            return f"{image_repo}:{parent_tag}", private_fix
 
     def _resolve_stream_parent(self, stream_name: str, original_parent: str, dfp: DockerfileParser):
         stream = self._runtime.resolve_stream(stream_name)
@@ -5,6 +5,7 @@ from pathlib import Path
 from typing import Dict, List, Optional, Sequence, Tuple, cast
 
 import click
+from artcommonlib import file_cache
 from artcommonlib.konflux.konflux_build_record import (
     KonfluxBuildOutcome,
     KonfluxBuildRecord,
@@ -25,12 +26,21 @@ from doozerlib.cli import (
 )
 from doozerlib.exceptions import DoozerFatalError
 from doozerlib.image import ImageMetadata
+from doozerlib.opm_render_cache import OpmRenderCache
 from doozerlib.runtime import Runtime
 
 LOGGER = logging.getLogger(__name__)
 yaml = opm.yaml
 
 
+def _opm_render_cache() -> Optional[OpmRenderCache]:
+    """Get a cache of `opm render` output in the cache root, if one is configured."""
+    cache_dir = file_cache.cache_dir("opm-render")
+    if not cache_dir:
+        return None
+    return OpmRenderCache(cache_dir)
+
+
 class FbcImportCli:
     def __init__(
         self,
@@ -101,6 +111,7 @@ class FbcImportCli:
             commit_message=self.message,
             fbc_repo=self.fbc_repo,
             auth=auth,
+            render_cache=_opm_render_cache(),
         )
 
         LOGGER.info("Importing FBC from index image...")
@@ -226,6 +237,7 @@ class FbcRebaseCli:
             fbc_repo=self.fbc_repo,
             upcycle=runtime.upcycle,
             record_logger=runtime.record_logger,
+            render_cache=_opm_render_cache(),
         )
         tasks = []
         for dgk, bundle_build in zip(dgk_operator_builds.keys(), bundle_builds):
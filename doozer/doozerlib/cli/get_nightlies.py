@@ -1,6 +1,7 @@
 import asyncio
+import hashlib
 import json
-from typing import Dict, List, Sequence, Set, Tuple
+from typing import Dict, Iterable, List, Optional, Sequence, Set, Tuple
 
 import aiohttp
 import click
@@ -145,10 +146,12 @@ async def get_nightlies(
     # find sets of nightlies where all arches have equivalent content
     inconsistent_nightly_sets = []
     remaining = limit
+    # the same pair of nightlies is usually part of several sets; only compare them once
+    deeper_equivalence_cache: Dict[Tuple[str, str], bool] = {}
     for nightly_set in generate_nightly_sets(nightlies_for_arch):
         # check for deeper equivalence
         await nightly_set.populate_nightly_content(runtime)
-        if await nightly_set.deeper_equivalence():
+        if await nightly_set.deeper_equivalence(deeper_equivalence_cache):
             green_print(nightly_set.details() if details else nightly_set)
             remaining -= 1
             if not remaining:
@@ -384,6 +387,24 @@ class Nightly:
 
         return True
 
+    def signature(self, tags: Optional[Set[str]] = None) -> str:
+        """
+        Hash of the source commits of this nightly's group images, optionally
+        restricted to the given tags. Nightlies that are equivalent (see
+        __eq__) have the same signature over any tags that have a commit in
+        both of them, so signatures over such tags can be used to bucket
+        candidates for equivalence.
+        """
+        pairs = sorted(
+            (tag, commit) for tag, commit in self.commit_for_tag.items() if commit and (tags is None or tag in tags)
+        )
+        return hashlib.sha256(json.dumps(pairs).encode()).hexdigest()
+
+    @property
+    def commit_tags(self) -> Set[str]:
+        """Tags that have a source commit (i.e. group images rather than RHCOS)"""
+        return {tag for tag, commit in self.commit_for_tag.items() if commit}
+
     def __repr__(self):
         # helpful for failing tests/errors; not intended for users
         return f"{self.name}: {self.commit_for_tag}"
@@ -406,7 +427,8 @@ class Nightly:
         )
         if not self.rhcos_inspector:
             ps4tag = {tag: self.pullspec_for_tag[tag] for tag in self.rhcos_tag_names}
-            self.rhcos_inspector = RHCOSBuildInspector(runtime, ps4tag, arch)
+            # fetching the build metadata blocks, so don't hold up other nightlies meanwhile
+            self.rhcos_inspector = await exectools.to_thread(RHCOSBuildInspector, runtime, ps4tag, arch)
 
     async def retrieve_nvr_for_tag(self, tag: str) -> str:
         """Retrieve group image NVR according to the image info at the tag pullspec"""
@@ -480,10 +502,13 @@ class NightlySet:
         self.nightly_for_arch = nightly_for_arch
         self.timestamp = max(nightly.release_image_info["config"]["created"] for nightly in nightly_for_arch.values())
 
-    def generate_equivalents_with(self, arch: str, nightlies: List[Nightly]) -> List['NightlySet']:
+    def generate_equivalents_with(
+        self, arch: str, nightlies: List[Nightly], equivalence_cache: Optional[Dict[Tuple[str, str], bool]] = None
+    ) -> List['NightlySet']:
         """
         Test each nightly for equivalence with all existing set members, and
         return a list of new sets extended with those that match.
+        Results of comparing two nightlies are stored in equivalence_cache if given.
 
         Assuming nightlies are listed in order of age and are always updated to
         newer rather than rolled back to earlier images, the sets generated
@@ -499,8 +524,15 @@ class NightlySet:
         for nightly in nightlies:
             nightly_for_arch = {arch: nightly}  # initialize new set with candidate nightly
             for exarch, existing in self.nightly_for_arch.items():
-                logger.debug(f"comparing {nightly.name} and {existing.name}")
-                if nightly != existing:
+                key = (nightly.name, existing.name)
+                if equivalence_cache is None or key not in equivalence_cache:
+                    logger.debug(f"comparing {nightly.name} and {existing.name}")
+                    equivalent = nightly == existing
+                    if equivalence_cache is not None:
+                        equivalence_cache[key] = equivalent
+                else:
+                    equivalent = equivalence_cache[key]
+                if not equivalent:
                     break  # not equivalent
                 nightly_for_arch[exarch] = existing
 
@@ -524,27 +556,51 @@ class NightlySet:
             *(nightly.populate_nightly_content(runtime, arch) for arch, nightly in self.nightly_for_arch.items())
         )
 
-    async def deeper_equivalence(self) -> bool:
-        """Check that all Nightlys have deeper equivalency"""
+    async def deeper_equivalence(self, cache: Optional[Dict[Tuple[str, str], bool]] = None) -> bool:
+        """
+        Check that all Nightlys have deeper equivalency.
+        Results for each pair of nightlies are stored in cache if given, to be reused by other sets.
+        """
         nightlies = list(self.nightly_for_arch.values())
         while len(nightlies) > 1:
             this = nightlies.pop()
             for other in nightlies:
-                logger.debug(f"comparing {this.name} and {other.name}")
-                if not await this.deeper_equivalence(other):
+                key = tuple(sorted((this.name, other.name)))
+                if cache is None or key not in cache:
+                    logger.debug(f"comparing {this.name} and {other.name}")
+                    equivalent = await this.deeper_equivalence(other)
+                    if cache is not None:
+                        cache[key] = equivalent
+                else:
+                    equivalent = cache[key]
+                if not equivalent:
                     logger.debug(f"deeper equivalence failed for {self}")
                     return False
 
         return True
 
 
+def shared_commit_tags(nightlies: Iterable[Nightly]) -> Set[str]:
+    """Tags that have a source commit in every one of the given nightlies"""
+    tags: Optional[Set[str]] = None
+    for nightly in nightlies:
+        tags = nightly.commit_tags if tags is None else tags & nightly.commit_tags
+    return tags or set()
+
+
 def generate_nightly_sets(nightlies_for_arch: Dict[str, List[Nightly]]) -> List[NightlySet]:
     """
     Build all-arch sets of equivalent (according to Nightly.__eq__) nightlies.
     We initialize sets with the arch with the fewest nightlies, then extend
     them with all equivalent nightlies from one arch at a time.
+
+    Equivalent nightlies agree on the commits of tags they all have, so
+    nightlies are bucketed by their signature over those tags and each set is
+    only compared with the nightlies in its own bucket.
     """
     nightly_sets: List[NightlySet] = []
+    shared_tags = shared_commit_tags(nightly for nightlies in nightlies_for_arch.values() for nightly in nightlies)
+    equivalence_cache: Dict[Tuple[str, str], bool] = {}
 
     # process arches from shortest list to longest to maximize elimination
     for arch, nightlies in sorted(nightlies_for_arch.items(), key=lambda it: len(it[1])):
@@ -553,10 +609,18 @@ def generate_nightly_sets(nightlies_for_arch: Dict[str, List[Nightly]]) -> List[
             nightly_sets = [NightlySet({arch: nightly}) for nightly in nightlies]
             continue
 
+        # bucket this arch's nightlies, keeping them in order within each bucket
+        buckets: Dict[str, List[Nightly]] = {}
+        for nightly in nightlies:
+            buckets.setdefault(nightly.signature(shared_tags), []).append(nightly)
+
         # try to combine nightlies in this arch with existing sets
         new_sets: List[NightlySet] = []
         for nightly_set in nightly_sets:
-            new_sets.extend(nightly_set.generate_equivalents_with(arch, nightlies))
+            # all members of a set agree on the shared tags, so any of them has the set's signature
+            member = next(iter(nightly_set.nightly_for_arch.values()))
+            candidates = buckets.get(member.signature(shared_tags), [])
+            new_sets.extend(nightly_set.generate_equivalents_with(arch, candidates, equivalence_cache))
         if not new_sets:
             return []  # no sets left to extend
         nightly_sets = new_sets
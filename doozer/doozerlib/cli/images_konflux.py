@@ -5,6 +5,7 @@ from pathlib import Path
 from typing import Dict, List, Optional, Sequence, Tuple
 
 import click
+from artcommonlib import file_cache
 from artcommonlib.konflux.konflux_build_record import (
     ArtifactType,
     Engine,
@@ -17,6 +18,7 @@ from artcommonlib.telemetry import start_as_current_span_async
 from opentelemetry import trace
 
 from doozerlib import constants
+from doozerlib.backend.konflux_build_scheduler import KonfluxBuildScheduler
 from doozerlib.backend.konflux_image_builder import KonfluxImageBuilder, KonfluxImageBuilderConfig
 from doozerlib.backend.konflux_olm_bundler import KonfluxOlmBundleBuilder, KonfluxOlmBundleRebaser
 from doozerlib.backend.rebaser import KonfluxRebaser
@@ -48,6 +50,7 @@ class KonfluxRebaseCli:
         image_repo: str,
         message: str,
         push: bool,
+        incremental: bool = False,
     ):
         self.runtime = runtime
         self.version = version
@@ -60,6 +63,7 @@ class KonfluxRebaseCli:
         self.image_repo = image_repo
         self.message = message
         self.push = push
+        self.incremental = incremental
         self.upcycle = runtime.upcycle
 
     @start_as_current_span_async(TRACER, "beta:images:konflux:rebase")
@@ -76,6 +80,7 @@ class KonfluxRebaseCli:
             repo_type=self.repo_type,
             upcycle=self.upcycle,
             force_private_bit=self.embargoed,
+            incremental=self.incremental,
         )
         tasks = []
         for image_meta in metas:
@@ -133,6 +138,12 @@ class KonfluxRebaseCli:
     help="Repo group type to use (e.g. signed, unsigned).",
 )
 @click.option('--image-repo', default=constants.KONFLUX_DEFAULT_IMAGE_REPO, help='Image repo for base images')
+@click.option(
+    "--incremental",
+    is_flag=True,
+    default=False,
+    help="Skip images whose rebase inputs (upstream commit, config, parents, repos, modification scripts) haven't changed since their last rebase, and reuse the existing commit on their build branch.",
+)
 @option_commit_message
 @option_push
 @pass_runtime
@@ -147,6 +158,7 @@ async def images_konflux_rebase(
     image_repo: str,
     message: str,
     push: bool,
+    incremental: bool,
 ):
     """
     Refresh a group's konflux content from source content.
@@ -161,6 +173,7 @@ async def images_konflux_rebase(
         image_repo=image_repo,
         message=message,
         push=push,
+        incremental=incremental,
     )
     await cli.run()
 
@@ -176,6 +189,7 @@ class KonfluxBuildCli:
         skip_checks: bool,
         dry_run: bool,
         plr_template: str,
+        max_concurrent_builds: int = constants.MAX_KONFLUX_BUILD_QUEUE_SIZE,
     ):
         self.runtime = runtime
         self.konflux_kubeconfig = konflux_kubeconfig
@@ -185,6 +199,7 @@ class KonfluxBuildCli:
         self.skip_checks = skip_checks
         self.dry_run = dry_run
         self.plr_template = plr_template
+        self.max_concurrent_builds = max_concurrent_builds
 
     @start_as_current_span_async(TRACER, "images:konflux:build")
     async def run(self):
@@ -203,12 +218,15 @@ class KonfluxBuildCli:
             skip_checks=self.skip_checks,
             dry_run=self.dry_run,
             plr_template=self.plr_template,
+            sbom_cache_dir=file_cache.cache_dir("sbom"),
         )
         builder = KonfluxImageBuilder(config=config, record_logger=runtime.record_logger)
-        tasks = []
-        for image_meta in metas:
-            tasks.append(asyncio.create_task(builder.build(image_meta)))
-        results = await asyncio.gather(*tasks, return_exceptions=True)
+        scheduler = KonfluxBuildScheduler(
+            build=builder.build,
+            max_concurrency=self.max_concurrent_builds,
+            on_skip=builder.skip,
+        )
+        results = await scheduler.run(metas)
         failed_images = []
         for index, result in enumerate(results):
             if isinstance(result, Exception):
@@ -245,6 +263,13 @@ class KonfluxBuildCli:
     default=constants.KONFLUX_DEFAULT_IMAGE_BUILD_PLR_TEMPLATE_URL,
     help='Use a custom PipelineRun template to build the bundle. Overrides the default template from openshift-priv/art-konflux-template',
 )
+@click.option(
+    '--max-concurrent-builds',
+    type=click.IntRange(min=1),
+    default=constants.MAX_KONFLUX_BUILD_QUEUE_SIZE,
+    show_default=True,
+    help='Maximum number of image build PipelineRuns to run at the same time.',
+)
 @pass_runtime
 @click_coroutine
 async def images_konflux_build(
@@ -256,6 +281,7 @@ async def images_konflux_build(
     skip_checks: bool,
     dry_run: bool,
     plr_template: str,
+    max_concurrent_builds: int,
 ):
     cli = KonfluxBuildCli(
         runtime=runtime,
@@ -266,6 +292,7 @@ async def images_konflux_build(
         skip_checks=skip_checks,
         dry_run=dry_run,
         plr_template=plr_template,
+        max_concurrent_builds=max_concurrent_builds,
     )
     await cli.run()
 
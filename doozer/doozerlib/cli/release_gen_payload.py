@@ -1,6 +1,8 @@
 import asyncio
+import copy
 import hashlib
 import json
+import logging
 import os
 import sys
 import traceback
@@ -24,10 +26,8 @@ from artcommonlib.format_util import red_print
 from artcommonlib.konflux.package_rpm_finder import PackageRpmFinder
 from artcommonlib.model import Model
 from artcommonlib.rhcos import RhcosMissingContainerException
-from artcommonlib.rpm_utils import parse_nvr
 from artcommonlib.telemetry import start_as_current_span_async
 from artcommonlib.util import convert_remote_git_to_https
-from elliottlib.util import chunk
 from opentelemetry import trace
 from tenacity import retry, stop_after_attempt, wait_fixed
 
@@ -37,8 +37,12 @@ from doozerlib.build_info import BuildRecordInspector, ImageInspector
 from doozerlib.cli import cli, click_coroutine, pass_runtime
 from doozerlib.exceptions import DoozerFatalError
 from doozerlib.image import ImageMetadata
+from doozerlib.imagestream_diff import imagestream_patch
+from doozerlib.payload_mirror import PayloadMirrorPlanner
 from doozerlib.rhcos import RHCOSBuildInspector
+from doozerlib.rpm_inventory import RPMInventory, rpm_name
 from doozerlib.runtime import Runtime
+from doozerlib.step_queue import StepQueue
 from doozerlib.util import (
     extract_version_fields,
     find_manifest_list_sha,
@@ -46,8 +50,12 @@ from doozerlib.util import (
     what_is_in_master,
 )
 
+LOGGER = logging.getLogger(__name__)
 TRACER = trace.get_tracer(__name__)
 
+# Maximum number of component manifest lists to push concurrently for a multi-arch payload
+MULTI_MANIFEST_LIST_PARALLELISM = 10
+
 
 class RepositoryType(Enum):
     PRIVATE = 0
@@ -137,6 +145,12 @@ class RepositoryType(Enum):
     is_flag=True,
     help="Allow embargoed builds to sync publicly in named assemblies",
 )
+@click.option(
+    "--multi-release-parallelism",
+    default=1,
+    type=click.IntRange(min=1),
+    help="Maximum number of per-arch multi release payloads to create concurrently with `oc adm release new`.",
+)
 @click_coroutine
 @pass_runtime
 async def release_gen_payload(
@@ -155,6 +169,7 @@ async def release_gen_payload(
     apply_multi_arch: bool,
     moist_run: bool,
     embargo_permit_ack: bool,
+    multi_release_parallelism: int,
 ):
     """
 Computes a set of imagestream tags which can be assembled into an OpenShift release for this
@@ -229,6 +244,7 @@ read and propagate/expose this annotation in its display of the release image.
         apply_multi_arch,
         moist_run,
         embargo_permit_ack,
+        multi_release_parallelism,
     ).run()
 
 
@@ -278,50 +294,78 @@ def payload_imagestream_namespace_and_name(
     return namespace, name
 
 
-async def modify_and_replace_api_object(
-    api_obj: oc.APIObject, modifier_func: Callable[[oc.APIObject], Any], backup_file_path: Path, dry_run: bool
+async def modify_and_patch_api_object(
+    api_obj: oc.APIObject,
+    modifier_func: Callable[[oc.APIObject], Any],
+    backup_file_path: Path,
+    dry_run: bool,
+    attempts: int = 3,
 ):
     """
     Receives an APIObject, archives the current state of that object, runs a modifying method on it,
-    archives the new state of the object, and then tries to replace the object on the
-    cluster API server.
+    archives the new state of the object, and then patches the object on the cluster API server with
+    only the changes the modifier made. Nothing is written if the modifier changed nothing.
+
+    The patch is rejected by the server if the object changed since it was read; in that case the object
+    is refreshed and the modifier runs again against the new state.
     :param api_obj: The openshift client APIObject to work with.
     :param modifier_func: A function that will accept the api_obj as its first parameter and make
                           any desired change to that object.
     :param backup_file_path: A Path object that can be used to archive pre & post modification
-                             states of the object before triggering the update.
+                             states of the object (and the patch) before triggering the update.
     :param dry_run: Write archive files but do not actually update the imagestream.
+    :param attempts: Maximum number of times to try the update when the object changes concurrently.
     """
 
-    filepath = backup_file_path.joinpath(
-        f"replacing-{api_obj.kind()}.{api_obj.namespace()}.{api_obj.name()}.before-modify.json"
-    )
-    async with aiofiles.open(filepath, mode='w+') as backup_file:
-        await backup_file.write(api_obj.as_json(indent=4))
-
-    modifier_func(api_obj)
-    api_obj_model = api_obj.model
+    qualified_name = f"{api_obj.kind()}.{api_obj.namespace()}.{api_obj.name()}"
+    for attempt in range(1, attempts + 1):
+        before = copy.deepcopy(api_obj.model._primitive())
+        filepath = backup_file_path.joinpath(f"replacing-{qualified_name}.before-modify.json")
+        async with aiofiles.open(filepath, mode='w+') as backup_file:
+            await backup_file.write(json.dumps(before, indent=4))
 
-    # Before replacing api objects on the server, make sure to remove aspects that can
-    # confuse subsequent CLI interactions with the object.
-    if api_obj_model.metadata.annotations["kubectl.kubernetes.io/last-applied-configuration"]:
-        api_obj_model.metadata.annotations.pop("kubectl.kubernetes.io/last-applied-configuration")
+        modifier_func(api_obj)
+        api_obj_model = api_obj.model
 
-    # If server-side metadata is being passed in, remove it before we try to replace the object.
-    if api_obj_model.metadata:
-        for md in ["creationTimestamp", "generation", "uid"]:
-            api_obj_model.metadata.pop(md)
+        # Make sure to remove aspects that can confuse subsequent CLI interactions with the object.
+        if api_obj_model.metadata.annotations["kubectl.kubernetes.io/last-applied-configuration"]:
+            api_obj_model.metadata.annotations.pop("kubectl.kubernetes.io/last-applied-configuration")
 
-    api_obj_model.pop("status")
+        after = api_obj_model._primitive()
+        filepath = backup_file_path.joinpath(f"replacing-{qualified_name}.after-modify.json")
+        async with aiofiles.open(filepath, mode="w+") as backup_file:
+            await backup_file.write(json.dumps(after, indent=4))
 
-    filepath = backup_file_path.joinpath(
-        f"replacing-{api_obj.kind()}.{api_obj.namespace()}.{api_obj.name()}.after-modify.json"
-    )
-    async with aiofiles.open(filepath, mode="w+") as backup_file:
-        await backup_file.write(api_obj.as_json(indent=4))
+        patch = imagestream_patch(before, after)
+        if not patch:
+            LOGGER.info("%s is already up to date; not updating it", qualified_name)
+            return
+        filepath = backup_file_path.joinpath(f"replacing-{qualified_name}.patch.json")
+        async with aiofiles.open(filepath, mode="w+") as backup_file:
+            await backup_file.write(json.dumps(patch, indent=4))
+        LOGGER.info("Patching %s with %s operations", qualified_name, len(patch))
 
-    if not dry_run:
-        api_obj.replace()
+        if dry_run:
+            return
+        try:
+            # The patch can be too large for a command line argument, so oc reads it from the file
+            await exectools.cmd_assert_async(
+                [
+                    "oc",
+                    "patch",
+                    f"--namespace={api_obj.namespace()}",
+                    api_obj.qname(),
+                    "--type=json",
+                    f"--patch-file={filepath}",
+                ]
+            )
+            return
+        except ChildProcessError as e:
+            if attempt == attempts:
+                raise
+            # Most likely the object was changed concurrently and the resourceVersion test failed.
+            LOGGER.warning("Failed to patch %s (attempt %s); refreshing and retrying: %s", qualified_name, attempt, e)
+            api_obj.refresh()
 
 
 class PayloadEntry(NamedTuple):
@@ -385,6 +429,7 @@ class GenPayloadCli:
         apply_multi_arch: bool = False,
         moist_run: bool = False,
         embargo_permit_ack: bool = False,
+        multi_release_parallelism: int = 1,
     ):
         self.runtime = runtime
         self.package_rpm_finder = PackageRpmFinder(runtime)
@@ -397,6 +442,7 @@ class GenPayloadCli:
         self.private_component_repo = (organization, private_repository)
         self.release_repo = (organization, release_repository)
 
+        self.output_path: Optional[Path] = None
         if output_dir:  # where to output yaml report and backed up IS
             self.output_path = Path(output_dir).absolute()
             self.output_path.mkdir(parents=True, exist_ok=True)
@@ -413,12 +459,21 @@ class GenPayloadCli:
         self.private_payload_entries_for_arch: Dict[str, Dict[str, PayloadEntry]] = {}
         # for gathering issues that are found while evaluating the payload:
         self.assembly_issues: List[AssemblyIssue] = list()
+        # RPMs installed in the RHCOS builds, indexed once for all RHCOS consistency checks
+        self.rpm_inventory = RPMInventory()
         # private releases (only nightlies) can reference private component builds
         self.privacy_modes: List[bool] = [False]
         # do we proceed with this payload after weighing issues against permits?
         self.payload_permitted = False
         # Allows embargoed builds to be released
         self.embargo_permit_ack = embargo_permit_ack
+        # Bounds and times the steps of multi-arch payload assembly
+        self.multi_step_queue = StepQueue(
+            {"release-new": multi_release_parallelism, "manifest-list": MULTI_MANIFEST_LIST_PARALLELISM},
+            logger=self.logger,
+        )
+        # Multi payload artifacts already pushed by this run, by a hash of their inputs
+        self._multi_manifest_lists: Dict[str, asyncio.Future] = {}
 
     @start_as_current_span_async(TRACER, "releases:gen-payload")
     async def run(self):
@@ -441,7 +496,7 @@ class GenPayloadCli:
         self.logger.info(f"Collecting latest information associated with the assembly: {rt.assembly}")
         with TRACER.start_as_current_span("Calls AssemblyInspector.__init__"):
             assembly_inspector = AssemblyInspector(rt, rt.build_retrying_koji_client())
-            await assembly_inspector.initialize(lookup_mode='both')
+            await assembly_inspector.initialize(lookup_mode='both', rhcos_arches=self.payload_arches())
 
         self.payload_entries_for_arch, self.private_payload_entries_for_arch = await self.generate_payload_entries(
             assembly_inspector
@@ -679,8 +734,7 @@ class GenPayloadCli:
                     # It could also mean that images are pinning content, which may be expected, so allow permits.
                     for installed_nevra, newest_nevra, repo in non_latest_rpms:
                         nevr, _ = installed_nevra.rsplit(".", maxsplit=1)
-                        rpm_name = parse_nvr(nevr)['name']
-                        is_exempt, pattern = image_meta.is_rpm_exempt(rpm_name)
+                        is_exempt, pattern = image_meta.is_rpm_exempt(rpm_name(nevr))
                         if is_exempt:
                             self.logger.warning(
                                 "%s is exempt from rpm change detection by '%s'", installed_nevra, pattern
@@ -729,6 +783,16 @@ class GenPayloadCli:
 
         return f"quay.io/{org}/{repo}"
 
+    def all_payload_arches(self) -> List[str]:
+        """The arches configured for the group's payloads, including excluded ones"""
+        return (
+            self.runtime.group_config.konflux.arches if self.runtime.build_system == 'konflux' else self.runtime.arches
+        )
+
+    def payload_arches(self) -> List[str]:
+        """The arches to generate payloads for"""
+        return [arch for arch in self.all_payload_arches() if arch not in self.exclude_arch]
+
     @TRACER.start_as_current_span("GenPayloadCli.generate_payload_entries")
     async def generate_payload_entries(
         self, assembly_inspector: AssemblyInspector
@@ -742,9 +806,7 @@ class GenPayloadCli:
         public_entries_for_arch: Dict[str, Dict[str, PayloadEntry]] = dict()  # arch => img tag => PayloadEntry
         private_entries_for_arch: Dict[str, Dict[str, PayloadEntry]] = dict()  # arch => img tag => PayloadEntry
 
-        arches = (
-            self.runtime.group_config.konflux.arches if self.runtime.build_system == 'konflux' else self.runtime.arches
-        )
+        arches = self.all_payload_arches()
 
         for arch in arches:
             if arch in self.exclude_arch:
@@ -867,6 +929,7 @@ class GenPayloadCli:
                                 assembly_inspector.get_group_release_images(),
                                 cross_payload_requirements,
                                 self.package_rpm_finder,
+                                self.rpm_inventory,
                             ),
                         )
                 else:
@@ -895,7 +958,7 @@ class GenPayloadCli:
         for privacy_mode in self.privacy_modes:  # only for relevant modes
             rhcos_builds = targeted_rhcos_builds[privacy_mode]
             rhcos_inconsistencies: Dict[str, List[str]] = self.payload_generator.find_rhcos_build_rpm_inconsistencies(
-                rhcos_builds
+                rhcos_builds, self.rpm_inventory
             )
             if rhcos_inconsistencies:
                 self.assembly_issues.append(
@@ -911,7 +974,9 @@ class GenPayloadCli:
         for privacy_mode in self.privacy_modes:  # only for relevant modes
             rhcos_builds = targeted_rhcos_builds[privacy_mode]
             for rhcos_build in rhcos_builds:
-                inconsistencies = self.payload_generator.find_rhcos_build_kernel_inconsistencies(rhcos_build)
+                inconsistencies = self.payload_generator.find_rhcos_build_kernel_inconsistencies(
+                    rhcos_build, self.rpm_inventory
+                )
                 if inconsistencies:
                     self.assembly_issues.append(
                         AssemblyIssue(
@@ -1007,12 +1072,14 @@ class GenPayloadCli:
         # Ensure that all payload images have been mirrored before updating
         # the imagestream. Otherwise, the imagestream will fail to import the
         # image.
-        tasks = []
+        # Content from all arches and modes is planned together, so that anything shared between them
+        # (e.g. manifest lists) is only mirrored once.
+        planner = self.new_mirror_planner()
         for arch, payload_entries in self.private_payload_entries_for_arch.items():
-            tasks.append(self.mirror_payload_content(arch, payload_entries, True))
+            await self.mirror_payload_content(arch, payload_entries, True, planner=planner)
         for arch, payload_entries in self.payload_entries_for_arch.items():
-            tasks.append(self.mirror_payload_content(arch, payload_entries))
-        await asyncio.gather(*tasks)
+            await self.mirror_payload_content(arch, payload_entries, planner=planner)
+        await planner.execute()
 
         await asyncio.sleep(120)
 
@@ -1038,14 +1105,19 @@ class GenPayloadCli:
                     "not have group.multi_arch.enabled==true"
                 )
 
-    async def mirror_payload_content(self, arch: str, payload_entries: Dict[str, PayloadEntry], private: bool = False):
+    async def mirror_payload_content(
+        self,
+        arch: str,
+        payload_entries: Dict[str, PayloadEntry],
+        private: bool = False,
+        planner: Optional[PayloadMirrorPlanner] = None,
+    ):
         """
         Ensure an arch's payload entries are synced out for the public to access.
+        :param planner: If given, only add the arch's content to the plan; the caller runs it.
+            Otherwise the content is mirrored right away.
         """
 
-        # Prevents writing the same destination twice (not supported by oc if in the same mirroring file):
-        mirror_src_for_dest: Dict[str, str] = dict()
-
         # Login to the konflux registry
         if self.runtime.build_system == 'konflux':
             cmd = [
@@ -1058,45 +1130,32 @@ class GenPayloadCli:
             ]
             await exectools.cmd_assert_async(cmd)
 
+        execute = planner is None
+        if planner is None:
+            planner = self.new_mirror_planner()
+
         for payload_entry in payload_entries.values():
             if not payload_entry.image_inspector:
                 continue  # Nothing to mirror (e.g. RHCOS)
-            mirror_src_for_dest[payload_entry.dest_pullspec] = payload_entry.image_inspector.get_pullspec()
+            planner.add(payload_entry.image_inspector.get_pullspec(), payload_entry.dest_pullspec)
             if payload_entry.dest_manifest_list_pullspec:
                 # For heterogeneous release payloads, if a component builds for all arches
                 # (without using -alt images), we can use the manifest list for the images directly from OSBS.
                 # This saves a significant amount of time compared to building the manifest list again.
-                mirror_src_for_dest[payload_entry.dest_manifest_list_pullspec] = (
-                    payload_entry.build_record_inspector.get_build_pullspec()
+                planner.add(
+                    payload_entry.build_record_inspector.get_build_pullspec(),
+                    payload_entry.dest_manifest_list_pullspec,
                 )
 
-        @exectools.limit_concurrency(500)
-        @retry(reraise=True, stop=stop_after_attempt(10), wait=wait_fixed(60))
-        async def _mirror(file_path: Path, dest_src_pullspecs: List[Tuple[str, str]]):
-            # Save the default SRC=DEST input to a file for syncing by 'oc image mirror'
-            async with aiofiles.open(file_path, mode="w+", encoding="utf-8") as out_file:
-                for dest_pullspec, src_pullspec in dest_src_pullspecs:
-                    await out_file.write(f"{src_pullspec}={dest_pullspec}\n")
-
-            if self.apply or self.apply_multi_arch:
-                self.logger.info(f"Mirroring images from {str(src_dest_path)}")
-                cmd = [
-                    'oc',
-                    'image',
-                    'mirror',
-                    '--keep-manifest-list',
-                    '--continue-on-error',
-                    f'--filename={str(src_dest_path)}',
-                ]
-                await asyncio.wait_for(exectools.cmd_assert_async(cmd), timeout=7200)
+        if execute:
+            await planner.execute(label=f"{arch}-{'private' if private else 'public'}")
 
-        # Mirror the images in chunks to avoid erroring out due to possible registry issues
-        image_chunk_size = 50
-        i = 0
-        for pullspec_pair_chunk in chunk(list(mirror_src_for_dest.items()), image_chunk_size):
-            src_dest_path = self.output_path.joinpath(f"src_dest.{arch}-{'private' if private else 'public'}-{i}.txt")
-            await _mirror(src_dest_path, pullspec_pair_chunk)
-            i += 1
+    def new_mirror_planner(self) -> PayloadMirrorPlanner:
+        return PayloadMirrorPlanner(
+            output_path=self.output_path,
+            apply=bool(self.apply or self.apply_multi_arch),
+            logger=self.logger,
+        )
 
     async def generate_specific_payload_imagestreams(
         self,
@@ -1346,7 +1405,7 @@ class GenPayloadCli:
 
             apiobj.model.spec.tags = new_istags
 
-        await modify_and_replace_api_object(istream_apiobj, update_single_arch_istags, self.output_path, self.moist_run)
+        await modify_and_patch_api_object(istream_apiobj, update_single_arch_istags, self.output_path, self.moist_run)
         return pruning_tags, adding_tags
 
     async def sync_heterogeneous_payloads(self, multi_specs: Dict[bool, Dict[str, Dict[str, PayloadEntry]]]):
@@ -1425,6 +1484,17 @@ class GenPayloadCli:
             with oc.project(imagestream_namespace):
                 await self.apply_multi_imagestream_update(final_multi_pullspec, imagestream_name, multi_release_istag)
 
+        for kind, stats in self.multi_step_queue.summary().items():
+            self.logger.info(
+                "Multi payload step %s: %s runs (%s failed), %.1fs total, %.1fs max",
+                kind,
+                stats["count"],
+                stats["failed"],
+                stats["seconds"],
+                stats["max_seconds"],
+            )
+        self.multi_step_queue.write_timings(self.output_path.joinpath("multi-payload-step-timings.json"))
+
     def get_multi_release_names(self, private_mode: bool) -> Tuple[str, str]:
         """
         Determine a unique name for the multi release (recorded in the imagestream for the assembly) and a
@@ -1483,8 +1553,10 @@ class GenPayloadCli:
             self.logger.info(f"Reusing brew manifest-list {output_digest_pullspec} for component {tag_name}")
         else:
             # Flow 2: Build a new manifest list and push it to quay.
-            output_digest_pullspec = await self.create_multi_manifest_list(
-                tag_name, arch_to_payload_entry, imagestream_namespace
+            output_digest_pullspec = await self.multi_step_queue.run(
+                "manifest-list",
+                tag_name,
+                lambda: self.create_multi_manifest_list(tag_name, arch_to_payload_entry, imagestream_namespace),
             )
 
         issues = list(
@@ -1538,14 +1610,31 @@ class GenPayloadCli:
         # we've calculated a sha256 of all the manifests being added.
         output_pullspec: str = f"{self.full_component_repo()}:sha256-{manifest_list_hash.hexdigest()}"
 
-        # write the manifest list to a file and push it to the registry.
-        async with aiofiles.open(component_manifest_path, mode="w+") as ml:
-            await ml.write(yaml.safe_dump(dict(image=output_pullspec, manifests=manifests), default_flow_style=False))
-        await manifest_tool(f'push from-spec {str(component_manifest_path)}')
+        # Components with the same manifests get the same tag; pushing the list again would only
+        # untag the first push, so reuse it.
+        if output_pullspec in self._multi_manifest_lists:
+            self.logger.info(f"Reusing manifest list {output_pullspec} for component {tag_name}")
+            return await self._multi_manifest_lists[output_pullspec]
+
+        async def _push() -> str:
+            # write the manifest list to a file and push it to the registry.
+            async with aiofiles.open(component_manifest_path, mode="w+") as ml:
+                await ml.write(
+                    yaml.safe_dump(dict(image=output_pullspec, manifests=manifests), default_flow_style=False)
+                )
+            await manifest_tool(f'push from-spec {str(component_manifest_path)}')
 
-        # we are pushing a new manifest list, so return its sha256 based pullspec
-        sha = await find_manifest_list_sha(output_pullspec)
-        return exchange_pullspec_tag_for_shasum(output_pullspec, sha)
+            # we are pushing a new manifest list, so return its sha256 based pullspec
+            sha = await find_manifest_list_sha(output_pullspec)
+            return exchange_pullspec_tag_for_shasum(output_pullspec, sha)
+
+        push = self._multi_manifest_lists[output_pullspec] = asyncio.ensure_future(_push())
+        try:
+            return await push
+        except BaseException:
+            # Let a later request try again
+            self._multi_manifest_lists.pop(output_pullspec, None)
+            raise
 
     async def create_multi_release_image(
         self,
@@ -1568,6 +1657,7 @@ class GenPayloadCli:
         multi_release_is_path: Path = self.output_path.joinpath(f"{imagestream_name}-release-imagestream.yaml")
         async with aiofiles.open(multi_release_is_path, mode="w+") as mf:
             await mf.write(yaml.safe_dump(multi_release_is))
+        metadata = json.dumps({"release.openshift.io/architecture": "multi"})
 
         @retry(reraise=True, stop=stop_after_attempt(10), wait=wait_fixed(60))
         async def _run(to_image, to_image_base):
@@ -1584,20 +1674,27 @@ class GenPayloadCli:
                     f"--to-image-base={to_image_base}",
                     f"--to-image={to_image}",
                     "--metadata",
-                    json.dumps({"release.openshift.io/architecture": "multi"}),
+                    metadata,
                 ]
             )
 
+        async def _create(arch: str, to_image_base: str) -> str:
+            to_image = f"{multi_release_dest}-{arch}"
+            await self.multi_step_queue.run(
+                "release-new", arch, lambda: _run(to_image=to_image, to_image_base=to_image_base)
+            )
+            return to_image
+
+        # Create the arch specific release payloads containing tags pointing to manifest list
+        # component images (i.e. based on the arch's CVO image). Too many concurrent runs can
+        # result in a large number of concurrent requests to the registry, which can cause
+        # unexpected EOFs/fails, so they are bounded by --multi-release-parallelism.
+        cvo_entries = multi_specs[private_mode]["cluster-version-operator"]
+        release_dests = await asyncio.gather(
+            *(_create(arch, cvo_entry.dest_pullspec) for arch, cvo_entry in cvo_entries.items())
+        )
         # This will map arch names to a release payload pullspec we create for that arch
-        # (i.e. based on the arch's CVO image)
-        arch_release_dests: Dict[str, str] = dict()
-        for arch, cvo_entry in multi_specs[private_mode]["cluster-version-operator"].items():
-            arch_release_dests[arch] = f"{multi_release_dest}-{arch}"
-            # Create the arch specific release payload containing tags pointing to manifest list
-            # component images.
-            # Note: Do not use asyncio.gather here because it can result in a large number of
-            # concurrent requests to the registry, which can cause unexpected EOFs/fails
-            await _run(to_image=arch_release_dests[arch], to_image_base=cvo_entry.dest_pullspec)
+        arch_release_dests: Dict[str, str] = dict(zip(cvo_entries.keys(), release_dests))
 
         return await self.create_multi_release_manifest_list(arch_release_dests, imagestream_name, multi_release_dest)
 
@@ -1752,7 +1849,7 @@ class GenPayloadCli:
             )
             return True
 
-        await modify_and_replace_api_object(
+        await modify_and_patch_api_object(
             multi_art_latest_is, add_multi_nightly_release, self.output_path, self.moist_run
         )
 
@@ -1822,53 +1919,49 @@ class PayloadGenerator:
         return mismatched_siblings
 
     @staticmethod
-    def find_rhcos_build_rpm_inconsistencies(rhcos_builds: List[RHCOSBuildInspector]) -> Dict[str, List[str]]:
+    def find_rhcos_build_rpm_inconsistencies(
+        rhcos_builds: List[RHCOSBuildInspector], rpm_inventory: Optional[RPMInventory] = None
+    ) -> Dict[str, Dict[str, List[str]]]:
         """
         Looks through a set of RHCOS builds and finds if any of those builds contains a package version that
         is inconsistent with the same package in another RHCOS build.
-        :return: Returns Dict[inconsistent_rpm_name] -> [inconsistent_nvrs, ...]. The Dictionary will be empty
-                 if there are no inconsistencies detected.
+        :param rpm_inventory: An inventory to record the builds' RPMs in, so that other checks can share it
+        :return: Returns Dict[inconsistent_rpm_name] -> Dict[inconsistent_nvr] -> [brew_arch, ...].
+                 The Dictionary will be empty if there are no inconsistencies detected.
         """
-
-        rpm_uses: Dict[str, Set[str]] = {}
-
-        for rhcos_build in rhcos_builds:
-            for nvr in rhcos_build.get_rpm_nvrs():
-                rpm_name = parse_nvr(nvr)["name"]
-                if rpm_name not in rpm_uses:
-                    rpm_uses[rpm_name] = dict()
-                if nvr not in rpm_uses[rpm_name]:
-                    rpm_uses[rpm_name][nvr] = []
-                rpm_uses[rpm_name][nvr].append(rhcos_build.brew_arch)
-
-        # Report back rpm name keys which were associated with more than one NVR in the set of RHCOS builds.
-        return {rpm_name: nvr_dict for rpm_name, nvr_dict in rpm_uses.items() if len(nvr_dict) > 1}
+        rpm_inventory = rpm_inventory or RPMInventory()
+        arch_for_source = {
+            rpm_inventory.add_rhcos_build(rhcos_build): rhcos_build.brew_arch for rhcos_build in rhcos_builds
+        }
+        # Report back rpm names which were associated with more than one NVR in the set of RHCOS builds.
+        return {
+            name: {nvr: [arch_for_source[source] for source in sources] for nvr, sources in nvrs.items()}
+            for name, nvrs in rpm_inventory.find_inconsistencies(arch_for_source).items()
+        }
 
     @staticmethod
-    def find_rhcos_build_kernel_inconsistencies(rhcos_build: RHCOSBuildInspector) -> List[Dict[str, str]]:
+    def find_rhcos_build_kernel_inconsistencies(
+        rhcos_build: RHCOSBuildInspector, rpm_inventory: Optional[RPMInventory] = None
+    ) -> List[Dict[str, str]]:
         """
         Looks through a RHCOS build and finds if any of those builds contains a kernel-rt version that
         is inconsistent with kernel.
 
         e.g. kernel-4.18.0-372.43.1.el8_6 and kernel-rt-4.18.0-372.43.1.rt7.200.el8_6 are consistent,
         while kernel-4.18.0-372.43.1.el8_6 and kernel-rt-4.18.0-372.41.1.rt7.198.el8_6 are not.
+        :param rpm_inventory: An inventory to look up (or record) the build's RPMs in
         :return: Returns List[Dict[inconsistent_rpm_name, rpm_nvra]] The List will be empty
                  if there are no inconsistencies detected.
         """
         inconsistencies = []
-        # rpm_list will be a list of rpms.
-        # Each entry is another list in the format of [name, epoch, version, release, arch].
-        rpm_list = rhcos_build.get_os_metadata_rpm_list()
-        rpms_dict = {entry[0]: entry for entry in rpm_list}
-
-        def _to_nvr(nevra):
-            return f'{nevra[0]}-{nevra[2]}-{nevra[3]}'
-
-        if {"kernel-core", "kernel-rt-core"} <= rpms_dict.keys():
-            # ["kernel-core", 0, "4.18.0", "372.43.1.el8_6", "x86_64"] => ["4.18.0", "372.43.1.el8_6"]
-            kernel_v, kernel_r = rpms_dict["kernel-core"][2:4]
-            # ["kernel-rt-core", 0, "4.18.0", "4.18.0-372.41.1.rt7.198.el8_6", "x86_64"] => ["4.18.0", "4.18.0-372.41.1.rt7.198.el8_6"]
-            kernel_rt_v, kernel_rt_r = rpms_dict["kernel-rt-core"][2:4]
+        rpm_inventory = rpm_inventory or RPMInventory()
+        source = rpm_inventory.add_rhcos_build(rhcos_build)
+
+        if {"kernel-core", "kernel-rt-core"} <= rpm_inventory.names(source):
+            # ("4.18.0", "372.43.1.el8_6")
+            kernel_v, kernel_r = rpm_inventory.get(source, "kernel-core")
+            # ("4.18.0", "372.41.1.rt7.198.el8_6")
+            kernel_rt_v, kernel_rt_r = rpm_inventory.get(source, "kernel-rt-core")
             inconsistency = False
             if kernel_v != kernel_rt_v:
                 inconsistency = True
@@ -1882,8 +1975,8 @@ class PayloadGenerator:
             if inconsistency:
                 inconsistencies.append(
                     {
-                        "kernel-core": _to_nvr(rpms_dict["kernel-core"]),
-                        "kernel-rt-core": _to_nvr(rpms_dict["kernel-rt-core"]),
+                        "kernel-core": rpm_inventory.get_nvr(source, "kernel-core"),
+                        "kernel-rt-core": rpm_inventory.get_nvr(source, "kernel-rt-core"),
                     }
                 )
         return inconsistencies
@@ -1895,6 +1988,7 @@ class PayloadGenerator:
         # payload tag -> [pkg_name1, ...]
         payload_consistency_config: Dict[str, List[str]],
         package_rpm_finder=None,
+        rpm_inventory: Optional[RPMInventory] = None,
     ) -> List[AssemblyIssue]:
         """
         Compares designated brew packages installed in designated payload members with the RPMs
@@ -1906,15 +2000,16 @@ class PayloadGenerator:
         provides. So we have to do a little more work to find all RPMs for the NVRs installed in the
         member and compare.
 
+        :param rpm_inventory: An inventory to look up (or record) the RHCOS build's RPMs in
         :return: Returns a list of AssemblyIssue objects describing any inconsistencies found.
         """
         issues: List[AssemblyIssue] = []
 
         # index by name the RPMs installed in the RHCOS build
-        rhcos_rpm_vrs: Dict[str, str] = {}  # name -> version-release
-        for rpm in primary_rhcos_build.get_os_metadata_rpm_list():
-            name, _, version, release, _ = rpm
-            rhcos_rpm_vrs[name] = f"{version}-{release}"
+        rpm_inventory = rpm_inventory or RPMInventory()
+        rhcos_rpm_vrs: Dict[str, str] = rpm_inventory.version_releases(
+            rpm_inventory.add_rhcos_build(primary_rhcos_build)
+        )  # name -> version-release
 
         # check that each member consistency condition is met
         primary_rhcos_build.runtime.logger.debug(f"Running payload consistency checks against {primary_rhcos_build}")
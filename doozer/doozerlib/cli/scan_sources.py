@@ -70,6 +70,9 @@ class ConfigScanSources:
         # changes have been calculated. The following function call does this.
         self.check_builder_images()
 
+        if self.ci_kubeconfig:
+            await self._prefetch_rhcos_metadata()
+
         # We have our information. Now build and print the output report
         self.generate_report()
 
@@ -603,6 +606,23 @@ class ConfigScanSources:
             )
             return None
 
+    async def _prefetch_rhcos_metadata(self):
+        """
+        Fetch the RHCOS build metadata of all arches concurrently, so that _detect_rhcos_status finds it cached.
+        Failures are ignored here; they are reported when the latest build id is looked up again.
+        """
+        if self.runtime.group_config.rhcos.get("layered_rhcos", False):
+            return
+        version = self.runtime.get_minor_version()
+        # private builds are looked up in the same release stream, so one lookup per arch covers both
+        await asyncio.gather(
+            *(
+                rhcos.RHCOSBuildFinder(self.runtime, version, arch).latest_rhcos_build_id_async()
+                for arch in self.runtime.arches
+            ),
+            return_exceptions=True,
+        )
+
     def _detect_rhcos_status(self) -> list:
         """
         gather the existing RHCOS tags and compare them to latest rhcos builds
@@ -741,10 +761,9 @@ async def config_scan_source_changes(runtime: Runtime, ci_kubeconfig, as_yaml, r
     # Initialize group config: we need this to determine the canonical builders behavior
     runtime.initialize(config_only=True)
 
+    runtime.initialize(mode='both', clone_distgits=False)
     if runtime.group_config.canonical_builders_from_upstream and runtime.build_system == 'brew':
-        runtime.initialize(mode="both", clone_distgits=True)
-    else:
-        runtime.initialize(mode='both', clone_distgits=False)
+        await runtime.clone_distgits_async()
 
     await ConfigScanSources(runtime, ci_kubeconfig, as_yaml, rebase_priv, dry_run).run()
 
@@ -24,7 +24,7 @@ from artcommonlib import assertion, exectools, logutil
 from artcommonlib.brew import BuildStates
 from artcommonlib.constants import GIT_NO_PROMPTS
 from artcommonlib.format_util import yellow_print
-from artcommonlib.git_helper import gather_git, git_clone
+from artcommonlib.git_helper import gather_git, git_clone_async
 from artcommonlib.konflux.konflux_build_record import ArtifactType, Engine, KonfluxBuildOutcome, KonfluxBuildRecord
 from artcommonlib.lock import get_named_semaphore
 from artcommonlib.model import ListModel, Missing, Model
@@ -167,73 +167,73 @@ class DistGitRepo(object):
             exectools.cmd_assert('rhpkg sources')
 
     def clone(self, distgits_root_dir, distgit_branch):
+        """
+        Clone the distgit repository, attempting failed git/rhpkg commands up to 3 times.
+        Async callers should await clone_async() instead.
+        """
+        retries = 3
+        for attempt in range(1, retries + 1):
+            try:
+                return exectools.run_coroutine(self.clone_async(distgits_root_dir, distgit_branch))
+            except ChildProcessError as e:
+                if attempt == retries:
+                    raise
+                self.logger.warning("Attempt %s/%s to clone %s failed; will retry: %s", attempt, retries, self.name, e)
+
+    async def clone_async(self, distgits_root_dir, distgit_branch):
+        """
+        Clone the distgit repository. Commands are attempted once; on failure the partially
+        cloned directory is removed so that callers (see clone() and DistGitEngine) can apply their own retry policy.
+        """
         if self.metadata.prevent_cloning:
             raise IOError(
                 f'Attempt to clone downstream {self.metadata.distgit_key} after cloning disabled; a regression has been introduced.'
             )
 
-        with Dir(distgits_root_dir):
-            namespace_dir = os.path.join(distgits_root_dir, self.metadata.namespace)
-
-            # It is possible we have metadata for the same distgit twice in a group.
-            # There are valid scenarios (when they represent different branches) and
-            # scenarios where this is a user error. In either case, make sure we
-            # don't conflict by stomping on the same git directory.
-            self.distgit_dir = os.path.join(namespace_dir, self.metadata.distgit_key)
-            self.dg_path = pathlib.Path(self.distgit_dir)
-
-            fake_distgit = self.runtime.local and 'content' in self.metadata.config
-
-            if os.path.isdir(self.distgit_dir):
-                self.logger.info("Distgit directory already exists; skipping clone: %s" % self.distgit_dir)
-                if self.runtime.upcycle:
-                    self.logger.info("Refreshing source for '{}' due to --upcycle".format(self.distgit_dir))
-                    with Dir(self.distgit_dir):
-                        exectools.cmd_assert('git fetch --all', retries=3)
-                        exectools.cmd_assert('git reset --hard @{upstream}', retries=3)
-            else:
-                # Make a directory for the distgit namespace if it does not already exist
-                try:
-                    os.mkdir(namespace_dir)
-                except OSError as e:
-                    if e.errno != errno.EEXIST:
-                        raise
-
-                if fake_distgit and self.runtime.command == 'images:rebase':
-                    cmd_list = ['mkdir', '-p', self.distgit_dir]
-                    self.logger.info("Creating local build dir: {}".format(self.distgit_dir))
-                    exectools.cmd_assert(cmd_list)
-                else:
-                    if self.runtime.command == 'images:build':
-                        yellow_print(
-                            'Warning: images:rebase was skipped and therefore your '
-                            'local build will be sourced from the current dist-git '
-                            'contents and not the typical GitHub source. ',
-                        )
+        namespace_dir = os.path.join(distgits_root_dir, self.metadata.namespace)
+        self.distgit_dir = os.path.join(namespace_dir, self.metadata.distgit_key)
+        self.dg_path = pathlib.Path(self.distgit_dir)
 
-                    self.logger.info(
-                        "Cloning distgit repository [branch:%s] into: %s" % (distgit_branch, self.distgit_dir)
+        fake_distgit = self.runtime.local and 'content' in self.metadata.config
+        env = os.environ.copy()
+        env.update(GIT_NO_PROMPTS)
+
+        if os.path.isdir(self.distgit_dir):
+            self.logger.info("Distgit directory already exists; skipping clone: %s" % self.distgit_dir)
+            if self.runtime.upcycle:
+                self.logger.info("Refreshing source for '{}' due to --upcycle".format(self.distgit_dir))
+                await exectools.cmd_assert_async(['git', 'fetch', '--all'], cwd=self.distgit_dir, env=env)
+                await exectools.cmd_assert_async(['git', 'reset', '--hard', '@{upstream}'], cwd=self.distgit_dir)
+        else:
+            os.makedirs(namespace_dir, exist_ok=True)
+
+            if fake_distgit and self.runtime.command == 'images:rebase':
+                self.logger.info("Creating local build dir: {}".format(self.distgit_dir))
+                os.makedirs(self.distgit_dir, exist_ok=True)
+            else:
+                if self.runtime.command == 'images:build':
+                    yellow_print(
+                        'Warning: images:rebase was skipped and therefore your '
+                        'local build will be sourced from the current dist-git '
+                        'contents and not the typical GitHub source. ',
                     )
 
-                    # Has the user specified a specific commit to checkout from distgit on the command line?
-                    distgit_commitish = self.runtime.downstream_commitish_overrides.get(self.metadata.distgit_key, None)
+                self.logger.info("Cloning distgit repository [branch:%s] into: %s" % (distgit_branch, self.distgit_dir))
 
-                    timeout = str(self.runtime.global_opts['rhpkg_clone_timeout'])
-                    rhpkg_clone_depth = int(self.runtime.global_opts.get('rhpkg_clone_depth', '0'))
+                distgit_commitish = self.runtime.downstream_commitish_overrides.get(self.metadata.distgit_key, None)
+                timeout = str(self.runtime.global_opts['rhpkg_clone_timeout'])
+                rhpkg_clone_depth = int(self.runtime.global_opts.get('rhpkg_clone_depth', '0'))
 
+                try:
                     if self.metadata.namespace == 'containers':
-                        # Containers don't generally require distgit lookaside. We can rely on normal
-                        # git clone & leverage git caches to greatly accelerate things if the user supplied it.
                         gitargs = ['--branch', distgit_branch]
-
                         if not distgit_commitish:
                             gitargs.append('--single-branch')
-
                         if not distgit_commitish and rhpkg_clone_depth > 0:
                             gitargs.extend(["--depth", str(rhpkg_clone_depth)])
 
                         try:
-                            git_clone(
+                            await git_clone_async(
                                 self.metadata.distgit_remote_url(),
                                 self.distgit_dir,
                                 gitargs=gitargs,
@@ -243,47 +243,53 @@ class DistGitRepo(object):
                             )
                         except ChildProcessError as err:
                             # Create branch on demand
-                            if (
-                                len(err.args) > 1
-                                and self.has_source()
+                            if not (
+                                self.has_source()
                                 and re.fullmatch(r'rhaos-\d+\.\d+-rhel-\d+', distgit_branch)
+                                and f"Remote branch {distgit_branch} not found" in str(err)
                             ):
-                                _, _, clone_error = err.args[1]
-                                if f"Remote branch {distgit_branch} not found" in clone_error:
-                                    self.logger.info(f"Creating distgit branch {distgit_branch} for {self.name}")
-                                    exectools.cmd_assert(f"git init {self.distgit_dir}")
-                                    exectools.cmd_assert(
-                                        f'git -C {self.distgit_dir} remote add origin {self.metadata.distgit_remote_url()}'
-                                    )
-                                    exectools.cmd_assert(
-                                        f'git -C {self.distgit_dir} checkout --orphan {distgit_branch}'
-                                    )
+                                raise
+                            self.logger.info(f"Creating distgit branch {distgit_branch} for {self.name}")
+                            await exectools.cmd_assert_async(['git', 'init', self.distgit_dir])
+                            await exectools.cmd_assert_async(
+                                [
+                                    'git',
+                                    '-C',
+                                    self.distgit_dir,
+                                    'remote',
+                                    'add',
+                                    'origin',
+                                    self.metadata.distgit_remote_url(),
+                                ]
+                            )
+                            await exectools.cmd_assert_async(
+                                ['git', '-C', self.distgit_dir, 'checkout', '--orphan', distgit_branch]
+                            )
                     else:
-                        # Use rhpkg -- presently no idea how to cache.
-                        cmd_list = ["timeout", timeout]
-                        cmd_list.append("rhpkg")
-
+                        cmd_list = ["timeout", timeout, "rhpkg"]
                         if self.runtime.rhpkg_config_lst:
                             cmd_list.extend(self.runtime.rhpkg_config_lst)
-
                         if self.runtime.user is not None:
                             cmd_list.append("--user=%s" % self.runtime.user)
-
                         cmd_list.extend(["clone", self.metadata.qualified_name, self.distgit_dir])
                         cmd_list.extend(["--branch", distgit_branch])
-
                         if not distgit_commitish and rhpkg_clone_depth > 0:
                             cmd_list.extend(["--depth", str(rhpkg_clone_depth)])
 
-                        # Clone the distgit repository. Occasional flakes in clone, so use retry.
-                        exectools.cmd_assert(cmd_list, retries=3, set_env=GIT_NO_PROMPTS)
+                        await exectools.cmd_assert_async(cmd_list, env=env)
 
                     if distgit_commitish:
-                        with Dir(self.distgit_dir):
-                            exectools.cmd_assert(f'git checkout {distgit_commitish}')
-        rc, out, err = exectools.cmd_gather(["git", "-C", self.distgit_dir, "rev-parse", "HEAD"], strip=True)
+                        await exectools.cmd_assert_async(['git', 'checkout', distgit_commitish], cwd=self.distgit_dir)
+                except BaseException:
+                    # Don't leave a partial clone behind for a retry to mistake for a complete one
+                    shutil.rmtree(self.distgit_dir, ignore_errors=True)
+                    raise
+
+        rc, out, err = await exectools.cmd_gather_async(
+            ["git", "-C", self.distgit_dir, "rev-parse", "HEAD"], check=False
+        )
         if rc == 0:
-            self.sha = out
+            self.sha = out.strip()
         elif "unknown revision" in err:
             self.sha = None
         else:
@@ -532,8 +538,8 @@ class ImageDistGitRepo(DistGitRepo):
         if autoclone:
             self.clone(self.runtime.distgits_dir, self.branch)
 
-    def clone(self, distgits_root_dir, distgit_branch):
-        super(ImageDistGitRepo, self).clone(distgits_root_dir, distgit_branch)
+    async def clone_async(self, distgits_root_dir, distgit_branch):
+        await super(ImageDistGitRepo, self).clone_async(distgits_root_dir, distgit_branch)
         self._read_master_data()
 
     def _get_diff(self):
@@ -0,0 +1,186 @@
+import asyncio
+import logging
+import random
+import time
+from collections import defaultdict
+from typing import TYPE_CHECKING, Awaitable, Callable, Dict, List, Optional, Sequence, Tuple, TypeVar, Union
+from urllib.parse import urlparse
+
+from artcommonlib import exectools
+
+if TYPE_CHECKING:
+    from doozerlib.distgit import DistGitRepo
+    from doozerlib.metadata import Metadata
+    from doozerlib.runtime import Runtime
+
+LOGGER = logging.getLogger(__name__)
+
+T = TypeVar("T")
+
+# Maximum number of simultaneous dist-git pushes
+PUSH_CONCURRENCY = 5
+
+
+def remote_host(url: str) -> str:
+    """Return the host part of a git remote URL. Supports both URL and scp-like (git@host:path) syntax."""
+    parsed = urlparse(url)
+    if parsed.hostname:
+        return parsed.hostname
+    # scp-like syntax: [user@]host:path
+    return url.split(':', 1)[0].rsplit('@', 1)[-1]
+
+
+class HostBackoff:
+    """Tracks consecutive failures per remote host.
+
+    Retries against a host that keeps failing back off together, rather than each repository
+    hammering the same struggling server on its own schedule.
+    Delays use "full jitter": a random value between 0 and an exponentially growing cap.
+    """
+
+    def __init__(self, base_delay: float = 5.0, max_delay: float = 120.0):
+        self.base_delay = base_delay
+        self.max_delay = max_delay
+        self._failures: Dict[str, int] = defaultdict(int)
+
+    def record_failure(self, host: str):
+        self._failures[host] += 1
+
+    def record_success(self, host: str):
+        self._failures.pop(host, None)
+
+    def delay(self, host: str) -> float:
+        failures = self._failures.get(host, 0)
+        if not failures:
+            return 0
+        cap = min(self.max_delay, self.base_delay * 2 ** (failures - 1))
+        return random.uniform(0, cap)
+
+
+class DistGitEngine:
+    """Clones and pushes dist-git repositories with asyncio.
+
+    All git/rhpkg operations run as subprocesses through exectools.cmd_gather_async, with at most
+    `concurrency` of them in flight, instead of dedicating an OS thread to every image.
+    Failed operations are retried with jittered backoff shared per remote host. When an operation
+    fails for good (or the caller is cancelled, e.g. by Ctrl-C) all outstanding operations are cancelled
+    and their subprocesses terminated.
+    """
+
+    def __init__(
+        self,
+        runtime: "Runtime",
+        concurrency: Optional[int] = None,
+        retries: int = 3,
+        backoff: Optional[HostBackoff] = None,
+    ):
+        self.runtime = runtime
+        self.concurrency = concurrency or runtime.global_opts['distgit_threads']
+        self.retries = retries
+        self.backoff = backoff or HostBackoff()
+        # distgit_key -> seconds taken by the last operation, including retries
+        self.timings: Dict[str, float] = {}
+
+    async def clone_all(self, metas: Sequence["Metadata"]) -> List["DistGitRepo"]:
+        """Clone the dist-git repositories of all metas.
+        :return: DistGitRepo objects in the same order as metas
+        :raises: The first error encountered, after cancelling the remaining clones
+        """
+
+        async def _clone(meta: "Metadata") -> "DistGitRepo":
+            # Constructing a DistGitRepo may resolve upstream sources synchronously; keep that off the event loop
+            dg = await exectools.to_thread(meta.distgit_repo, autoclone=False)
+            await self._retry(meta, lambda: dg.clone_async(self.runtime.distgits_dir, dg.branch))
+            return dg
+
+        return await self._run_all('clone', metas, _clone, self.concurrency)
+
+    async def push_all(self, metas: Sequence["Metadata"]) -> List[Tuple["Metadata", Union[bool, str]]]:
+        """Push the dist-git repositories of all metas.
+        Like DistGitRepo.push(), a push failure is reported in the result rather than raised.
+        :return: (meta, True) for each successful push or (meta, repr(error)) for each failed one
+        """
+
+        async def _push(meta: "Metadata") -> Tuple["Metadata", Union[bool, str]]:
+            dg = meta.distgit_repo()
+            try:
+                await self._retry(meta, lambda: self._push_one(dg))
+            except IOError as e:
+                return meta, repr(e)
+            return meta, True
+
+        # When initializing new release branches a large amount of data needs to be pushed, and pushing
+        # every distgit at once makes each push take hours. Keep the limit DistGitRepo.push() uses.
+        return await self._run_all('push', metas, _push, min(self.concurrency, PUSH_CONCURRENCY))
+
+    async def _push_one(self, dg: "DistGitRepo"):
+        timeout = str(self.runtime.global_opts['rhpkg_push_timeout'])
+        LOGGER.info("Pushing distgit repository %s", dg.name)
+        await exectools.cmd_assert_async(
+            ['timeout', timeout, 'git', 'push', '--set-upstream', 'origin', dg.branch], cwd=dg.distgit_dir
+        )
+        # See DistGitRepo.push(): tags must be pushed for 4.x, but can't be overwritten in dist-git for 3.x
+        major, _ = self.runtime.get_major_minor_fields()
+        if major >= 4:
+            await exectools.cmd_assert_async(['timeout', timeout, 'git', 'push', '--tags'], cwd=dg.distgit_dir)
+        else:
+            await exectools.cmd_gather_async(
+                ['timeout', '300', 'git', 'push', '--tags'], cwd=dg.distgit_dir, check=False
+            )
+
+    async def _run_all(
+        self, op_name: str, metas: Sequence["Metadata"], op: Callable[["Metadata"], Awaitable[T]], concurrency: int
+    ) -> List[T]:
+        semaphore = asyncio.Semaphore(concurrency)
+        total = len(metas)
+        completed = 0
+
+        async def _run_one(meta: "Metadata") -> T:
+            nonlocal completed
+            async with semaphore:
+                start = time.monotonic()
+                result = await op(meta)
+                elapsed = time.monotonic() - start
+            self.timings[meta.distgit_key] = elapsed
+            completed += 1
+            LOGGER.info("[%s/%s] %s of %s finished in %.1fs", completed, total, op_name, meta.distgit_key, elapsed)
+            return result
+
+        start = time.monotonic()
+        tasks = [asyncio.create_task(_run_one(meta)) for meta in metas]
+        try:
+            return await asyncio.gather(*tasks)
+        except BaseException:
+            for task in tasks:
+                task.cancel()
+            await asyncio.gather(*tasks, return_exceptions=True)
+            raise
+        finally:
+            slowest = sorted(self.timings.items(), key=lambda item: item[1], reverse=True)[:5]
+            LOGGER.info(
+                "%s of %s/%s dist-git repos took %.1fs; slowest: %s",
+                op_name,
+                completed,
+                total,
+                time.monotonic() - start,
+                ", ".join(f"{key} ({elapsed:.1f}s)" for key, elapsed in slowest),
+            )
+
+    async def _retry(self, meta: "Metadata", func: Callable[[], Awaitable[T]]) -> T:
+        host = remote_host(meta.distgit_remote_url())
+        for attempt in range(1, self.retries + 1):
+            delay = self.backoff.delay(host)
+            if delay:
+                await asyncio.sleep(delay)
+            try:
+                result = await func()
+            except ChildProcessError as e:
+                self.backoff.record_failure(host)
+                if attempt == self.retries:
+                    raise
+                LOGGER.warning(
+                    "Attempt %s/%s for %s failed; will retry: %s", attempt, self.retries, meta.distgit_key, e
+                )
+                continue
+            self.backoff.record_success(host)
+            return result
@@ -7,7 +7,7 @@ from typing import Any, Dict, List, Optional, Set, Tuple
 
 from artcommonlib.model import Missing, Model
 from artcommonlib.pushd import Dir
-from artcommonlib.rpm_utils import parse_nvr, to_nevra
+from artcommonlib.rpm_utils import to_nevra
 from artcommonlib.util import deep_merge
 
 import doozerlib
@@ -15,6 +15,7 @@ from doozerlib import brew, coverity, util
 from doozerlib.build_info import BrewBuildRecordInspector
 from doozerlib.distgit import pull_image
 from doozerlib.metadata import Metadata, RebuildHint, RebuildHintCode
+from doozerlib.rpm_inventory import rpm_name
 
 
 class ImageMetadata(Metadata):
@@ -42,6 +43,12 @@ class ImageMetadata(Metadata):
         """ Event that is set when this image is being rebased. """
         self.rebase_status = False
         """ True if this image has been successfully rebased. """
+        self.rebase_input_digest: Optional[str] = None
+        """ Digest of the inputs of the Konflux rebase of this image. See KonfluxRebaser.calculate_input_digest. """
+        self.rebase_uuid_tag: Optional[str] = None
+        """ Tag that the image built from the Konflux rebase of this image is pushed to. """
+        self.rebase_reused = False
+        """ True if the Konflux rebase of this image reused the commit of a previous rebase. See KonfluxRebaser.rebase_to. """
         self.build_event = Event()
         """ Event that is set when this image is being built. """
         self.build_status = False
@@ -118,14 +125,14 @@ class ImageMetadata(Metadata):
         for rpm_entry in group_deps:
             if eltag in rpm_entry:  # This entry has something for the requested RHEL version
                 nvr = rpm_entry[eltag]
-                package_name = parse_nvr(nvr)['name']
+                package_name = rpm_name(nvr)
                 aggregate_deps[package_name] = nvr
 
         # Perform the same process, but only for dependencies directly listed for the member
         for rpm_entry in member_deps:
             if eltag in rpm_entry:  # This entry has something for the requested RHEL version
                 nvr = rpm_entry[eltag]
-                package_name = parse_nvr(nvr)['name']
+                package_name = rpm_name(nvr)
                 direct_member_deps[package_name] = nvr
                 aggregate_deps[package_name] = nvr  # Override anything at the group level
 
@@ -0,0 +1,105 @@
+"""
+Compute minimal JSON patches (RFC 6902) between two states of an ImageStream, so that updates only send
+the tags that actually changed instead of replacing an object that can carry hundreds of tags.
+"""
+
+from difflib import SequenceMatcher
+from typing import Any, Dict, List, Optional
+
+# Fields of an ImageStream that doozer changes; everything else is left to the server and other controllers.
+_METADATA_FIELDS = ("annotations", "labels")
+
+# Fields of an imagestream tag that the server fills in when a tag does not set them
+_SERVER_DEFAULTED_TAG_FIELDS = ("generation", "referencePolicy")
+
+
+def _escape(key: str) -> str:
+    """Escape a key for use in a JSON pointer."""
+    return key.replace("~", "~0").replace("/", "~1")
+
+
+def _field_ops(path: str, before: Optional[Any], after: Optional[Any]) -> List[Dict[str, Any]]:
+    if before == after:
+        return []
+    if after is None:
+        return [{"op": "remove", "path": path}]
+    # "add" replaces the value if it exists
+    return [{"op": "add", "path": path, "value": after}]
+
+
+def _tag_changed(live: Dict[str, Any], desired: Dict[str, Any]) -> bool:
+    """
+    Whether a tag read from the server differs from the desired tag. Fields the server defaults are ignored
+    unless the desired tag sets them, and empty values (which the server drops) are treated as missing.
+    """
+
+    def _normalize(tag: Dict[str, Any]) -> Dict[str, Any]:
+        return {
+            key: value
+            for key, value in tag.items()
+            if value not in (None, {}, []) and (key in desired or key not in _SERVER_DEFAULTED_TAG_FIELDS)
+        }
+
+    return _normalize(live) != _normalize(desired)
+
+
+def tag_ops(
+    before: List[Dict[str, Any]], after: List[Dict[str, Any]], path: str = "/spec/tags"
+) -> List[Dict[str, Any]]:
+    """
+    Compute the operations that turn one list of imagestream tags into another, matching tags by name.
+    Unchanged tags produce no operations, and the order of the list is preserved. A changed tag is replaced
+    as a whole, so the server defaults its fields again.
+    """
+    ops: List[Dict[str, Any]] = []
+    matcher = SequenceMatcher(
+        a=[tag.get("name") for tag in before], b=[tag.get("name") for tag in after], autojunk=False
+    )
+    # Work from the end of the list so that indices of earlier operations remain valid
+    for opcode, i1, i2, j1, j2 in reversed(matcher.get_opcodes()):
+        if opcode == "equal":
+            for offset in range(i2 - i1):
+                if _tag_changed(before[i1 + offset], after[j1 + offset]):
+                    ops.append({"op": "replace", "path": f"{path}/{i1 + offset}", "value": after[j1 + offset]})
+            continue
+        if opcode in ("delete", "replace"):
+            ops.extend({"op": "remove", "path": f"{path}/{index}"} for index in reversed(range(i1, i2)))
+        if opcode in ("insert", "replace"):
+            ops.extend(
+                {"op": "add", "path": f"{path}/{i1 + offset}", "value": tag} for offset, tag in enumerate(after[j1:j2])
+            )
+    return ops
+
+
+def imagestream_patch(before: Dict[str, Any], after: Dict[str, Any]) -> List[Dict[str, Any]]:
+    """
+    Compute a JSON patch that applies the changes between two states of an ImageStream to the live object.
+    The patch starts with a test of the resourceVersion of the before state, so that the server rejects it
+    if the object was changed in the meantime.
+
+    :param before: The ImageStream as it was read from the server
+    :param after: The desired ImageStream
+    :return: The patch operations, or an empty list if nothing changed
+    """
+    ops: List[Dict[str, Any]] = []
+    before_metadata = before.get("metadata") or {}
+    after_metadata = after.get("metadata") or {}
+    for field in _METADATA_FIELDS:
+        ops.extend(_field_ops(f"/metadata/{field}", before_metadata.get(field), after_metadata.get(field)))
+
+    before_spec = before.get("spec")
+    after_spec = after.get("spec")
+    if before_spec is None or after_spec is None:
+        ops.extend(_field_ops("/spec", before_spec, after_spec))
+    else:
+        for field in sorted(set(before_spec) | set(after_spec)):
+            before_value, after_value = before_spec.get(field), after_spec.get(field)
+            if field == "tags" and before_value is not None and after_value is not None:
+                ops.extend(tag_ops(before_value, after_value, f"/spec/{_escape(field)}"))
+            else:
+                ops.extend(_field_ops(f"/spec/{_escape(field)}", before_value, after_value))
+
+    resource_version = before_metadata.get("resourceVersion")
+    if ops and resource_version:
+        ops.insert(0, {"op": "test", "path": "/metadata/resourceVersion", "value": resource_version})
+    return ops
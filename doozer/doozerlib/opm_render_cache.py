@@ -0,0 +1,162 @@
+"""
+An on-disk cache of `opm render` output, shared by all doozer invocations using the same cache directory.
+
+Rendered catalogs are keyed by the digest of the image they were rendered from, so tags are resolved to digests
+before every lookup and the image is always rendered by digest. Entries are gzip compressed with one blob per line,
+prefixed by the name of the OLM package the blob belongs to, so that the blobs of a few packages can be read without
+loading (or even parsing) the rest of a catalog that can be hundreds of MB.
+"""
+
+import asyncio
+import gzip
+import json
+import logging
+import tempfile
+from pathlib import Path
+from typing import Any, BinaryIO, Dict, Iterator, List, Optional, Set, Union
+
+from artcommonlib import exectools, file_cache
+from artcommonlib.registry_client import RegistryClient, RegistryError, parse_pullspec
+from tenacity import retry, stop_after_attempt, wait_fixed
+
+from doozerlib import opm
+
+LOGGER = logging.getLogger(__name__)
+
+# Version of the format of rendered catalog entries
+_CACHE_VERSION = 1
+
+
+def blob_package_name(blob: Dict[str, Any]) -> str:
+    """Get the name of the OLM package a file-based catalog blob belongs to."""
+    schema = blob["schema"]
+    package_name = None
+    match schema:
+        case "olm.package":
+            package_name = blob["name"]
+        case "olm.channel" | "olm.bundle" | "olm.deprecations":
+            package_name = blob["package"]
+    if not package_name:
+        raise IOError(f"Couldn't determine package name for unknown schema: {schema}")
+    return package_name
+
+
+class OpmRenderCache:
+    """Renders catalog, index and bundle images with `opm render`, caching the result on disk by image digest."""
+
+    def __init__(self, cache_dir: Union[str, Path], logger: Optional[logging.Logger] = None):
+        self.cache_dir = Path(cache_dir)
+        self._logger = logger or LOGGER
+        # Concurrent requests for the same entry wait for a single render
+        self._locks: Dict[Path, asyncio.Lock] = {}
+
+    async def resolve_digest(self, pullspec: str, auth: Optional[opm.OpmRegistryAuth] = None) -> Optional[str]:
+        """Get the digest a pullspec currently points to, or None if it couldn't be determined."""
+        ref = parse_pullspec(pullspec)
+        if ref.digest:
+            return ref.digest
+        auth_file, credentials = None, None
+        if auth and auth.path:
+            auth_file = auth.path
+        elif auth and auth.username and auth.password:
+            credentials = {auth.registry_url or "quay.io": (auth.username, auth.password)}
+        try:
+            async with RegistryClient(auth_file=auth_file, credentials=credentials) as client:
+                return await client.head_manifest(pullspec)
+        except (RegistryError, OSError, asyncio.TimeoutError) as e:
+            self._logger.warning("Couldn't resolve the digest of %s; it won't be cached: %s", pullspec, e)
+            return None
+
+    def _path(self, digest: str, migrate: bool) -> Path:
+        algorithm, _, hex_digest = digest.partition(":")
+        suffix = "-migrate" if migrate else ""
+        return self.cache_dir / f"v{_CACHE_VERSION}" / f"{algorithm}-{hex_digest}{suffix}.jsonl.gz"
+
+    async def _ensure_entry(self, pullspec: str, migrate: bool, auth: Optional[opm.OpmRegistryAuth]) -> Optional[Path]:
+        """Make sure the rendered catalog of pullspec is cached.
+        :return: The path of the cache entry, or None if pullspec couldn't be resolved to a digest
+        """
+        digest = await self.resolve_digest(pullspec, auth)
+        if not digest:
+            return None
+        path = self._path(digest, migrate)
+        lock = self._locks.setdefault(path, asyncio.Lock())
+        async with lock:
+            if path.exists():
+                self._logger.debug("Using cached opm render output of %s (%s)", pullspec, digest)
+                return path
+            ref = parse_pullspec(pullspec)
+            # Render by digest so that the entry matches its key even if the tag moves in the meantime
+            pinned = f"{ref.registry}/{ref.repository}@{digest}"
+            self._logger.info("Rendering %s into the opm render cache", pinned)
+            path.parent.mkdir(parents=True, exist_ok=True)
+            with tempfile.TemporaryDirectory(dir=path.parent, prefix=".render-") as tmp_dir:
+                rendered_path = Path(tmp_dir, "rendered.yaml")
+                await retry(reraise=True, stop=stop_after_attempt(3), wait=wait_fixed(5))(self._render_to_file)(
+                    pinned, rendered_path, migrate, auth
+                )
+                with file_cache.atomic_write(path, "wb") as entry:
+                    await exectools.to_thread(self._write_entry, rendered_path, entry)
+        return path
+
+    @staticmethod
+    async def _render_to_file(pullspec: str, dest: Path, migrate: bool, auth: Optional[opm.OpmRegistryAuth]):
+        args = ["render"]
+        if migrate:
+            args.append("--migrate")
+        with dest.open("w") as out:
+            await opm.gather_opm(args + ["-o", "yaml", "--", pullspec], stdout=out, auth=auth)
+
+    @staticmethod
+    def _write_entry(rendered_path: Path, entry_file: BinaryIO):
+        with rendered_path.open() as rendered, gzip.open(entry_file, "wt", compresslevel=6) as entry:
+            # load_all parses one document at a time, so the whole catalog is never held in memory
+            for blob in opm.yaml.load_all(rendered):
+                if blob is None:
+                    continue
+                entry.write(f"{blob_package_name(blob)}\t{json.dumps(blob)}\n")
+
+    @staticmethod
+    def _read_entry(path: Path, package_names: Optional[Set[str]] = None) -> Iterator[Dict[str, Any]]:
+        with gzip.open(path, "rt") as entry:
+            for line in entry:
+                package_name, _, data = line.partition("\t")
+                if package_names is None or package_name in package_names:
+                    yield json.loads(data)
+
+    async def render(
+        self, pullspec: str, migrate: bool = False, auth: Optional[opm.OpmRegistryAuth] = None
+    ) -> List[Dict[str, Any]]:
+        """Render an image like opm.render, using the cached output if there is one.
+        :param pullspec: The catalog, index or bundle image to render
+        :param migrate: Whether to perform all available schema migrations on the rendered FBC
+        :param auth: The registry authentication information to use
+        :return: The file-based catalog blobs
+        """
+        path = await self._ensure_entry(pullspec, migrate, auth)
+        if not path:
+            return await opm.render(pullspec, migrate=migrate, auth=auth)
+        return await exectools.to_thread(lambda: list(self._read_entry(path)))
+
+    async def get_package_blobs(
+        self,
+        pullspec: str,
+        package_names: Set[str],
+        migrate: bool = False,
+        auth: Optional[opm.OpmRegistryAuth] = None,
+    ) -> Optional[Dict[str, List[Dict[str, Any]]]]:
+        """Get the file-based catalog blobs of some packages in an image.
+        Only the blobs of the requested packages are parsed from a cached entry.
+
+        :param package_names: Names of the OLM packages to get the blobs of
+        :return: Dict of package name -> blobs, for the requested packages that are present in the image;
+            None if the image couldn't be resolved to a digest, so that the caller renders it by its own means
+        """
+        path = await self._ensure_entry(pullspec, migrate, auth)
+        if not path:
+            return None
+        blobs = await exectools.to_thread(lambda: list(self._read_entry(path, package_names)))
+        filtered: Dict[str, List[Dict[str, Any]]] = {}
+        for blob in blobs:
+            filtered.setdefault(blob_package_name(blob), []).append(blob)
+        return filtered
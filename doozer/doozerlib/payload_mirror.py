@@ -0,0 +1,187 @@
+import asyncio
+import logging
+import re
+from pathlib import Path
+from typing import Awaitable, Callable, Dict, List, Optional, Tuple
+
+import aiofiles
+from artcommonlib import exectools
+from artcommonlib.registry_client import RegistryClient, RegistryError, parse_pullspec
+from tenacity import AsyncRetrying, stop_after_attempt, wait_exponential
+
+LOGGER = logging.getLogger(__name__)
+
+# Payload images are mirrored to tags derived from their digest; see PayloadGenerator.get_mirroring_destination
+_DIGEST_TAG_PATTERN = re.compile(r"^(sha256)-([0-9a-f]{64})$")
+
+
+def dest_content_digest(dest_pullspec: str) -> Optional[str]:
+    """Get the content digest a destination pullspec is addressed by: its digest or a sha256-<hex> tag."""
+    dest = parse_pullspec(dest_pullspec)
+    if dest.digest:
+        return dest.digest
+    match = _DIGEST_TAG_PATTERN.match(dest.tag or "")
+    return f"{match.group(1)}:{match.group(2)}" if match else None
+
+
+def content_digest(src_pullspec: str, dest_pullspec: str) -> Optional[str]:
+    """Determine the digest of the content being mirrored, if it can be told from the pullspecs."""
+    return dest_content_digest(dest_pullspec) or parse_pullspec(src_pullspec).digest
+
+
+class PayloadMirrorPlanner:
+    """Plans and runs `oc image mirror` for release payload content.
+
+    Mirror requests from every arch and public/private mode are collected first, so that content requested
+    more than once is only copied once. The plan is then deduplicated by destination repository and content
+    digest. Destinations that already hold the content are dropped. All destinations of a source are kept in
+    the same batch so that `oc image mirror` copies its blobs once. Batches run concurrently and each one is
+    retried on its own.
+    """
+
+    def __init__(
+        self,
+        output_path: Path,
+        apply: bool = True,
+        batch_size: int = 50,
+        concurrency: int = 4,
+        attempts: int = 5,
+        exists: Optional[Callable[[str, str], Awaitable[bool]]] = None,
+        logger: Optional[logging.Logger] = None,
+    ):
+        """
+        :param output_path: Directory to write the `oc image mirror` mapping files to
+        :param apply: If False, only write the mapping files
+        :param batch_size: Maximum number of mappings per `oc image mirror` invocation
+        :param concurrency: Maximum number of concurrent `oc image mirror` invocations
+        :param attempts: Maximum number of attempts per batch
+        :param exists: Coroutine function (src, dest) -> True if dest already holds the content of src.
+            Defaults to a HEAD request for the destination manifest.
+        """
+        self.output_path = output_path
+        self.apply = apply
+        self.batch_size = batch_size
+        self.concurrency = concurrency
+        self.attempts = attempts
+        self._exists = exists
+        self._retry_wait = wait_exponential(multiplier=10, max=300)
+        self._logger = logger or LOGGER
+        # (dest repository, content digest of a digest-addressed dest or else the dest pullspec) -> (src, dest)
+        self._mappings: Dict[Tuple[str, str], Tuple[str, str]] = {}
+        self.requested = 0
+
+    def add(self, src_pullspec: str, dest_pullspec: str):
+        """Request that src_pullspec be mirrored to dest_pullspec."""
+        self.requested += 1
+        dest = parse_pullspec(dest_pullspec)
+        digest = dest_content_digest(dest_pullspec)
+        key = (f"{dest.registry}/{dest.repository}", digest or dest_pullspec)
+        existing = self._mappings.get(key)
+        if existing:
+            if digest:
+                return  # The same content into the same repository; copying it once is enough
+            if existing[0] != src_pullspec:
+                # Mirror the latest request, like a plain SRC=DEST mapping would
+                self._logger.warning(
+                    "%s is requested from both %s and %s; using the latter", dest_pullspec, existing[0], src_pullspec
+                )
+        self._mappings[key] = (src_pullspec, dest_pullspec)
+
+    @property
+    def mappings(self) -> List[Tuple[str, str]]:
+        """The deduplicated (src, dest) pairs, in the order they were first requested."""
+        return list(self._mappings.values())
+
+    async def _default_exists(self, client: RegistryClient, src_pullspec: str, dest_pullspec: str) -> bool:
+        digest = content_digest(src_pullspec, dest_pullspec)
+        if not digest:
+            return False  # Mutable tag; always mirror
+        try:
+            return await client.head_manifest(dest_pullspec) == digest
+        except (RegistryError, OSError, asyncio.TimeoutError) as e:
+            self._logger.debug("Couldn't check whether %s exists; will mirror it: %s", dest_pullspec, e)
+            return False
+
+    async def _filter_existing(self, mappings: List[Tuple[str, str]]) -> List[Tuple[str, str]]:
+        candidates = [(src, dest) for src, dest in mappings if content_digest(src, dest)]
+        if not candidates:
+            return mappings
+        if self._exists:
+            results = await asyncio.gather(*(self._exists(src, dest) for src, dest in candidates))
+        else:
+            async with RegistryClient() as client:
+                results = await asyncio.gather(*(self._default_exists(client, src, dest) for src, dest in candidates))
+        present = {pair for pair, exists in zip(candidates, results) if exists}
+        if present:
+            self._logger.info("Skipping %s images that are already present at their destination", len(present))
+        return [pair for pair in mappings if pair not in present]
+
+    def batches(self, mappings: List[Tuple[str, str]]) -> List[List[Tuple[str, str]]]:
+        """Split mappings into batches of at most batch_size, keeping mappings of the same source together
+        (unless a single source has more than batch_size destinations)."""
+        by_src: Dict[str, List[Tuple[str, str]]] = {}
+        for src, dest in mappings:
+            by_src.setdefault(src, []).append((src, dest))
+        batches: List[List[Tuple[str, str]]] = []
+        current: List[Tuple[str, str]] = []
+        for group in by_src.values():
+            if current and len(current) + len(group) > self.batch_size:
+                batches.append(current)
+                current = []
+            current.extend(group)
+            while len(current) > self.batch_size:
+                batches.append(current[: self.batch_size])
+                current = current[self.batch_size :]
+        if current:
+            batches.append(current)
+        return batches
+
+    async def _mirror_batch(self, file_path: Path, batch: List[Tuple[str, str]], semaphore: asyncio.Semaphore):
+        # Save the default SRC=DEST input to a file for syncing by 'oc image mirror'
+        async with aiofiles.open(file_path, mode="w+", encoding="utf-8") as out_file:
+            for src_pullspec, dest_pullspec in batch:
+                await out_file.write(f"{src_pullspec}={dest_pullspec}\n")
+        if not self.apply:
+            return
+        cmd = [
+            'oc',
+            'image',
+            'mirror',
+            '--keep-manifest-list',
+            '--continue-on-error',
+            f'--filename={str(file_path)}',
+        ]
+        async with semaphore:
+            async for attempt in AsyncRetrying(
+                reraise=True,
+                stop=stop_after_attempt(self.attempts),
+                wait=self._retry_wait,
+            ):
+                with attempt:
+                    if attempt.retry_state.attempt_number > 1:
+                        self._logger.warning(
+                            "Retrying mirroring from %s (attempt %s)", file_path, attempt.retry_state.attempt_number
+                        )
+                    self._logger.info("Mirroring images from %s", str(file_path))
+                    await asyncio.wait_for(exectools.cmd_assert_async(cmd), timeout=7200)
+
+    async def execute(self, label: str = "payload"):
+        """Mirror everything that has been requested.
+        :param label: Included in the names of the mapping files
+        """
+        mappings = self.mappings
+        self._logger.info(
+            "%s mirroring requests deduplicated to %s (destination repository, content) pairs",
+            self.requested,
+            len(mappings),
+        )
+        if self.apply:
+            mappings = await self._filter_existing(mappings)
+        batches = self.batches(mappings)
+        semaphore = asyncio.Semaphore(self.concurrency)
+        await asyncio.gather(
+            *(
+                self._mirror_batch(self.output_path.joinpath(f"src_dest.{label}-{i}.txt"), batch, semaphore)
+                for i, batch in enumerate(batches)
+            )
+        )
@@ -2,10 +2,11 @@ import asyncio
 import json
 import os
 import tempfile
-from typing import Dict, List, Optional, Tuple
-from urllib import request
+import threading
+from typing import Dict, Iterable, List, Optional, Tuple, Union
 from urllib.error import URLError
 
+import aiohttp
 import koji
 from artcommonlib import exectools, logutil, rhcos
 from artcommonlib.arch_util import brew_suffix_for_arch, go_arch_for_brew_arch
@@ -15,9 +16,10 @@ from artcommonlib.release_util import isolate_el_version_in_release
 from artcommonlib.rhcos import get_build_id_from_rhcos_pullspec
 from tenacity import retry, stop_after_attempt, wait_fixed
 
-from doozerlib import brew, util
+from doozerlib import brew, rhcos_metadata, util
 from doozerlib.constants import ART_PROD_IMAGE_REPO
 from doozerlib.repodata import OutdatedRPMFinder, Repodata
+from doozerlib.rhcos_metadata import RHCOSBuildIndex
 from doozerlib.runtime import Runtime
 
 logger = logutil.get_logger(__name__)
@@ -88,28 +90,69 @@ class RHCOSBuildFinder:
         # this is hard to test with retries, so wrap testable method
         return self._latest_rhcos_build_id()
 
-    def _latest_rhcos_build_id(self) -> Optional[str]:
-        # returns the build id string or None (raises RHCOSNotFound for failure to retrieve)
-        # (may want to return "schema-version" also if this ever gets more complex)
-        url = f"{self.rhcos_release_url()}/builds.json"
+    def builds_url(self) -> str:
+        return f"{self.rhcos_release_url()}/builds.json"
+
+    def build_meta_url(self, build_id: str, arch: str = None, meta_type: str = "meta") -> str:
+        return f"{self.rhcos_release_url()}/{build_id}/{arch or self.brew_arch}/{meta_type}.json"
+
+    def _arches_building(self) -> List[str]:
+        # A multi stream builds every arch; a build is only usable once all of them are complete
+        if self.runtime.group_config.urls.rhcos_release_base["multi"]:
+            return list(self.runtime.group_config.arches)
+        return []
+
+    def get_build_index(self) -> RHCOSBuildIndex:
+        """
+        :return: The builds of the release stream (raises RHCOSNotFound for failure to retrieve)
+        """
+        url = self.builds_url()
         try:
-            with request.urlopen(url) as req:
-                data = json.loads(req.read().decode())
+            return RHCOSBuildIndex(rhcos_metadata.get_client().get_json_sync(url))
         except URLError as ex:
             raise RHCOSNotFound(f"Loading RHCOS build at {url} failed: {ex}")
 
-        if not data["builds"]:
-            return None
-
-        multi_url = self.runtime.group_config.urls.rhcos_release_base["multi"]
-        arches_building = []
-        if multi_url:
-            arches_building = self.runtime.group_config.arches
-        for b in data["builds"]:
+    def _latest_rhcos_build_id(self) -> Optional[str]:
+        # returns the build id string or None (raises RHCOSNotFound for failure to retrieve)
+        # (may want to return "schema-version" also if this ever gets more complex)
+        index = self.get_build_index()
+        arches_building = self._arches_building()
+        for b in index.builds_with_arches(arches_building):
             # Make sure all rhcos arch builds are complete
-            if multi_url and not self.is_multi_build_complete(b, arches_building):
+            if arches_building and not self.is_multi_build_complete(b, arches_building):
                 continue
             return b["id"]
+        return None
+
+    async def latest_rhcos_build_id_async(self) -> Optional[str]:
+        """
+        Like latest_rhcos_build_id, but fetches builds.json and the metadata of all arches of a multi build concurrently.
+        """
+        url = self.builds_url()
+        client = rhcos_metadata.get_client()
+        try:
+            index = RHCOSBuildIndex(await client.get_json(url))
+        except (aiohttp.ClientError, asyncio.TimeoutError) as ex:
+            raise RHCOSNotFound(f"Loading RHCOS build at {url} failed: {ex}")
+        arches_building = self._arches_building()
+        for b in index.builds_with_arches(arches_building):
+            if not arches_building:
+                return b["id"]
+            if len(b["arches"]) != len(arches_building):
+                continue
+            urls = [self.build_meta_url(b["id"], arch) for arch in arches_building]
+            metas = await client.get_json_many(urls, immutable=True)
+            for arch, meta_url, meta in zip(arches_building, urls, metas):
+                if not self.meta_has_required_attributes(meta):
+                    meta = await client.get_json(meta_url, revalidate=True)
+                if not self.meta_has_required_attributes(meta):
+                    logger.warning(
+                        f"Skipping {b['id']} - {arch} meta.json isn't complete - forget to run rhcos release job?"
+                    )
+                    break
+            else:
+                return b["id"]
+        return None
 
     def is_multi_build_complete(self, build_dict, arches_building):
         if len(build_dict["arches"]) != len(arches_building):
@@ -177,11 +220,14 @@ class RHCOSBuildFinder:
         """
         See public API rhcos_build_meta for details.
         """
-        if not arch:
-            arch = self.brew_arch
-        url = f"{self.rhcos_release_url()}/{build_id}/{arch}/{meta_type}.json"
-        with request.urlopen(url) as req:
-            return json.loads(req.read().decode())
+        url = self.build_meta_url(build_id, arch, meta_type)
+        client = rhcos_metadata.get_client()
+        # The metadata of a build doesn't change once published, except that the release job
+        # adds to meta.json after the build; don't trust a cached copy without those additions.
+        meta = client.get_json_sync(url, immutable=True)
+        if meta_type == "meta" and not self.meta_has_required_attributes(meta):
+            meta = client.get_json_sync(url, revalidate=True)
+        return meta
 
     def latest_container(self, container_conf: dict = None) -> Tuple[Optional[str], Optional[str]]:
         """
@@ -208,14 +254,92 @@ class RHCOSBuildFinder:
             )
 
 
+class RPMBuildResolver:
+    """
+    Resolves RPM NVRAs to the Brew builds that produced them. Lookups are shared by every RHCOS build
+    using the same resolver, so RPMs installed in several builds (e.g. one per arch) are only looked up once.
+    """
+
+    def __init__(self, runtime: Runtime):
+        self.runtime = runtime
+        self._rpm_for_nvra: Dict[str, Union[Dict, koji.GenericError]] = {}  # nvra -> rpm dict or "No such rpm" error
+        self._build_for_id: Dict[int, Dict] = {}  # build id -> package build dict
+        self._lock = threading.Lock()
+
+    def resolve(self, nvras: Iterable[str]):
+        """
+        Look up the RPMs and builds of NVRAs that have not been resolved yet, with one multicall for each.
+        """
+        with self._lock:
+            nvras = sorted(set(nvras) - self._rpm_for_nvra.keys())
+            if not nvras:
+                return
+            with self.runtime.pooled_koji_client_session() as koji_api:
+                self.runtime.logger.info("Getting %s rpm(s) from Brew...", len(nvras))
+                tasks = []
+                # strict=False means don't raise the first error it encounters
+                with koji_api.multicall(strict=False) as m:
+                    for nvra in nvras:
+                        tasks.append(m.getRPM(nvra, brew.KojiWrapperOpts(caching=True), strict=True))
+                rpm_for_nvra: Dict[str, Union[Dict, koji.GenericError]] = {}
+                for nvra, task in zip(nvras, tasks):
+                    try:
+                        rpm_for_nvra[nvra] = task.result
+                    except koji.GenericError as e:
+                        if "No such rpm" not in str(e):
+                            # e.g. a transient server error; nothing is remembered, so that a later lookup retries
+                            raise
+                        rpm_for_nvra[nvra] = e
+
+                build_ids = sorted(
+                    {rpm_def['build_id'] for rpm_def in rpm_for_nvra.values() if isinstance(rpm_def, dict)}
+                    - self._build_for_id.keys()
+                )
+                self.runtime.logger.info("Getting build infos for %s rpm build(s)...", len(build_ids))
+                tasks = []
+                with koji_api.multicall(strict=True) as m:
+                    for build_id in build_ids:
+                        tasks.append(m.getBuild(build_id, brew.KojiWrapperOpts(caching=True), strict=True))
+                # Only remember RPMs once their builds are known too, so a failed lookup can be retried
+                self._build_for_id.update((build_id, task.result) for build_id, task in zip(build_ids, tasks))
+                self._rpm_for_nvra.update(rpm_for_nvra)
+
+    def get_package_builds(self, nvras: List[str]) -> Dict[str, Dict]:
+        """
+        :return: Maps package_name -> brew build dict for the packages the NVRAs were built from.
+        """
+        self.resolve(nvras)
+        aggregate: Dict[str, Dict] = dict()
+        for nvra in nvras:
+            rpm_def = self._rpm_for_nvra[nvra]
+            if isinstance(rpm_def, koji.GenericError):
+                if self.runtime.group_config.rhcos.allow_missing_brew_rpms and "No such rpm" in str(rpm_def):
+                    self.runtime.logger.warning("Failed to find RPM %s in Brew: %s", nvra, rpm_def)
+                    continue  # if conigured, just skip RPMs brew doesn't know about
+                raise Exception(f"Failed to find RPM {nvra} in brew: {rpm_def}")
+            package_build = self._build_for_id[rpm_def['build_id']]
+            aggregate[package_build['package_name']] = package_build
+        return aggregate
+
+
 class RHCOSBuildInspector:
     def __init__(
-        self, runtime: Runtime, pullspec_for_tag: Dict[str, str], brew_arch: str, build_id: Optional[str] = None
+        self,
+        runtime: Runtime,
+        pullspec_for_tag: Dict[str, str],
+        brew_arch: str,
+        build_id: Optional[str] = None,
+        rpm_build_resolver: Optional[RPMBuildResolver] = None,
     ):
+        """
+        :param rpm_build_resolver: Resolver to look up the builds of installed RPMs with. Share one between
+            inspectors to avoid looking up the same RPMs more than once.
+        """
         self.runtime = runtime
         self.brew_arch = brew_arch
         self.pullspec_for_tag = pullspec_for_tag
         self.build_id = build_id
+        self.rpm_build_resolver = rpm_build_resolver or RPMBuildResolver(runtime)
 
         # Remember the pullspec(s) provided in case it does not match what is in the releases.yaml.
         # Because of an incident where we needed to repush RHCOS and get a new SHA for 4.10 GA,
@@ -337,36 +461,7 @@ class RHCOSBuildInspector:
                  RPMs used by this RHCOS build.
                  Maps package_name -> brew build dict for package.
         """
-
-        aggregate: Dict[str, Dict] = dict()
-        rpms = self.get_rpm_nvras()
-        with self.runtime.pooled_koji_client_session() as koji_api:
-            self.runtime.logger.info("Getting %s rpm(s) from Brew...", len(rpms))
-            tasks = []
-            with koji_api.multicall(strict=False) as m:  # strict=False means don't raise the first error it encounters
-                for nvra in rpms:
-                    tasks.append(m.getRPM(nvra, brew.KojiWrapperOpts(caching=True), strict=True))
-            rpm_defs = []
-            for task in tasks:
-                try:
-                    rpm_defs.append(task.result)
-                except koji.GenericError as e:
-                    nvra = task.args[0]
-                    if self.runtime.group_config.rhcos.allow_missing_brew_rpms and "No such rpm" in str(e):
-                        self.runtime.logger.warning("Failed to find RPM %s in Brew", nvra, exc_info=True)
-                        continue  # if conigured, just skip RPMs brew doesn't know about
-                    raise Exception(f"Failed to find RPM {nvra} in brew: {e}")
-
-            self.runtime.logger.info("Getting build infos for %s rpm(s)...", len(rpm_defs))
-            tasks = []
-            with koji_api.multicall(strict=True) as m:
-                for rpm_def in rpm_defs:
-                    tasks.append(m.getBuild(rpm_def['build_id'], brew.KojiWrapperOpts(caching=True), strict=True))
-            for task in tasks:
-                package_build = task.result
-                package_name = package_build['package_name']
-                aggregate[package_name] = package_build
-        return aggregate
+        return self.rpm_build_resolver.get_package_builds(self.get_rpm_nvras())
 
     def get_primary_container_conf(self):
         """
@@ -0,0 +1,214 @@
+"""
+A client for the JSON documents of the RHCOS release browser (builds.json, and meta.json / commitmeta.json
+of each build), shared by every RHCOSBuildFinder in the process and optionally backed by an on-disk cache.
+
+builds.json changes whenever RHCOS builds, so cached copies are revalidated with conditional requests
+(If-None-Match / If-Modified-Since) once they are older than the client's max_age, 60 seconds by default.
+The metadata of a build does not change once it is published, so it is only ever fetched once per cache.
+"""
+
+import asyncio
+import hashlib
+import json
+import threading
+import time
+from pathlib import Path
+from typing import Any, Dict, Iterable, List, NamedTuple, Optional, Union
+from urllib import request
+from urllib.error import HTTPError
+
+import aiohttp
+from artcommonlib import file_cache, logutil
+
+LOGGER = logutil.get_logger(__name__)
+
+
+class RHCOSBuildIndex:
+    """The builds listed in an RHCOS builds.json, indexed by id and by arch."""
+
+    def __init__(self, data: Dict[str, Any]):
+        # builds.json lists the newest build first
+        self.builds: List[Dict[str, Any]] = list(data.get("builds") or [])
+        self._arches = [frozenset(build.get("arches") or []) for build in self.builds]
+        self._position = {build["id"]: position for position, build in enumerate(self.builds)}
+        self._positions_with_arch: Dict[str, List[int]] = {}
+        for position, arches in enumerate(self._arches):
+            for arch in arches:
+                self._positions_with_arch.setdefault(arch, []).append(position)
+
+    def __len__(self):
+        return len(self.builds)
+
+    def __contains__(self, build_id: str):
+        return build_id in self._position
+
+    def arches(self, build_id: str) -> frozenset:
+        """:return: The arches a build was built for"""
+        return self._arches[self._position[build_id]]
+
+    def builds_with_arches(self, arches: Iterable[str]) -> List[Dict[str, Any]]:
+        """:return: The builds (newest first) that were built for all of the given arches"""
+        arches = frozenset(arches)
+        if not arches:
+            return list(self.builds)
+        # Only look at the builds of the least common arch
+        positions = min((self._positions_with_arch.get(arch, []) for arch in arches), key=len)
+        return [self.builds[position] for position in positions if arches <= self._arches[position]]
+
+    def latest(self, arches: Iterable[str] = ()) -> Optional[str]:
+        """:return: The id of the newest build that was built for all of the given arches, or None"""
+        builds = self.builds_with_arches(arches)
+        return builds[0]["id"] if builds else None
+
+
+class _CacheEntry(NamedTuple):
+    body: Any
+    etag: Optional[str]
+    last_modified: Optional[str]
+    fetched: float  # epoch seconds of the last time the server confirmed the body
+
+
+class RHCOSMetadataClient:
+    """Fetches JSON documents from the RHCOS release browser, caching them in memory and optionally on disk."""
+
+    def __init__(self, cache_dir: Optional[Union[str, Path]] = None, max_age: float = 60):
+        """
+        :param cache_dir: Directory to cache documents in across processes; only cached in memory if None
+        :param max_age: Seconds a document that may change is used without revalidating it
+        """
+        self._disk = file_cache.JsonFileCache(cache_dir)
+        self.max_age = max_age
+        self._entries: Dict[str, _CacheEntry] = {}
+        self._lock = threading.Lock()
+
+    @staticmethod
+    def _key(url: str) -> str:
+        return hashlib.sha256(url.encode()).hexdigest()
+
+    def _load(self, url: str) -> Optional[_CacheEntry]:
+        with self._lock:
+            entry = self._entries.get(url)
+        if entry:
+            return entry
+        data = self._disk.get(self._key(url))
+        if not isinstance(data, dict) or data.get("url") != url:
+            return None
+        # Entries loaded from disk are always revalidated before they are used for documents that may change
+        entry = _CacheEntry(data["body"], data.get("etag"), data.get("last_modified"), 0)
+        with self._lock:
+            self._entries[url] = entry
+        return entry
+
+    def _store(self, url: str, entry: _CacheEntry, write: bool = True) -> Any:
+        with self._lock:
+            self._entries[url] = entry
+        if write:
+            self._disk.put(
+                self._key(url),
+                {"url": url, "etag": entry.etag, "last_modified": entry.last_modified, "body": entry.body},
+            )
+        return entry.body
+
+    def _is_usable(self, entry: Optional[_CacheEntry], immutable: bool, revalidate: bool) -> bool:
+        """Whether a cached document can be used without asking the server."""
+        return bool(entry) and not revalidate and (immutable or time.time() - entry.fetched < self.max_age)
+
+    @staticmethod
+    def _conditional_headers(entry: Optional[_CacheEntry]) -> Dict[str, str]:
+        headers = {}
+        if entry and entry.etag:
+            headers["If-None-Match"] = entry.etag
+        if entry and entry.last_modified:
+            headers["If-Modified-Since"] = entry.last_modified
+        return headers
+
+    def _not_modified(self, url: str, entry: _CacheEntry) -> Any:
+        LOGGER.debug("%s was not modified", url)
+        # Nothing changed on disk, so only remember when the document was revalidated
+        return self._store(url, entry._replace(fetched=time.time()), write=False)
+
+    def _modified(self, url: str, body: bytes, headers) -> Any:
+        return self._store(
+            url, _CacheEntry(json.loads(body), headers.get("ETag"), headers.get("Last-Modified"), time.time())
+        )
+
+    def get_json_sync(self, url: str, immutable: bool = False, revalidate: bool = False) -> Any:
+        """
+        Get a JSON document, from the cache if possible.
+        :param url: The URL of the document
+        :param immutable: Whether the document never changes once it exists, so a cached copy is always used
+        :param revalidate: Check a cached copy with the server even if it would otherwise be used
+        :return: The parsed document
+        :raises urllib.error.URLError: If the document couldn't be fetched
+        """
+        entry = self._load(url)
+        if self._is_usable(entry, immutable, revalidate):
+            return entry.body
+        headers = self._conditional_headers(entry)
+        try:
+            with request.urlopen(request.Request(url, headers=headers) if headers else url) as resp:
+                return self._modified(url, resp.read(), resp.headers)
+        except HTTPError as e:
+            if e.code == 304 and entry:
+                return self._not_modified(url, entry)
+            raise
+
+    async def get_json(
+        self,
+        url: str,
+        immutable: bool = False,
+        revalidate: bool = False,
+        session: Optional[aiohttp.ClientSession] = None,
+    ) -> Any:
+        """
+        Get a JSON document asynchronously, from the cache if possible. See get_json_sync for the parameters.
+        :param session: The session to send requests with; a new one is used if None
+        :raises aiohttp.ClientError: If the document couldn't be fetched
+        """
+        entry = self._load(url)
+        if self._is_usable(entry, immutable, revalidate):
+            return entry.body
+        if not session:
+            async with self._session() as session:
+                return await self.get_json(url, immutable, revalidate, session)
+        async with session.get(url, headers=self._conditional_headers(entry)) as resp:
+            if resp.status == 304 and entry:
+                return self._not_modified(url, entry)
+            resp.raise_for_status()
+            return self._modified(url, await resp.read(), resp.headers)
+
+    async def get_json_many(
+        self, urls: Iterable[str], immutable: bool = False, return_exceptions: bool = False
+    ) -> List[Any]:
+        """
+        Get several JSON documents concurrently over one session.
+        :return: The parsed documents in the order of urls; or the errors fetching them if return_exceptions
+        """
+        async with self._session() as session:
+            return await asyncio.gather(
+                *(self.get_json(url, immutable=immutable, session=session) for url in urls),
+                return_exceptions=return_exceptions,
+            )
+
+    @staticmethod
+    def _session() -> aiohttp.ClientSession:
+        return aiohttp.ClientSession(
+            connector=aiohttp.TCPConnector(limit=16), timeout=aiohttp.ClientTimeout(total=60 * 2)
+        )
+
+
+_client: Optional[RHCOSMetadataClient] = None
+
+
+def configure(cache_dir: Optional[Union[str, Path]] = None, max_age: float = 60) -> RHCOSMetadataClient:
+    """Replace the shared client, e.g. to cache documents in cache_dir."""
+    global _client
+    _client = RHCOSMetadataClient(cache_dir, max_age)
+    return _client
+
+
+def get_client() -> RHCOSMetadataClient:
+    """:return: The client shared by everything in this process, caching in the cache root unless configured"""
+    if _client is None:
+        return configure(file_cache.cache_dir("rhcos-meta"))
+    return _client
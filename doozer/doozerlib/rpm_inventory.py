@@ -0,0 +1,111 @@
+import sys
+from functools import lru_cache
+from typing import TYPE_CHECKING, Dict, Iterable, List, Optional, Set, Tuple
+
+from artcommonlib.rpm_utils import parse_nvr
+
+if TYPE_CHECKING:
+    from doozerlib.rhcos import RHCOSBuildInspector
+
+
+@lru_cache(maxsize=None)
+def _split_nvr(nvr: str) -> Tuple[str, str, str]:
+    parsed = parse_nvr(nvr)
+    return sys.intern(parsed["name"]), parsed["version"], parsed["release"]
+
+
+def rpm_name(nvr: str) -> str:
+    """
+    :return: The name of an RPM or package NVR. Each distinct NVR is only parsed once per process.
+    """
+    return _split_nvr(nvr)[0]
+
+
+class RPMInventory:
+    """
+    An index of the RPMs installed in a set of sources (RHCOS builds, payload images, ...), built once
+    and shared by the consistency checks that compare them.
+
+    Each RPM is indexed both by name (name -> nvr -> [source, ...]) and by source (source -> name -> (version, release)),
+    so that cross-source checks become lookups and set operations over these indices instead of walking
+    and re-parsing the NVR lists of every build.
+    """
+
+    def __init__(self):
+        # name -> nvr -> sources that install it, in the order they were added
+        self._by_name: Dict[str, Dict[str, List[str]]] = {}
+        # source -> name -> (version, release)
+        self._by_source: Dict[str, Dict[str, Tuple[str, str]]] = {}
+
+    def add_rpm(self, source: str, name: str, version: str, release: str):
+        """Record that source installs the RPM name-version-release."""
+        name = sys.intern(name)
+        rpms = self._by_source.setdefault(source, {})
+        if rpms.get(name) == (version, release):
+            return
+        rpms[name] = (version, release)
+        sources = self._by_name.setdefault(name, {}).setdefault(f"{name}-{version}-{release}", [])
+        if source not in sources:
+            sources.append(source)
+
+    def add_nvrs(self, source: str, nvrs: Iterable[str]):
+        """Record that source installs the given RPM NVRs."""
+        for nvr in nvrs:
+            self.add_rpm(source, *_split_nvr(nvr))
+
+    def add_rhcos_build(self, rhcos_build: "RHCOSBuildInspector", source: Optional[str] = None) -> str:
+        """
+        Record the RPMs installed in an RHCOS build, as listed in its OS metadata.
+        :param source: How to refer to the build; defaults to its build id and brew arch, since the inventory
+            may hold several RHCOS builds of an arch (e.g. for different privacy modes)
+        :return: The source name the RPMs were recorded under
+        """
+        source = source or f"rhcos:{rhcos_build.build_id}:{rhcos_build.brew_arch}"
+        if source not in self._by_source:
+            self._by_source[source] = {}
+            # Example entry ['NetworkManager', '1', '1.14.0', '14.el8', 'x86_64' ]; no parsing required
+            for name, _, version, release, _ in rhcos_build.get_os_metadata_rpm_list():
+                self.add_rpm(source, name, version, release)
+        return source
+
+    @property
+    def sources(self) -> List[str]:
+        return list(self._by_source.keys())
+
+    def names(self, source: str) -> Set[str]:
+        """:return: The names of the RPMs installed in source"""
+        return set(self._by_source.get(source, {}))
+
+    def get(self, source: str, name: str) -> Optional[Tuple[str, str]]:
+        """:return: (version, release) of RPM name installed in source, or None if it is not installed"""
+        return self._by_source.get(source, {}).get(name)
+
+    def get_nvr(self, source: str, name: str) -> Optional[str]:
+        vr = self.get(source, name)
+        return f"{name}-{vr[0]}-{vr[1]}" if vr else None
+
+    def version_releases(self, source: str) -> Dict[str, str]:
+        """:return: Dict[rpm_name] -> "version-release" for the RPMs installed in source"""
+        return {name: f"{version}-{release}" for name, (version, release) in self._by_source.get(source, {}).items()}
+
+    def find_inconsistencies(self, sources: Optional[Iterable[str]] = None) -> Dict[str, Dict[str, List[str]]]:
+        """
+        Find RPMs installed at different NVRs in different sources.
+        :param sources: The sources to compare; defaults to all of them
+        :return: Dict[rpm_name] -> Dict[nvr] -> [source, ...] for every RPM name with more than one NVR
+        """
+        selected = None if sources is None else set(sources)
+        inconsistencies: Dict[str, Dict[str, List[str]]] = {}
+        for name, nvrs in self._by_name.items():
+            if len(nvrs) < 2:
+                continue  # cheap exit for the common case of one NVR everywhere
+            if selected is not None:
+                nvrs = {
+                    nvr: [s for s in users if s in selected]
+                    for nvr, users in nvrs.items()
+                    if selected.intersection(users)
+                }
+                if len(nvrs) < 2:
+                    continue
+            inconsistencies[name] = {nvr: list(users) for nvr, users in nvrs.items()}
+        return inconsistencies
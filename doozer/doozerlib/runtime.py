@@ -16,7 +16,7 @@ from typing import Dict, List, Optional, Tuple, Union
 
 import click
 import yaml
-from artcommonlib import exectools, gitdata
+from artcommonlib import exectools, file_cache, gitdata, image_info_cache
 from artcommonlib.assembly import (
     AssemblyTypes,
     assembly_basis_event,
@@ -31,9 +31,10 @@ from artcommonlib.runtime import GroupRuntime
 from artcommonlib.util import deep_merge, isolate_el_version_in_brew_tag
 from jira import JIRA
 
-from doozerlib import brew, dblib, state, util
+from doozerlib import brew, dblib, rhcos_metadata, state, util
 from doozerlib.brew import brew_event_from_datetime
 from doozerlib.build_status_detector import BuildStatusDetector
+from doozerlib.distgit_engine import DistGitEngine
 from doozerlib.exceptions import DoozerFatalError
 from doozerlib.image import ImageMetadata
 from doozerlib.record_logger import RecordLogger
@@ -418,6 +419,11 @@ class Runtime(GroupRuntime):
 
         if self.cache_dir:
             self.cache_dir = os.path.abspath(self.cache_dir)
+            if not os.environ.get(file_cache.CACHE_DIR_ENV):
+                # Share cached metadata with other doozer invocations using the same cache dir
+                file_cache.configure(self.cache_dir)
+                image_info_cache.configure(file_cache.cache_dir('image-info'))
+                rhcos_metadata.configure(file_cache.cache_dir('rhcos-meta'))
 
         # get_releases_config also inits self.releases_config
         self.assembly_type = assembly_type(self.get_releases_config(), self.assembly)
@@ -1164,19 +1170,41 @@ class Runtime(GroupRuntime):
         return re.match(r"^v\d+((\.\d+)+)?$", version) is not None
 
     def clone_distgits(self, n_threads=None):
+        """
+        Clone the dist-git repositories of all loaded metadata.
+        Async callers should await clone_distgits_async() instead.
+        :param n_threads: Maximum number of concurrent clones. Defaults to global_opts['distgit_threads'].
+        """
+        return exectools.run_coroutine(self.clone_distgits_async(n_threads))
+
+    async def clone_distgits_async(self, n_threads=None):
+        """
+        Clone the dist-git repositories of all loaded metadata.
+        :param n_threads: Maximum number of concurrent clones. Defaults to global_opts['distgit_threads'].
+        """
         with exectools.timer(self._logger.info, 'Full runtime clone'):
-            if n_threads is None:
-                n_threads = self.global_opts['distgit_threads']
-            return exectools.parallel_exec(lambda m, _: m.distgit_repo(), self.all_metas(), n_threads=n_threads).get()
+            engine = DistGitEngine(self, concurrency=n_threads)
+            return await engine.clone_all(self.all_metas())
 
     def push_distgits(self, n_threads=None):
+        """
+        Push the dist-git repositories of all loaded metadata.
+        Async callers should await push_distgits_async() instead.
+        :param n_threads: Maximum number of concurrent pushes. Defaults to global_opts['distgit_threads'].
+        :return: A list of (meta, True) or (meta, error_repr) tuples
+        """
+        return exectools.run_coroutine(self.push_distgits_async(n_threads))
+
+    async def push_distgits_async(self, n_threads=None):
+        """
+        Push the dist-git repositories of all loaded metadata.
+        :param n_threads: Maximum number of concurrent pushes. Defaults to global_opts['distgit_threads'].
+        :return: A list of (meta, True) or (meta, error_repr) tuples
+        """
         self.assert_mutation_is_permitted()
 
-        if n_threads is None:
-            n_threads = self.global_opts['distgit_threads']
-        return exectools.parallel_exec(
-            lambda m, _: m.distgit_repo().push(), self.all_metas(), n_threads=n_threads
-        ).get()
+        engine = DistGitEngine(self, concurrency=n_threads)
+        return await engine.push_all(self.all_metas())
 
     def get_el_targeted_default_branch(self, el_target: Optional[Union[str, int]] = None):
         if not self.branch:
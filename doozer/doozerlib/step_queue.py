@@ -0,0 +1,82 @@
+import asyncio
+import json
+import logging
+import time
+from pathlib import Path
+from typing import Any, Awaitable, Callable, Dict, List, NamedTuple, Optional, TypeVar
+
+LOGGER = logging.getLogger(__name__)
+
+T = TypeVar("T")
+
+
+class StepTiming(NamedTuple):
+    kind: str  # e.g. "release-new"
+    name: str  # what the step worked on, e.g. an arch or a component
+    started: float  # epoch seconds
+    seconds: float
+    status: str  # "succeeded" or "failed"
+
+
+class StepQueue:
+    """Runs heterogeneous steps of a pipeline with a separate concurrency limit for each kind of step,
+    recording how long every step took.
+
+    Steps of the same kind wait for a free slot of that kind only, so a slow kind of step (e.g. `oc adm release new`)
+    cannot starve a fast one (e.g. pushing manifest lists) or be overwhelmed by its fan-out.
+    """
+
+    def __init__(self, limits: Dict[str, int], default_limit: int = 8, logger: Optional[logging.Logger] = None):
+        """
+        :param limits: Maximum number of concurrent steps per kind
+        :param default_limit: Maximum number of concurrent steps of kinds not in limits
+        """
+        self._limits = dict(limits)
+        self._default_limit = default_limit
+        self._semaphores: Dict[str, asyncio.Semaphore] = {}
+        self._logger = logger or LOGGER
+        self.timings: List[StepTiming] = []
+
+    def _semaphore(self, kind: str) -> asyncio.Semaphore:
+        if kind not in self._semaphores:
+            self._semaphores[kind] = asyncio.Semaphore(max(1, self._limits.get(kind, self._default_limit)))
+        return self._semaphores[kind]
+
+    def record(self, kind: str, name: str, started: float, status: str):
+        timing = StepTiming(kind, name, started, time.time() - started, status)
+        self.timings.append(timing)
+        self._logger.info("step=%s name=%s status=%s seconds=%.1f", kind, name, status, timing.seconds)
+
+    async def run(self, kind: str, name: str, func: Callable[[], Awaitable[T]]) -> T:
+        """Run a step once a slot for its kind is free.
+        :param kind: The kind of step, which determines its concurrency limit
+        :param name: What the step works on; only used to report its timing
+        :param func: Coroutine function that performs the step
+        :return: The result of func
+        """
+        async with self._semaphore(kind):
+            started = time.time()
+            try:
+                result = await func()
+            except BaseException:
+                self.record(kind, name, started, "failed")
+                raise
+            self.record(kind, name, started, "succeeded")
+            return result
+
+    def summary(self) -> Dict[str, Dict[str, Any]]:
+        """:return: Dict of step kind -> counts and durations of its steps"""
+        summary: Dict[str, Dict[str, Any]] = {}
+        for timing in self.timings:
+            entry = summary.setdefault(timing.kind, {"count": 0, "failed": 0, "seconds": 0.0, "max_seconds": 0.0})
+            entry["count"] += 1
+            if timing.status == "failed":
+                entry["failed"] += 1
+            entry["seconds"] += timing.seconds
+            entry["max_seconds"] = max(entry["max_seconds"], timing.seconds)
+        return summary
+
+    def write_timings(self, path: Path):
+        """Write all step timings and their summary to a JSON file."""
+        with path.open("w") as f:
+            json.dump({"summary": self.summary(), "steps": [timing._asdict() for timing in self.timings]}, f, indent=2)
@@ -18,7 +18,7 @@ from typing import Dict, List, Optional, Union
 import artcommonlib
 import semver
 import yaml
-from artcommonlib import exectools
+from artcommonlib import exectools, image_info_cache
 from artcommonlib.arch_util import GO_ARCHES, brew_arch_for_go_arch, go_arch_for_brew_arch
 from artcommonlib.assembly import AssemblyTypes
 from artcommonlib.format_util import red_print
@@ -575,6 +575,7 @@ def oc_image_info(
     Returns a Dict of the parsed JSON output of `oc image info` for the specified
     pullspec. Use oc_image_info__caching if you do not believe the image will change
     during the course of doozer's execution.
+    The output for digest-pinned pullspecs is kept in the on-disk image info cache, if one is configured.
 
     :param pullspec: e.g. registry-proxy.engineering.redhat.com/rh-osbs/openshift-ose-vsphere-problem-detector-rhel9:v4.19.0-202501230108.p0.gcbd8539.assembly.stream.el9
     :param options: list of extra args to use with oc, e.g. '--show-multiarch', '--filter-by-os=linux/amd64'
@@ -591,15 +592,23 @@ def oc_image_info(
         out, _ = exectools.cmd_assert(cmd, retries=3)
         return json.loads(out)
 
+    cache = image_info_cache.get_cache()
+    info = cache.get("image-info", pullspec, options)
+    if info is not None:
+        return info
+
     # If neither a username nor a password were provided, assume an auth file is being used or no auth at all
     if not registry_username and not registry_password:
-        return run_oc(auth_file=registry_config)
+        info = run_oc(auth_file=registry_config)
+    else:
+        # Store the basic auth info in a temporary temp file to be used with --registry-config
+        with tempfile.NamedTemporaryFile(mode='w', prefix="_doozer_") as registry_config_file:
+            registry_config_file.write(get_registry_basic_auth(pullspec, registry_password, registry_username))
+            registry_config_file.flush()
+            info = run_oc(auth_file=registry_config_file.name)
 
-    # Store the basic auth info in a temporary temp file to be used with --registry-config
-    with tempfile.NamedTemporaryFile(mode='w', prefix="_doozer_") as registry_config_file:
-        registry_config_file.write(get_registry_basic_auth(pullspec, registry_password, registry_username))
-        registry_config_file.flush()
-        return run_oc(auth_file=registry_config_file.name)
+    cache.put("image-info", pullspec, options, info)
+    return info
 
 
 def oc_image_info_for_arch(pullspec: str, go_arch: str = 'amd64') -> Dict:
@@ -668,7 +677,7 @@ async def oc_image_info_async(
     This function will authenticate with the registry using the provided registry_config or username and password.
 
     Use oc_image_info_async__caching if you think the image won't change during the course of doozer
-    execution.
+    execution. The output for digest-pinned pullspecs is kept in the on-disk image info cache, if one is configured.
 
     :param pullspec: The image pullspec to query.
     :param registry_config: The path to the registry config file.
@@ -687,15 +696,23 @@ async def oc_image_info_async(
         _, out, _ = await exectools.cmd_gather_async(cmd)
         return json.loads(out)
 
+    cache = image_info_cache.get_cache()
+    info = cache.get("image-info", pullspec, options)
+    if info is not None:
+        return info
+
     # If neither a username nor a password were provided, assume an auth file is being used or no auth at all
     if not registry_username and not registry_password:
-        return await run_oc(auth_file=registry_config)
-
-    # Store the basic auth info in a temporary temp file to be used with --registry-config
-    with tempfile.NamedTemporaryFile(mode='w', prefix="_doozer_") as registry_config_file:
-        registry_config_file.write(get_registry_basic_auth(pullspec, registry_password, registry_username))
-        registry_config_file.flush()
-        return await run_oc(auth_file=registry_config_file.name)
+        info = await run_oc(auth_file=registry_config)
+    else:
+        # Store the basic auth info in a temporary temp file to be used with --registry-config
+        with tempfile.NamedTemporaryFile(mode='w', prefix="_doozer_") as registry_config_file:
+            registry_config_file.write(get_registry_basic_auth(pullspec, registry_password, registry_username))
+            registry_config_file.flush()
+            info = await run_oc(auth_file=registry_config_file.name)
+
+    cache.put("image-info", pullspec, options, info)
+    return info
 
 
 async def oc_image_info_for_arch_async(
@@ -0,0 +1,106 @@
+import asyncio
+from collections import OrderedDict
+from unittest import IsolatedAsyncioTestCase
+from unittest.mock import MagicMock
+
+from doozerlib.backend.konflux_build_scheduler import KonfluxBuildScheduler, ParentBuildFailedError
+from doozerlib.backend.konflux_image_builder import KonfluxImageBuilder
+
+
+def _metas(parent_map):
+    """Create fake image metas from a dict of distgit_key -> list of parent distgit_keys."""
+    metas = {}
+    for key in parent_map:
+        meta = MagicMock(distgit_key=key, build_status=False)
+        metas[key] = meta
+    for key, parents in parent_map.items():
+        metas[key].get_parent_members.return_value = OrderedDict((p, metas.get(p)) for p in parents)
+    return list(metas.values())
+
+
+class TestKonfluxBuildScheduler(IsolatedAsyncioTestCase):
+    def test_critical_path_priorities(self):
+        metas = _metas({"base": [], "a": ["base"], "b": ["a"], "lonely": [], "c": ["base"]})
+        _, children = KonfluxBuildScheduler.dependency_graph(metas)
+        priorities = KonfluxBuildScheduler.critical_path_priorities(children)
+        self.assertEqual(priorities["base"], (-2, -3))
+        self.assertEqual(priorities["a"], (-1, -1))
+        self.assertEqual(priorities["b"], (0, 0))
+        self.assertEqual(priorities["lonely"], (0, 0))
+
+    async def test_run_respects_dependencies_and_limit(self):
+        metas = _metas({"lonely": [], "base": [], "a": ["base"], "b": ["a", "base"], "c": ["base", "missing"]})
+        started = []
+        finished = set()
+        running = 0
+        max_running = 0
+
+        async def _build(meta):
+            nonlocal running, max_running
+            for parent in meta.get_parent_members().values():
+                if parent is not None:
+                    self.assertIn(parent.distgit_key, finished)
+            started.append(meta.distgit_key)
+            running += 1
+            max_running = max(max_running, running)
+            await asyncio.sleep(0.01)
+            running -= 1
+            finished.add(meta.distgit_key)
+            return meta.distgit_key
+
+        scheduler = KonfluxBuildScheduler(build=_build, max_concurrency=2)
+        results = await scheduler.run(metas)
+        self.assertEqual(results, ["lonely", "base", "a", "b", "c"])
+        self.assertLessEqual(max_running, 2)
+        # "base" is on the critical path so it goes before "lonely" even though "lonely" comes first
+        self.assertEqual(started[0], "base")
+
+    async def test_run_skips_descendants_of_failed_parent(self):
+        metas = _metas({"base": [], "a": ["base"], "b": ["a"], "other": []})
+        skipped = []
+
+        async def _build(meta):
+            if meta.distgit_key == "base":
+                raise IOError("build failed")
+            return meta.distgit_key
+
+        scheduler = KonfluxBuildScheduler(
+            build=_build, max_concurrency=10, on_skip=lambda meta, error: skipped.append(meta.distgit_key)
+        )
+        results = await scheduler.run(metas)
+        self.assertIsInstance(results[0], IOError)
+        self.assertIsInstance(results[1], ParentBuildFailedError)
+        self.assertEqual(results[1].failed_parents, ["base"])
+        self.assertIsInstance(results[2], ParentBuildFailedError)
+        self.assertEqual(results[2].failed_parents, ["a"])
+        self.assertEqual(results[3], "other")
+        self.assertEqual(sorted(skipped), ["a", "b"])
+        metas[1].build_event.set.assert_called_once()
+
+    async def test_run_cancels_builds(self):
+        metas = _metas({"a": [], "b": []})
+        cancelled = []
+
+        async def _build(meta):
+            try:
+                await asyncio.sleep(60)
+            except asyncio.CancelledError:
+                cancelled.append(meta.distgit_key)
+                raise
+
+        scheduler = KonfluxBuildScheduler(build=_build, max_concurrency=10)
+        task = asyncio.create_task(scheduler.run(metas))
+        await asyncio.sleep(0.01)
+        task.cancel()
+        with self.assertRaises(asyncio.CancelledError):
+            await task
+        self.assertEqual(sorted(cancelled), ["a", "b"])
+
+    def test_failed_parent_members(self):
+        metas = _metas({"built": [], "failed": [], "unbuilt": [], "child": ["built", "failed", "unbuilt", "missing"]})
+        metas[0].build_status = True
+        metas[0].build_event.is_set.return_value = True
+        metas[1].build_event.is_set.return_value = True
+        metas[2].build_event.is_set.return_value = False
+        # parents are checked once instead of being polled until they are built
+        self.assertEqual(KonfluxImageBuilder._failed_parent_members(metas[3]), ["failed", "unbuilt"])
@@ -188,6 +188,29 @@ class TestKonfluxFbcImporter(unittest.IsolatedAsyncioTestCase):
         )
         mock_render_index_image.assert_called_once_with(index_image)
 
+    async def test_get_catalog_blobs_from_render_cache(self):
+        self.importer.render_cache = MagicMock()
+        self.importer.render_cache.get_package_blobs = AsyncMock(
+            return_value={"test-package": [{"schema": "olm.package", "name": "test-package"}]}
+        )
+        actual = await self.importer._get_catalog_blobs_from_index_image("test-index-image", "test-package")
+        self.assertEqual(actual, [{"schema": "olm.package", "name": "test-package"}])
+        self.importer.render_cache.get_package_blobs.assert_awaited_once_with(
+            "test-index-image", {"test-package"}, auth=self.importer.auth
+        )
+
+    @patch("doozerlib.backend.konflux_fbc.KonfluxFbcImporter._render_index_image")
+    async def test_get_catalog_blobs_falls_back_to_render_index_image(self, mock_render_index_image: AsyncMock):
+        self.importer.render_cache = MagicMock()
+        self.importer.render_cache.get_package_blobs = AsyncMock(return_value=None)
+        mock_render_index_image.return_value = [
+            {"schema": "olm.package", "name": "test-package"},
+            {"schema": "olm.package", "name": "other-package"},
+        ]
+        actual = await self.importer._get_catalog_blobs_from_index_image("test-index-image", "test-package")
+        self.assertEqual(actual, [{"schema": "olm.package", "name": "test-package"}])
+        mock_render_index_image.assert_awaited_once_with("test-index-image")
+
     @patch("pathlib.Path.open")
     @patch("pathlib.Path.glob")
     async def test_get_package_name(self, mock_glob, mock_open):
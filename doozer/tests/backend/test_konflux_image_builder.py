@@ -0,0 +1,58 @@
+import tempfile
+from pathlib import Path
+from unittest import IsolatedAsyncioTestCase
+from unittest.mock import AsyncMock, MagicMock, patch
+
+from doozerlib.backend.konflux_image_builder import KonfluxImageBuilder, KonfluxImageBuilderConfig
+
+
+class TestKonfluxImageBuilderBuild(IsolatedAsyncioTestCase):
+    def setUp(self):
+        self._tmpdir = tempfile.TemporaryDirectory()
+        self.addCleanup(self._tmpdir.cleanup)
+        config = KonfluxImageBuilderConfig(
+            base_dir=Path(self._tmpdir.name),
+            group_name="openshift-4.17",
+            namespace="test-namespace",
+            plr_template="template",
+            image_repo="quay.io/foo/bar",
+        )
+        with patch("doozerlib.backend.konflux_image_builder.KonfluxClient.from_kubeconfig"):
+            self.builder = KonfluxImageBuilder(config=config)
+        self.metadata = MagicMock(distgit_key="foo", qualified_key="containers/foo", rebase_reused=False)
+        Path(self._tmpdir.name, "containers/foo").mkdir(parents=True)
+        self.existing_build = MagicMock(image_pullspec="quay.io/foo/bar:foo-v4.17.0-1", rebase_commitish="cafe")
+        self.metadata.runtime.konflux_db.get_build_records_by_nvrs = AsyncMock(return_value=[self.existing_build])
+        self.build_repo = MagicMock(commit_hash="cafe")
+        patcher = patch(
+            "doozerlib.backend.konflux_image_builder.BuildRepo.from_local_dir",
+            AsyncMock(return_value=self.build_repo),
+        )
+        patcher.start()
+        self.addCleanup(patcher.stop)
+        patcher = patch.object(
+            self.builder, "_parse_dockerfile", return_value=("foo-v4.17.0-1", "foo-container", "v4.17.0", "1")
+        )
+        patcher.start()
+        self.addCleanup(patcher.stop)
+
+    async def test_build_reused_rebase(self):
+        with patch.object(self.builder, "_start_build") as start_build:
+            self.assertEqual(await self.builder.build(self.metadata), (None, None))
+        start_build.assert_not_called()
+        self.assertTrue(self.metadata.build_status)
+        self.metadata.build_event.set.assert_called_once()
+
+    async def test_build_reused_rebase_in_this_run(self):
+        self.metadata.rebase_reused = True
+        self.build_repo.commit_hash = "beef"
+        with patch.object(self.builder, "_start_build") as start_build:
+            self.assertEqual(await self.builder.build(self.metadata), (None, None))
+        start_build.assert_not_called()
+        self.assertTrue(self.metadata.build_status)
+
+    async def test_build_existing_nvr(self):
+        self.build_repo.commit_hash = "beef"
+        with self.assertRaisesRegex(ValueError, "already exists in DB"):
+            await self.builder.build(self.metadata)
+        self.assertFalse(self.metadata.build_status)
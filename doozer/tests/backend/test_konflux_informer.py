@@ -0,0 +1,151 @@
+import asyncio
+import datetime
+import queue
+from unittest import IsolatedAsyncioTestCase
+from unittest.mock import MagicMock, patch
+
+from doozerlib.backend.konflux_informer import PIPELINE_LABEL, KonfluxInformer
+from kubernetes.dynamic import exceptions
+
+
+class FakeWatch:
+    """Stands in for kubernetes.watch.Watch. Yields the events put on the queue of the watched kind."""
+
+    def __init__(self, queues, streams):
+        self._queues = queues
+        self._streams = streams
+        self._stopped = False
+
+    def stream(self, func, **kwargs):
+        self._streams.append(kwargs)
+        events = self._queues[func]
+        while not self._stopped:
+            try:
+                event = events.get(timeout=0.05)
+            except queue.Empty:
+                continue
+            yield event
+
+    def stop(self):
+        self._stopped = True
+
+
+def _plr(name, status="Unknown"):
+    return {
+        "apiVersion": "tekton.dev/v1",
+        "kind": "PipelineRun",
+        "metadata": {"name": name, "resourceVersion": "1"},
+        "status": {"conditions": [{"type": "Succeeded", "status": status, "reason": "Running"}]},
+    }
+
+
+def _pod(name, plr_name, phase, exit_code=0):
+    return {
+        "metadata": {
+            "name": name,
+            "labels": {PIPELINE_LABEL: plr_name},
+            "resourceVersion": "2",
+            "creationTimestamp": datetime.datetime.now().strftime("%Y-%m-%dT%H:%M:%SZ"),
+            "managedFields": [{"manager": "tekton"}],
+        },
+        "spec": {"containers": [{"name": "step-build"}]},
+        "status": {
+            "phase": phase,
+            "containerStatuses": [{"name": "step-build", "state": {"terminated": {"exitCode": exit_code}}}],
+        },
+    }
+
+
+@patch("doozerlib.backend.konflux_informer.COMPLETION_SETTLE_SECONDS", 0)
+class TestKonfluxInformer(IsolatedAsyncioTestCase):
+    def setUp(self):
+        self.plr_api = MagicMock()
+        self.plr_api.get.side_effect = exceptions.NotFoundError(MagicMock(status=404))
+        self.pod_api = MagicMock()
+        self.pod_api.get.return_value = MagicMock(items=[])
+        self.corev1_client = MagicMock()
+        self.corev1_client.read_namespaced_pod_log.return_value = "build failed"
+        self.plr_events = queue.Queue()
+        self.pod_events = queue.Queue()
+        self.streams = []
+        queues = {self.plr_api.get: self.plr_events, self.pod_api.get: self.pod_events}
+        self.informer = KonfluxInformer(
+            MagicMock(),
+            self.corev1_client,
+            "test-ns",
+            pipelinerun_api=self.plr_api,
+            pod_api=self.pod_api,
+            watch_factory=lambda: FakeWatch(queues, self.streams),
+        )
+
+    def tearDown(self):
+        self.informer.stop()
+
+    async def _wait(self, name, pending_timeout=datetime.timedelta(hours=1)):
+        return await self.informer.wait_for_pipelinerun(
+            name, overall_timeout_timedelta=datetime.timedelta(hours=5), pending_timeout_timedelta=pending_timeout
+        )
+
+    async def test_wait_for_pipelinerun_shares_watches(self):
+        task1 = asyncio.create_task(self._wait("plr-1"))
+        task2 = asyncio.create_task(self._wait("plr-2"))
+        await asyncio.sleep(0.1)
+        self.plr_events.put({"type": "ADDED", "object": _plr("plr-1")})
+        self.plr_events.put({"type": "ADDED", "object": _plr("plr-2")})
+        self.plr_events.put({"type": "ADDED", "object": _plr("unrelated")})
+        self.pod_events.put({"type": "ADDED", "object": _pod("plr-1-pod", "plr-1", "Succeeded")})
+        self.pod_events.put({"type": "ADDED", "object": _pod("plr-2-pod", "plr-2", "Failed", exit_code=1)})
+        # A garbage collected pod is still reported when the run finishes
+        self.pod_events.put({"type": "DELETED", "object": _pod("plr-1-pod", "plr-1", "Succeeded")})
+        await asyncio.sleep(0.2)
+        self.assertFalse(task1.done())
+        self.plr_events.put({"type": "MODIFIED", "object": _plr("plr-1", "True")})
+        self.plr_events.put({"type": "MODIFIED", "object": _plr("plr-2", "False")})
+
+        plr1, pods1 = await asyncio.wait_for(task1, 5)
+        plr2, pods2 = await asyncio.wait_for(task2, 5)
+
+        self.assertEqual(plr1.metadata.name, "plr-1")
+        self.assertEqual([pod["metadata"]["name"] for pod in pods1], ["plr-1-pod"])
+        self.assertNotIn("spec", pods1[0])
+        self.assertNotIn("managedFields", pods1[0]["metadata"])
+        self.assertEqual(plr2.status.conditions[0].status, "False")
+        self.assertEqual(pods2[0]["status"]["containerStatuses"][0]["log_output"], "build failed")
+        self.corev1_client.read_namespaced_pod_log.assert_called_once_with(
+            name="plr-2-pod", namespace="test-ns", container="step-build"
+        )
+        # One watch per kind, no matter how many PipelineRuns are waited on
+        self.assertEqual(len(self.streams), 2)
+        self.assertEqual(self.streams[1]["label_selector"], PIPELINE_LABEL)
+        self.assertEqual(self.informer._subscriptions, {})
+
+    async def test_wait_for_pipelinerun_seeds_from_current_state(self):
+        self.plr_api.get.side_effect = None
+        self.plr_api.get.return_value = MagicMock(to_dict=lambda: _plr("plr-1", "True"))
+        self.pod_api.get.return_value = MagicMock(items=[MagicMock(to_dict=lambda: _pod("pod", "plr-1", "Succeeded"))])
+        plr, pods = await asyncio.wait_for(self._wait("plr-1"), 5)
+        self.assertEqual(plr.metadata.name, "plr-1")
+        self.assertEqual(len(pods), 1)
+
+    async def test_wait_for_pipelinerun_cancels_pending(self):
+        task = asyncio.create_task(self._wait("plr-1", pending_timeout=datetime.timedelta(seconds=-1)))
+        await asyncio.sleep(0.1)
+        self.plr_events.put({"type": "ADDED", "object": _plr("plr-1")})
+        self.pod_events.put({"type": "ADDED", "object": _pod("pod", "plr-1", "Pending")})
+        self.pod_events.put({"type": "MODIFIED", "object": _pod("pod", "plr-1", "Pending")})
+        await asyncio.sleep(0.2)
+        self.plr_events.put({"type": "MODIFIED", "object": _plr("plr-1", "False")})
+        await asyncio.wait_for(task, 5)
+        self.plr_api.patch.assert_called_once_with(
+            name="plr-1",
+            namespace="test-ns",
+            body={"spec": {"status": "Cancelled"}},
+            content_type="application/merge-patch+json",
+        )
+
+    async def test_wait_for_pipelinerun_deleted(self):
+        task = asyncio.create_task(self._wait("plr-1"))
+        await asyncio.sleep(0.1)
+        self.plr_events.put({"type": "DELETED", "object": _plr("plr-1")})
+        with self.assertRaisesRegex(IOError, "deleted"):
+            await asyncio.wait_for(task, 5)
@@ -1,8 +1,9 @@
+import tempfile
 from pathlib import Path
-from unittest import TestCase
-from unittest.mock import MagicMock
+from unittest import IsolatedAsyncioTestCase, TestCase
+from unittest.mock import AsyncMock, MagicMock, patch
 
-from artcommonlib.model import Missing
+from artcommonlib.model import Missing, Model
 from dockerfile_parse import DockerfileParser
 from doozerlib.backend.rebaser import KonfluxRebaser
 
@@ -267,3 +268,79 @@ USER 3000
         rebaser._add_build_repos(dfp=dfp, metadata=metadata, dest_dir=Path("."))
 
         self.assertEqual(dfp.content.strip(), expected.strip())
+
+
+class TestRebaserIncremental(IsolatedAsyncioTestCase):
+    def setUp(self):
+        self.runtime = MagicMock(group="openshift-4.17", assembly="stream", data_dir="/nonexistent")
+        self.parent = MagicMock(distgit_key="base", rebase_input_digest="sha256:parent")
+        self.runtime.resolve_image.return_value = self.parent
+        self.rebaser = KonfluxRebaser(
+            runtime=self.runtime,
+            base_dir=Path("/tmp"),
+            source_resolver=MagicMock(),
+            repo_type="unsigned",
+            incremental=True,
+        )
+        self.metadata = MagicMock(distgit_key="foo", qualified_key="containers/foo")
+        self.metadata.config = Model({"from": {"member": "base"}, "content": {"source": {}}})
+        self.metadata.calculate_config_digest.return_value = "sha256:config"
+        self.metadata.get_parent_members.return_value = {"base": self.parent}
+        self.source = MagicMock(commit_hash="abc123", url="https://example.com/foo.git")
+
+    def test_calculate_input_digest(self):
+        digest = self.rebaser.calculate_input_digest(self.metadata, self.source, "4.17.0", False, "quay.io/foo")
+        self.assertEqual(
+            digest, self.rebaser.calculate_input_digest(self.metadata, self.source, "4.17.0", False, "quay.io/foo")
+        )
+
+        self.source.commit_hash = "def456"
+        changed_commit = self.rebaser.calculate_input_digest(self.metadata, self.source, "4.17.0", False, "quay.io/foo")
+        self.assertNotEqual(digest, changed_commit)
+
+        self.parent.rebase_input_digest = "sha256:parent2"
+        changed_parent = self.rebaser.calculate_input_digest(self.metadata, self.source, "4.17.0", False, "quay.io/foo")
+        self.assertNotEqual(changed_commit, changed_parent)
+
+    def test_calculate_input_digest_unloaded_parent(self):
+        self.runtime.resolve_image.return_value = None
+        with patch.object(self.rebaser, "_resolve_member_parent", return_value=("quay.io/foo:base-1", False)):
+            digest = self.rebaser.calculate_input_digest(self.metadata, self.source, "4.17.0", False, "quay.io/foo")
+        with patch.object(self.rebaser, "_resolve_member_parent", return_value=("quay.io/foo:base-2", False)):
+            changed_parent = self.rebaser.calculate_input_digest(
+                self.metadata, self.source, "4.17.0", False, "quay.io/foo"
+            )
+        self.assertNotEqual(digest, changed_parent)
+
+    @patch("doozerlib.backend.rebaser.BuildRepo")
+    async def test_rebase_to_skips_unchanged(self, BuildRepo: MagicMock):
+        self.runtime.resolve_image.return_value = None
+        self.metadata.config = Model({"content": {"source": {}}})
+        self.rebaser._source_resolver.resolve_source.return_value = self.source
+        with tempfile.TemporaryDirectory() as tmpdir:
+            self.rebaser._base_dir = Path(tmpdir)
+            dest_dir = Path(tmpdir, "containers/foo")
+            dest_dir.joinpath(".oit").mkdir(parents=True)
+            dest_dir.joinpath("Dockerfile").write_text(
+                "FROM base\nENV __doozer_uuid_tag=foo-v4.17.0-old\nLABEL release=1.p2\n"
+            )
+            build_repo = BuildRepo.return_value
+            build_repo.ensure_source = AsyncMock()
+            build_repo.commit = AsyncMock()
+            build_repo.push = AsyncMock()
+            build_repo.commit_hash = "cafe"
+            digest = self.rebaser.calculate_input_digest(self.metadata, self.source, "4.17.0", False, "quay.io/foo")
+            dest_dir.joinpath(".oit", "rebase_input_digest").write_text(digest)
+
+            with patch.object(self.rebaser, "_rebase_dir") as rebase_dir:
+                await self.rebaser.rebase_to(self.metadata, "4.17.0", "1.p?", False, "quay.io/foo", "msg", push=True)
+
+            rebase_dir.assert_not_called()
+            build_repo.commit.assert_not_called()
+            build_repo.push.assert_not_called()
+            self.assertTrue(self.metadata.rebase_status)
+            self.assertEqual(self.metadata.rebase_uuid_tag, "foo-v4.17.0-old")
+            self.assertEqual(self.metadata.rebase_input_digest, digest)
+            self.assertIs(self.metadata.rebase_reused, True)
+            self.assertFalse(self.metadata.private_fix)
+            self.metadata.rebase_event.set.assert_called_once()
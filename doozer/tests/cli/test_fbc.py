@@ -15,6 +15,7 @@ class TestFbcImportCli(unittest.IsolatedAsyncioTestCase):
         self.runtime.group = "test-group"
         self.runtime.assembly = "test-assembly"
         self.runtime.upcycle = False
+        self.runtime.cache_dir = None
         self.runtime.source_resolver = mock.Mock(spec=SourceResolver)
         self.fbc_import_cli = FbcImportCli(
             runtime=self.runtime,
@@ -1,3 +1,4 @@
+import asyncio
 import io
 import os
 import pathlib
@@ -28,9 +29,8 @@ def as_multi_release_name(prefix):
     return f'{prefix}-multi-2024-10-10-061203'
 
 
-rgp_cli.asyncio.sleep = no_sleep
-
-
+# Patched per test rather than at import time, so that asyncio.sleep isn't replaced for other test modules
+@patch("doozerlib.cli.release_gen_payload.asyncio.sleep", no_sleep)
 class TestGenPayloadCli(IsolatedAsyncioTestCase):
     def test_find_rhcos_payload_entries(self):
         rhcos_build = MagicMock()
@@ -590,7 +590,7 @@ spec:
         gpcli.ensure_imagestream_apiobj("release-s390x")
 
     @patch("doozerlib.cli.release_gen_payload.PayloadGenerator.build_inconsistency_annotations")
-    @patch("doozerlib.cli.release_gen_payload.modify_and_replace_api_object")
+    @patch("doozerlib.cli.release_gen_payload.modify_and_patch_api_object")
     async def test_apply_imagestream_update(self, mar_mock, binc_mock):
         gpcli = rgp_cli.GenPayloadCli(
             output_dir="/tmp",
@@ -754,6 +754,51 @@ spec:
             {"arch": "quay.io/org/repo:spam-arch"}, 'isname', 'quay.io/org/repo:spam'
         )
 
+    @patch("artcommonlib.exectools.cmd_assert_async")
+    @patch("aiofiles.open")
+    async def test_create_multi_release_images_concurrently(self, open_mock, exec_mock):
+        gpcli = rgp_cli.GenPayloadCli(output_dir="/tmp", multi_release_parallelism=2)
+        open_mock.return_value.__aenter__.return_value.write = AsyncMock()
+        running = 0
+        max_running = 0
+
+        async def _release_new(cmd):
+            nonlocal running, max_running
+            running += 1
+            max_running = max(max_running, running)
+            # asyncio.sleep is patched out for this class
+            done = asyncio.get_running_loop().create_future()
+            asyncio.get_running_loop().call_later(0.01, done.set_result, None)
+            await done
+            running -= 1
+
+        exec_mock.side_effect = _release_new
+        gpcli.create_multi_release_manifest_list = AsyncMock(return_value="some_pullspec")
+        args = dict(
+            imagestream_name="isname",
+            multi_release_is=dict(example="spam"),
+            multi_release_dest="quay.io/org/repo:spam",
+            multi_release_name="relname",
+            multi_specs={
+                False: {
+                    "cluster-version-operator": {
+                        arch: Mock(dest_pullspec=f"cvo-{arch}") for arch in ["x86_64", "s390x", "ppc64le", "aarch64"]
+                    }
+                }
+            },
+            private_mode=False,
+        )
+
+        await gpcli.create_multi_release_image(**args)
+        self.assertEqual(exec_mock.await_count, 4)
+        self.assertEqual(max_running, 2)
+        gpcli.create_multi_release_manifest_list.assert_awaited_with(
+            {arch: f"quay.io/org/repo:spam-{arch}" for arch in ["x86_64", "s390x", "ppc64le", "aarch64"]},
+            "isname",
+            "quay.io/org/repo:spam",
+        )
+        self.assertEqual(gpcli.multi_step_queue.summary()["release-new"]["count"], 4)
+
     @patch("doozerlib.cli.release_gen_payload.find_manifest_list_sha")
     @patch("doozerlib.cli.release_gen_payload.GenPayloadCli.mirror_payload_content")
     @patch("artcommonlib.exectools.cmd_assert_async")
@@ -789,7 +834,7 @@ manifests:
         )
 
     @patch("doozerlib.cli.release_gen_payload.what_is_in_master", return_value="4.19")
-    @patch("doozerlib.cli.release_gen_payload.modify_and_replace_api_object")
+    @patch("doozerlib.cli.release_gen_payload.modify_and_patch_api_object")
     async def test_apply_multi_imagestream_update(self, mar_mock, _):
         gpcli = flexmock(
             rgp_cli.GenPayloadCli(output_dir="/tmp", runtime=MagicMock(assembly_type=AssemblyTypes.STREAM))
@@ -859,7 +904,7 @@ manifests:
         self.assertIn('release.openshift.io/runtime-brew-event', new_tag_annotations)
 
     @patch("doozerlib.cli.release_gen_payload.what_is_in_master", return_value="4.19")
-    @patch("doozerlib.cli.release_gen_payload.modify_and_replace_api_object")
+    @patch("doozerlib.cli.release_gen_payload.modify_and_patch_api_object")
     async def test_apply_multi_imagestream_update_retain_accepted(self, mar_mock, _):
         gpcli = flexmock(
             rgp_cli.GenPayloadCli(output_dir="/tmp", runtime=MagicMock(assembly_type=AssemblyTypes.STREAM))
@@ -370,3 +370,44 @@ class TestGetNightlies(IsolatedAsyncioTestCase):
             ),
         ]
         self.assertEqual(0, len(subject.generate_nightly_sets(nightlies_for_arch)))
+
+    def test_generate_nightly_sets_buckets_by_shared_tags(self):
+        def make(name, created, commits):
+            nightly = subject.Nightly(
+                release_image_info={"config": {"created": created}}, name=name, phase="Accepted", pullspec="ignore"
+            )
+            nightly.commit_for_tag.update(commits)
+            return nightly
+
+        nightlies_for_arch = {
+            "x86_64": [
+                make("x1", "2022-07-18", {"pod": "p", "cvo": "c2", "x86-only": "x"}),
+                make("x2", "2022-07-17", {"pod": "p", "cvo": "c1", "x86-only": "x"}),
+            ],
+            "s390x": [
+                make("s1", "2022-07-18", {"pod": "p", "cvo": "c2", "rhcos": None}),
+                make("s2", "2022-07-17", {"pod": "p", "cvo": "c1"}),
+                make("s3", "2022-07-16", {"pod": "p", "cvo": "c1", "x86-only": "other"}),
+            ],
+        }
+        with patch.object(subject.Nightly, "__eq__", autospec=True, side_effect=subject.Nightly.__eq__) as eq:
+            sets = subject.generate_nightly_sets(nightlies_for_arch)
+        self.assertEqual(["s1 x1", "s2 x2"], [str(s) for s in sets])
+        # only nightlies with the same commits for shared tags were compared
+        self.assertEqual(
+            {("s1", "x1"), ("s2", "x2"), ("s3", "x2")}, {(a.name, b.name) for (a, b), _ in eq.call_args_list}
+        )
+
+    async def test_nightly_set_deeper_equivalence_cache(self):
+        n1 = self.vanilla_nightly(name="n1")
+        n2 = self.vanilla_nightly(name="n2")
+        n1.deeper_equivalence = AsyncMock(return_value=False)
+        n2.deeper_equivalence = AsyncMock(return_value=False)
+        n1.release_image_info["config"] = n2.release_image_info["config"] = {"created": "2022-07-18"}
+        nset = subject.NightlySet({"x86_64": n1, "s390x": n2})
+        cache = {}
+        self.assertFalse(await nset.deeper_equivalence(cache))
+        self.assertEqual({("n1", "n2"): False}, cache)
+        # a set with the same pair reuses the result
+        self.assertFalse(await subject.NightlySet({"aarch64": n2, "ppc64le": n1}).deeper_equivalence(cache))
+        self.assertEqual(1, n1.deeper_equivalence.await_count + n2.deeper_equivalence.await_count)
@@ -1,5 +1,5 @@
 from unittest import IsolatedAsyncioTestCase
-from unittest.mock import MagicMock
+from unittest.mock import MagicMock, patch
 
 from artcommonlib.assembly import AssemblyTypes
 from artcommonlib.model import Model
@@ -80,3 +80,30 @@ class TestAssemblyInspector(IsolatedAsyncioTestCase):
         self.assertEqual(issues, [])
 
     pass
+
+    async def test_initialize_prefetches_rhcos_builds(self):
+        rt = MagicMock(mode="both", group_config=Model({}))
+        rt.get_for_release_image_metas.return_value = []
+        ai = AssemblyInspector(rt, MagicMock())
+        builds = {
+            "x86_64": MagicMock(get_rpm_nvras=MagicMock(return_value=["foo-1-1.el9.x86_64", "bar-1-1.el9.noarch"])),
+            "s390x": MagicMock(get_rpm_nvras=MagicMock(return_value=["foo-1-1.el9.s390x", "bar-1-1.el9.noarch"])),
+        }
+
+        def find_rhcos_build(arch, private, custom):
+            if arch == "ppc64le":
+                raise IOError("No RHCOS latest found")
+            return builds[arch]
+
+        with (
+            patch.object(ai, "_find_rhcos_build", side_effect=find_rhcos_build) as find_mock,
+            patch.object(ai._rpm_build_resolver, "resolve") as resolve_mock,
+        ):
+            await ai.initialize(rhcos_arches=["x86_64", "s390x", "ppc64le"])
+            # RPMs of all arches are resolved together, once
+            resolve_mock.assert_called_once_with({"foo-1-1.el9.x86_64", "foo-1-1.el9.s390x", "bar-1-1.el9.noarch"})
+            # later lookups reuse the prefetched builds; failures are raised again
+            self.assertIs(ai.get_rhcos_build("s390x"), builds["s390x"])
+            with self.assertRaises(IOError):
+                ai.get_rhcos_build("ppc64le")
+            self.assertEqual(4, find_mock.call_count)
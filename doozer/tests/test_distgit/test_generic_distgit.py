@@ -2,6 +2,7 @@ import errno
 import os
 import unittest
 from unittest import mock
+from unittest.mock import AsyncMock
 
 from artcommonlib.assembly import AssemblyTypes
 from artcommonlib.model import Model
@@ -67,9 +68,6 @@ class TestGenericDistGit(TestDistgit):
         distgit.DistGitRepo(self.md)
 
     def test_clone_already_cloned(self):
-        # preventing tests from interacting with the real filesystem
-        flexmock(distgit).should_receive("Dir").and_return(flexmock(__exit__=None))
-
         # pretenting the directory exists (already cloned)
         flexmock(distgit.os.path).should_receive("isdir").and_return(True)
 
@@ -88,20 +86,15 @@ class TestGenericDistGit(TestDistgit):
         )
 
         expected_cmd = ['git', '-C', 'my-root-dir/my-namespace/my-distgit-key', 'rev-parse', 'HEAD']
-        (
-            flexmock(distgit.exectools)
-            .should_receive("cmd_gather")
-            .with_args(expected_cmd, strip=True)
-            .and_return(0, "abcdefg", "")
-            .once()
-        )
-
-        distgit.DistGitRepo(metadata, autoclone=False).clone("my-root-dir", "my-branch")
+        with mock.patch.object(
+            distgit.exectools, "cmd_gather_async", AsyncMock(return_value=(0, "abcdefg\n", ""))
+        ) as cmd_gather_async:
+            repo = distgit.DistGitRepo(metadata, autoclone=False)
+            repo.clone("my-root-dir", "my-branch")
+        cmd_gather_async.assert_awaited_once_with(expected_cmd, check=False)
+        self.assertEqual(repo.sha, "abcdefg")
 
     def test_clone_fails_to_create_namespace_dir(self):
-        # preventing tests from interacting with the real filesystem
-        flexmock(distgit).should_receive("Dir").and_return(flexmock(__exit__=None))
-
         # pretenting the directory doesn't exist (not yet cloned)
         flexmock(distgit.os.path).should_receive("isdir").and_return(False)
 
@@ -117,45 +110,33 @@ class TestGenericDistGit(TestDistgit):
 
         repo = distgit.DistGitRepo(metadata, autoclone=False)
 
-        # simulating a "File exists" error
-        (flexmock(distgit.os).should_receive("mkdir").and_raise(OSError(errno.EEXIST, os.strerror(errno.EEXIST))))
-
-        try:
-            repo.clone("my-root-dir", "my-branch")
-        except OSError:
-            self.fail("Should not have raised a \"dir already exists\" exception")
-        except:
-            pass  # doesn't matter if something fails at a later point
-
-        # simulating any other OSError
-        (flexmock(distgit.os).should_receive("mkdir").and_raise(OSError))
+        # an existing namespace dir is not an error
+        (
+            flexmock(distgit.os)
+            .should_receive("makedirs")
+            .with_args("my-root-dir/_irrelevant_", exist_ok=True)
+            .and_raise(OSError(errno.EACCES, os.strerror(errno.EACCES)))
+            .once()
+        )
 
+        # any other OSError is raised
         self.assertRaises(OSError, repo.clone, "my-root-dir", "my-branch")
 
     def test_clone_with_fake_distgit(self):
-        # preventing tests from interacting with the real filesystem
-        flexmock(distgit).should_receive("Dir").and_return(flexmock(__exit__=None))
-        flexmock(distgit.os).should_receive("mkdir").replace_with(lambda _: None)
-
         # pretenting the directory doesn't exist (not yet cloned)
         flexmock(distgit.os.path).should_receive("isdir").and_return(False)
+        flexmock(distgit.os).should_receive("makedirs").with_args("my-root-dir/my-namespace", exist_ok=True).once()
+        (
+            flexmock(distgit.os)
+            .should_receive("makedirs")
+            .with_args("my-root-dir/my-namespace/my-distgit-key", exist_ok=True)
+            .once()
+        )
 
         expected_log_msg = "Creating local build dir: my-root-dir/my-namespace/my-distgit-key"
         logger = flexmock()
         logger.should_receive("info").with_args(expected_log_msg).once()
 
-        expected_cmd = ["mkdir", "-p", "my-root-dir/my-namespace/my-distgit-key"]
-        (flexmock(distgit.exectools).should_receive("cmd_assert").with_args(expected_cmd).once())
-
-        expected_cmd = ['git', '-C', 'my-root-dir/my-namespace/my-distgit-key', 'rev-parse', 'HEAD']
-        (
-            flexmock(distgit.exectools)
-            .should_receive("cmd_gather")
-            .with_args(expected_cmd, strip=True)
-            .and_return(0, "abcdefg", "")
-            .once()
-        )
-
         metadata = flexmock(
             config=MockConfig(content="_irrelevant_"),
             runtime=self.mock_runtime(local=True, command="images:rebase", branch="_irrelevant_", rhpkg_config_lst=[]),
@@ -166,21 +147,23 @@ class TestGenericDistGit(TestDistgit):
             name="_irrelevant_",
         )
 
-        distgit.DistGitRepo(metadata, autoclone=False).clone("my-root-dir", "my-branch")
+        expected_cmd = ['git', '-C', 'my-root-dir/my-namespace/my-distgit-key', 'rev-parse', 'HEAD']
+        with mock.patch.object(
+            distgit.exectools, "cmd_gather_async", AsyncMock(return_value=(0, "abcdefg", ""))
+        ) as cmd_gather_async:
+            distgit.DistGitRepo(metadata, autoclone=False).clone("my-root-dir", "my-branch")
+        cmd_gather_async.assert_awaited_once_with(expected_cmd, check=False)
 
     def test_clone_images_build_command(self):
-        # preventing tests from interacting with the real filesystem
-        flexmock(distgit).should_receive("Dir").and_return(flexmock(__exit__=None))
-        flexmock(distgit.os).should_receive("mkdir").replace_with(lambda _: None)
-
         # pretenting the directory doesn't exist (not yet cloned)
         flexmock(distgit.os.path).should_receive("isdir").and_return(False)
+        flexmock(distgit.os).should_receive("makedirs").replace_with(lambda *_, **__: None)
 
         expected_log_msg = "Cloning distgit repository [branch:my-branch] into: my-root-dir/my-namespace/my-distgit-key"
         logger = flexmock()
         logger.should_receive("info").with_args(expected_log_msg).once()
 
-        expected_cmd = [
+        expected_clone_cmd = [
             "timeout",
             "999",
             "rhpkg",
@@ -190,23 +173,7 @@ class TestGenericDistGit(TestDistgit):
             "--branch",
             "my-branch",
         ]
-
-        (
-            flexmock(distgit.exectools)
-            .should_receive("cmd_assert")
-            .with_args(expected_cmd, retries=3, set_env=object)
-            .once()
-            .and_return(None)
-        )
-
         expected_cmd = ['git', '-C', 'my-root-dir/my-namespace/my-distgit-key', 'rev-parse', 'HEAD']
-        (
-            flexmock(distgit.exectools)
-            .should_receive("cmd_gather")
-            .with_args(expected_cmd, strip=True)
-            .and_return(0, "abcdefg", "")
-            .once()
-        )
 
         expected_warning = (
             "Warning: images:rebase was skipped and "
@@ -236,20 +203,25 @@ class TestGenericDistGit(TestDistgit):
             name="_irrelevant_",
         )
 
-        distgit.DistGitRepo(metadata, autoclone=False).clone("my-root-dir", "my-branch")
+        with (
+            mock.patch.object(distgit.exectools, "cmd_assert_async", AsyncMock(return_value=0)) as cmd_assert_async,
+            mock.patch.object(
+                distgit.exectools, "cmd_gather_async", AsyncMock(return_value=(0, "abcdefg", ""))
+            ) as cmd_gather_async,
+        ):
+            distgit.DistGitRepo(metadata, autoclone=False).clone("my-root-dir", "my-branch")
+        cmd_assert_async.assert_awaited_once_with(expected_clone_cmd, env=mock.ANY)
+        cmd_gather_async.assert_awaited_once_with(expected_cmd, check=False)
 
     def test_clone_cmd_with_user(self):
-        # preventing tests from interacting with the real filesystem
-        flexmock(distgit).should_receive("Dir").and_return(flexmock(__exit__=None))
-        flexmock(distgit.os).should_receive("mkdir").replace_with(lambda _: None)
-
         # pretenting the directory doesn't exist (not yet cloned)
         flexmock(distgit.os.path).should_receive("isdir").and_return(False)
+        flexmock(distgit.os).should_receive("makedirs").replace_with(lambda *_, **__: None)
 
         # avoid warning print in the middle of the test progress report
         flexmock(distgit).should_receive("yellow_print").replace_with(lambda _: None)
 
-        expected_cmd = [
+        expected_clone_cmd = [
             "timeout",
             "999",
             "rhpkg",
@@ -261,22 +233,37 @@ class TestGenericDistGit(TestDistgit):
             "my-branch",
         ]
 
-        (
-            flexmock(distgit.exectools)
-            .should_receive("cmd_assert")
-            .with_args(expected_cmd, retries=3, set_env=object)
-            .once()
-            .and_return(None)
+        metadata = flexmock(
+            config=MockConfig(content="_irrelevant_"),
+            runtime=self.mock_runtime(
+                local=False,
+                command="images:build",
+                global_opts={"rhpkg_clone_timeout": 999},
+                user="my-user",
+                branch="_irrelevant_",
+                rhpkg_config_lst=[],
+                downstream_commitish_overrides={},
+            ),
+            namespace="my-namespace",
+            distgit_key="my-distgit-key",
+            qualified_name="my-qualified-name",
+            logger=flexmock(info=lambda _: None),
+            prevent_cloning=False,
+            name="_irrelevant_",
         )
 
-        expected_cmd = ['git', '-C', 'my-root-dir/my-namespace/my-distgit-key', 'rev-parse', 'HEAD']
-        (
-            flexmock(distgit.exectools)
-            .should_receive("cmd_gather")
-            .with_args(expected_cmd, strip=True)
-            .and_return(0, "abcdefg", "")
-            .once()
-        )
+        with (
+            mock.patch.object(distgit.exectools, "cmd_assert_async", AsyncMock(return_value=0)) as cmd_assert_async,
+            mock.patch.object(distgit.exectools, "cmd_gather_async", AsyncMock(return_value=(0, "abcdefg", ""))),
+        ):
+            distgit.DistGitRepo(metadata, autoclone=False).clone("my-root-dir", "my-branch")
+        cmd_assert_async.assert_awaited_once_with(expected_clone_cmd, env=mock.ANY)
+
+    def test_clone_retries_failed_clone(self):
+        # pretenting the directory doesn't exist (not yet cloned)
+        flexmock(distgit.os.path).should_receive("isdir").and_return(False)
+        flexmock(distgit.os).should_receive("makedirs").replace_with(lambda *_, **__: None)
+        flexmock(distgit).should_receive("yellow_print").replace_with(lambda _: None)
 
         metadata = flexmock(
             config=MockConfig(content="_irrelevant_"),
@@ -284,7 +271,7 @@ class TestGenericDistGit(TestDistgit):
                 local=False,
                 command="images:build",
                 global_opts={"rhpkg_clone_timeout": 999},
-                user="my-user",
+                user=None,
                 branch="_irrelevant_",
                 rhpkg_config_lst=[],
                 downstream_commitish_overrides={},
@@ -292,12 +279,22 @@ class TestGenericDistGit(TestDistgit):
             namespace="my-namespace",
             distgit_key="my-distgit-key",
             qualified_name="my-qualified-name",
-            logger=flexmock(info=lambda _: None),
+            logger=flexmock(info=lambda *_: None, warning=lambda *_: None),
             prevent_cloning=False,
             name="_irrelevant_",
         )
 
-        distgit.DistGitRepo(metadata, autoclone=False).clone("my-root-dir", "my-branch")
+        with (
+            mock.patch.object(
+                distgit.exectools, "cmd_assert_async", AsyncMock(side_effect=[ChildProcessError("flake"), 0])
+            ) as cmd_assert_async,
+            mock.patch.object(distgit.exectools, "cmd_gather_async", AsyncMock(return_value=(0, "abcdefg", ""))),
+            mock.patch.object(distgit.shutil, "rmtree") as rmtree,
+        ):
+            distgit.DistGitRepo(metadata, autoclone=False).clone("my-root-dir", "my-branch")
+        self.assertEqual(cmd_assert_async.await_count, 2)
+        # the partial clone is removed before trying again
+        rmtree.assert_called_once_with("my-root-dir/my-namespace/my-distgit-key", ignore_errors=True)
 
     def test_merge_branch(self):
         # pretenting there is no Dockerfile nor .oit directory
@@ -50,10 +50,14 @@ class TestImageDistGit(TestDistgit):
 
     def test_clone_invokes_read_master_data(self):
         """
-        Mocking `clone` method of parent class, since we are only interested
+        Mocking `clone_async` method of parent class, since we are only interested
         in validating that `_read_master_data` is called in the child class.
         """
-        (flexmock(distgit.DistGitRepo).should_receive("clone").replace_with(lambda *_: None))
+
+        async def _clone_async(*_):
+            pass
+
+        (flexmock(distgit.DistGitRepo).should_receive("clone_async").replace_with(_clone_async))
 
         (flexmock(distgit.ImageDistGitRepo).should_receive("_read_master_data").once())
 
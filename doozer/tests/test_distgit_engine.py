@@ -0,0 +1,126 @@
+import asyncio
+from unittest import IsolatedAsyncioTestCase, TestCase
+from unittest.mock import AsyncMock, MagicMock, patch
+
+from doozerlib.distgit_engine import DistGitEngine, HostBackoff, remote_host
+
+
+class TestRemoteHost(TestCase):
+    def test_url(self):
+        self.assertEqual(remote_host("ssh://user@pkgs.devel.redhat.com/containers/foo"), "pkgs.devel.redhat.com")
+        self.assertEqual(remote_host("https://github.com/openshift/foo.git"), "github.com")
+
+    def test_scp_like(self):
+        self.assertEqual(remote_host("git@github.com:openshift/foo.git"), "github.com")
+
+
+class TestHostBackoff(TestCase):
+    def test_delay(self):
+        backoff = HostBackoff(base_delay=2, max_delay=5)
+        self.assertEqual(backoff.delay("a"), 0)
+        backoff.record_failure("a")
+        self.assertTrue(0 <= backoff.delay("a") <= 2)
+        for _ in range(10):
+            backoff.record_failure("a")
+        self.assertTrue(0 <= backoff.delay("a") <= 5)
+        self.assertEqual(backoff.delay("b"), 0)
+        backoff.record_success("a")
+        self.assertEqual(backoff.delay("a"), 0)
+
+
+def _meta(key):
+    meta = MagicMock(distgit_key=key)
+    meta.distgit_remote_url.return_value = f"ssh://pkgs.example.com/containers/{key}"
+    dg = MagicMock(branch="rhaos-4.17-rhel-9", distgit_dir=f"/tmp/{key}")
+    dg.name = key
+    dg.clone_async = AsyncMock()
+    meta.distgit_repo.return_value = dg
+    return meta
+
+
+class TestDistGitEngine(IsolatedAsyncioTestCase):
+    def setUp(self):
+        self.runtime = MagicMock(distgits_dir="/tmp/distgits")
+        self.runtime.global_opts = {'distgit_threads': 20, 'rhpkg_push_timeout': 1200}
+        self.runtime.get_major_minor_fields.return_value = (4, 17)
+        self.backoff = HostBackoff(base_delay=0, max_delay=0)
+
+    async def test_clone_all(self):
+        metas = [_meta(f"image-{i}") for i in range(5)]
+        engine = DistGitEngine(self.runtime, concurrency=2, backoff=self.backoff)
+        running = 0
+        max_running = 0
+
+        def _clone_async_for(dg):
+            async def _clone_async(*_):
+                nonlocal running, max_running
+                running += 1
+                max_running = max(max_running, running)
+                await asyncio.sleep(0.01)
+                running -= 1
+
+            return _clone_async
+
+        for meta in metas:
+            dg = meta.distgit_repo.return_value
+            dg.clone_async.side_effect = _clone_async_for(dg)
+
+        actual = await engine.clone_all(metas)
+        self.assertEqual(actual, [meta.distgit_repo.return_value for meta in metas])
+        self.assertEqual(max_running, 2)
+        self.assertEqual(set(engine.timings), {meta.distgit_key for meta in metas})
+        for meta in metas:
+            meta.distgit_repo.assert_called_once_with(autoclone=False)
+            meta.distgit_repo.return_value.clone_async.assert_awaited_once_with("/tmp/distgits", "rhaos-4.17-rhel-9")
+
+    async def test_clone_all_retries(self):
+        meta = _meta("image")
+        dg = meta.distgit_repo.return_value
+        dg.clone_async.side_effect = [ChildProcessError("flake"), None]
+        engine = DistGitEngine(self.runtime, backoff=self.backoff)
+        actual = await engine.clone_all([meta])
+        self.assertEqual(actual, [dg])
+        self.assertEqual(dg.clone_async.await_count, 2)
+
+    async def test_clone_all_cancels_on_failure(self):
+        failing = _meta("failing")
+        failing.distgit_repo.return_value.clone_async.side_effect = ChildProcessError("boom")
+        slow = _meta("slow")
+        cancelled = asyncio.Event()
+
+        async def _slow_clone(*_):
+            try:
+                await asyncio.sleep(60)
+            except asyncio.CancelledError:
+                cancelled.set()
+                raise
+
+        slow.distgit_repo.return_value.clone_async.side_effect = _slow_clone
+        engine = DistGitEngine(self.runtime, retries=2, backoff=self.backoff)
+        with self.assertRaises(ChildProcessError):
+            await engine.clone_all([slow, failing])
+        self.assertTrue(cancelled.is_set())
+        self.assertEqual(failing.distgit_repo.return_value.clone_async.await_count, 2)
+
+    @patch("artcommonlib.exectools.cmd_assert_async", new_callable=AsyncMock)
+    async def test_push_all(self, cmd_assert_async: AsyncMock):
+        ok = _meta("ok")
+        bad = _meta("bad")
+
+        async def _cmd_assert_async(cmd, **kwargs):
+            if kwargs["cwd"] == "/tmp/bad":
+                raise ChildProcessError("rejected")
+            return 0
+
+        cmd_assert_async.side_effect = _cmd_assert_async
+        engine = DistGitEngine(self.runtime, retries=2, backoff=self.backoff)
+        actual = await engine.push_all([ok, bad])
+        self.assertEqual(actual[0], (ok, True))
+        self.assertIs(actual[1][0], bad)
+        self.assertIn("rejected", actual[1][1])
+        cmd_assert_async.assert_any_await(
+            ['timeout', '1200', 'git', 'push', '--set-upstream', 'origin', 'rhaos-4.17-rhel-9'], cwd="/tmp/ok"
+        )
+        cmd_assert_async.assert_any_await(['timeout', '1200', 'git', 'push', '--tags'], cwd="/tmp/ok")
+        # 2 commands for "ok", 2 failed attempts for "bad"
+        self.assertEqual(cmd_assert_async.await_count, 4)
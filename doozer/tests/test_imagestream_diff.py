@@ -0,0 +1,228 @@
+import copy
+import json
+import tempfile
+from pathlib import Path
+from typing import Any, Dict, List
+from unittest import IsolatedAsyncioTestCase, TestCase
+from unittest.mock import patch
+
+import openshift_client as oc
+from doozerlib.cli.release_gen_payload import modify_and_patch_api_object
+from doozerlib.imagestream_diff import imagestream_patch, tag_ops
+
+
+def _resolve(doc: Any, path: str):
+    """Return the container and final key of a JSON pointer."""
+    parts = [part.replace("~1", "/").replace("~0", "~") for part in path.split("/")[1:]]
+    for part in parts[:-1]:
+        doc = doc[int(part)] if isinstance(doc, list) else doc[part]
+    last = parts[-1]
+    return doc, (int(last) if isinstance(doc, list) and last != "-" else last)
+
+
+def apply_patch(doc: Dict, ops: List[Dict]) -> Dict:
+    """A minimal RFC 6902 implementation of the operations imagestream_patch produces."""
+    doc = copy.deepcopy(doc)
+    for op in ops:
+        container, key = _resolve(doc, op["path"])
+        if op["op"] == "test":
+            if container[key] != op["value"]:
+                raise ChildProcessError(f"testing value {op['path']} failed")
+        elif op["op"] == "remove":
+            del container[key]
+        elif op["op"] == "add" and isinstance(container, list):
+            container.insert(len(container) if key == "-" else key, op["value"])
+        elif op["op"] in ("add", "replace"):
+            container[key] = op["value"]
+        else:
+            raise ValueError(f"Unsupported op {op['op']}")
+    return doc
+
+
+class FakeApiServer:
+    """
+    Stands in for the cluster API server: stores objects, defaults imagestream tag fields the way the server
+    does and applies JSON patches with resourceVersion checks.
+    """
+
+    def __init__(self, obj: Dict):
+        self.obj = {"metadata": {"resourceVersion": "0"}}
+        self.write(obj)
+        self.patches: List[List[Dict]] = []
+
+    def write(self, obj: Dict):
+        version = int(self.obj["metadata"]["resourceVersion"]) + 1
+        self.obj = copy.deepcopy(obj)
+        self.obj["metadata"]["resourceVersion"] = str(version)
+        for tag in self.obj["spec"]["tags"]:
+            tag.setdefault("generation", version)
+            tag.setdefault("referencePolicy", {"type": "Source"})
+            if not tag.get("annotations"):
+                tag["annotations"] = None
+
+    def patch(self, ops: List[Dict]):
+        self.patches.append(ops)
+        self.write(apply_patch(self.obj, ops))
+
+    async def oc(self, cmd: List[str]):
+        """Handles the `oc patch` commands modify_and_patch_api_object runs."""
+        assert cmd[:2] == ["oc", "patch"] and "--type=json" in cmd, cmd
+        patch_file = next(arg.split("=", 1)[1] for arg in cmd if arg.startswith("--patch-file="))
+        self.patch(json.loads(Path(patch_file).read_text()))
+
+    def api_object(self) -> "FakeAPIObject":
+        return FakeAPIObject(self)
+
+
+class FakeAPIObject:
+    """The parts of oc.APIObject that modify_and_patch_api_object uses, backed by a FakeApiServer."""
+
+    def __init__(self, server: FakeApiServer):
+        self.server = server
+        self.refresh()
+
+    def refresh(self):
+        self.model = oc.Model(copy.deepcopy(self.server.obj))
+
+    def kind(self):
+        return "ImageStream"
+
+    def qname(self):
+        return f"imagestream.image.openshift.io/{self.name()}"
+
+    def namespace(self):
+        return self.server.obj["metadata"]["namespace"]
+
+    def name(self):
+        return self.server.obj["metadata"]["name"]
+
+
+def _tags(*names, image="old"):
+    return [{"name": name, "from": {"kind": "DockerImage", "name": f"{image}-{name}"}} for name in names]
+
+
+class TestImagestreamPatch(TestCase):
+    def test_tag_ops(self):
+        before = _tags("a", "b", "c", "d")
+        cases = [
+            _tags("a", "b", "c", "d"),
+            _tags("b", "d"),
+            _tags("a", "b", "c", "d", "e"),
+            _tags("x", "a", "c", "y", "d"),
+            _tags("a", "b") + _tags("c", image="new") + _tags("d"),
+            [],
+        ]
+        for after in cases:
+            ops = tag_ops(before, after)
+            self.assertEqual(apply_patch({"spec": {"tags": before}}, ops)["spec"]["tags"], after)
+        self.assertEqual(tag_ops(before, before), [])
+        self.assertEqual(len(tag_ops(before, _tags("a", "b") + _tags("c", image="new") + _tags("d"))), 1)
+
+        # Fields the server defaults only count if the desired tag sets them
+        live = [dict(tag, generation=2, referencePolicy={"type": "Source"}, annotations=None) for tag in before]
+        self.assertEqual(tag_ops(live, before), [])
+        desired = copy.deepcopy(before)
+        desired[1]["referencePolicy"] = {"type": "Local"}
+        self.assertEqual(tag_ops(live, desired), [{"op": "replace", "path": "/spec/tags/1", "value": desired[1]}])
+
+    def test_imagestream_patch(self):
+        before = {
+            "metadata": {"name": "is", "resourceVersion": "5", "annotations": {"a/b": "1"}},
+            "spec": {"tags": _tags("a", "b")},
+        }
+        self.assertEqual(imagestream_patch(before, copy.deepcopy(before)), [])
+        after = copy.deepcopy(before)
+        after["metadata"]["annotations"]["a/b"] = "2"
+        after["spec"]["tags"].append(_tags("c")[0])
+        ops = imagestream_patch(before, after)
+        self.assertEqual(ops[0], {"op": "test", "path": "/metadata/resourceVersion", "value": "5"})
+        self.assertEqual(apply_patch(before, ops), after)
+
+
+class TestModifyAndPatchApiObject(IsolatedAsyncioTestCase):
+    def setUp(self):
+        self.tmpdir = tempfile.TemporaryDirectory()
+        self.addCleanup(self.tmpdir.cleanup)
+        self.server = FakeApiServer(
+            {
+                "kind": "ImageStream",
+                "metadata": {"name": "4.19-art-latest", "namespace": "ocp"},
+                "spec": {"tags": _tags(*(f"tag{i}" for i in range(300)))},
+                "status": {"dockerImageRepository": "registry/ocp/4.19-art-latest"},
+            }
+        )
+        oc_patch = patch("artcommonlib.exectools.cmd_assert_async", side_effect=self.server.oc)
+        oc_patch.start()
+        self.addCleanup(oc_patch.stop)
+
+    def _set_tag(self, name, image):
+        def _modify(apiobj):
+            tags = apiobj.model.spec.tags._primitive()
+            for tag in tags:
+                if tag["name"] == name:
+                    tag["from"]["name"] = image
+            apiobj.model.spec.tags = tags
+
+        return _modify
+
+    def _rebuild_tags(self, name, image):
+        # Like the payload generator, build every tag from scratch, without the fields the server defaults
+        def _modify(apiobj):
+            apiobj.model.spec.tags = [
+                {
+                    "annotations": {},
+                    "name": tag["name"],
+                    "from": {"kind": "DockerImage", "name": image if tag["name"] == name else tag["from"]["name"]},
+                }
+                for tag in apiobj.model.spec.tags._primitive()
+            ]
+
+        return _modify
+
+    async def test_unchanged_object_is_not_written(self):
+        await modify_and_patch_api_object(
+            self.server.api_object(), self._set_tag("tag7", "old-tag7"), Path(self.tmpdir.name), False
+        )
+        self.assertEqual(self.server.patches, [])
+        self.assertEqual(self.server.obj["metadata"]["resourceVersion"], "1")
+
+    async def test_rebuilt_tags_with_server_defaults_are_not_written(self):
+        await modify_and_patch_api_object(
+            self.server.api_object(), self._rebuild_tags("tag7", "old-tag7"), Path(self.tmpdir.name), False
+        )
+        self.assertEqual(self.server.patches, [])
+
+        await modify_and_patch_api_object(
+            self.server.api_object(), self._rebuild_tags("tag7", "new-tag7"), Path(self.tmpdir.name), False
+        )
+        self.assertEqual([op["op"] for op in self.server.patches[0]], ["test", "replace"])
+        self.assertEqual(self.server.obj["spec"]["tags"][7]["from"]["name"], "new-tag7")
+        self.assertEqual(self.server.obj["spec"]["tags"][7]["referencePolicy"], {"type": "Source"})
+
+    async def test_only_changed_tags_are_sent(self):
+        await modify_and_patch_api_object(
+            self.server.api_object(), self._set_tag("tag7", "new-tag7"), Path(self.tmpdir.name), False
+        )
+        self.assertEqual(len(self.server.patches), 1)
+        self.assertEqual([op["op"] for op in self.server.patches[0]], ["test", "replace"])
+        self.assertEqual(self.server.obj["spec"]["tags"][7]["from"]["name"], "new-tag7")
+        self.assertTrue(Path(self.tmpdir.name, "replacing-ImageStream.ocp.4.19-art-latest.patch.json").exists())
+
+    async def test_dry_run(self):
+        await modify_and_patch_api_object(
+            self.server.api_object(), self._set_tag("tag7", "new-tag7"), Path(self.tmpdir.name), True
+        )
+        self.assertEqual(self.server.patches, [])
+
+    async def test_conflicting_update_is_retried(self):
+        apiobj = self.server.api_object()
+        # Another writer updates the imagestream after we read it
+        concurrent = copy.deepcopy(self.server.obj)
+        concurrent["spec"]["tags"][0]["from"]["name"] = "theirs"
+        self.server.write(concurrent)
+
+        await modify_and_patch_api_object(apiobj, self._set_tag("tag7", "new-tag7"), Path(self.tmpdir.name), False)
+        self.assertEqual(len(self.server.patches), 2)  # the first one failed its resourceVersion test
+        self.assertEqual(self.server.obj["spec"]["tags"][0]["from"]["name"], "theirs")
+        self.assertEqual(self.server.obj["spec"]["tags"][7]["from"]["name"], "new-tag7")
+        self.assertEqual(self.server.obj["metadata"]["resourceVersion"], "3")
@@ -0,0 +1,91 @@
+import asyncio
+import tempfile
+import unittest
+from pathlib import Path
+from unittest.mock import AsyncMock, patch
+
+from doozerlib.opm import OpmRegistryAuth
+from doozerlib.opm_render_cache import OpmRenderCache
+
+DIGEST = "sha256:" + "a" * 64
+CATALOG = """---
+schema: olm.package
+name: foo
+---
+schema: olm.channel
+name: stable
+package: foo
+---
+schema: olm.package
+name: bar
+---
+schema: olm.bundle
+name: bar.v1
+package: bar
+"""
+
+
+class TestOpmRenderCache(unittest.IsolatedAsyncioTestCase):
+    def setUp(self):
+        self.tmpdir = tempfile.TemporaryDirectory()
+        self.addCleanup(self.tmpdir.cleanup)
+        self.cache = OpmRenderCache(self.tmpdir.name)
+
+    async def _gather_opm(self, args, stdout, auth=None):
+        await asyncio.sleep(0.01)
+        stdout.write(CATALOG)
+        return 0, "", ""
+
+    @patch("doozerlib.opm_render_cache.opm.gather_opm", new_callable=AsyncMock)
+    async def test_render_is_cached_by_digest(self, mock_gather_opm):
+        mock_gather_opm.side_effect = self._gather_opm
+        auth = OpmRegistryAuth(path="/path/to/auth.json")
+        with patch.object(self.cache, "resolve_digest", AsyncMock(return_value=DIGEST)):
+            # Concurrent requests share a single render
+            first, second = await asyncio.gather(
+                self.cache.get_package_blobs("registry.io/org/index:v4.18", {"foo"}, auth=auth),
+                self.cache.get_package_blobs("registry.io/org/index:v4.18", {"bar"}, auth=auth),
+            )
+            # Another instance stands in for another doozer invocation
+            blobs = await OpmRenderCache(self.tmpdir.name).render(f"registry.io/org/index@{DIGEST}")
+
+        mock_gather_opm.assert_awaited_once()
+        args = mock_gather_opm.await_args.args[0]
+        self.assertEqual(args, ["render", "-o", "yaml", "--", f"registry.io/org/index@{DIGEST}"])
+        self.assertEqual(
+            first,
+            {
+                "foo": [
+                    {"schema": "olm.package", "name": "foo"},
+                    {"schema": "olm.channel", "name": "stable", "package": "foo"},
+                ]
+            },
+        )
+        self.assertEqual(list(second.keys()), ["bar"])
+        self.assertEqual(len(blobs), 4)
+
+    @patch("doozerlib.opm_render_cache.opm.gather_opm", new_callable=AsyncMock)
+    async def test_migrate_is_cached_separately(self, mock_gather_opm):
+        mock_gather_opm.side_effect = self._gather_opm
+        await self.cache.render(f"registry.io/org/bundle@{DIGEST}")
+        await self.cache.render(f"registry.io/org/bundle@{DIGEST}", migrate=True)
+        self.assertEqual(mock_gather_opm.await_count, 2)
+        self.assertEqual(mock_gather_opm.await_args.args[0][:2], ["render", "--migrate"])
+
+    @patch("doozerlib.opm_render_cache.opm.render", new_callable=AsyncMock)
+    async def test_unresolvable_tag_is_left_to_the_caller(self, mock_render):
+        with patch.object(self.cache, "resolve_digest", AsyncMock(return_value=None)):
+            actual = await self.cache.get_package_blobs("registry.io/org/index:v4.18", {"bar"})
+        self.assertIsNone(actual)
+        mock_render.assert_not_awaited()
+        self.assertEqual(list(Path(self.tmpdir.name).iterdir()), [])
+
+    @patch("doozerlib.opm_render_cache.RegistryClient")
+    async def test_resolve_digest(self, mock_client):
+        client = mock_client.return_value.__aenter__.return_value
+        client.head_manifest = AsyncMock(return_value=DIGEST)
+        auth = OpmRegistryAuth(username="user", password="pass", registry_url="registry.io")
+        self.assertEqual(await self.cache.resolve_digest("registry.io/org/index:v4.18", auth), DIGEST)
+        mock_client.assert_called_once_with(auth_file=None, credentials={"registry.io": ("user", "pass")})
+        self.assertEqual(await self.cache.resolve_digest(f"registry.io/org/index@{DIGEST}"), DIGEST)
+        client.head_manifest.assert_awaited_once()
@@ -0,0 +1,91 @@
+import asyncio
+import io
+from pathlib import Path
+from unittest import IsolatedAsyncioTestCase, TestCase
+from unittest.mock import AsyncMock, MagicMock, patch
+
+from doozerlib.payload_mirror import PayloadMirrorPlanner, content_digest
+from tenacity import wait_none
+
+DIGEST_A = "sha256:" + "a" * 64
+DIGEST_B = "sha256:" + "b" * 64
+DEST_REPO = "quay.io/openshift-release-dev/ocp-v4.0-art-dev"
+
+
+class TestContentDigest(TestCase):
+    def test_content_digest(self):
+        self.assertEqual(content_digest("src:tag", f"{DEST_REPO}:sha256-{'a' * 64}"), DIGEST_A)
+        self.assertEqual(content_digest(f"src@{DIGEST_B}", f"{DEST_REPO}:tag"), DIGEST_B)
+        self.assertIsNone(content_digest("src:tag", f"{DEST_REPO}:tag"))
+
+
+class TestPayloadMirrorPlanner(IsolatedAsyncioTestCase):
+    def test_add_dedupes(self):
+        planner = PayloadMirrorPlanner(output_path=Path("/tmp"))
+        # The same manifest list requested by every arch and by the private payload
+        for src in ["brew/foo@" + DIGEST_A, "quay/foo@" + DIGEST_A, "brew/foo@" + DIGEST_A]:
+            planner.add(src, f"{DEST_REPO}:sha256-{'a' * 64}")
+        planner.add("brew/foo@" + DIGEST_A, f"{DEST_REPO}-priv:sha256-{'a' * 64}")
+        # Mutable tags aren't deduplicated by content
+        planner.add("brew/foo@" + DIGEST_A, f"{DEST_REPO}:foo")
+        planner.add("brew/bar@" + DIGEST_B, f"{DEST_REPO}:foo")
+        self.assertEqual(planner.requested, 6)
+        self.assertEqual(
+            planner.mappings,
+            [
+                ("brew/foo@" + DIGEST_A, f"{DEST_REPO}:sha256-{'a' * 64}"),
+                ("brew/foo@" + DIGEST_A, f"{DEST_REPO}-priv:sha256-{'a' * 64}"),
+                ("brew/bar@" + DIGEST_B, f"{DEST_REPO}:foo"),
+            ],
+        )
+
+    def test_batches_keep_sources_together(self):
+        planner = PayloadMirrorPlanner(output_path=Path("/tmp"), batch_size=3)
+        mappings = [("a", "1"), ("b", "2"), ("a", "3"), ("c", "4"), ("c", "5"), ("d", "6"), ("d", "7"), ("d", "8")]
+        self.assertEqual(
+            planner.batches(mappings),
+            [[("a", "1"), ("a", "3"), ("b", "2")], [("c", "4"), ("c", "5")], [("d", "6"), ("d", "7"), ("d", "8")]],
+        )
+
+    @patch("aiofiles.open")
+    @patch("artcommonlib.exectools.cmd_assert_async")
+    async def test_execute(self, cmd_assert_async: AsyncMock, open_mock: MagicMock):
+        buffers = {}
+
+        def _open(path, **_):
+            buffers[path] = io.StringIO()
+            file = MagicMock()
+            file.__aenter__.return_value.write = AsyncMock(side_effect=buffers[path].write)
+            return file
+
+        open_mock.side_effect = _open
+        running = 0
+        max_running = 0
+        attempts = {}
+
+        async def _mirror(cmd):
+            nonlocal running, max_running
+            attempts[cmd[-1]] = attempts.get(cmd[-1], 0) + 1
+            running += 1
+            max_running = max(max_running, running)
+            await asyncio.sleep(0.01)
+            running -= 1
+            if cmd[-1].endswith("-0.txt") and attempts[cmd[-1]] == 1:
+                raise ChildProcessError("registry hiccup")
+
+        cmd_assert_async.side_effect = _mirror
+        exists = AsyncMock(side_effect=lambda src, dest: src == "present@" + DIGEST_A)
+        planner = PayloadMirrorPlanner(output_path=Path("/tmp"), batch_size=1, concurrency=2, attempts=2, exists=exists)
+        planner.add("present@" + DIGEST_A, f"{DEST_REPO}:sha256-{'a' * 64}")
+        for i in range(4):
+            planner.add(f"src{i}:latest", f"{DEST_REPO}:tag{i}")
+
+        planner._retry_wait = wait_none()
+        await planner.execute(label="test")
+
+        exists.assert_awaited_once_with("present@" + DIGEST_A, f"{DEST_REPO}:sha256-{'a' * 64}")
+        self.assertEqual(len(buffers), 4)
+        self.assertEqual(buffers[Path("/tmp/src_dest.test-0.txt")].getvalue(), f"src0:latest={DEST_REPO}:tag0\n")
+        self.assertEqual(cmd_assert_async.await_count, 5)  # one batch was retried
+        self.assertEqual(attempts["--filename=/tmp/src_dest.test-0.txt"], 2)
+        self.assertLessEqual(max_running, 2)
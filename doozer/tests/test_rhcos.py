@@ -6,10 +6,11 @@ from pathlib import Path
 from unittest.mock import AsyncMock, MagicMock, Mock, patch
 from urllib.error import URLError
 
+import koji
 import yaml
 from artcommonlib.model import Model
 from artcommonlib.rhcos import RhcosMissingContainerException
-from doozerlib import rhcos
+from doozerlib import rhcos, rhcos_metadata
 from doozerlib.repodata import Repodata, Rpm
 from doozerlib.repos import Repos
 
@@ -27,6 +28,7 @@ def _urlopen_json_cm(mock_urlopen, content, rc=200):
     cm = MagicMock()
     cm.getcode.return_value = rc
     cm.read.return_value = bytes(json.dumps(content), 'utf-8')
+    cm.headers = {}
     cm.__enter__.return_value = cm
     mock_urlopen.return_value = cm
 
@@ -39,6 +41,8 @@ class TestRhcos(unittest.IsolatedAsyncioTestCase):
         self.runtime = runtime
         self.koji_mock = runtime.pooled_koji_client_session.return_value.__enter__.return_value
         self.respath = Path(os.path.dirname(__file__), 'resources')
+        # don't share cached RHCOS metadata between tests
+        rhcos_metadata.configure()
 
     def tearDown(self):
         pass
@@ -120,6 +124,38 @@ class TestRhcos(unittest.IsolatedAsyncioTestCase):
         self.runtime.group_config.arches = ['arch1', 'arch2']
         self.assertEqual('id-2', rhcos.RHCOSBuildFinder(self.runtime, "4.14")._latest_rhcos_build_id())
 
+    async def test_build_id_async_multi(self):
+        self.runtime.group_config.rhcos = Model(dict(payload_tags=[dict(name="eggs", build_metadata_key="eggs")]))
+        self.runtime.group_config.urls = Model(dict(rhcos_release_base=dict(multi='https://example.com/multi')))
+        self.runtime.group_config.arches = ['arch1', 'arch2']
+        builds = [
+            {'id': 'id-3', 'arches': ['arch1']},
+            {'id': 'id-2', 'arches': ['arch1', 'arch2']},
+            {'id': 'id-1', 'arches': ['arch1', 'arch2']},
+        ]
+        metas = {
+            'https://example.com/multi/builds.json': dict(builds=builds),
+            'https://example.com/multi/id-2/arch1/meta.json': {'eggs': 'sha:1'},
+            'https://example.com/multi/id-2/arch2/meta.json': {},  # release job didn't finish
+            'https://example.com/multi/id-1/arch1/meta.json': {'eggs': 'sha:2'},
+            'https://example.com/multi/id-1/arch2/meta.json': {'eggs': 'sha:3'},
+        }
+
+        async def get_json(url, immutable=False, revalidate=False, session=None):
+            return metas[url]
+
+        async def get_json_many(urls, immutable=False):
+            return [metas[url] for url in urls]
+
+        client = rhcos_metadata.get_client()
+        with (
+            patch.object(client, "get_json", side_effect=get_json),
+            patch.object(client, "get_json_many", side_effect=get_json_many),
+        ):
+            self.assertEqual('id-1', await rhcos.RHCOSBuildFinder(self.runtime, "4.16").latest_rhcos_build_id_async())
+            # the incomplete meta.json was checked again with the server
+            client.get_json.assert_any_await('https://example.com/multi/id-2/arch2/meta.json', revalidate=True)
+
     @patch('urllib.request.urlopen')
     def test_build_find_failure(self, mock_urlopen):
         mock_urlopen.side_effect = URLError("test")
@@ -330,3 +366,79 @@ class TestRhcos(unittest.IsolatedAsyncioTestCase):
         get_repodata_threadsafe.assert_awaited()
         get_os_metadata_rpm_list.assert_called_once_with()
         self.assertEqual(actual, [('bar-0:1.0.0-1.el9.x86_64', 'bar-0:1.1.0-1.el9.x86_64', 'rhel-8-appstream-rpms')])
+
+    def test_rpm_build_resolver(self):
+        class MissingRpmTask:
+            @property
+            def result(self):
+                raise koji.GenericError("No such rpm")
+
+        rpm_defs = {
+            "foo-1.0-1.el9.x86_64": {"build_id": 1},
+            "foo-1.0-1.el9.s390x": {"build_id": 1},
+            "bar-2.0-1.el9.x86_64": {"build_id": 2},
+        }
+        builds = {
+            1: {"package_name": "foo", "nvr": "foo-1.0-1.el9"},
+            2: {"package_name": "bar", "nvr": "bar-2.0-1.el9"},
+        }
+
+        def get_rpm(nvra, *_, **__):
+            return Mock(result=rpm_defs[nvra]) if nvra in rpm_defs else MissingRpmTask()
+
+        koji_multicall = self.koji_mock.multicall.return_value.__enter__.return_value
+        koji_multicall.getRPM.side_effect = get_rpm
+        koji_multicall.getBuild.side_effect = lambda b, *_, **__: Mock(result=builds[b])
+
+        resolver = rhcos.RPMBuildResolver(self.runtime)
+        resolver.resolve(["foo-1.0-1.el9.x86_64", "foo-1.0-1.el9.s390x", "bar-2.0-1.el9.x86_64"])
+        self.assertEqual(3, koji_multicall.getRPM.call_count)
+        self.assertEqual(2, koji_multicall.getBuild.call_count)
+
+        # another RHCOS build sharing the resolver only looks up what it hasn't seen
+        self.assertEqual(
+            {"foo": builds[1]}, resolver.get_package_builds(["foo-1.0-1.el9.s390x", "foo-1.0-1.el9.x86_64"])
+        )
+        self.assertEqual(3, koji_multicall.getRPM.call_count)
+        with self.assertRaisesRegex(Exception, "Failed to find RPM baz"):
+            resolver.get_package_builds(["bar-2.0-1.el9.x86_64", "baz-1-1.el9.x86_64"])
+        self.assertEqual(4, koji_multicall.getRPM.call_count)
+        self.assertEqual(2, koji_multicall.getBuild.call_count)
+
+        self.runtime.group_config.rhcos = Model({"allow_missing_brew_rpms": True})
+        self.assertEqual(
+            {"bar": builds[2]}, resolver.get_package_builds(["bar-2.0-1.el9.x86_64", "baz-1-1.el9.x86_64"])
+        )
+
+    def test_rpm_build_resolver_build_lookup_fails(self):
+        koji_multicall = self.koji_mock.multicall.return_value.__enter__.return_value
+        koji_multicall.getRPM.side_effect = lambda nvra, *_, **__: Mock(result={"build_id": 1})
+        koji_multicall.getBuild.side_effect = koji.GenericError("Brew is down")
+
+        resolver = rhcos.RPMBuildResolver(self.runtime)
+        with self.assertRaisesRegex(koji.GenericError, "Brew is down"):
+            resolver.resolve(["foo-1.0-1.el9.x86_64"])
+
+        # nothing is remembered from the failed lookup, so it is looked up again
+        koji_multicall.getBuild.side_effect = lambda b, *_, **__: Mock(result={"package_name": "foo"})
+        self.assertEqual({"foo": {"package_name": "foo"}}, resolver.get_package_builds(["foo-1.0-1.el9.x86_64"]))
+        self.assertEqual(2, koji_multicall.getRPM.call_count)
+
+    def test_rpm_build_resolver_rpm_lookup_fails(self):
+        class FailedRpmTask:
+            @property
+            def result(self):
+                raise koji.GenericError("Brew is down")
+
+        koji_multicall = self.koji_mock.multicall.return_value.__enter__.return_value
+        koji_multicall.getRPM.side_effect = lambda nvra, *_, **__: FailedRpmTask()
+
+        resolver = rhcos.RPMBuildResolver(self.runtime)
+        with self.assertRaisesRegex(koji.GenericError, "Brew is down"):
+            resolver.resolve(["foo-1.0-1.el9.x86_64"])
+
+        # errors other than a missing RPM aren't remembered, so the RPM is looked up again
+        koji_multicall.getRPM.side_effect = lambda nvra, *_, **__: Mock(result={"build_id": 1})
+        koji_multicall.getBuild.side_effect = lambda b, *_, **__: Mock(result={"package_name": "foo"})
+        self.assertEqual({"foo": {"package_name": "foo"}}, resolver.get_package_builds(["foo-1.0-1.el9.x86_64"]))
+        self.assertEqual(2, koji_multicall.getRPM.call_count)
@@ -0,0 +1,127 @@
+import json
+import tempfile
+from unittest import IsolatedAsyncioTestCase, TestCase
+from unittest.mock import MagicMock, patch
+from urllib.error import HTTPError
+
+from doozerlib.rhcos_metadata import RHCOSBuildIndex, RHCOSMetadataClient
+
+BUILDS = {
+    "builds": [
+        {"id": "id-4", "arches": ["x86_64"]},
+        {"id": "id-3", "arches": ["x86_64", "s390x", "aarch64"]},
+        {"id": "id-2", "arches": ["x86_64", "aarch64"]},
+        {"id": "id-1", "arches": ["x86_64", "s390x", "aarch64"]},
+    ]
+}
+
+
+def _response(content, headers=None):
+    resp = MagicMock()
+    resp.read.return_value = json.dumps(content).encode()
+    resp.headers = headers or {}
+    resp.__enter__.return_value = resp
+    return resp
+
+
+def _not_modified(url):
+    return HTTPError(url, 304, "Not Modified", {}, None)
+
+
+class TestRHCOSBuildIndex(TestCase):
+    def test_queries(self):
+        index = RHCOSBuildIndex(BUILDS)
+        self.assertEqual(len(index), 4)
+        self.assertIn("id-2", index)
+        self.assertEqual(index.arches("id-2"), {"x86_64", "aarch64"})
+        self.assertEqual(index.latest(), "id-4")
+        self.assertEqual(index.latest(["aarch64"]), "id-3")
+        self.assertEqual([b["id"] for b in index.builds_with_arches(["s390x", "x86_64"])], ["id-3", "id-1"])
+        self.assertIsNone(index.latest(["ppc64le"]))
+        self.assertIsNone(RHCOSBuildIndex({"builds": []}).latest())
+
+
+class TestRHCOSMetadataClient(TestCase):
+    def setUp(self):
+        self.tmpdir = tempfile.TemporaryDirectory()
+        self.addCleanup(self.tmpdir.cleanup)
+        self.url = "https://rhcos.example.com/rhcos-4.16/builds.json"
+
+    @patch("urllib.request.urlopen")
+    def test_revalidates_with_etag(self, mock_urlopen):
+        mock_urlopen.return_value = _response(BUILDS, {"ETag": '"v1"', "Last-Modified": "yesterday"})
+        client = RHCOSMetadataClient(self.tmpdir.name, max_age=0)
+        self.assertEqual(client.get_json_sync(self.url), BUILDS)
+        self.assertEqual(mock_urlopen.call_args[0][0], self.url)
+
+        # a new process finds the document on disk and asks whether it changed
+        client = RHCOSMetadataClient(self.tmpdir.name, max_age=0)
+        mock_urlopen.side_effect = _not_modified(self.url)
+        self.assertEqual(client.get_json_sync(self.url), BUILDS)
+        req = mock_urlopen.call_args[0][0]
+        self.assertEqual(req.get_header("If-none-match"), '"v1"')
+        self.assertEqual(req.get_header("If-modified-since"), "yesterday")
+
+    @patch("urllib.request.urlopen")
+    def test_fresh_documents_are_not_revalidated(self, mock_urlopen):
+        mock_urlopen.return_value = _response(BUILDS)
+        client = RHCOSMetadataClient(max_age=60)
+        client.get_json_sync(self.url)
+        client.get_json_sync(self.url)
+        self.assertEqual(mock_urlopen.call_count, 1)
+        client.get_json_sync(self.url, revalidate=True)
+        self.assertEqual(mock_urlopen.call_count, 2)
+
+    @patch("urllib.request.urlopen")
+    def test_immutable_documents_are_fetched_once(self, mock_urlopen):
+        url = "https://rhcos.example.com/rhcos-4.16/id-1/x86_64/meta.json"
+        mock_urlopen.return_value = _response({"buildid": "id-1"})
+        RHCOSMetadataClient(self.tmpdir.name, max_age=0).get_json_sync(url, immutable=True)
+        meta = RHCOSMetadataClient(self.tmpdir.name, max_age=0).get_json_sync(url, immutable=True)
+        self.assertEqual(meta, {"buildid": "id-1"})
+        self.assertEqual(mock_urlopen.call_count, 1)
+
+
+class FakeResponse:
+    def __init__(self, status, content=None, headers=None):
+        self.status = status
+        self.content = content
+        self.headers = headers or {}
+
+    async def __aenter__(self):
+        return self
+
+    async def __aexit__(self, *args):
+        pass
+
+    def raise_for_status(self):
+        if self.status >= 400:
+            raise AssertionError(f"HTTP {self.status}")
+
+    async def read(self):
+        return json.dumps(self.content).encode()
+
+
+class TestRHCOSMetadataClientAsync(IsolatedAsyncioTestCase):
+    async def test_get_json(self):
+        url = "https://rhcos.example.com/rhcos-4.16/builds.json"
+        session = MagicMock()
+        session.get.return_value = FakeResponse(200, BUILDS, {"ETag": '"v1"'})
+        client = RHCOSMetadataClient(max_age=0)
+        self.assertEqual(await client.get_json(url, session=session), BUILDS)
+
+        session.get.return_value = FakeResponse(304)
+        self.assertEqual(await client.get_json(url, session=session), BUILDS)
+        self.assertEqual(session.get.call_args[1]["headers"], {"If-None-Match": '"v1"'})
+
+    async def test_get_json_many(self):
+        urls = [f"https://rhcos.example.com/rhcos-4.16/id-1/{arch}/meta.json" for arch in ("x86_64", "s390x")]
+        session = MagicMock()
+        session.get.side_effect = lambda url, headers: FakeResponse(200, {"url": url})
+        session.__aenter__.return_value = session
+        client = RHCOSMetadataClient()
+        with patch.object(RHCOSMetadataClient, "_session", return_value=session):
+            metas = await client.get_json_many(urls, immutable=True)
+            self.assertEqual(metas, [{"url": url} for url in urls])
+            await client.get_json_many(urls, immutable=True)
+        self.assertEqual(session.get.call_count, 2)
@@ -0,0 +1,72 @@
+from unittest import TestCase
+from unittest.mock import MagicMock
+
+from doozerlib.cli.release_gen_payload import PayloadGenerator
+from doozerlib.rpm_inventory import RPMInventory, rpm_name
+
+
+def _rhcos_build(arch, rpms, build_id="418.94.202410090804-0"):
+    build = MagicMock(brew_arch=arch, build_id=build_id)
+    build.get_os_metadata_rpm_list.return_value = rpms
+    return build
+
+
+class TestRPMInventory(TestCase):
+    def test_rpm_name(self):
+        self.assertEqual(rpm_name("kernel-rt-core-4.18.0-372.41.1.rt7.198.el8_6"), "kernel-rt-core")
+        self.assertIs(rpm_name("foo-1-1.el9"), rpm_name("foo-1-2.el9"))
+
+    def test_find_inconsistencies(self):
+        inventory = RPMInventory()
+        inventory.add_nvrs("a", ["foo-1.0-1.el9", "bar-2.0-1.el9"])
+        inventory.add_nvrs("b", ["foo-1.0-2.el9", "bar-2.0-1.el9"])
+        inventory.add_nvrs("c", ["foo-1.0-1.el9"])
+        self.assertEqual(inventory.get("b", "foo"), ("1.0", "2.el9"))
+        self.assertEqual(inventory.version_releases("c"), {"foo": "1.0-1.el9"})
+        self.assertEqual(
+            inventory.find_inconsistencies(), {"foo": {"foo-1.0-1.el9": ["a", "c"], "foo-1.0-2.el9": ["b"]}}
+        )
+        self.assertEqual(inventory.find_inconsistencies(["a", "c"]), {})
+
+    def test_rhcos_checks_share_inventory(self):
+        x86 = _rhcos_build(
+            "x86_64",
+            [
+                ["kernel-core", "0", "4.18.0", "372.43.1.el8_6", "x86_64"],
+                ["kernel-rt-core", "0", "4.18.0", "372.41.1.rt7.198.el8_6", "x86_64"],
+                ["foo", "0", "1.0", "1.el8", "x86_64"],
+            ],
+        )
+        arm = _rhcos_build("aarch64", [["foo", "0", "1.0", "2.el8", "aarch64"]])
+        inventory = RPMInventory()
+
+        self.assertEqual(
+            PayloadGenerator.find_rhcos_build_rpm_inconsistencies([x86, arm], inventory),
+            {"foo": {"foo-1.0-1.el8": ["x86_64"], "foo-1.0-2.el8": ["aarch64"]}},
+        )
+        self.assertEqual(
+            PayloadGenerator.find_rhcos_build_kernel_inconsistencies(x86, inventory),
+            [
+                {
+                    "kernel-core": "kernel-core-4.18.0-372.43.1.el8_6",
+                    "kernel-rt-core": "kernel-rt-core-4.18.0-372.41.1.rt7.198.el8_6",
+                }
+            ],
+        )
+        self.assertEqual(PayloadGenerator.find_rhcos_build_kernel_inconsistencies(arm, inventory), [])
+        # The OS metadata of each build is only indexed once
+        x86.get_os_metadata_rpm_list.assert_called_once()
+        arm.get_os_metadata_rpm_list.assert_called_once()
+
+    def test_rhcos_builds_of_the_same_arch(self):
+        public = _rhcos_build("x86_64", [["foo", "0", "1.0", "1.el8", "x86_64"]])
+        private = _rhcos_build("x86_64", [["foo", "0", "1.0", "2.el8", "x86_64"]], build_id="418.94.202410090805-0")
+        inventory = RPMInventory()
+
+        public_source = inventory.add_rhcos_build(public)
+        private_source = inventory.add_rhcos_build(private)
+        self.assertNotEqual(public_source, private_source)
+        self.assertEqual(inventory.get(public_source, "foo"), ("1.0", "1.el8"))
+        self.assertEqual(inventory.get(private_source, "foo"), ("1.0", "2.el8"))
+        self.assertEqual(inventory.add_rhcos_build(public), public_source)
+        public.get_os_metadata_rpm_list.assert_called_once()
@@ -0,0 +1,47 @@
+import asyncio
+import json
+import tempfile
+from pathlib import Path
+from unittest import IsolatedAsyncioTestCase
+
+from doozerlib.step_queue import StepQueue
+
+
+class TestStepQueue(IsolatedAsyncioTestCase):
+    async def test_limits_are_per_kind(self):
+        queue = StepQueue({"slow": 1}, default_limit=3)
+        running = {"slow": 0, "fast": 0}
+        max_running = {"slow": 0, "fast": 0}
+
+        async def _step(kind):
+            running[kind] += 1
+            max_running[kind] = max(max_running[kind], running[kind])
+            await asyncio.sleep(0.01)
+            running[kind] -= 1
+            return kind
+
+        results = await asyncio.gather(
+            *(queue.run(kind, f"{kind}{i}", lambda kind=kind: _step(kind)) for i in range(4) for kind in running)
+        )
+        self.assertEqual(results, ["slow", "fast"] * 4)
+        self.assertEqual(max_running, {"slow": 1, "fast": 3})
+        self.assertEqual(len(queue.timings), 8)
+
+    async def test_failures_are_recorded(self):
+        queue = StepQueue({})
+
+        async def _fail():
+            raise ValueError("boom")
+
+        with self.assertRaises(ValueError):
+            await queue.run("release-new", "x86_64", _fail)
+        queue.record("release-new", "s390x", 0, "succeeded")
+        summary = queue.summary()["release-new"]
+        self.assertEqual((summary["count"], summary["failed"]), (2, 1))
+
+        with tempfile.TemporaryDirectory() as tmpdir:
+            path = Path(tmpdir, "timings.json")
+            queue.write_timings(path)
+            written = json.loads(path.read_text())
+        self.assertEqual([step["name"] for step in written["steps"]], ["x86_64", "s390x"])
+        self.assertEqual(written["summary"]["release-new"]["count"], 2)
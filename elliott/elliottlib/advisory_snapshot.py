@@ -0,0 +1,110 @@
+"""
+What verify-attached-bugs knows about a set of advisories, gathered once before anything is checked.
+
+The checks only look at a snapshot, so they can run against one saved earlier (see to_dict / from_dict)
+without access to Errata Tool, JIRA, Bugzilla or Brew.
+"""
+
+from dataclasses import dataclass, field
+from typing import Dict, Iterable, List, Optional, Set, Tuple
+
+from elliottlib.bzutil import Bug, BugTracker
+
+# A Go builder image NVR -> (name, version, release) of the attached builds built with it,
+# as returned by util.get_golang_container_nvrs
+GoNVRMap = Dict[str, Set[Tuple[str, str, str]]]
+
+
+@dataclass
+class AdvisorySnapshot:
+    advisory_id: int
+    errata_type: str  # RHBA, RHSA or RHEA
+    status: str
+    # The `CVE Names` field of the advisory
+    cves: List[str]
+    # Tracker type -> ids of the attached bugs
+    bug_ids: Dict[str, List]
+    # The following are only gathered when verifying flaws
+    builds: List[str] = field(default_factory=list)
+    # CVE -> package -> exclusion id, see AsyncErrataUtils.get_advisory_cve_exclusions
+    cve_exclusions: Dict[str, Dict[str, int]] = field(default_factory=dict)
+    # str(id) of an attached tracker bug -> ids of its flaw bugs
+    tracker_flaws: Dict[str, List] = field(default_factory=dict)
+    first_fix_flaw_ids: List = field(default_factory=list)
+    # Only gathered if golang trackers are attached
+    go_nvr_map: Optional[GoNVRMap] = None
+
+    def is_editable(self) -> bool:
+        return self.status in {"NEW_FILES", "QE"}
+
+    def to_dict(self) -> Dict:
+        data = dict(self.__dict__)
+        if self.go_nvr_map is not None:
+            data["go_nvr_map"] = {builder: sorted(map(list, nvrs)) for builder, nvrs in self.go_nvr_map.items()}
+        return data
+
+    @classmethod
+    def from_dict(cls, data: Dict) -> "AdvisorySnapshot":
+        data = dict(data)
+        if data.get("go_nvr_map") is not None:
+            data["go_nvr_map"] = {builder: set(map(tuple, nvrs)) for builder, nvrs in data["go_nvr_map"].items()}
+        return cls(**data)
+
+
+@dataclass
+class VerificationSnapshot:
+    advisories: Dict[int, AdvisorySnapshot]
+    # Tracker type -> str(bug id) -> attached bug
+    bugs: Dict[str, Dict[str, Bug]]
+    # str(id) -> flaw bug referenced by attached trackers, from the bugzilla tracker
+    flaws: Dict[str, Bug] = field(default_factory=dict)
+    # Tracker type -> str(bug id) -> advisories an attached bug is attached to; None if not gathered
+    attachments: Optional[Dict[str, Dict[str, List[int]]]] = None
+
+    def attached_bugs(self, advisory_id: int) -> Set[Bug]:
+        """:return: The bugs attached to an advisory that could be fetched from their trackers"""
+        advisory = self.advisories[advisory_id]
+        return {
+            self.bugs[tracker_type][str(bug_id)]
+            for tracker_type, bug_ids in advisory.bug_ids.items()
+            for bug_id in bug_ids
+            if str(bug_id) in self.bugs.get(tracker_type, {})
+        }
+
+    def advisory_bugs(self) -> Dict[int, Set[Bug]]:
+        """:return: advisory id -> the bugs attached to it"""
+        return {advisory_id: self.attached_bugs(advisory_id) for advisory_id in self.advisories}
+
+    def advisories_of(self, tracker_type: str, bug_id) -> List[int]:
+        """:return: The advisories a bug is attached to"""
+        return self.attachments[tracker_type].get(str(bug_id), [])
+
+    def to_dict(self) -> Dict:
+        """:return: The snapshot as JSON-serializable data"""
+        return {
+            "advisories": [advisory.to_dict() for advisory in self.advisories.values()],
+            "bugs": {
+                tracker_type: [bug.raw_data() for bug in bugs.values()] for tracker_type, bugs in self.bugs.items()
+            },
+            "flaws": [flaw.raw_data() for flaw in self.flaws.values()],
+            "attachments": self.attachments,
+        }
+
+    @classmethod
+    def from_dict(cls, data: Dict, bug_trackers: Dict[str, BugTracker]) -> "VerificationSnapshot":
+        """
+        :param data: The result of to_dict
+        :param bug_trackers: Tracker type -> tracker to rebuild bugs with; they aren't asked for anything
+        """
+
+        def _bugs(tracker_type: str, raw_bugs: Iterable[Dict]) -> Dict[str, Bug]:
+            bugs = (bug_trackers[tracker_type].bug_from_raw(raw) for raw in raw_bugs)
+            return {str(bug.id): bug for bug in bugs}
+
+        advisories = (AdvisorySnapshot.from_dict(advisory) for advisory in data["advisories"])
+        return cls(
+            advisories={advisory.advisory_id: advisory for advisory in advisories},
+            bugs={tracker_type: _bugs(tracker_type, raw_bugs) for tracker_type, raw_bugs in data["bugs"].items()},
+            flaws=_bugs("bugzilla", data["flaws"]),
+            attachments=data["attachments"],
+        )
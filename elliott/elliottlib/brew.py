@@ -22,10 +22,13 @@ from tenacity import retry, stop_after_attempt, wait_fixed
 
 # ours
 from elliottlib import constants, exceptions
-from elliottlib.util import total_size
+from elliottlib.util import chunk, total_size
 
 logger = logutil.get_logger(__name__)
 
+# Maximum number of calls in one Koji multicall
+MULTICALL_CHUNK_SIZE = 500
+
 
 def get_tagged_builds(
     tag_component_tuples: Iterable[Tuple[str, Optional[str]]],
@@ -133,10 +136,12 @@ def get_build_objects(ids_or_nvrs, session=None):
     if not session:
         session = koji.ClientSession(constants.BREW_HUB)
     # Use Koji multicall interface to boost performance. See https://pagure.io/koji/pull-request/957
+    # Calls are sent in chunks so that hundreds of builds don't make one huge request and response
     tasks = []
-    with session.multicall(strict=True) as m:
-        for b in ids_or_nvrs:
-            tasks.append(m.getBuild(b))
+    for ids_or_nvrs_chunk in chunk(list(ids_or_nvrs), MULTICALL_CHUNK_SIZE):
+        with session.multicall(strict=True) as m:
+            for b in ids_or_nvrs_chunk:
+                tasks.append(m.getBuild(b))
     return [task.result for task in tasks]
 
 
@@ -196,8 +201,9 @@ def get_brew_build(nvr, product_version='', session=None):
         raise exceptions.BrewBuildException("{build}: {msg}".format(build=nvr, msg=res.text))
 
 
-def get_nvr_arch_log(name, version, release, arch='x86_64'):
-    log_url = '{host}/packages/{name}/{version}/{release}/data/logs/{arch}.log'.format(
+def nvr_arch_log_url(name, version, release, arch='x86_64'):
+    """:return: The URL of the build log of a container build for an arch"""
+    return '{host}/packages/{name}/{version}/{release}/data/logs/{arch}.log'.format(
         host=constants.BREW_DOWNLOAD_URL,
         name=name,
         version=version,
@@ -205,6 +211,10 @@ def get_nvr_arch_log(name, version, release, arch='x86_64'):
         arch=arch,
     )
 
+
+def get_nvr_arch_log(name, version, release, arch='x86_64'):
+    log_url = nvr_arch_log_url(name, version, release, arch)
+
     logger.debug(f"Trying {log_url}")
     res = requests.get(log_url, verify=ssl.get_default_verify_paths().openssl_cafile)
     if res.status_code != 200:
@@ -212,7 +222,8 @@ def get_nvr_arch_log(name, version, release, arch='x86_64'):
     return res.text
 
 
-def get_nvr_root_log(name, version, release, arch='x86_64'):
+def nvr_root_log_url(name, version, release, arch='x86_64'):
+    """:return: The URL of the root.log (buildroot installation log) of an RPM build for an arch"""
     tmp = re.search(r'\.el(\d+)', release)
     try:
         rhel_version = int(tmp.groups()[0])
@@ -221,7 +232,11 @@ def get_nvr_root_log(name, version, release, arch='x86_64'):
         logger.warning("Assuming rhel-8")
         rhel_version = 8
 
-    root_log_url = f'{constants.BREW_DOWNLOAD_URL}/vol/rhel-{rhel_version}/packages/{name}/{version}/{release}/data/logs/{arch}/root.log'
+    return f'{constants.BREW_DOWNLOAD_URL}/vol/rhel-{rhel_version}/packages/{name}/{version}/{release}/data/logs/{arch}/root.log'
+
+
+def get_nvr_root_log(name, version, release, arch='x86_64'):
+    root_log_url = nvr_root_log_url(name, version, release, arch)
 
     logger.debug(f"Trying {root_log_url}")
     res = requests.get(root_log_url, verify=ssl.get_default_verify_paths().openssl_cafile)
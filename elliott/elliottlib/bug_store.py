@@ -0,0 +1,219 @@
+"""
+A local SQLite store of the bugs returned by bug tracker searches, shared by the elliott commands run on a host.
+
+Commands like find-bugs:sweep and verify-attached-bugs repeat the same broad searches every few minutes.
+The store remembers which bugs each search returned. A search repeated within max_age seconds is answered
+locally. After that, only bugs that changed since the last sync are fetched again (updated >= ... in JIRA,
+last_change_time in Bugzilla), instead of running the whole search again.
+
+Searches are not evaluated locally: a search only changes when a bug it returned changed, or when a bug
+that changed now matches the search. Both kinds of change show up when looking for changed bugs.
+"""
+
+import json
+import os
+import sqlite3
+import threading
+import time
+import xmlrpc.client
+from typing import Any, Callable, Dict, Iterable, List, Optional, Set
+
+from artcommonlib import logutil
+
+from elliottlib import constants
+
+logger = logutil.get_logger(__name__)
+
+# Bump when the format of stored bugs changes
+_SCHEMA_VERSION = 1
+
+# Functions the trackers provide to the store:
+# fetch(query, since) -> id -> raw bug of the bugs matching the search, only those changed since `since` if not None
+Fetch = Callable[[Any, Optional[float]], Dict[str, Dict]]
+# changed_ids(since) -> the ids of all bugs of the tracker's project/product changed since `since`
+ChangedIds = Callable[[float], Set[str]]
+# changed_among(ids, since) -> the ids of those of the given bugs that changed since `since`
+ChangedAmong = Callable[[List[str], float], Set[str]]
+# fetch_ids(ids) -> id -> raw bug of the given bugs that exist
+FetchIds = Callable[[List[str]], Dict[str, Dict]]
+
+
+def _encode(obj):
+    # Bugzilla returns timestamps as XML-RPC DateTime objects
+    if isinstance(obj, xmlrpc.client.DateTime):
+        return {"__xmlrpc_datetime__": obj.value}
+    raise TypeError(f"Object of type {type(obj).__name__} is not JSON serializable")
+
+
+def _decode(obj: Dict):
+    if "__xmlrpc_datetime__" in obj:
+        return xmlrpc.client.DateTime(obj["__xmlrpc_datetime__"])
+    return obj
+
+
+class BugStore:
+    """Bugs and search results of bug trackers, stored in an SQLite database."""
+
+    # Seconds after which stored bugs are no longer updated incrementally, but fetched again
+    MAX_INCREMENTAL_AGE = 24 * 60 * 60
+
+    def __init__(self, path: str, max_age: float = 300):
+        """
+        :param path: Path of the database
+        :param max_age: Seconds a search or bug is used without checking the tracker for changes
+        """
+        self.path = path
+        self.max_age = max_age
+        self._lock = threading.Lock()
+        self._db = sqlite3.connect(path, timeout=60, check_same_thread=False, isolation_level=None)
+        with self._lock:
+            self._db.execute("PRAGMA journal_mode=WAL")
+            self._db.executescript(
+                f"""
+                CREATE TABLE IF NOT EXISTS bugs_v{_SCHEMA_VERSION} (
+                    tracker TEXT, fields TEXT, id TEXT, data TEXT, synced REAL,
+                    PRIMARY KEY (tracker, fields, id)
+                );
+                CREATE TABLE IF NOT EXISTS searches_v{_SCHEMA_VERSION} (
+                    tracker TEXT, fields TEXT, query TEXT, ids TEXT, synced REAL,
+                    PRIMARY KEY (tracker, fields, query)
+                );
+                """
+            )
+
+    def close(self):
+        self._db.close()
+
+    def _execute(self, sql: str, params: Iterable = ()) -> List[tuple]:
+        sql = sql.format(v=_SCHEMA_VERSION)
+        with self._lock:
+            return self._db.execute(sql, tuple(params)).fetchall()
+
+    def _put_bugs(self, tracker: str, fields: str, bugs: Dict[str, Dict], synced: float):
+        if not bugs:
+            return
+        rows = [(tracker, fields, bug_id, json.dumps(data, default=_encode), synced) for bug_id, data in bugs.items()]
+        with self._lock:
+            self._db.executemany(f"INSERT OR REPLACE INTO bugs_v{_SCHEMA_VERSION} VALUES (?, ?, ?, ?, ?)", rows)
+
+    def _load_bugs(self, tracker: str, fields: str, ids: Iterable[str]) -> Dict[str, tuple]:
+        """:return: id -> (raw bug, time it was synced) of the given bugs that are stored"""
+        ids = list(ids)
+        rows = []
+        # Stay below SQLite's limit on the number of query parameters
+        for start in range(0, len(ids), 500):
+            batch = ids[start : start + 500]
+            rows += self._execute(
+                "SELECT id, data, synced FROM bugs_v{v} WHERE tracker = ? AND fields = ? "
+                f"AND id IN ({','.join('?' * len(batch))})",
+                [tracker, fields, *batch],
+            )
+        return {bug_id: (json.loads(data, object_hook=_decode), synced) for bug_id, data, synced in rows}
+
+    def _touch_bugs(self, tracker: str, fields: str, ids: Iterable[str], synced: float):
+        with self._lock:
+            self._db.executemany(
+                f"UPDATE bugs_v{_SCHEMA_VERSION} SET synced = ? WHERE tracker = ? AND fields = ? AND id = ?",
+                [(synced, tracker, fields, bug_id) for bug_id in ids],
+            )
+
+    def forget(self, tracker: str, bug_id):
+        """Drop a bug, e.g. after changing it, so that it is fetched again the next time it's needed."""
+        self._execute("DELETE FROM bugs_v{v} WHERE tracker = ? AND id = ?", [tracker, str(bug_id)])
+
+    def search(
+        self, tracker: str, fields: str, query, fetch: Fetch, changed_ids: ChangedIds, fetch_ids: FetchIds
+    ) -> Dict[str, Dict]:
+        """
+        Run a search, using the stored results where possible.
+        :param tracker: Bug tracker type
+        :param fields: The fields the tracker fetches for the bugs; bugs with other fields are stored separately
+        :param query: The search; its str() identifies it
+        :return: id -> raw bug of the bugs matching the search
+        """
+        now = time.time()
+        rows = self._execute(
+            "SELECT ids, synced FROM searches_v{v} WHERE tracker = ? AND fields = ? AND query = ?",
+            [tracker, fields, str(query)],
+        )
+        last_ids, last_sync = (set(json.loads(rows[0][0])), rows[0][1]) if rows else (None, None)
+
+        if last_ids is not None and now - last_sync < self.max_age:
+            bugs = self._load_bugs(tracker, fields, last_ids)
+            if len(bugs) == len(last_ids):
+                logger.debug("Using %s stored results of %s", len(bugs), query)
+                return {bug_id: data for bug_id, (data, _) in bugs.items()}
+
+        if last_ids is None or now - last_sync > self.MAX_INCREMENTAL_AGE:
+            found = fetch(query, None)
+            ids = set(found)
+        else:
+            # Look for changed bugs first: a bug changing in between is then fetched again by the search if it
+            # still matches, and found by the next sync otherwise
+            changed = changed_ids(last_sync)
+            found = fetch(query, last_sync)
+            # Bugs that changed and don't match the search anymore are dropped
+            ids = (last_ids - changed) | set(found)
+            logger.info("%s bugs changed since the last search; %s of them match %s", len(changed), len(found), query)
+        self._put_bugs(tracker, fields, found, now)
+
+        bugs = {bug_id: data for bug_id, (data, _) in self._load_bugs(tracker, fields, ids).items()}
+        missing = ids - set(bugs)
+        if missing:
+            fetched = fetch_ids(sorted(missing))
+            self._put_bugs(tracker, fields, fetched, now)
+            bugs.update(fetched)
+        self._execute(
+            "INSERT OR REPLACE INTO searches_v{v} VALUES (?, ?, ?, ?, ?)",
+            [tracker, fields, str(query), json.dumps(sorted(bugs)), now],
+        )
+        return bugs
+
+    def get_bugs(
+        self, tracker: str, fields: str, ids: Iterable[str], changed_among: ChangedAmong, fetch_ids: FetchIds
+    ) -> Dict[str, Dict]:
+        """
+        Get bugs by id, using the stored bugs where possible.
+        Stored bugs are checked for changes by id, since they can belong to any project/product (e.g. flaw bugs).
+        :return: id -> raw bug of the bugs that exist
+        """
+        now = time.time()
+        ids = set(ids)
+        stored = self._load_bugs(tracker, fields, ids)
+        bugs = {bug_id: data for bug_id, (data, synced) in stored.items() if now - synced < self.max_age}
+
+        stale = {bug_id: synced for bug_id, (_, synced) in stored.items() if bug_id not in bugs}
+        since = min(stale.values(), default=now)
+        if stale and now - since <= self.MAX_INCREMENTAL_AGE:
+            unchanged = set(stale) - changed_among(sorted(stale), since)
+            self._touch_bugs(tracker, fields, unchanged, now)
+            bugs.update({bug_id: stored[bug_id][0] for bug_id in unchanged})
+
+        missing = ids - set(bugs)
+        if missing:
+            fetched = fetch_ids(sorted(missing))
+            self._put_bugs(tracker, fields, fetched, now)
+            bugs.update(fetched)
+        logger.debug("Fetched %s of %s bugs", len(missing), len(ids))
+        return bugs
+
+
+_stores: Dict[str, BugStore] = {}
+_stores_lock = threading.Lock()
+
+
+def default_store() -> Optional[BugStore]:
+    """
+    :return: The store in the directory named by ART_BUG_STORE_DIR, shared by the trackers of this process;
+        None if the variable isn't set
+    """
+    store_dir = os.environ.get(constants.BUG_STORE_DIR_ENV)
+    if not store_dir:
+        return None
+    with _stores_lock:
+        store = _stores.get(store_dir)
+        if not store:
+            os.makedirs(store_dir, exist_ok=True)
+            max_age = float(os.environ.get(constants.BUG_STORE_MAX_AGE_ENV, 300))
+            store = _stores[store_dir] = BugStore(os.path.join(store_dir, "bugs.sqlite"), max_age)
+        return store
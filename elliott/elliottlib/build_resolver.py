@@ -0,0 +1,123 @@
+"""
+Resolve many Brew builds at once, as Brew and Errata Tool know them.
+
+Brew builds are fetched with chunked Koji multicalls. Errata Tool has no bulk build endpoint, so
+its view of builds is fetched with concurrent requests over one connection pool instead.
+Results are cached for the life of the process, so that commands run in the same process
+(e.g. by pyartcd) don't ask for the same builds again.
+"""
+
+import asyncio
+import copy
+from typing import Dict, Iterable, List, Optional, Sequence, Set, Tuple, Union
+
+import koji
+from aiohttp import ClientResponseError
+from artcommonlib import logutil
+
+from elliottlib import brew, constants, exceptions
+from elliottlib.errata_async import AsyncErrataAPI
+
+_LOGGER = logutil.get_logger(__name__)
+
+# (name, version, release, product version) of a build to attach
+NVRP = Tuple[str, str, str, Optional[str]]
+
+
+class BuildResolver:
+    """Fetches builds in bulk and caches them by NVR and id."""
+
+    def __init__(self, errata_url: str = constants.errata_url, max_connections: int = 16):
+        """
+        :param errata_url: Errata Tool URL
+        :param max_connections: Maximum number of concurrent requests to Errata Tool
+        """
+        self._errata_url = errata_url
+        self._max_connections = max_connections
+        # NVR or id -> Brew buildinfo
+        self._brew_builds: Dict[Union[str, int], Dict] = {}
+        # NVR -> Errata Tool build
+        self._errata_builds: Dict[str, Dict] = {}
+        # NVRs of builds whose RPMs are known to be signed
+        self._signed: Set[str] = set()
+
+    def forget(self, nvrs: Iterable[str]):
+        """Drop what is known about builds whose Errata Tool state changed, e.g. after attaching them"""
+        for nvr in nvrs:
+            self._errata_builds.pop(nvr, None)
+            self._signed.discard(nvr)
+
+    def get_build_objects(
+        self, ids_or_nvrs: Sequence[Union[str, int]], session: Optional[koji.ClientSession] = None
+    ) -> List[Optional[Dict]]:
+        """
+        Like brew.get_build_objects, but only asks Brew for builds that weren't fetched before.
+        :return: A copy of the buildinfo of each build, or None for builds that don't exist
+        """
+        ids_or_nvrs = list(ids_or_nvrs)
+        missing = list(dict.fromkeys(b for b in ids_or_nvrs if b not in self._brew_builds))
+        if missing:
+            _LOGGER.debug("Fetching %s of %s builds from Brew", len(missing), len(ids_or_nvrs))
+            for build in brew.get_build_objects(missing, session):
+                # Builds that don't exist yet may exist later, so they aren't cached
+                if build:
+                    self._brew_builds[build["id"]] = self._brew_builds[build["nvr"]] = build
+        return [copy.deepcopy(self._brew_builds.get(b)) for b in ids_or_nvrs]
+
+    async def get_errata_builds(self, nvrs: Iterable[str]) -> Dict[str, Dict]:
+        """
+        Fetch builds from Errata Tool concurrently.
+        :return: NVR -> build as returned by /api/v1/build/{nvr}
+        :raises exceptions.BrewBuildException: If Errata Tool doesn't know a build
+        """
+        nvrs = list(dict.fromkeys(nvrs))
+        missing = [nvr for nvr in nvrs if nvr not in self._errata_builds]
+        if missing:
+            _LOGGER.debug("Fetching %s of %s builds from Errata Tool", len(missing), len(nvrs))
+            async with AsyncErrataAPI(self._errata_url, self._max_connections, cache=False) as api:
+
+                async def _get(nvr: str):
+                    try:
+                        self._errata_builds[nvr] = await api.get_brew_build(nvr)
+                    except ClientResponseError as e:
+                        raise exceptions.BrewBuildException(f"{nvr}: {e.message}")
+
+                await asyncio.gather(*(_get(nvr) for nvr in missing))
+        return {nvr: copy.deepcopy(self._errata_builds[nvr]) for nvr in nvrs}
+
+    async def get_brew_builds(self, nvrps: Iterable[NVRP]) -> List[brew.Build]:
+        """
+        Bulk version of errata.get_brew_build.
+        :param nvrps: (name, version, release, product version) of each build
+        :return: A Build for each of nvrps, in the same order
+        """
+        nvrps = list(nvrps)
+        nvrs = [f"{n}-{v}-{r}" for n, v, r, _ in nvrps]
+        errata_builds = await self.get_errata_builds(nvrs)
+        return [
+            brew.Build(nvr=nvr, body=errata_builds[nvr], product_version=pv) for nvr, (_, _, _, pv) in zip(nvrs, nvrps)
+        ]
+
+    async def builds_signed(self, nvrs: Iterable[str]) -> Dict[str, bool]:
+        """
+        Check whether the RPMs of builds are signed.
+        Builds that aren't signed yet are asked about again on every call.
+        :return: NVR -> whether the build is signed
+        """
+        nvrs = list(dict.fromkeys(nvrs))
+        unknown = [nvr for nvr in nvrs if nvr not in self._signed]
+        self.forget(unknown)
+        errata_builds = await self.get_errata_builds(unknown)
+        self._signed.update(nvr for nvr, build in errata_builds.items() if build["rpms_signed"])
+        return {nvr: nvr in self._signed for nvr in nvrs}
+
+
+_resolver: Optional[BuildResolver] = None
+
+
+def get_resolver() -> BuildResolver:
+    """:return: The resolver shared by everything in this process"""
+    global _resolver
+    if _resolver is None:
+        _resolver = BuildResolver()
+    return _resolver
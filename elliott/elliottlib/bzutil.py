@@ -5,17 +5,22 @@ with BugTrackers
 
 import asyncio
 import itertools
+import math
 import os
 import re
+import time
 import urllib.parse
 import xmlrpc.client
 from datetime import datetime, timezone
+from multiprocessing.dummy import Pool as ThreadPool
 from time import sleep
-from typing import Dict, Iterable, List, Optional
+from typing import Dict, Iterable, List, Optional, Set
 
 import bugzilla
 import requests
 from artcommonlib import exectools, logutil
+from artcommonlib.file_cache import JsonFileCache
+from bugzilla.bug import Bug as BugzillaBugObject
 from errata_tool import Erratum
 from errata_tool.bug import Bug as ErrataBug
 from errata_tool.jira_issue import JiraIssue as ErrataJira
@@ -24,9 +29,9 @@ from koji import ClientSession
 from requests_gssapi import HTTPSPNEGOAuth
 from tenacity import retry, stop_after_attempt, wait_fixed
 
-from elliottlib import constants, errata, exceptions, util
+from elliottlib import bug_store, constants, errata, exceptions, util
 from elliottlib.cli import cli_opts
-from elliottlib.errata_async import AsyncErrataAPI
+from elliottlib.errata_async import AdvisoryAttachmentIndex, AsyncErrataAPI
 from elliottlib.metadata import Metadata
 from elliottlib.util import chunk, isolate_timestamp_in_release
 
@@ -59,6 +64,10 @@ class Bug:
     def id(self):
         raise NotImplementedError
 
+    def raw_data(self) -> Dict:
+        """:return: The data the tracker returned for the bug, as accepted by BugTracker.bug_from_raw"""
+        raise NotImplementedError
+
     def created_days_ago(self):
         created_date = self.creation_time_parsed()
         return (datetime_now() - created_date).days
@@ -177,6 +186,9 @@ class BugzillaBug(Bug):
     def id(self):
         return self.bug.id
 
+    def raw_data(self) -> Dict:
+        return self.bug.get_raw_data()
+
     @property
     def product(self):
         return self.bug.product
@@ -254,6 +266,9 @@ class JIRABug(Bug):
     def id(self):
         return self.bug.key
 
+    def raw_data(self) -> Dict:
+        return self.bug.raw
+
     @property
     def weburl(self):
         return self.bug.permalink()
@@ -498,6 +513,8 @@ class BugTracker:
         self.config = config
         self._server = self.config.get('server', '')
         self.type = tracker_type
+        # Local store of bugs and search results; None if searches always go to the tracker
+        self._store: Optional[bug_store.BugStore] = bug_store.default_store()
 
     def component_filter(self, filter_name='default') -> List:
         return self.config.get('filters', {}).get(filter_name)
@@ -520,6 +537,10 @@ class BugTracker:
     def get_bugs(self, bugids: List, permissive=False, **kwargs):
         raise NotImplementedError
 
+    def bug_from_raw(self, raw: Dict) -> Bug:
+        """Rebuild a bug from the data the tracker returned for it, see Bug.raw_data"""
+        raise NotImplementedError
+
     def get_bugs_map(self, bugids: List, permissive: bool = False, **kwargs) -> Dict:
         id_bug_map = {}
         if not bugids:
@@ -574,6 +595,8 @@ class BugTracker:
             logger.info(f"Would have {action}")
         else:
             self._update_bug_status(bug.id, target_status)
+            if self._store:
+                self._store.forget(self.type, bug.id)
             logger.info(action)
 
         comment_lines = []
@@ -587,19 +610,27 @@ class BugTracker:
 
     @staticmethod
     def get_corresponding_flaw_bugs(
-        tracker_bugs: List[Bug], flaw_bug_tracker, brew_api, strict: bool = True, verbose: bool = False
+        tracker_bugs: List[Bug],
+        flaw_bug_tracker,
+        brew_api,
+        strict: bool = True,
+        verbose: bool = False,
+        flaw_bugs: Optional[Iterable[Bug]] = None,
     ) -> (Dict, Dict):
         """Get corresponding flaw bug objects for given list of tracker bug objects.
         flaw_bug_tracker object to fetch flaw bugs from
+        flaw_bugs: flaw bugs fetched beforehand, e.g. for the trackers of several advisories at once;
+        fetched from flaw_bug_tracker if None
 
         :return: (tracker_flaws, flaw_id_bugs): tracker_flaws is a dict with tracker bug id as key and list of flaw
         bug id as value, flaw_id_bugs is a dict with flaw bug id as key and flaw bug object as value
         """
         bug_tracker = flaw_bug_tracker
-        flaw_bugs = bug_tracker.get_flaw_bugs(
-            list(set(sum([t.corresponding_flaw_bug_ids for t in tracker_bugs], []))),
-            verbose=verbose,
-        )
+        flaw_bug_ids = list(set(sum([t.corresponding_flaw_bug_ids for t in tracker_bugs], [])))
+        if flaw_bugs is None:
+            flaw_bugs = bug_tracker.get_flaw_bugs(flaw_bug_ids, verbose=verbose)
+        else:
+            flaw_bugs = [b for b in flaw_bugs if b.id in flaw_bug_ids]
         flaw_tracker_map = {bug.id: {'bug': bug, 'trackers': []} for bug in flaw_bugs}
 
         # Validate that each tracker has a corresponding flaw bug
@@ -661,6 +692,10 @@ class BugTracker:
 
 class JIRABugTracker(BugTracker):
     JIRA_BUG_BATCH_SIZE = 50
+    # Maximum number of chunks of bugs fetched concurrently by get_bugs
+    JIRA_SEARCH_CONCURRENCY = 4
+    # Seconds for which the mapping of field names to ids cached on disk is used
+    JIRA_FIELDS_CACHE_TTL = 24 * 60 * 60
 
     # There are several @property function defined, which requires the values to be available at compile time
     # We later override them at runtime, so that if the field name changes, we'll still get the updated one
@@ -694,17 +729,62 @@ class JIRABugTracker(BugTracker):
         client = JIRA(self._server, token_auth=token_auth)
         return client
 
+    # Names of the custom fields JIRABug reads, and the attributes holding their ids
+    _CUSTOM_FIELD_NAMES = {
+        'Target Version': 'field_target_version',
+        'Release Blocker': 'field_release_blocker',
+        'Blocked Reason': 'field_blocked_reason',
+        'Severity': 'field_severity',
+    }
+
+    # Standard fields JIRABug reads; searches only request these and the custom fields above
+    # instead of every field of every issue (comments, descriptions etc.)
+    _BUG_FIELDS = (
+        'summary',
+        'labels',
+        'status',
+        'resolution',
+        'components',
+        'versions',
+        'fixVersions',
+        'security',
+        'issuetype',
+        'issuelinks',
+        'project',
+        'priority',
+        'created',
+        'updated',
+    )
+
+    def _load_field_ids(self) -> Dict[str, str]:
+        """
+        :return: Dict of field name -> field id for the custom fields JIRABug reads.
+            Cached on disk if a cache root is set (see artcommonlib.file_cache), since listing all fields is slow.
+        """
+        cache = JsonFileCache.named("jira-fields", max_age=self.JIRA_FIELDS_CACHE_TTL)
+        key = urllib.parse.quote(self._server or "default", safe="")
+        field_ids = cache.get(key)
+        if field_ids is None:
+            field_ids = {f['name']: f['id'] for f in self._client.fields() if f['name'] in self._CUSTOM_FIELD_NAMES}
+            cache.put(key, field_ids)
+        return field_ids
+
     @retry(reraise=True, stop=stop_after_attempt(10), wait=wait_fixed(30))
     def _init_fields(self):
-        for f in self._client.fields():
-            if f['name'] == 'Target Version':
-                self.field_target_version = f['id']
-            if f['name'] == 'Release Blocker':
-                self.field_release_blocker = f['id']
-            if f['name'] == 'Blocked Reason':
-                self.field_blocked_reason = f['id']
-            if f['name'] == 'Severity':
-                self.field_severity = f['id']
+        for name, field_id in self._load_field_ids().items():
+            setattr(self, self._CUSTOM_FIELD_NAMES[name], field_id)
+
+    def bug_fields(self) -> List[str]:
+        """:return: The fields to request for issues so that JIRABug can read them"""
+        return list(self._BUG_FIELDS) + [
+            self.field_target_version,
+            self.field_release_blocker,
+            self.field_blocked_reason,
+            self.field_severity,
+            self.field_cve_id,
+            self.field_cve_component,
+            self.field_cve_is_embargo,
+        ]
 
     def __init__(self, config):
         super().__init__(config, 'jira')
@@ -733,14 +813,17 @@ class JIRABugTracker(BugTracker):
         if not bugids:
             return []
 
-        # Split the request in chunks, in order not to fall into
-        # jira.exceptions.JIRAError for request header size too large
-        bugs = []
-        for chunk_of_bugs in chunk(list(bugids), self.JIRA_BUG_BATCH_SIZE):
-            query = self._query(bugids=chunk_of_bugs, with_target_release=False)
-            if verbose:
-                logger.info(query)
-            bugs.extend(self._search(query))
+        if self._store:
+            raw_bugs = self._store.get_bugs(
+                self.type,
+                self._store_fields(),
+                bugids,
+                self._store_changed_among,
+                lambda ids: {b.id: b.bug.raw for b in self._fetch_bugs(ids, verbose=verbose)},
+            )
+            bugs = [self.bug_from_raw(raw_bugs[b]) for b in bugids if b in raw_bugs]
+        else:
+            bugs = self._fetch_bugs(bugids, verbose=verbose)
 
         if len(bugs) < len(bugids):
             bugids_not_found = set(bugids) - {b.id for b in bugs}
@@ -751,6 +834,20 @@ class JIRABugTracker(BugTracker):
                 logger.warn(msg)
         return bugs
 
+    def _fetch_bugs(self, bugids: List[str], verbose=False) -> List[JIRABug]:
+        # Split the request in chunks, in order not to fall into
+        # jira.exceptions.JIRAError for request header size too large
+        queries = [
+            self._query(bugids=chunk_of_bugs, with_target_release=False)
+            for chunk_of_bugs in chunk(list(bugids), self.JIRA_BUG_BATCH_SIZE)
+        ]
+        if len(queries) == 1:
+            results = [self._search(queries[0], verbose=verbose)]
+        else:
+            with ThreadPool(min(self.JIRA_SEARCH_CONCURRENCY, len(queries))) as pool:
+                results = pool.map(lambda query: self._search(query, verbose=verbose), queries)
+        return [bug for result in results for bug in result]
+
     def get_bug_remote_links(self, bug: JIRABug):
         remote_links = self._client.remote_links(bug)
         link_dict = {}
@@ -835,9 +932,53 @@ class JIRABugTracker(BugTracker):
     def _search(self, query, verbose=False) -> List[JIRABug]:
         if verbose:
             logger.info(query)
-        results = self._client.search_issues(query, maxResults=0)
+        results = self._client.search_issues(query, maxResults=0, fields=self.bug_fields())
         return [JIRABug(j) for j in results]
 
+    def _stored_search(self, query, verbose=False) -> List[JIRABug]:
+        """Like _search, but answered from the local bug store where possible"""
+        if not self._store:
+            return self._search(query, verbose=verbose)
+        if verbose:
+            logger.info(query)
+        raw_bugs = self._store.search(
+            self.type,
+            self._store_fields(),
+            query,
+            self._store_fetch,
+            self._store_changed_ids,
+            lambda ids: {b.id: b.bug.raw for b in self._fetch_bugs(ids)},
+        )
+        return [self.bug_from_raw(raw) for raw in raw_bugs.values()]
+
+    def _store_fields(self) -> str:
+        return ','.join(self.bug_fields())
+
+    def bug_from_raw(self, raw: Dict) -> JIRABug:
+        return JIRABug(Issue(self._client._options, self._client._session, raw=raw))
+
+    @staticmethod
+    def _updated_since(since: float) -> str:
+        # Relative dates don't depend on the time zone of the JIRA user; allow a minute of clock skew
+        minutes = math.ceil((time.time() - since) / 60) + 1
+        return f'updated >= "-{minutes}m"'
+
+    def _store_fetch(self, query: str, since: Optional[float]) -> Dict[str, Dict]:
+        if since is not None:
+            query = f"({query}) and {self._updated_since(since)}"
+        return {b.id: b.bug.raw for b in self._search(query)}
+
+    def _store_changed_ids(self, since: float) -> Set[str]:
+        query = f"project={self._project} and {self._updated_since(since)}"
+        return {issue.key for issue in self._client.search_issues(query, maxResults=0, fields='key')}
+
+    def _store_changed_among(self, ids: List[str], since: float) -> Set[str]:
+        changed = set()
+        for chunk_of_ids in chunk(ids, self.JIRA_BUG_BATCH_SIZE):
+            query = f"project={self._project} and issue in ({','.join(chunk_of_ids)}) and {self._updated_since(since)}"
+            changed.update(issue.key for issue in self._client.search_issues(query, maxResults=0, fields='key'))
+        return changed
+
     def blocker_search(self, status, search_filter='default', verbose=False, **kwargs):
         query = self._query(
             status=status,
@@ -845,14 +986,14 @@ class JIRABugTracker(BugTracker):
             search_filter=search_filter,
             custom_query='and "Release Blocker" = "Approved"',
         )
-        return self._search(query, verbose=verbose, **kwargs)
+        return self._stored_search(query, verbose=verbose, **kwargs)
 
     def search(self, status, search_filter='default', verbose=False):
         query = self._query(
             status=status,
             search_filter=search_filter,
         )
-        return self._search(query, verbose=verbose)
+        return self._stored_search(query, verbose=verbose)
 
     def cve_tracker_search(self, status, search_filter='default', verbose=False):
         query = self._query(
@@ -860,7 +1001,7 @@ class JIRABugTracker(BugTracker):
             search_filter=search_filter,
             include_labels=["SecurityTracking"],
         )
-        return self._search(query, verbose=verbose)
+        return self._stored_search(query, verbose=verbose)
 
     def remove_bugs(self, advisory_obj, bugids: List, noop=False):
         if noop:
@@ -882,13 +1023,23 @@ class JIRABugTracker(BugTracker):
         query = f"issue in ({','.join([b.id for b in bugs])}) and status was in ({val}) on(\"{dt}\")"
         return self._search(query, verbose=verbose)
 
-    async def filter_attached_bugs(self, bugs: Iterable):
+    async def filter_attached_bugs(self, bugs: Iterable, index: Optional[AdvisoryAttachmentIndex] = None):
+        """
+        :param bugs: Bugs to check
+        :param index: Which open advisories of the product bugs are attached to. Only the bugs it doesn't list
+            are looked up in Errata Tool, since they may be attached to other advisories.
+        :return: The bugs that are attached to an advisory
+        """
         bugs = list(bugs)
+        indexed = {bug.id for bug in bugs if index is not None and index.is_attached(self.type, bug.id)}
+        unindexed = [bug for bug in bugs if bug.id not in indexed]
         api = AsyncErrataAPI()
-        results = await asyncio.gather(*[api.get_advisories_for_jira(bug.id, ignore_not_found=True) for bug in bugs])
-        attached_bugs = [bug for bug, advisories in zip(bugs, results) if advisories]
+        results = await asyncio.gather(
+            *[api.get_advisories_for_jira(bug.id, ignore_not_found=True) for bug in unindexed]
+        )
         await api.close()
-        return attached_bugs
+        found = {bug.id for bug, advisories in zip(unindexed, results) if advisories}
+        return [bug for bug in bugs if bug.id in indexed or bug.id in found]
 
     @staticmethod
     def advisory_bug_ids(advisory_obj):
@@ -942,7 +1093,17 @@ class BugzillaBugTracker(BugTracker):
         if 'verbose' in kwargs:
             if kwargs.pop('verbose'):
                 logger.info(f'get_bugs called with bugids: {bugids}, permissive: {permissive} and kwargs: {kwargs}')
-        bugs = [BugzillaBug(b) for b in self._client.getbugs(bugids, permissive=permissive, **kwargs)]
+        if self._store and set(kwargs) <= {'include_fields'}:
+            raw_bugs = self._store.get_bugs(
+                self.type,
+                ','.join(kwargs.get('include_fields') or ['*']),
+                [str(b) for b in bugids],
+                self._store_changed_among,
+                lambda ids: self._store_fetch_ids(ids, permissive=permissive, **kwargs),
+            )
+            bugs = [self.bug_from_raw(raw_bugs[str(b)]) for b in bugids if str(b) in raw_bugs]
+        else:
+            bugs = [BugzillaBug(b) for b in self._client.getbugs(bugids, permissive=permissive, **kwargs)]
         if len(bugs) < len(bugids):
             bugids_not_found = set(bugids) - {b.id for b in bugs}
             msg = f"Some bugs could not be fetched ({len(bugids) - len(bugs)}): {bugids_not_found}"
@@ -969,7 +1130,44 @@ class BugzillaBugTracker(BugTracker):
     def _search(self, query, verbose=False):
         if verbose:
             logger.info(query)
-        return [BugzillaBug(b) for b in _perform_query(self._client, query)]
+        if not self._store:
+            return [BugzillaBug(b) for b in _perform_query(self._client, query)]
+        fields = _query_fields(query)
+        raw_bugs = self._store.search(
+            self.type,
+            ','.join(fields),
+            query,
+            self._store_fetch,
+            self._store_changed_ids,
+            lambda ids: self._store_fetch_ids(ids, permissive=True, include_fields=fields),
+        )
+        return [self.bug_from_raw(raw) for raw in raw_bugs.values()]
+
+    def bug_from_raw(self, raw: Dict) -> BugzillaBug:
+        return BugzillaBug(BugzillaBugObject(self._client, dict=raw))
+
+    def _store_fetch(self, query, since: Optional[float]) -> Dict[str, Dict]:
+        return {str(b.id): b.get_raw_data() for b in _perform_query(self._client, query, last_change_time=since)}
+
+    def _store_fetch_ids(self, ids: List[str], **kwargs) -> Dict[str, Dict]:
+        return {str(b.id): b.get_raw_data() for b in self._client.getbugs([int(i) for i in ids], **kwargs)}
+
+    def _store_changed_ids(self, since: float) -> Set[str]:
+        query = {
+            'product': self.product,
+            'last_change_time': _bugzilla_time(since),
+            'include_fields': ['id'],
+        }
+        return {str(b.id) for b in _iterate_query(self._client, query)}
+
+    def _store_changed_among(self, ids: List[str], since: float) -> Set[str]:
+        # Not limited to the product: flaw bugs are in Security Response
+        query = {
+            'id': [int(i) for i in ids],
+            'last_change_time': _bugzilla_time(since),
+            'include_fields': ['id'],
+        }
+        return {str(b.id) for b in _iterate_query(self._client, query)}
 
     def remove_bugs(self, advisory_obj, bugids: List, noop=False):
         if noop:
@@ -1118,13 +1316,21 @@ class BugzillaBugTracker(BugTracker):
 
         return qualified_bugs
 
-    async def filter_attached_bugs(self, bugs: Iterable):
+    async def filter_attached_bugs(self, bugs: Iterable, index: Optional[AdvisoryAttachmentIndex] = None):
+        """
+        :param bugs: Bugs to check
+        :param index: Which open advisories of the product bugs are attached to. Only the bugs it doesn't list
+            are looked up in Errata Tool, since they may be attached to other advisories.
+        :return: The bugs that are attached to an advisory
+        """
         bugs = list(bugs)
+        indexed = {bug.id for bug in bugs if index is not None and index.is_attached(self.type, bug.id)}
+        unindexed = [bug for bug in bugs if bug.id not in indexed]
         api = AsyncErrataAPI()
-        results = await asyncio.gather(*[api.get_advisories_for_bug(bug.id) for bug in bugs])
-        attached_bugs = [bug for bug, advisories in zip(bugs, results) if advisories]
+        results = await asyncio.gather(*[api.get_advisories_for_bug(bug.id) for bug in unindexed])
         await api.close()
-        return attached_bugs
+        found = {bug.id for bug, advisories in zip(unindexed, results) if advisories}
+        return [bug for bug in bugs if bug.id in indexed or bug.id in found]
 
     @staticmethod
     def advisory_bug_ids(advisory_obj):
@@ -1234,27 +1440,39 @@ def _construct_query_url(config, status, search_filter='default', flag=None):
     return query_url
 
 
-def _perform_query(bzapi, query_url):
+def _bugzilla_time(timestamp: float) -> str:
+    # Allow a minute of clock skew
+    return datetime.fromtimestamp(timestamp - 60, tz=timezone.utc).strftime("%Y-%m-%dT%H:%M:%SZ")
+
+
+def _iterate_query(bzapi, query: Dict):
     BZ_PAGE_SIZE = 1000
+    query["limit"] = BZ_PAGE_SIZE
+    query["offset"] = 0
+    results = []
+    while True:
+        page = bzapi.query(query)
+        results += page
+        if len(page) < BZ_PAGE_SIZE:
+            return results
+        query['offset'] += BZ_PAGE_SIZE
 
-    def iterate_query(query):
-        results = bzapi.query(query)
 
-        if len(results) == BZ_PAGE_SIZE:
-            query['offset'] += BZ_PAGE_SIZE
-            results += iterate_query(query)
-        return results
+def _query_fields(query_url) -> List[str]:
+    """:return: The fields of the bugs returned for a query; only their ids if the query doesn't name any"""
+    return query_url.fields or ['id']
 
-    include_fields = query_url.fields
-    if not include_fields:
-        include_fields = ['id']
 
+def _perform_query(bzapi, query_url, last_change_time: Optional[float] = None):
+    """
+    :param last_change_time: Only return bugs changed since this timestamp
+    """
     query = bzapi.url_to_query(str(query_url))
-    query["include_fields"] = include_fields
-    query["limit"] = BZ_PAGE_SIZE
-    query["offset"] = 0
+    query["include_fields"] = _query_fields(query_url)
+    if last_change_time is not None:
+        query["last_change_time"] = _bugzilla_time(last_change_time)
 
-    return iterate_query(query)
+    return _iterate_query(bzapi, query)
 
 
 class SearchFilter(object):
@@ -10,12 +10,11 @@ web service.
 
 # Prepare for Python 3
 # stdlib
+import asyncio
 import datetime
 import json
 import logging
 import sys
-from multiprocessing import cpu_count
-from multiprocessing.dummy import Pool as ThreadPool
 from typing import Dict, List
 
 # 3rd party
@@ -32,6 +31,7 @@ import elliottlib.exceptions
 
 # ours
 from elliottlib import Runtime, util
+from elliottlib.build_resolver import get_resolver
 from elliottlib.cli import konflux_release_watch_cli
 from elliottlib.cli.advisory_commons_cli import advisory_commons_cli
 from elliottlib.cli.advisory_drop_cli import advisory_drop_cli
@@ -72,7 +72,6 @@ from elliottlib.cli.verify_attached_bugs_cli import verify_attached_bugs_cli
 from elliottlib.cli.verify_attached_operators_cli import verify_attached_operators_cli
 from elliottlib.cli.verify_cvp_cli import verify_cvp_cli
 from elliottlib.exceptions import ElliottFatalError
-from elliottlib.util import pbar_header, progress_func
 
 # -----------------------------------------------------------------------------
 # Constants and defaults
@@ -80,6 +79,9 @@ from elliottlib.util import pbar_header, progress_func
 pass_runtime = click.make_pass_decorator(Runtime)
 LOGGER = logging.getLogger(__name__)
 
+# Seconds between checks of poll-signed
+POLL_SIGNED_INTERVAL = 10
+
 
 #
 # Get an Advisory
@@ -247,9 +249,10 @@ async def verify_payload(runtime, payload_or_imagestream, advisory):
     if missing_in_errata:  # check if missing images are already shipped or pending to ship
         advisory_nvrs: Dict[int, List[str]] = {}  # a dict mapping advisory numbers to lists of NVRs
         green_print(f"Checking if {len(missing_in_errata)} missing images are shipped...")
+        missing_builds = await get_resolver().get_errata_builds(missing_in_errata.values())
         for nvr in missing_in_errata.copy().values():
             # get the list of advisories that this build has been attached to
-            build = elliottlib.errata.get_brew_build(nvr)
+            build = elliottlib.brew.Build(nvr=nvr, body=missing_builds[nvr])
             # filter out dropped advisories
             advisories = [ad for ad in build.all_errata if ad["status"] != "DROPPED_NO_SHIP"]
             if not advisories:
@@ -308,7 +311,8 @@ async def verify_payload(runtime, payload_or_imagestream, advisory):
     help="Don't actually poll, just print the signed status of each build",
 )
 @pass_runtime
-def poll_signed(runtime, minutes, advisory, default_advisory_type, noop):
+@click_coroutine
+async def poll_signed(runtime, minutes, advisory, default_advisory_type, noop):
     """Poll for the signed-status of RPM builds attached to
     ADVISORY. Returns rc=0 when all builds have been signed. Returns non-0
     after MINUTES have passed and all builds have not been signed. This
@@ -363,20 +367,12 @@ def poll_signed(runtime, minutes, advisory, default_advisory_type, noop):
         click.echo("{} builds to check".format(len(all_builds)))
         start_time = datetime.datetime.now()
         while datetime.datetime.now() - start_time < datetime.timedelta(minutes=minutes):
-            pbar_header("Getting build signatures: ", "Should be pretty quick", all_builds)
-            pool = ThreadPool(cpu_count())
-            # Look up builds concurrently
-            click.secho("[", nl=False)
-
-            build_sigs = pool.map(
-                lambda build: progress_func(lambda: elliottlib.errata.build_signed(build), '*'), all_builds
-            )
-            # Wait for results
-            pool.close()
-            pool.join()
-            click.echo(']')
+            green_prefix("Getting build signatures: ")
+            # Look up builds concurrently; builds already known to be signed aren't looked up again
+            build_sigs = await get_resolver().builds_signed(all_builds)
+            click.echo("{} of {} builds signed".format(sum(build_sigs.values()), len(build_sigs)))
 
-            if all(build_sigs):
+            if all(build_sigs.values()):
                 all_signed = True
                 break
             elif noop:
@@ -384,7 +380,8 @@ def poll_signed(runtime, minutes, advisory, default_advisory_type, noop):
                 break
             else:
                 yellow_prefix("Not all builds signed: ")
-                click.echo("re-checking")
+                click.echo("re-checking in {} seconds".format(POLL_SIGNED_INTERVAL))
+                await asyncio.sleep(POLL_SIGNED_INTERVAL)
                 continue
 
         if not all_signed:
@@ -1,7 +1,7 @@
 import logging
 import sys
 import traceback
-from typing import Dict, Iterable, List, Set
+from typing import Dict, Iterable, List, Optional, Set
 
 import click
 from artcommonlib import arch_util
@@ -118,7 +118,9 @@ def get_attached_trackers(advisory: Erratum, bug_tracker: BugTracker):
     return attached_tracker_bugs
 
 
-def get_flaws(flaw_bug_tracker: BugTracker, tracker_bugs: Iterable[Bug], brew_api) -> (Dict, List):
+def get_flaws(
+    flaw_bug_tracker: BugTracker, tracker_bugs: Iterable[Bug], brew_api, flaw_bugs: Optional[Iterable[Bug]] = None
+) -> (Dict, List):
     # validate and get target_release
     if not tracker_bugs:
         return {}, []  # Bug.get_target_release will panic on empty array
@@ -127,6 +129,7 @@ def get_flaws(flaw_bug_tracker: BugTracker, tracker_bugs: Iterable[Bug], brew_ap
         tracker_bugs,
         flaw_bug_tracker,
         brew_api,
+        flaw_bugs=flaw_bugs,
     )
     LOGGER.info(
         f'Found {len(flaw_tracker_map)} {flaw_bug_tracker.type} corresponding flaw bugs:'
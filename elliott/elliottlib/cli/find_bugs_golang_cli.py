@@ -17,7 +17,7 @@ from elliottlib.cli.common import cli, click_coroutine
 from elliottlib.cli.find_builds_cli import _fetch_builds_by_kind_rpm
 from elliottlib.cli.get_golang_report_cli import golang_report_for_version
 from elliottlib.exceptions import ElliottFatalError
-from elliottlib.util import get_golang_container_nvrs, get_golang_rpm_nvrs, get_nvrs_from_release
+from elliottlib.util import get_golang_container_nvrs, get_golang_rpm_nvrs_async, get_nvrs_from_release
 from pyartcd import constants as pyartcd_constants
 from pyartcd.util import get_release_name_for_assembly, load_releases_config
 
@@ -276,7 +276,7 @@ class FindBugsGolangCli:
             self._logger.warning(f"rpm {rpm_name} not found for assembly {self._runtime.assembly}. Is it a valid rpm?")
             return False, None
 
-        go_nvr_map = get_golang_rpm_nvrs(nvrs, self._logger)
+        go_nvr_map = await get_golang_rpm_nvrs_async(nvrs, self._logger)
         if self.fixed_in_nvrs:
             final_fixed_nvrs = []
             final_fixed_in_nvrs = []
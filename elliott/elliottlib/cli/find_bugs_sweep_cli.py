@@ -13,6 +13,7 @@ from elliottlib import Runtime, bzutil, constants, errata
 from elliottlib.bzutil import Bug, BugTracker, JIRABug
 from elliottlib.cli import common
 from elliottlib.cli.common import click_coroutine
+from elliottlib.errata_async import AdvisoryAttachmentIndex, AsyncErrataAPI
 from elliottlib.exceptions import ElliottFatalError
 from elliottlib.util import chunk, fix_summary_suffix
 
@@ -205,7 +206,8 @@ async def get_bugs_sweep(runtime: Runtime, find_bugs_obj, bug_tracker):
 
         # filter bugs that have been swept into other advisories
         logger.info("Filtering bugs that haven't been attached to any advisories...")
-        attached_bugs = await bug_tracker.filter_attached_bugs(bugs)
+        attachment_index = await get_attachment_index(runtime) if bugs else None
+        attached_bugs = await bug_tracker.filter_attached_bugs(bugs, attachment_index)
         if attached_bugs:
             attached_bug_ids = {b.id for b in attached_bugs}
             logger.debug(f"Bugs attached to other advisories: {sorted(attached_bug_ids)}")
@@ -561,3 +563,11 @@ async def get_sweep_cutoff_timestamp(runtime):
         sweep_cutoff_timestamp = runtime.assembly_basis_event.timestamp()
 
     return sweep_cutoff_timestamp
+
+
+async def get_attachment_index(runtime) -> AdvisoryAttachmentIndex:
+    """Index which open advisories of the product bugs are attached to, so only the bugs it doesn't list need to be
+    looked up one by one"""
+    et_data = runtime.get_errata_config()
+    async with AsyncErrataAPI(et_data.get("server", constants.errata_url)) as api:
+        return await AdvisoryAttachmentIndex.build(api, et_data["product"])
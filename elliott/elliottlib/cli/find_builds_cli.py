@@ -8,7 +8,6 @@ from typing import Dict, List, Set, Union
 
 import click
 import koji
-import requests
 from artcommonlib import exectools, logutil
 from artcommonlib.arch_util import BREW_ARCHES
 from artcommonlib.assembly import assembly_metadata_config, assembly_rhcos_config
@@ -21,6 +20,7 @@ from errata_tool import ErrataException
 
 from elliottlib import Runtime, brew, errata
 from elliottlib.build_finder import BuildFinder
+from elliottlib.build_resolver import get_resolver
 from elliottlib.cli.common import cli, click_coroutine, find_default_advisory, use_default_advisory_option
 from elliottlib.errata_async import AsyncErrataAPI
 from elliottlib.exceptions import ElliottFatalError
@@ -29,7 +29,6 @@ from elliottlib.util import (
     ensure_erratatool_auth,
     get_release_version,
     isolate_el_version_in_brew_tag,
-    parallel_results_with_progress,
     pbar_header,
     progress_func,
 )
@@ -212,10 +211,7 @@ async def find_builds_cli(
             nvrps = await _fetch_builds_by_kind_rpm(runtime, tag_pv_map, brew_session, include_shipped, member_only)
 
     LOGGER.info('Fetching info for builds from Errata')
-    builds: List[brew.Build] = parallel_results_with_progress(
-        nvrps,
-        lambda nvrp: errata.get_brew_build(f'{nvrp[0]}-{nvrp[1]}-{nvrp[2]}', nvrp[3], session=requests.Session()),
-    )
+    builds: List[brew.Build] = await get_resolver().get_brew_builds(nvrps)
 
     _json_dump(as_json, builds, kind, tag_pv_map)
     canonical_nvrs = [b.nvr for b in builds]
@@ -260,6 +256,7 @@ async def find_builds_cli(
         else:
             erratum.ensure_state('NEW_FILES')
             erratum.attach_builds(builds, kind)
+            get_resolver().forget(b.nvr for b in builds)
 
         if clean:
             nvrs_to_remove = set(advisory_build_nvrs) - set(canonical_nvrs)
@@ -290,6 +287,7 @@ async def find_builds_cli(
                 else:
                     erratum.ensure_state('NEW_FILES')
                     erratum.remove_builds(list(nvrs_to_remove))
+                    get_resolver().forget(nvrs_to_remove)
 
         if not builds:
             return
@@ -339,14 +337,13 @@ def get_rhcos_nvrs_from_assembly(runtime: Runtime, brew_session: koji.ClientSess
                 build_ids_by_arch[arch] = set()
             build_ids_by_arch[arch].add(build_id)
 
-    for arch, builds in build_ids_by_arch.items():
-        for build_id in builds:
-            nvr = f'rhcos-{arch}-{build_id}'
-            if brew_session.getBuild(nvr):
-                LOGGER.info(f'Found rhcos nvr: {nvr}')
-                nvrs.append(nvr)
-            else:
-                LOGGER.warning(f'rhcos nvr not found: {nvr}')
+    candidates = [f'rhcos-{arch}-{build_id}' for arch, builds in build_ids_by_arch.items() for build_id in builds]
+    for nvr, build in zip(candidates, get_resolver().get_build_objects(candidates, brew_session)):
+        if build:
+            LOGGER.info(f'Found rhcos nvr: {nvr}')
+            nvrs.append(nvr)
+        else:
+            LOGGER.warning(f'rhcos nvr not found: {nvr}')
     return nvrs
 
 
@@ -383,7 +380,7 @@ def _fetch_nvrps_by_nvr_or_id(
     ignore_product_version=False,
     brew_session: koji.ClientSession = None,
 ):
-    builds = brew.get_build_objects(ids_or_nvrs, brew_session)
+    builds = get_resolver().get_build_objects(ids_or_nvrs, brew_session)
     nonexistent_builds = list(filter(lambda b: b[1] is None, zip(ids_or_nvrs, builds)))
     if nonexistent_builds:
         raise ValueError(
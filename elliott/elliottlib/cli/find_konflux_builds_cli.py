@@ -3,6 +3,7 @@ from artcommonlib import logutil
 from artcommonlib.konflux.konflux_build_record import ArtifactType, Engine, KonfluxBuildOutcome, KonfluxBuildRecord
 
 from elliottlib.cli.common import cli, click_coroutine, pass_runtime
+from elliottlib.konflux_resolver import KonfluxResolver
 from elliottlib.runtime import Runtime
 
 LOGGER = logutil.get_logger(__name__)
@@ -46,17 +47,18 @@ async def find_k_builds_cli(runtime: Runtime, kind, engine, outcome, output):
     metas = runtime.image_metas() if kind == 'image' else runtime.rpm_metas()
     names = [meta.distgit_key for meta in metas]
 
-    args = {
-        'names': names,
-        'group': runtime.group,
-        'assembly': runtime.assembly,
-        'outcome': outcome,
-    }
-    if engine:
-        args.update({'engine': Engine(engine)})
-    builds = await runtime.konflux_db.get_latest_builds(**args)
+    # Look up the latest builds of all components at once
+    resolver = KonfluxResolver(konflux_db=runtime.konflux_db)
+    latest_builds = await resolver.get_latest_builds(
+        names,
+        group=runtime.group,
+        outcome=outcome,
+        assembly=runtime.assembly,
+        engine=Engine(engine) if engine else None,
+    )
+    builds = [b for b in latest_builds if b]
 
-    missing_builds = [name for name in names if name not in [b.name for b in builds]]
+    missing_builds = [name for name, build in zip(names, latest_builds) if not build]
     if missing_builds:
         LOGGER.warning('Builds have not been found for these components: %s', ', '.join(missing_builds))
 
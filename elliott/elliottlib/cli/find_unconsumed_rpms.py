@@ -7,11 +7,15 @@ import koji
 from artcommonlib import exectools
 from artcommonlib.arch_util import brew_arch_for_go_arch
 from artcommonlib.assembly import AssemblyTypes, assembly_rhcos_config, assembly_type
+from artcommonlib.konflux.konflux_build_record import KonfluxBuildRecord
+from artcommonlib.rpm_utils import parse_nvr
 
-from elliottlib import brew, rhcos
+from elliottlib import rhcos
 from elliottlib.build_finder import BuildFinder
+from elliottlib.build_resolver import get_resolver
 from elliottlib.cli.common import cli, click_coroutine
 from elliottlib.imagecfg import ImageMetadata
+from elliottlib.rpm_consumption import default_index
 from elliottlib.runtime import Runtime
 
 LOGGER = logging.getLogger(__name__)
@@ -102,6 +106,30 @@ class FindUnconsumedRpms:
         rpm_dicts = [task.result if task else None for task in tasks]
         return rpm_dicts
 
+    @staticmethod
+    def _get_image_rpm_nvrs(image_builds: List, koji_api: koji.ClientSession) -> Dict[str, List[str]]:
+        """Look up the source RPMs installed in image builds
+        :param image_builds: Brew buildinfo dicts or Konflux build records of images
+        :param koji_api: instance of Brew session
+        :return: image NVR -> source RPM NVRs installed in it
+        """
+        consumption = {b.nvr: list(b.installed_packages) for b in image_builds if isinstance(b, KonfluxBuildRecord)}
+        brew_builds = [b for b in image_builds if not isinstance(b, KonfluxBuildRecord)]
+        if not brew_builds:
+            return consumption
+
+        LOGGER.info("Retrieve RPMs in %s Brew image build(s)...", len(brew_builds))
+        build_archives = FindUnconsumedRpms._list_archives_by_builds([b["id"] for b in brew_builds], "image", koji_api)
+        image_rpm_build_ids = [{rpm["build_id"] for ar in ars for rpm in ar["rpms"]} for ars in build_archives]
+
+        rpm_build_ids = list(set().union(*image_rpm_build_ids))
+        LOGGER.info("Retrieve %s RPM build(s)...", len(rpm_build_ids))
+        rpm_builds = get_resolver().get_build_objects(rpm_build_ids, koji_api)
+        rpm_build_nvrs = {b["id"]: b["nvr"] for b in rpm_builds}
+        for build, build_ids in zip(brew_builds, image_rpm_build_ids):
+            consumption[build["nvr"]] = [rpm_build_nvrs[build_id] for build_id in build_ids]
+        return consumption
+
     async def run(self):
         logger = LOGGER
         koji_api = self._runtime.build_retrying_koji_client(caching=True)
@@ -113,18 +141,25 @@ class FindUnconsumedRpms:
         image_metas: List[ImageMetadata] = [
             image for image in self._runtime.image_metas() if not image.base_only and image.is_release
         ]
-        logger.info("Fetching Brew builds for %s component(s)...", len(image_metas))
-        brew_builds: List[Dict] = await asyncio.gather(*[image.get_latest_build() for image in image_metas])
-
-        logger.info("Retrieve RPMs in %s image build(s)...", len(brew_builds))
-        build_archives = FindUnconsumedRpms._list_archives_by_builds([b["id"] for b in brew_builds], "image", koji_api)
-
-        image_rpms = [rpm for ars in build_archives for ar in ars for rpm in ar["rpms"]]
-
-        rpm_build_ids = list({rpm["build_id"] for rpm in rhcos_rpms + image_rpms if rpm})
-        logger.info("Retrieve %s RPM build(s)...", len(rpm_build_ids))
-        rpm_builds = brew.get_build_objects(rpm_build_ids, koji_api)
-        rpm_component_names = {b["name"] for b in rpm_builds}
+        logger.info("Fetching %s builds for %s component(s)...", self._runtime.build_system, len(image_metas))
+        image_builds = await asyncio.gather(*[image.get_latest_build() for image in image_metas])
+
+        # Only image builds that completed since the last run need to be looked at
+        index = default_index()
+        image_nvrs = [b.nvr if isinstance(b, KonfluxBuildRecord) else b["nvr"] for b in image_builds]
+        consumption = index.get(image_nvrs)
+        new_builds = [b for b, nvr in zip(image_builds, image_nvrs) if nvr not in consumption]
+        logger.info("%s of %s image build(s) are not indexed yet", len(new_builds), len(image_builds))
+        if new_builds:
+            new_consumption = self._get_image_rpm_nvrs(new_builds, koji_api)
+            index.add(new_consumption)
+            consumption.update(new_consumption)
+
+        rhcos_rpm_build_ids = list({rpm["build_id"] for rpm in rhcos_rpms if rpm})
+        logger.info("Retrieve %s RHCOS RPM build(s)...", len(rhcos_rpm_build_ids))
+        rpm_nvrs = {b["nvr"] for b in get_resolver().get_build_objects(rhcos_rpm_build_ids, koji_api)}
+        rpm_nvrs.update(nvr for nvrs in consumption.values() for nvr in nvrs)
+        rpm_component_names = {parse_nvr(nvr)["name"] for nvr in rpm_nvrs}
 
         # Compare tagged rpms
         replace_vars = self._runtime.group_config.vars.primitive() if self._runtime.group_config.vars else {}
@@ -1,6 +1,7 @@
 import os
 import sys
 from datetime import timedelta
+from typing import Dict, List, Tuple
 
 import click
 from artcommonlib import logutil
@@ -10,15 +11,16 @@ from doozerlib.constants import KONFLUX_DEFAULT_NAMESPACE
 
 from elliottlib.cli.common import click_coroutine
 from elliottlib.cli.konflux_release_cli import konflux_release_cli
+from elliottlib.konflux_resolver import KonfluxResolver, release_finished
 from elliottlib.runtime import Runtime
 
 LOGGER = logutil.get_logger(__name__)
 
 
 class WatchReleaseCli:
-    def __init__(self, runtime: Runtime, release: str, konflux_config: dict, timeout: int, dry_run: bool):
+    def __init__(self, runtime: Runtime, releases: List[str], konflux_config: dict, timeout: int, dry_run: bool):
         self.runtime = runtime
-        self.release = release
+        self.releases = releases
         self.konflux_config = konflux_config
         self.timeout = timeout
         self.dry_run = dry_run
@@ -30,34 +32,50 @@ class WatchReleaseCli:
         )
         self.konflux_client.verify_connection()
 
-    async def run(self):
-        self.runtime.initialize(no_group=True)
-        release_obj = await self.konflux_client.wait_for_release(
-            self.release, overall_timeout_timedelta=timedelta(hours=self.timeout)
-        )
-
+    @staticmethod
+    def release_succeeded(release_obj) -> bool:
+        """:return: Whether a finished Release succeeded; logs why it didn't"""
+        name = release_obj['metadata']['name']
         # Assume that these will be available
         released_condition = art_util.KubeCondition.find_condition(release_obj, 'Released')
         if not released_condition:
-            raise ValueError("Expected to find `Released` status in release_obj but couldn't")
+            raise ValueError(f"Expected to find `Released` status in Release {name} but couldn't")
 
         reason = released_condition.reason
         status = released_condition.status
-        success = reason == "Succeeded" and status == "True"
-
-        if success:
+        if reason == "Succeeded" and status == "True":
             return True
 
         message = released_condition.message
         if message == "Release processing failed on managed pipelineRun":
             managed_plr = release_obj['status'].get('managedProcessing', {}).get('pipelineRun', '')
             message += f" {managed_plr}"
-        LOGGER.error(message)
+        LOGGER.error("Release %s: %s", name, message)
         return False
 
-
-@konflux_release_cli.command("watch", short_help="Watch and report on status of a given Konflux Release")
-@click.argument("release", metavar='RELEASE_NAME', nargs=1)
+    async def run(self) -> Dict[str, bool]:
+        """:return: release name -> whether it succeeded"""
+        self.runtime.initialize(no_group=True)
+        # Watch all releases with one watch instead of one per release
+        resolver = KonfluxResolver(self.konflux_client, namespace=self.konflux_config['namespace'])
+        release_objs = await resolver.wait_for_releases(self.releases, timeout=timedelta(hours=self.timeout))
+
+        results = {}
+        for release in self.releases:
+            release_obj = release_objs.get(release)
+            if release_obj is None:
+                LOGGER.error("Release %s not found", release)
+                results[release] = False
+            elif not release_finished(release_obj):
+                LOGGER.error("Release %s did not finish in time", release)
+                results[release] = False
+            else:
+                results[release] = self.release_succeeded(release_obj)
+        return results
+
+
+@konflux_release_cli.command("watch", short_help="Watch and report on status of given Konflux Releases")
+@click.argument("releases", metavar='RELEASE_NAME...', nargs=-1, required=True)
 @click.option(
     '--konflux-kubeconfig', metavar='PATH', help='Path to the kubeconfig file to use for Konflux cluster connections.'
 )
@@ -84,7 +102,7 @@ class WatchReleaseCli:
 @click_coroutine
 async def watch_release_cli(
     runtime: Runtime,
-    release: str,
+    releases: Tuple[str, ...],
     konflux_kubeconfig: str,
     konflux_context: str,
     konflux_namespace,
@@ -92,7 +110,8 @@ async def watch_release_cli(
     dry_run: bool,
 ):
     """
-    Watch the given Konflux Release and report on its status
+    Watch the given Konflux Releases and report on their status.
+    All releases are watched at once; exits non-zero if any of them didn't succeed.
     \b
 
     $ elliott release watch ose-4-18-stage-202503131819 --konflux-namespace ocp-art-tenant
@@ -110,12 +129,9 @@ async def watch_release_cli(
     }
 
     pipeline = WatchReleaseCli(
-        runtime, release=release, konflux_config=konflux_config, timeout=timeout, dry_run=dry_run
+        runtime, releases=list(releases), konflux_config=konflux_config, timeout=timeout, dry_run=dry_run
     )
     release_status = await pipeline.run()
-    if release_status is True:
-        click.echo("Release successful!")
-        sys.exit(0)
-    else:
-        click.echo("Release failed!")
-        sys.exit(1)
+    for release, succeeded in release_status.items():
+        click.echo(f"Release {release} {'successful' if succeeded else 'failed'}!")
+    sys.exit(0 if all(release_status.values()) else 1)
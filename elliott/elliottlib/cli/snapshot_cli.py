@@ -1,6 +1,7 @@
 import asyncio
 import os
 import sys
+from typing import Optional
 
 import click
 from artcommonlib import logutil
@@ -13,7 +14,7 @@ from artcommonlib.konflux.konflux_build_record import (
 )
 from artcommonlib.rpm_utils import parse_nvr
 from artcommonlib.util import get_utc_now_formatted_str, new_roundtrip_yaml_handler
-from doozerlib.backend.konflux_client import API_VERSION, KIND_APPLICATION, KIND_COMPONENT, KIND_SNAPSHOT, KonfluxClient
+from doozerlib.backend.konflux_client import API_VERSION, KIND_APPLICATION, KIND_SNAPSHOT, KonfluxClient
 from doozerlib.backend.konflux_image_builder import KonfluxImageBuilder
 from doozerlib.constants import KONFLUX_DEFAULT_NAMESPACE
 from doozerlib.util import oc_image_info_for_arch_async
@@ -21,6 +22,7 @@ from kubernetes.dynamic import exceptions
 from kubernetes.dynamic.resource import ResourceInstance
 
 from elliottlib.cli.common import cli, click_coroutine
+from elliottlib.konflux_resolver import KonfluxResolver
 from elliottlib.runtime import Runtime
 
 yaml = new_roundtrip_yaml_handler()
@@ -45,6 +47,8 @@ class CreateSnapshotCli:
         self.for_fbc = for_fbc
         self.builds = builds
         self.dry_run = dry_run
+        # Created once the Konflux DB is initialized
+        self.resolver: Optional[KonfluxResolver] = None
         self.image_repo_pull_secret = image_repo_pull_secret
         self.konflux_client = KonfluxClient.from_kubeconfig(
             default_namespace=self.konflux_config['namespace'],
@@ -64,6 +68,7 @@ class CreateSnapshotCli:
             self.runtime.konflux_db.bind(KonfluxFbcBuildRecord)
         else:
             self.runtime.konflux_db.bind(KonfluxBuildRecord)
+        self.resolver = KonfluxResolver(self.konflux_client, self.runtime.konflux_db, self.konflux_config['namespace'])
 
         # Ensure the Snapshot CRD is accessible
         try:
@@ -110,12 +115,15 @@ class CreateSnapshotCli:
 
         # make sure application exists
         await self.konflux_client._get(API_VERSION, KIND_APPLICATION, application_name)
+        # list the components of the application at once instead of getting each of them
+        app_components = await self.resolver.get_components(application_name)
 
-        async def _comp(record):
+        def _comp(record):
             comp_name = KonfluxImageBuilder.get_component_name(application_name, record.name)
 
             # make sure component exists
-            await self.konflux_client._get(API_VERSION, KIND_COMPONENT, comp_name)
+            if comp_name not in app_components:
+                raise ValueError(f"Component {comp_name} not found in application {application_name}")
 
             source_url = record.rebase_repo_url
             revision = record.rebase_commitish
@@ -135,7 +143,7 @@ class CreateSnapshotCli:
                 "containerImage": record.image_pullspec,
             }
 
-        components = [await _comp(record) for record in build_records]
+        components = [_comp(record) for record in build_records]
 
         snapshot_obj = {
             "apiVersion": API_VERSION,
@@ -165,7 +173,7 @@ class CreateSnapshotCli:
 
         LOGGER.info("Fetching NVRs from DB...")
         where = {"group": self.runtime.group, "engine": Engine.KONFLUX.value}
-        records = await self.runtime.konflux_db.get_build_records_by_nvrs(self.builds, where=where, strict=True)
+        records = await self.resolver.get_build_records(self.builds, where=where, strict=True)
         return records
 
 
@@ -307,6 +315,7 @@ class GetSnapshotCli:
             self.runtime.konflux_db.bind(KonfluxFbcBuildRecord)
         else:
             self.runtime.konflux_db.bind(KonfluxBuildRecord)
+        resolver = KonfluxResolver(self.konflux_client, self.runtime.konflux_db, self.konflux_config['namespace'])
 
         # Ensure the Snapshot CRD is accessible
         try:
@@ -328,7 +337,7 @@ class GetSnapshotCli:
             # not existing would indicate inconsistency bw nvr construction & DB nvr field
             # or something more atypical like nvr/image not belonging to ART
             try:
-                await self.runtime.konflux_db.get_build_records_by_nvrs(nvrs, where=where, strict=True)
+                await resolver.get_build_records(nvrs, where=where, strict=True)
             except IOError as e:
                 LOGGER.warning(
                     "A snapshot is expected to exclusively contain ART built image builds "
@@ -2,7 +2,6 @@ import errno
 import os
 import pipes
 import shutil
-import tempfile
 from typing import Dict, Set
 
 import click
@@ -40,10 +39,21 @@ def tarball_sources_cli(ctx):
     help="Koji/Brew component names or build NVRs to filter on. Can be specified multiple times.",
 )
 @click.option("-f", "--force", is_flag=True, help="Force overwrite existing files.")
+@click.option(
+    "-j",
+    "--jobs",
+    "jobs_count",
+    type=click.IntRange(1),
+    default=None,
+    help="Number of tarball sources to generate in parallel. [default: number of CPUs]",
+)
 @click.pass_context
-def create(ctx, advisories, out_dir, out_layout, components, force):
+def create(ctx, advisories, out_dir, out_layout, components, force, jobs_count):
     """Create tarball sources for advisories.
 
+    Tarball sources are generated in parallel. Those generated before in the same working directory are reused,
+    so an interrupted run can be resumed by running the same command again.
+
     To create tarball sources for Brew component (package) logging-fluentd-container that was shipped on advisories 45606, 45527, and 46049:
     $ elliott tarball-sources create --component logging-fluentd-container --out-dir=out/ 45606 45527 46049
     """
@@ -109,29 +119,26 @@ Use --force to add new tarball sources to an existing directory.".format(os.path
     brew_builds = brew.get_build_objects(nvr_dirs.keys(), brew_session)
 
     # Ready to generate tarballs
-    tarball_sources_list = []
+    jobs = {}  # type: Dict[str, tarball_sources.TarballJob]
     for build_info in brew_builds:
         nvr = build_info["nvr"]
+        jobs[nvr] = tarball_sources.TarballJob(nvr + "/", build_info["name"], build_info["source"])
+    click.echo("Generating tarball sources for {} build(s)...".format(len(jobs)))
+    tarballs = tarball_sources.generate_tarball_sources(jobs.values(), working_dir, max_workers=jobs_count)
+
+    tarball_sources_list = []
+    for nvr, job in jobs.items():
         tarball_filename = nvr + ".tar.gz"
-        click.echo("Generating tarball source {} for {}...".format(tarball_filename, nvr))
-
-        with tempfile.NamedTemporaryFile(suffix="-" + tarball_filename, dir=working_dir) as temp_tarball:
-            temp_tarball_path = temp_tarball.name
-            LOGGER.debug("Temporary tarball file is {}".format(temp_tarball_path))
-
-            tarball_sources.generate_tarball_source(
-                temp_tarball, nvr + "/", os.path.join(working_dir, "repos", build_info["name"]), build_info["source"]
-            )
-            for dest_dir in nvr_dirs[nvr]:
-                mkdirs(dest_dir)
-                tarball_abspath = os.path.abspath(os.path.join(dest_dir, tarball_filename))
-                if os.path.exists(tarball_abspath):
-                    yellow_print("File {} will be overwritten.".format(tarball_abspath))
-
-                LOGGER.debug("Copying {} to {}...".format(temp_tarball_path, tarball_abspath))
-                shutil.copyfile(temp_tarball_path, tarball_abspath)  # `shutil.copyfile` uses default umask
-                tarball_sources_list.append(tarball_abspath)
-                green_print("Created tarball source {}.".format(tarball_abspath))
+        for dest_dir in nvr_dirs[nvr]:
+            mkdirs(dest_dir)
+            tarball_abspath = os.path.abspath(os.path.join(dest_dir, tarball_filename))
+            if os.path.exists(tarball_abspath):
+                yellow_print("File {} will be overwritten.".format(tarball_abspath))
+
+            LOGGER.debug("Copying {} to {}...".format(tarballs[job], tarball_abspath))
+            shutil.copyfile(tarballs[job], tarball_abspath)  # `shutil.copyfile` uses default umask
+            tarball_sources_list.append(tarball_abspath)
+            green_print("Created tarball source {}.".format(tarball_abspath))
 
     print_success_message(tarball_sources_list, out_dir)
 
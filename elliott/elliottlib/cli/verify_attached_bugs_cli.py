@@ -5,18 +5,19 @@ import re
 from typing import Any, Dict, Iterable, List, Set, Tuple
 
 import click
-from artcommonlib import arch_util, logutil
+from artcommonlib import arch_util, exectools, logutil
 from artcommonlib.assembly import assembly_issues_config
 from artcommonlib.rpm_utils import parse_nvr
 from artcommonlib.util import is_release_next_week
 from errata_tool import ErrataException
 
-from elliottlib import bzutil, constants
-from elliottlib.bzutil import Bug
+from elliottlib import bzutil, constants, util
+from elliottlib.advisory_snapshot import AdvisorySnapshot, VerificationSnapshot
+from elliottlib.bzutil import Bug, JIRABug
 from elliottlib.cli.attach_cve_flaws_cli import get_flaws
 from elliottlib.cli.common import cli, click_coroutine, pass_runtime
 from elliottlib.cli.find_bugs_sweep_cli import FindBugsSweep, categorize_bugs_by_type
-from elliottlib.errata import get_bug_ids, is_advisory_editable, sync_jira_issue
+from elliottlib.errata import sync_jira_issue
 from elliottlib.errata_async import AsyncErrataAPI, AsyncErrataUtils
 from elliottlib.runtime import Runtime
 from elliottlib.util import minor_version_tuple
@@ -118,14 +119,19 @@ async def verify_attached_bugs(
     skip_multiple_advisories_check: bool,
 ):
     validator = BugValidator(runtime, output="text")
-    advisory_bug_map = validator.get_attached_bugs(list(advisory_id_map.values()))
-    bugs = {b for bugs in advisory_bug_map.values() for b in bugs}
+    try:
+        # Gather everything up front, so that the checks below don't talk to Errata Tool or the bug trackers
+        snapshot = await validator.take_snapshot(
+            list(advisory_id_map.values()),
+            verify_flaws=verify_flaws,
+            check_multiple_advisories=not skip_multiple_advisories_check,
+        )
+        bugs = {b for bugs in snapshot.advisory_bugs().values() for b in bugs}
 
-    # bug.is_ocp_bug() filters by product/project, so we don't get flaw bugs or bugs of other products or
-    # placeholder
-    non_flaw_bugs = [b for b in bugs if b.is_ocp_bug()]
+        # bug.is_ocp_bug() filters by product/project, so we don't get flaw bugs or bugs of other products or
+        # placeholder
+        non_flaw_bugs = [b for b in bugs if b.is_ocp_bug()]
 
-    try:
         validator.validate(non_flaw_bugs, verify_bug_status, no_verify_blocking_bugs, is_attached=True)
 
         # skip advisory type check if advisories are
@@ -135,13 +141,13 @@ async def verify_attached_bugs(
             if runtime.assembly:
                 issues_config = assembly_issues_config(runtime.get_releases_config(), runtime.assembly)
                 included_bug_ids = {issue["id"] for issue in issues_config.include}
-            validator.verify_bugs_advisory_type(non_flaw_bugs, advisory_id_map, advisory_bug_map, included_bug_ids)
+            validator.verify_bugs_advisory_type(non_flaw_bugs, advisory_id_map, snapshot, included_bug_ids)
 
         if not skip_multiple_advisories_check:
-            await validator.verify_bugs_multiple_advisories(non_flaw_bugs)
+            validator.verify_bugs_multiple_advisories(non_flaw_bugs, snapshot)
 
         if verify_flaws:
-            await validator.verify_attached_flaws(advisory_bug_map)
+            validator.verify_attached_flaws(snapshot)
     except Exception as e:
         validator._complain(f"Error validating attached bugs: {e}")
     finally:
@@ -266,9 +272,11 @@ class BugValidator:
             blocking_bugs_for = self._get_blocking_bugs_for(non_flaw_bugs)
             self._verify_blocking_bugs(blocking_bugs_for, is_attached=is_attached)
 
-    def verify_bugs_advisory_type(self, non_flaw_bugs, advisory_id_map, advisory_bug_map, permitted_bug_ids):
+    def verify_bugs_advisory_type(
+        self, non_flaw_bugs, advisory_id_map, snapshot: VerificationSnapshot, permitted_bug_ids
+    ):
         advance_release = False
-        if "advance" in advisory_id_map and is_advisory_editable(advisory_id_map["advance"]):
+        if "advance" in advisory_id_map and snapshot.advisories[advisory_id_map["advance"]].is_editable():
             advance_release = True
         operator_bundle_advisory = "advance" if advance_release else "metadata"
         major_version, minor_version = self.runtime.get_major_minor()
@@ -286,7 +294,7 @@ class BugValidator:
             self._complain(i)
 
         for kind, advisory_id in advisory_id_map.items():
-            actual = {b for b in advisory_bug_map[advisory_id] if b.is_ocp_bug()}
+            actual = {b for b in snapshot.attached_bugs(advisory_id) if b.is_ocp_bug()}
 
             # If impetus is not present, assume no bugs need to be attached
             expected = bugs_by_type.get(kind, set())
@@ -305,171 +313,139 @@ class BugValidator:
                         f'Unexpected Bugs found in {kind} advisory ({advisory_id}): {[b.id for b in extra_bugs]}'
                     )
 
-    async def verify_bugs_multiple_advisories(self, non_flaw_bugs: List[Bug]):
-        logger.info(f'Checking {len(non_flaw_bugs)} bugs, if any bug is attached to multiple advisories')
-
-        async def get_all_advisory_ids(bug):
-            try:
-                all_advisories_id = bug.all_advisory_ids()
-            except ErrataException:
-                try:
-                    sync_jira_issue(bug.id)
-                except Exception as e:
-                    return f'Failed to sync bug {bug.id}: {e}'
-            if len(all_advisories_id) > 1:
-                return f'Bug <{bug.weburl}|{bug.id}> is attached in multiple advisories: {all_advisories_id}'
-            return None
-
-        results = await asyncio.gather(*[asyncio.create_task(get_all_advisory_ids(bug)) for bug in non_flaw_bugs])
-        for message in results:
-            if message:
-                self._complain(message)
-
-    async def verify_attached_flaws(self, advisory_bugs: Dict[int, List[Bug]]):
-        futures = []
-        for advisory_id, attached_bugs in advisory_bugs.items():
-            attached_trackers = [b for b in attached_bugs if b.is_tracker_bug()]
-            attached_flaws = [b for b in attached_bugs if b.is_flaw_bug()]
-            logger.info(
-                f"Verifying advisory {advisory_id}: attached-trackers: "
-                f"{[b.id for b in attached_trackers]} "
-                f"attached-flaws: {[b.id for b in attached_flaws]}"
-            )
-            futures.append(self._verify_attached_flaws_for(advisory_id, attached_trackers, attached_flaws))
-        await asyncio.gather(*futures)
+    async def take_snapshot(
+        self, advisory_ids: List[int], verify_flaws: bool = False, check_multiple_advisories: bool = False
+    ) -> VerificationSnapshot:
+        """Gather what the checks look at for the given advisories.
+        Advisories are fetched from Errata Tool concurrently, and the bugs of each tracker are fetched at once.
+        :param verify_flaws: Also gather the builds, CVE exclusions and flaw bugs of the advisories
+        :param check_multiple_advisories: Also gather the advisories the attached bugs are attached to
+        """
+        logger.info(f"Retrieving bugs for advisories: {advisory_ids}")
+        results = await asyncio.gather(
+            *[self._get_advisory_snapshot(advisory_id, verify_flaws) for advisory_id in advisory_ids]
+        )
+        advisories = {advisory.advisory_id: advisory for advisory in results}
 
-    async def _verify_attached_flaws_for(
-        self, advisory_id: int, attached_trackers: Iterable[Bug], attached_flaws: Iterable[Bug]
-    ):
-        flaw_bug_tracker = self.runtime.get_bug_tracker('bugzilla')
-        brew_api = self.runtime.build_retrying_koji_client()
-        tracker_flaws, first_fix_flaw_bugs = get_flaws(flaw_bug_tracker, attached_trackers, brew_api)
-
-        # Check if attached flaws match expected flaws
-        first_fix_flaw_ids = {b.id for b in first_fix_flaw_bugs}
-        attached_flaw_ids = {b.id for b in attached_flaws}
-        missing_flaw_ids = first_fix_flaw_ids - attached_flaw_ids
-        if missing_flaw_ids:
-            self._complain(
-                f"On advisory {advisory_id}, these flaw bugs are not attached: "
-                f"{', '.join(sorted(map(str, missing_flaw_ids)))} but "
-                "they are referenced by attached tracker bugs. "
-                "You need to attach those flaw bugs or drop corresponding tracker bugs."
-            )
-        extra_flaw_ids = attached_flaw_ids - first_fix_flaw_ids
-        if extra_flaw_ids:
-            self._complain(
-                f"On advisory {advisory_id}, these flaw bugs are attached: "
-                f"{', '.join(sorted(map(str, extra_flaw_ids)))} but "
-                f"there are no tracker bugs referencing them. "
-                "You need to drop those flaw bugs or attach corresponding tracker bugs."
+        # we do this to gather bug ids from all advisories of a bug type
+        # and fetch them in one go to avoid multiple requests
+        bug_ids = {
+            bug_tracker_type: {
+                bug_id for advisory in advisories.values() for bug_id in advisory.bug_ids[bug_tracker_type]
+            }
+            for bug_tracker_type in ['jira', 'bugzilla']
+        }
+        bug_maps = await asyncio.gather(
+            *(
+                exectools.to_thread(self.runtime.get_bug_tracker(bug_tracker_type).get_bugs_map, ids)
+                for bug_tracker_type, ids in bug_ids.items()
             )
+        )
+        snapshot = VerificationSnapshot(
+            advisories,
+            bugs={
+                bug_tracker_type: {str(bug_id): bug for bug_id, bug in bug_map.items()}
+                for bug_tracker_type, bug_map in zip(bug_ids, bug_maps)
+            },
+        )
 
-        # Check if advisory is of the expected type
-        advisory_info = await self.errata_api.get_advisory(advisory_id)
-        advisory_type = next(iter(advisory_info["errata"].keys())).upper()  # should be one of [RHBA, RHSA, RHEA]
-        if not first_fix_flaw_ids:
-            if advisory_type == "RHSA":
-                self._complain(
-                    f"Advisory {advisory_id} is of type {advisory_type} "
-                    f"but has no first-fix flaw bugs. It should be converted to RHBA or RHEA."
+        if check_multiple_advisories:
+            # Any advisory counts, whatever its state or product, so each bug is looked up in Errata Tool
+            snapshot.attachments = {}
+            for bug_tracker_type, ids in bug_ids.items():
+                ids = list(ids)
+                results = await asyncio.gather(
+                    *(self._get_bug_advisory_ids(bug_tracker_type, bug_id) for bug_id in ids)
                 )
-            return  # The remaining checks are not needed for a non-RHSA.
-        if advisory_type != "RHSA":
-            self._complain(
-                f"Advisory {advisory_id} is of type {advisory_type} but has first-fix flaw bugs "
-                f"{first_fix_flaw_ids}. It should be converted to RHSA."
+                snapshot.attachments[bug_tracker_type] = {
+                    str(bug_id): advisory_ids for bug_id, advisory_ids in zip(ids, results)
+                }
+        if verify_flaws:
+            await self._resolve_flaws(snapshot)
+        return snapshot
+
+    async def _get_bug_advisory_ids(self, bug_tracker_type: str, bug_id) -> List[int]:
+        if bug_tracker_type == 'jira':
+            # Jira issues that aren't synced to Errata Tool yet aren't attached to any advisory
+            advisories = await self.errata_api.get_advisories_for_jira(bug_id, ignore_not_found=True)
+        else:
+            advisories = await self.errata_api.get_advisories_for_bug(bug_id)
+        return sorted(advisory["id"] for advisory in advisories)
+
+    async def _get_advisory_snapshot(self, advisory_id: int, verify_flaws: bool) -> AdvisorySnapshot:
+        bug_ids = await self.errata_api.get_bug_ids(advisory_id)
+        # answered from the cache of the request get_bug_ids made
+        advisory_info = await self.errata_api.get_advisory(advisory_id)
+        errata_type, errata = next(iter(advisory_info["errata"].items()))
+        advisory = AdvisorySnapshot(
+            advisory_id=advisory_id,
+            errata_type=errata_type.upper(),
+            status=errata["status"],
+            cves=advisory_info["content"]["content"]["cve"].split(),
+            bug_ids=bug_ids,
+        )
+        if verify_flaws:
+            builds, advisory.cve_exclusions = await asyncio.gather(
+                self.errata_api.get_builds_flattened(advisory_id),
+                AsyncErrataUtils.get_advisory_cve_exclusions(self.errata_api, advisory_id),
             )
+            advisory.builds = sorted(builds)
+        return advisory
+
+    async def _resolve_flaws(self, snapshot: VerificationSnapshot):
+        """Find the flaw bugs of the attached trackers, fetching the flaws of all advisories at once"""
+        advisory_trackers = {
+            advisory_id: [b for b in bugs if b.is_tracker_bug()]
+            for advisory_id, bugs in snapshot.advisory_bugs().items()
+        }
+        flaw_bug_ids = {
+            flaw_id
+            for trackers in advisory_trackers.values()
+            for tracker in trackers
+            for flaw_id in tracker.corresponding_flaw_bug_ids
+        }
+        flaw_bug_tracker = self.runtime.get_bug_tracker('bugzilla')
+        flaw_bugs = (
+            await exectools.to_thread(flaw_bug_tracker.get_flaw_bugs, sorted(flaw_bug_ids)) if flaw_bug_ids else []
+        )
+        snapshot.flaws = {str(flaw.id): flaw for flaw in flaw_bugs}
 
-        # Get attached builds
-        attached_builds = await self.errata_api.get_builds_flattened(advisory_id)
-        attached_components = {parse_nvr(build)["name"] for build in attached_builds}
-
-        # Validate CVE mappings (of CVEs and builds)
-        flaw_id_bugs = {f.id: f for f in first_fix_flaw_bugs}
-        cve_components_mapping: Dict[str, Set[str]] = {}
-        for tracker in attached_trackers:
-            whiteboard_component = tracker.whiteboard_component
-            if not whiteboard_component:
-                raise ValueError(f"Bug {tracker.id} doesn't have a valid whiteboard component.")
-            if whiteboard_component == "rhcos":
-                # rhcos trackers are special, since they have per-architecture component names
-                # (rhcos-x86_64, rhcos-aarch64, ...) in Brew,
-                # but the tracker bug has a generic "rhcos" component name
-                # so we need to associate this CVE with all per-architecture component names
-                component_names = attached_components & arch_util.RHCOS_BREW_COMPONENTS
-            else:
-                component_names = {whiteboard_component}
-            flaw_ids = tracker_flaws[tracker.id]
-            for flaw_id in flaw_ids:
-                if flaw_id not in flaw_id_bugs:  # This means associated flaw wasn't considered a first fix
-                    continue
-                alias = [k for k in flaw_id_bugs[flaw_id].alias if k.startswith('CVE-')]
-                if len(alias) != 1:
-                    raise ValueError(f"Bug {flaw_id} should have exactly 1 CVE alias.")
-                cve = alias[0]
-                cve_components_mapping.setdefault(cve, set()).update(component_names)
-
-        try:
-            extra_exclusions, missing_exclusions = await AsyncErrataUtils.validate_cves_and_get_exclusions_diff(
-                self.errata_api, advisory_id, attached_builds, cve_components_mapping
+        async def _resolve(advisory: AdvisorySnapshot, attached_trackers: List[Bug]):
+            attached_flaws = [b for b in snapshot.attached_bugs(advisory.advisory_id) if b.is_flaw_bug()]
+            logger.info(
+                f"Verifying advisory {advisory.advisory_id}: attached-trackers: "
+                f"{[b.id for b in attached_trackers]} "
+                f"attached-flaws: {[b.id for b in attached_flaws]}"
             )
-            for cve, cve_package_exclusions in extra_exclusions.items():
-                if cve_package_exclusions:
-                    self._complain(
-                        f"On advisory {advisory_id}, {cve} is not associated with Brew components "
-                        f"{', '.join(sorted(cve_package_exclusions))}."
-                        " You may need to associate the CVE with the components "
-                        "in the CVE mapping or drop the tracker bugs."
-                    )
-            for cve, cve_package_exclusions in missing_exclusions.items():
-                if cve_package_exclusions:
-                    self._complain(
-                        f"On advisory {advisory_id}, {cve} is associated with Brew components "
-                        f"{', '.join(sorted(cve_package_exclusions))} without a tracker bug."
-                        " You may need to explicitly exclude those Brew components from the CVE "
-                        "mapping or attach the corresponding tracker bugs."
-                    )
-        except ValueError as e:
-            self._complain(e)
-
-        # Validate `CVE Names` field of the advisory
-        advisory_cves = advisory_info["content"]["content"]["cve"].split()
-        extra_cves = cve_components_mapping.keys() - advisory_cves
-        if extra_cves:
-            self._complain(
-                f"On advisory {advisory_id}, bugs for the following CVEs are already attached "
-                f"but they are not listed in advisory's `CVE Names` field: {', '.join(sorted(extra_cves))}"
+            brew_api = self.runtime.build_retrying_koji_client()
+            tracker_flaws, first_fix_flaw_bugs = await exectools.to_thread(
+                get_flaws, flaw_bug_tracker, attached_trackers, brew_api, flaw_bugs
             )
-        missing_cves = advisory_cves - cve_components_mapping.keys()
-        if missing_cves:
-            self._complain(
-                f"On advisory {advisory_id}, bugs for the following CVEs are not attached but listed in "
-                f"advisory's `CVE Names` field: {', '.join(sorted(missing_cves))}"
+            advisory.tracker_flaws = {str(tracker_id): flaw_ids for tracker_id, flaw_ids in tracker_flaws.items()}
+            advisory.first_fix_flaw_ids = sorted(flaw.id for flaw in first_fix_flaw_bugs)
+            if first_fix_flaw_bugs and any(
+                t.whiteboard_component == constants.GOLANG_BUILDER_CVE_COMPONENT for t in attached_trackers
+            ):
+                # golang CVEs are associated with the builds built by the affected Go builder images
+                nvrs = [(n['name'], n['version'], n['release']) for n in map(parse_nvr, advisory.builds)]
+                advisory.go_nvr_map = await exectools.to_thread(util.get_golang_container_nvrs, nvrs, logger)
+
+        await asyncio.gather(
+            *(
+                _resolve(snapshot.advisories[advisory_id], trackers)
+                for advisory_id, trackers in advisory_trackers.items()
             )
+        )
 
-    def get_attached_bugs(self, advisory_ids: List[str]) -> Dict[int, Set[Bug]]:
-        """Get bugs attached to specified advisories
-        :return: a dict with advisory id as key and set of bug objects as value
-        """
-        logger.info(f"Retrieving bugs for advisories: {advisory_ids}")
-
-        # {12345: {'bugzilla' -> [..], 'jira' -> [..]} .. }
-        advisory_bug_id_map: Dict[int, Dict] = {advisory_id: get_bug_ids(advisory_id) for advisory_id in advisory_ids}
+    def verify_bugs_multiple_advisories(self, non_flaw_bugs: List[Bug], snapshot: VerificationSnapshot):
+        logger.info(f'Checking {len(non_flaw_bugs)} bugs, if any bug is attached to multiple advisories')
+        for problem in multiple_advisories_problems(non_flaw_bugs, snapshot):
+            self._complain(problem)
 
-        # we do this to gather bug ids from all advisories of a bug type
-        # and fetch them in one go to avoid multiple requests
-        attached_bug_map: Dict[int, Set[Bug]] = {advisory_id: set() for advisory_id in advisory_ids}
-        for bug_tracker_type in ['jira', 'bugzilla']:
-            bug_tracker = self.runtime.get_bug_tracker(bug_tracker_type)
-            all_bug_ids = {bug_id for bug_dict in advisory_bug_id_map.values() for bug_id in bug_dict[bug_tracker_type]}
-            bug_map: Dict[Bug] = bug_tracker.get_bugs_map(all_bug_ids)
-            for advisory_id in advisory_ids:
-                set_of_bugs: Set[Bug] = {
-                    bug_map[bid] for bid in advisory_bug_id_map[advisory_id][bug_tracker_type] if bid in bug_map
-                }
-                attached_bug_map[advisory_id] = attached_bug_map[advisory_id] | set_of_bugs
-        return attached_bug_map
+    def verify_attached_flaws(self, snapshot: VerificationSnapshot):
+        for advisory_id in snapshot.advisories:
+            for problem in attached_flaws_problems(snapshot, advisory_id):
+                self._complain(problem)
 
     def filter_bugs_by_release(self, bugs: List[Bug], complain: bool = False) -> List[Bug]:
         # filter out bugs with an invalid target release
@@ -642,3 +618,127 @@ class BugValidator:
 
     def _complain(self, problem: str):
         self.problems.append(problem)
+
+
+def multiple_advisories_problems(non_flaw_bugs: Iterable[Bug], snapshot: VerificationSnapshot) -> List[str]:
+    """:return: Problems with bugs that are attached to more than one open advisory"""
+    problems = []
+    for bug in non_flaw_bugs:
+        tracker_type = 'jira' if JIRABug.looks_like_a_jira_bug(bug.id) else 'bugzilla'
+        advisory_ids = snapshot.advisories_of(tracker_type, bug.id)
+        if len(advisory_ids) > 1:
+            problems.append(f'Bug <{bug.weburl}|{bug.id}> is attached in multiple advisories: {advisory_ids}')
+    return problems
+
+
+def attached_flaws_problems(snapshot: VerificationSnapshot, advisory_id: int) -> List[str]:
+    """:return: Problems with the flaw bugs, type, CVE names and CVE package exclusions of an advisory"""
+    problems = []
+    advisory = snapshot.advisories[advisory_id]
+    attached_bugs = snapshot.attached_bugs(advisory_id)
+    attached_trackers = [b for b in attached_bugs if b.is_tracker_bug()]
+    attached_flaws = [b for b in attached_bugs if b.is_flaw_bug()]
+
+    # Check if attached flaws match expected flaws
+    first_fix_flaw_ids = set(advisory.first_fix_flaw_ids)
+    attached_flaw_ids = {b.id for b in attached_flaws}
+    missing_flaw_ids = first_fix_flaw_ids - attached_flaw_ids
+    if missing_flaw_ids:
+        problems.append(
+            f"On advisory {advisory_id}, these flaw bugs are not attached: "
+            f"{', '.join(sorted(map(str, missing_flaw_ids)))} but "
+            "they are referenced by attached tracker bugs. "
+            "You need to attach those flaw bugs or drop corresponding tracker bugs."
+        )
+    extra_flaw_ids = attached_flaw_ids - first_fix_flaw_ids
+    if extra_flaw_ids:
+        problems.append(
+            f"On advisory {advisory_id}, these flaw bugs are attached: "
+            f"{', '.join(sorted(map(str, extra_flaw_ids)))} but "
+            f"there are no tracker bugs referencing them. "
+            "You need to drop those flaw bugs or attach corresponding tracker bugs."
+        )
+
+    # Check if advisory is of the expected type
+    advisory_type = advisory.errata_type
+    if not first_fix_flaw_ids:
+        if advisory_type == "RHSA":
+            problems.append(
+                f"Advisory {advisory_id} is of type {advisory_type} "
+                f"but has no first-fix flaw bugs. It should be converted to RHBA or RHEA."
+            )
+        return problems  # The remaining checks are not needed for a non-RHSA.
+    if advisory_type != "RHSA":
+        problems.append(
+            f"Advisory {advisory_id} is of type {advisory_type} but has first-fix flaw bugs "
+            f"{first_fix_flaw_ids}. It should be converted to RHSA."
+        )
+
+    attached_components = {parse_nvr(build)["name"] for build in advisory.builds}
+
+    # Validate CVE mappings (of CVEs and builds)
+    flaw_id_bugs = {flaw_id: snapshot.flaws[str(flaw_id)] for flaw_id in first_fix_flaw_ids}
+    cve_components_mapping: Dict[str, Set[str]] = {}
+    for tracker in attached_trackers:
+        whiteboard_component = tracker.whiteboard_component
+        if not whiteboard_component:
+            raise ValueError(f"Bug {tracker.id} doesn't have a valid whiteboard component.")
+        if whiteboard_component == "rhcos":
+            # rhcos trackers are special, since they have per-architecture component names
+            # (rhcos-x86_64, rhcos-aarch64, ...) in Brew,
+            # but the tracker bug has a generic "rhcos" component name
+            # so we need to associate this CVE with all per-architecture component names
+            component_names = attached_components & arch_util.RHCOS_BREW_COMPONENTS
+        else:
+            component_names = {whiteboard_component}
+        flaw_ids = advisory.tracker_flaws[str(tracker.id)]
+        for flaw_id in flaw_ids:
+            if flaw_id not in flaw_id_bugs:  # This means associated flaw wasn't considered a first fix
+                continue
+            alias = [k for k in flaw_id_bugs[flaw_id].alias if k.startswith('CVE-')]
+            if len(alias) != 1:
+                raise ValueError(f"Bug {flaw_id} should have exactly 1 CVE alias.")
+            cve = alias[0]
+            cve_components_mapping.setdefault(cve, set()).update(component_names)
+
+    try:
+        AsyncErrataUtils.validate_cves(advisory_id, advisory.cves, cve_components_mapping)
+        expected_exclusions = AsyncErrataUtils.compute_cve_exclusions(
+            advisory.builds, cve_components_mapping, advisory.go_nvr_map
+        )
+        extra_exclusions, missing_exclusions = AsyncErrataUtils.diff_cve_exclusions(
+            advisory.cve_exclusions, expected_exclusions
+        )
+        for cve, cve_package_exclusions in extra_exclusions.items():
+            if cve_package_exclusions:
+                problems.append(
+                    f"On advisory {advisory_id}, {cve} is not associated with Brew components "
+                    f"{', '.join(sorted(cve_package_exclusions))}."
+                    " You may need to associate the CVE with the components "
+                    "in the CVE mapping or drop the tracker bugs."
+                )
+        for cve, cve_package_exclusions in missing_exclusions.items():
+            if cve_package_exclusions:
+                problems.append(
+                    f"On advisory {advisory_id}, {cve} is associated with Brew components "
+                    f"{', '.join(sorted(cve_package_exclusions))} without a tracker bug."
+                    " You may need to explicitly exclude those Brew components from the CVE "
+                    "mapping or attach the corresponding tracker bugs."
+                )
+    except ValueError as e:
+        problems.append(str(e))
+
+    # Validate `CVE Names` field of the advisory
+    extra_cves = cve_components_mapping.keys() - advisory.cves
+    if extra_cves:
+        problems.append(
+            f"On advisory {advisory_id}, bugs for the following CVEs are already attached "
+            f"but they are not listed in advisory's `CVE Names` field: {', '.join(sorted(extra_cves))}"
+        )
+    missing_cves = advisory.cves - cve_components_mapping.keys()
+    if missing_cves:
+        problems.append(
+            f"On advisory {advisory_id}, bugs for the following CVEs are not attached but listed in "
+            f"advisory's `CVE Names` field: {', '.join(sorted(missing_cves))}"
+        )
+    return problems
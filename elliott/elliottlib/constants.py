@@ -129,3 +129,9 @@ errata_post_erratum_url = errata_url + "/api/v1/erratum"
 errata_get_advisories_for_bug_url = errata_url + "/bugs/{id}/advisories.json"
 
 JIRA_API_FIELD = "https://issues.redhat.com/rest/api/2/field"
+# Directory of the local store of JIRA and Bugzilla bugs; searches and bugs are fetched from the trackers if unset
+BUG_STORE_DIR_ENV = "ART_BUG_STORE_DIR"
+# Seconds stored searches and bugs are used without checking the trackers for changes
+BUG_STORE_MAX_AGE_ENV = "ART_BUG_STORE_MAX_AGE"
+# Directory of the local index of the source RPMs installed in each image build, used by find-unconsumed-rpms
+RPM_CONSUMPTION_INDEX_DIR_ENV = "ART_RPM_CONSUMPTION_INDEX_DIR"
@@ -12,6 +12,7 @@ import datetime
 import json
 import re
 import ssl
+import threading
 from functools import lru_cache
 from typing import Dict, List
 
@@ -30,6 +31,30 @@ logger = logutil.get_logger(__name__)
 
 ErrataConnector._url = constants.errata_url
 
+_thread_local = threading.local()
+
+
+def _errata_session() -> requests.Session:
+    """
+    Get a requests session for the current thread, so that consecutive calls reuse connections to Errata Tool
+    instead of doing a TLS handshake each time.
+    """
+    session = getattr(_thread_local, "session", None)
+    if session is None:
+        session = _thread_local.session = requests.Session()
+    return session
+
+
+def _errata_auth() -> HTTPSPNEGOAuth:
+    """
+    Get the SPNEGO auth of the current thread, so that consecutive calls reuse the negotiated security context
+    instead of doing a Kerberos negotiation each time.
+    """
+    auth = getattr(_thread_local, "auth", None)
+    if auth is None:
+        auth = _thread_local.auth = HTTPSPNEGOAuth()
+    return auth
+
 
 class Advisory(Erratum):
     """
@@ -295,7 +320,9 @@ def build_signed(build):
     :param string build: The build nvr or id
     """
     filter_endpoint = constants.errata_get_build_url.format(id=build)
-    res = requests.get(filter_endpoint, verify=ssl.get_default_verify_paths().openssl_cafile, auth=HTTPSPNEGOAuth())
+    res = _errata_session().get(
+        filter_endpoint, verify=ssl.get_default_verify_paths().openssl_cafile, auth=_errata_auth()
+    )
     if res.status_code == 200:
         return res.json()['rpms_signed']
     elif res.status_code == 401:
@@ -332,10 +359,10 @@ def add_comment(advisory_id, comment):
     :param dict comment: The metadata object to add as a comment
     """
     data = {"comment": json.dumps(comment)}
-    return requests.post(
+    return _errata_session().post(
         constants.errata_add_comment_url.format(id=advisory_id),
         verify=ssl.get_default_verify_paths().openssl_cafile,
-        auth=HTTPSPNEGOAuth(),
+        auth=_errata_auth(),
         json=data,
     )
 
@@ -356,11 +383,11 @@ def get_builds(advisory_id, session=None):
      https://errata.devel.redhat.com/developer-guide/api-http-api.html#api-get-apiv1erratumidbuilds
     """
     if not session:
-        session = requests.session()
+        session = _errata_session()
     res = session.get(
         constants.errata_get_builds_url.format(id=advisory_id),
         verify=ssl.get_default_verify_paths().openssl_cafile,
-        auth=HTTPSPNEGOAuth(),
+        auth=_errata_auth(),
     )
     if res.status_code == 200:
         return res.json()
@@ -390,12 +417,12 @@ def get_brew_builds(errata_id, session=None):
 
     """
     if session is None:
-        session = requests.session()
+        session = _errata_session()
 
     res = session.get(
         constants.errata_get_builds_url.format(id=errata_id),
         verify=ssl.get_default_verify_paths().openssl_cafile,
-        auth=HTTPSPNEGOAuth(),
+        auth=_errata_auth(),
     )
     brew_list = []
     if res.status_code == 200:
@@ -431,12 +458,12 @@ def get_brew_build(nvr, product_version='', session=None) -> brew.Build:
 
     """
     if session is None:
-        session = requests.Session()
+        session = _errata_session()
 
     res = session.get(
         constants.errata_get_build_url.format(id=nvr),
         verify=ssl.get_default_verify_paths().openssl_cafile,
-        auth=HTTPSPNEGOAuth(),
+        auth=_errata_auth(),
     )
 
     if res.status_code == 200:
@@ -454,11 +481,11 @@ def get_advisories_for_bug(bug_id, session=None):
     :param session: Optional requests.Session
     """
     if not session:
-        session = requests.session()
+        session = _errata_session()
     r = session.get(
         constants.errata_get_advisories_for_bug_url.format(id=int(bug_id)),
         verify=ssl.get_default_verify_paths().openssl_cafile,
-        auth=HTTPSPNEGOAuth(),
+        auth=_errata_auth(),
     )
     r.raise_for_status()
     return r.json()
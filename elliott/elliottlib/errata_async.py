@@ -1,35 +1,68 @@
 import asyncio
 import base64
-from typing import Dict, Iterable, List, Optional, Set, Union, cast
-from urllib.parse import quote, urlparse
+import hashlib
+import json
+import re
+from typing import Any, Dict, Iterable, List, Optional, Set, Tuple, Union, cast
+from urllib.parse import quote, urlencode, urlparse
 
 import aiohttp
 import gssapi
 from aiohttp import ClientResponse, ClientResponseError, ClientTimeout
 from artcommonlib import logutil
 from artcommonlib.exectools import limit_concurrency
+from artcommonlib.file_cache import JsonFileCache
 from artcommonlib.rpm_utils import parse_nvr
+from tenacity import AsyncRetrying, retry_if_exception, stop_after_attempt, wait_exponential
 
 from elliottlib import constants, util
 
 _LOGGER = logutil.get_logger(__name__)
 
+# Paths of cached responses that mention an advisory, e.g. /api/v1/erratum/123/builds or /advisory/123/jira_issues.json
+_ADVISORY_PATH_PATTERN = re.compile(r"/(?:erratum|advisory)/([^/?]+)")
+
+
+def _is_retryable(e: BaseException) -> bool:
+    """Whether a failed request is worth retrying: connection problems and server errors, but not client errors."""
+    if isinstance(e, ClientResponseError):
+        return e.status >= 500
+    return isinstance(e, (aiohttp.ClientConnectionError, aiohttp.ClientPayloadError, asyncio.TimeoutError))
+
 
 class AsyncErrataAPI:
-    def __init__(self, url: str = constants.errata_url):
+    """Errata Tool API client.
+
+    All requests share one connection pool with a bounded number of connections to the server.
+    Requests that don't change anything are retried with backoff on connection and server errors.
+    Responses of read-only endpoints are cached for the lifetime of the client; writes to an advisory
+    drop the cached responses about it.
+    """
+
+    def __init__(self, url: str = constants.errata_url, max_connections: int = 16, cache: bool = True):
+        """
+        :param url: Errata Tool URL
+        :param max_connections: Maximum number of concurrent connections to Errata Tool
+        :param cache: Whether to cache responses of read-only endpoints
+        """
         self._errata_url = urlparse(url).geturl()
         self._timeout = ClientTimeout(total=60 * 15)  # 900 seconds (15 min)
         self._errata_gssapi_name = gssapi.Name(
             f"HTTP@{urlparse(self._errata_url).hostname}", gssapi.NameType.hostbased_service
         )
         self._gssapi_flags = [gssapi.RequirementFlag.out_of_sequence_detection]
+        # Keep connections alive so that every request doesn't need a new TLS handshake
         self._session = aiohttp.ClientSession(
-            connector=aiohttp.TCPConnector(limit=32, force_close=True), timeout=self._timeout
+            connector=aiohttp.TCPConnector(limit=max_connections, limit_per_host=max_connections),
+            timeout=self._timeout,
         )
         self._headers = {
             "Content-Type": "application/json",
             "Accept": "application/json",
         }
+        self._cache_enabled = cache
+        # request key -> task fetching the response; concurrent requests for the same key share one task
+        self._cache: Dict[str, asyncio.Task] = {}
 
     async def __aenter__(self):
         return self
@@ -46,6 +79,19 @@ class AsyncErrataAPI:
         return f'Negotiate {base64.b64encode(out_token).decode()}'
 
     async def _make_request(self, method: str, path: str, parse_json: bool = True, **kwargs) -> Union[Dict, bytes]:
+        if method not in (aiohttp.hdrs.METH_GET, aiohttp.hdrs.METH_HEAD):
+            self.invalidate(path)
+            return await self._send_request(method, path, parse_json, **kwargs)
+        async for attempt in AsyncRetrying(
+            reraise=True,
+            stop=stop_after_attempt(5),
+            wait=wait_exponential(multiplier=1, min=1, max=30),
+            retry=retry_if_exception(_is_retryable),
+        ):
+            with attempt:
+                return await self._send_request(method, path, parse_json, **kwargs)
+
+    async def _send_request(self, method: str, path: str, parse_json: bool = True, **kwargs) -> Union[Dict, bytes]:
         auth_header = self._generate_auth_header()
         headers = self._headers.copy()
         headers["Authorization"] = auth_header
@@ -57,6 +103,38 @@ class AsyncErrataAPI:
             result = await (resp.json() if parse_json else resp.read())
         return result
 
+    async def _get(self, path: str, params: Optional[Dict] = None) -> Any:
+        """GET a read-only endpoint, using the cached response if there is one."""
+        if not self._cache_enabled:
+            return await self._make_request(aiohttp.hdrs.METH_GET, path, **({"params": params} if params else {}))
+        key = f"{path}?{urlencode(sorted(params.items()))}" if params else path
+        task = self._cache.get(key)
+        if task is None:
+            request = self._make_request(aiohttp.hdrs.METH_GET, path, **({"params": dict(params)} if params else {}))
+            task = self._cache[key] = asyncio.ensure_future(request)
+        try:
+            return await asyncio.shield(task)
+        except Exception:
+            # Don't cache failures
+            if self._cache.get(key) is task:
+                del self._cache[key]
+            raise
+
+    def invalidate(self, path: Optional[str] = None):
+        """Drop cached responses that may be outdated after a write.
+        :param path: The path that was written to; if it is about an advisory, only responses about that advisory
+            or about which advisories bugs are attached to are dropped. Otherwise everything is.
+        """
+        match = _ADVISORY_PATH_PATTERN.search(path) if path else None
+        if not match:
+            self._cache.clear()
+            return
+        advisory = match.group(1)
+        for key in list(self._cache):
+            key_match = _ADVISORY_PATH_PATTERN.search(key)
+            if (key_match and key_match.group(1) == advisory) or key.startswith(("/jira_issues/", "/bugs/")):
+                del self._cache[key]
+
     @staticmethod
     async def _raise_for_status(response: ClientResponse):
         if not response.ok:
@@ -72,13 +150,13 @@ class AsyncErrataAPI:
 
     async def get_advisory(self, advisory: Union[int, str]) -> Dict:
         path = f"/api/v1/erratum/{quote(str(advisory))}"
-        return await self._make_request(aiohttp.hdrs.METH_GET, path)
+        return await self._get(path)
 
     async def get_builds(self, advisory: Union[int, str]):
         # As of May 25, 2023, /api/v1/erratum/{id}/builds_list doesn't return all builds.
         # Use /api/v1/erratum/{id}/builds instead.
         path = f"/api/v1/erratum/{quote(str(advisory))}/builds"
-        return await self._make_request(aiohttp.hdrs.METH_GET, path)
+        return await self._get(path)
 
     async def get_builds_flattened(self, advisory: Union[int, str]) -> Set[str]:
         pv_builds = await self.get_builds(advisory)
@@ -89,12 +167,43 @@ class AsyncErrataAPI:
         # Not sure if it's an Errata bug. Use a different approach instead.
         return (await self.get_advisory(advisory))["content"]["content"]["cve"].split()
 
+    async def get_advisory_info(self, advisory: Union[int, str]) -> Dict:
+        """Get the details of an advisory without the nesting by advisory type of get_advisory.
+        e.g. {"id": 110351, "synopsis": ..., "status": "QE", "blocking_advisories": [...], ...}
+        """
+        errata = (await self.get_advisory(advisory))["errata"]
+        return next(iter(errata.values()))
+
+    async def get_bug_ids(self, advisory: Union[int, str]) -> Dict[str, List]:
+        """Get the ids of the bugs attached to an advisory.
+        :return: A dict with keys 'bugzilla' and 'jira' containing lists of bug ids
+        """
+        advisory_info = await self.get_advisory(advisory)
+        return {
+            "bugzilla": [bug["bug"]["id"] for bug in advisory_info["bugs"]["bugs"]],
+            "jira": advisory_info["jira_issues"]["idsfixed"],
+        }
+
+    async def get_blocking_advisories(self, advisory: Union[int, str]) -> List[int]:
+        return (await self.get_advisory_info(advisory))["blocking_advisories"]
+
+    async def is_advisory_editable(self, advisory: Union[int, str]) -> bool:
+        return (await self.get_advisory_info(advisory))["status"] in {"NEW_FILES", "QE"}
+
+    @limit_concurrency(limit=32)
+    async def get_brew_build(self, nvr: str) -> Dict:
+        """Get the details of a Brew build as known to Errata Tool.
+        https://errata.devel.redhat.com/developer-guide/api-http-api.html#api-get-apiv1buildid_or_nvr
+        """
+        path = f"/api/v1/build/{quote(str(nvr))}"
+        return await self._get(path)
+
     async def get_cve_package_exclusions(self, advisory_id: int):
         path = "/api/v1/cve_package_exclusion"
         # This is a paginated API, we need to increment page[number] until an empty array is returned.
         params = {"filter[errata_id]": str(int(advisory_id)), "page[number]": 1, "page[size]": 1000}
         while True:
-            result = await self._make_request(aiohttp.hdrs.METH_GET, path, params=params)
+            result = await self._get(path, params=params)
             data: List[Dict] = result.get('data', [])
             if not data:
                 break
@@ -119,7 +228,7 @@ class AsyncErrataAPI:
     async def get_advisories_for_jira(self, jira_key: str, ignore_not_found=False):
         path = f"/jira_issues/{quote(jira_key)}/advisories.json"
         try:
-            result = await self._make_request(aiohttp.hdrs.METH_GET, path)
+            result = await self._get(path)
         except ClientResponseError as e:
             # When newly created jira bugs are not sync'd to ET we get a 404,
             # assume that they are not attached to any advisory
@@ -132,7 +241,7 @@ class AsyncErrataAPI:
     @limit_concurrency(limit=16)
     async def get_advisories_for_bug(self, bz_key: str):
         path = f"/bugs/{bz_key}/advisories.json"
-        return await self._make_request(aiohttp.hdrs.METH_GET, path)
+        return await self._get(path)
 
     async def _paginated_request(
         self, method: str, path: str, params: Optional[Dict] = None, start_page_number: int = 1, page_size: int = 0
@@ -143,7 +252,13 @@ class AsyncErrataAPI:
         if page_size > 0:
             params["page[size]"] = page_size
         while True:
-            result = cast(Dict, await self._make_request(method=method, path=path, params=params))
+            query: Union[Dict, List] = params
+            if any(isinstance(value, list) for value in params.values()):
+                # Parameters with several values, e.g. status[]=QE&status[]=NEW_FILES, are given as lists
+                query = [
+                    (k, v) for k, values in params.items() for v in (values if isinstance(values, list) else [values])
+                ]
+            result = cast(Dict, await self._make_request(method=method, path=path, params=query))
             data: List[Dict] = result.get('data', [])
             if not data:
                 break
@@ -167,6 +282,25 @@ class AsyncErrataAPI:
             params["filter[name]"] = name
         return self._paginated_request(aiohttp.hdrs.METH_GET, path, params=params)
 
+    def search_advisories(self, product: str = "", releases: Iterable[str] = (), states: Iterable[str] = ()):
+        """Search advisories.
+        https://errata.devel.redhat.com/documentation/developer-guide/api-http-api.html#api-get-apiv1erratumsearch
+
+        :param product: Filter by product short name, e.g. RHOSE
+        :param releases: Filter by release names
+        :param states: Filter by advisory states, e.g. constants.errata_active_advisory_labels
+        :return: a generator of advisories
+        """
+        path = "/api/v1/erratum/search"
+        params: Dict[str, Any] = {}
+        if product:
+            params["product[]"] = [product]
+        if releases:
+            params["release[]"] = list(releases)
+        if states:
+            params["status[]"] = list(states)
+        return self._paginated_request(aiohttp.hdrs.METH_GET, path, params=params)
+
     async def create_batch(
         self,
         name: str,
@@ -346,6 +480,81 @@ class AsyncErrataAPI:
         return await self._make_request(aiohttp.hdrs.METH_POST, path)
 
 
+class AdvisoryAttachmentIndex:
+    """Which open advisories bugs are attached to.
+
+    The index is built once from the bug lists of the open advisories of a product, so that checking whether
+    a bug is attached anywhere is a dictionary lookup instead of a request to Errata Tool per bug.
+    Bugs attached to shipped or dropped advisories are not indexed.
+    """
+
+    # Seconds a cached index is used for; bugs are attached to advisories all the time
+    CACHE_TTL = 300
+
+    def __init__(self, advisory_bugs: Dict[int, Dict[str, List]]):
+        """
+        :param advisory_bugs: advisory id -> the ids of the attached bugs as returned by AsyncErrataAPI.get_bug_ids
+        """
+        self.advisory_bugs = advisory_bugs
+        self._advisories: Dict[Tuple[str, str], Set[int]] = {}
+        for advisory, bug_ids in advisory_bugs.items():
+            for tracker_type, ids in bug_ids.items():
+                for bug_id in ids:
+                    self._advisories.setdefault((tracker_type, str(bug_id)), set()).add(advisory)
+
+    def advisories_for(self, tracker_type: str, bug_id: Union[int, str]) -> Set[int]:
+        """:return: The ids of the open advisories a bug is attached to"""
+        return self._advisories.get((tracker_type, str(bug_id)), set())
+
+    def is_attached(self, tracker_type: str, bug_id: Union[int, str]) -> bool:
+        return (tracker_type, str(bug_id)) in self._advisories
+
+    @classmethod
+    def _cache(cls) -> JsonFileCache:
+        return JsonFileCache.named("advisory-attachments", max_age=cls.CACHE_TTL)
+
+    @staticmethod
+    def _cache_key(product: str, states: Iterable[str]) -> str:
+        return hashlib.sha256(json.dumps([product, sorted(states)]).encode()).hexdigest()
+
+    @classmethod
+    async def build(
+        cls,
+        api: AsyncErrataAPI,
+        product: str,
+        states: Iterable[str] = constants.errata_active_advisory_labels,
+        concurrency: int = 16,
+    ) -> "AdvisoryAttachmentIndex":
+        """Build the index from the advisories of a product in the given states.
+        The index is cached on disk for CACHE_TTL seconds if a cache root is set (see artcommonlib.file_cache).
+
+        :param api: Errata Tool API client
+        :param product: Product short name, e.g. RHOSE
+        :param states: Advisory states to index
+        :param concurrency: Maximum number of advisories fetched at the same time
+        """
+        states = list(states)
+        cache = cls._cache()
+        key = cls._cache_key(product, states)
+        cached = cache.get(key)
+        if cached:
+            _LOGGER.info("Using %s advisories of %s cached in %s", len(cached), product, cache.path(key))
+            return cls({int(advisory): bug_ids for advisory, bug_ids in cached.items()})
+
+        advisories = [advisory["id"] async for advisory in api.search_advisories(product=product, states=states)]
+        _LOGGER.info("Indexing bugs of %s open %s advisories", len(advisories), product)
+        semaphore = asyncio.Semaphore(concurrency)
+
+        async def _get_bug_ids(advisory: int):
+            async with semaphore:
+                return await api.get_bug_ids(advisory)
+
+        bug_ids = await asyncio.gather(*(_get_bug_ids(advisory) for advisory in advisories))
+        index = cls(dict(zip(advisories, bug_ids)))
+        cache.put(key, index.advisory_bugs)
+        return index
+
+
 class AsyncErrataUtils:
     @classmethod
     async def get_advisory_cve_exclusions(cls, api: AsyncErrataAPI, advisory_id: int):
@@ -362,10 +571,16 @@ class AsyncErrataUtils:
         return current_exclusions
 
     @classmethod
-    def compute_cve_exclusions(cls, attached_builds: Iterable[str], expected_cve_components: Dict[str, Set[str]]):
+    def compute_cve_exclusions(
+        cls,
+        attached_builds: Iterable[str],
+        expected_cve_components: Dict[str, Set[str]],
+        go_nvr_map: Optional[Dict[str, Set[Tuple[str, str, str]]]] = None,
+    ):
         """Compute cve package exclusions from a list of attached builds and CVE-components mapping.
         :param attached_builds: list of NVRs
         :param expected_cve_components: a dict mapping each CVE to a list of brew components
+        :param go_nvr_map: the result of util.get_golang_container_nvrs for the attached builds; looked up if None
         :return: a dict that key is CVE name, value is another dict with package name as key and 0 as value
         """
         attached_brew_components = {parse_nvr(nvr)["name"] for nvr in attached_builds}
@@ -389,7 +604,7 @@ class AsyncErrataUtils:
 
         if golang_cve_names:
             expected_cve_components = cls.populate_golang_cve_components(
-                golang_cve_names, expected_cve_components, attached_builds
+                golang_cve_names, expected_cve_components, attached_builds, go_nvr_map
             )
 
         cve_exclusions = {
@@ -399,10 +614,13 @@ class AsyncErrataUtils:
         return cve_exclusions
 
     @classmethod
-    def populate_golang_cve_components(cls, golang_cve_names, expected_cve_components, attached_builds):
+    def populate_golang_cve_components(
+        cls, golang_cve_names, expected_cve_components, attached_builds, go_nvr_map=None
+    ):
         # Get go builder images for all attached image builds
-        parsed_nvrs = [(n['name'], n['version'], n['release']) for n in [parse_nvr(n) for n in attached_builds]]
-        go_nvr_map = util.get_golang_container_nvrs(parsed_nvrs, _LOGGER)
+        if go_nvr_map is None:
+            parsed_nvrs = [(n['name'], n['version'], n['release']) for n in [parse_nvr(n) for n in attached_builds]]
+            go_nvr_map = util.get_golang_container_nvrs(parsed_nvrs, _LOGGER)
 
         etcd_golang_builder, base_golang_builders = None, []
         for builder_nvr_string in go_nvr_map.keys():
@@ -469,7 +687,20 @@ class AsyncErrataUtils:
     ):
         _LOGGER.info("Getting associated CVEs for advisory %s", advisory_id)
         advisory_cves = await api.get_cves(advisory_id)
+        cls.validate_cves(advisory_id, advisory_cves, cve_components_mapping)
 
+        _LOGGER.info("Getting current CVE package exclusions for advisory %s", advisory_id)
+        current_exclusions = await cls.get_advisory_cve_exclusions(api, advisory_id)
+        _LOGGER.info("Comparing current CVE package exclusions with expected ones for advisory %s", advisory_id)
+        expected_exclusions = cls.compute_cve_exclusions(attached_builds, cve_components_mapping)
+        extra_exclusions, missing_exclusions = cls.diff_cve_exclusions(current_exclusions, expected_exclusions)
+        return extra_exclusions, missing_exclusions
+
+    @classmethod
+    def validate_cves(cls, advisory_id: int, advisory_cves: Iterable[str], cve_components_mapping: Dict[str, Dict]):
+        """Make sure the CVE names field of an advisory lists exactly the CVEs of the attached trackers.
+        :raises ValueError: If it doesn't
+        """
         extra_cves = cve_components_mapping.keys() - advisory_cves
         if extra_cves:
             raise ValueError(
@@ -487,13 +718,6 @@ class AsyncErrataUtils:
                 " from the CVE names field in advisory"
             )
 
-        _LOGGER.info("Getting current CVE package exclusions for advisory %s", advisory_id)
-        current_exclusions = await cls.get_advisory_cve_exclusions(api, advisory_id)
-        _LOGGER.info("Comparing current CVE package exclusions with expected ones for advisory %s", advisory_id)
-        expected_exclusions = cls.compute_cve_exclusions(attached_builds, cve_components_mapping)
-        extra_exclusions, missing_exclusions = cls.diff_cve_exclusions(current_exclusions, expected_exclusions)
-        return extra_exclusions, missing_exclusions
-
     @classmethod
     async def associate_builds_with_cves(
         cls,
@@ -0,0 +1,209 @@
+"""
+Detect the Go version Brew builds were built with.
+
+The Go version of a build never changes, so detected versions are cached on disk by NVR if
+a cache root is set (see artcommonlib.file_cache). Versions are read from the RPMs Brew recorded for builds
+(the buildroot of RPM builds, the contents of container images) where possible, and otherwise
+from build logs, which are streamed and only read up to the line naming the Go compiler.
+"""
+
+import asyncio
+import re
+import ssl
+from typing import Any, Dict, Iterable, List, Optional, Tuple
+
+import aiohttp
+import koji
+from artcommonlib import exectools, file_cache, logutil
+
+from elliottlib import brew, constants, util
+
+_LOGGER = logutil.get_logger(__name__)
+
+# (name, version, release) of a build
+NVR = Tuple[str, str, str]
+
+# Go compilers built for RHEL 7 software collections, e.g. go-toolset-1.14-golang
+_GO_TOOLSET_PATTERN = re.compile(r'go-toolset-1\S+-golang')
+
+
+def golang_in_rpms(rpms: Iterable[Dict]) -> Optional[str]:
+    """
+    :param rpms: Koji RPM dicts, e.g. the buildroot listing of a build
+    :return: The version of the Go compiler among the RPMs, formatted like it is read from build logs; or None
+    """
+    rpms = list(rpms)
+    for rpm in rpms:
+        if rpm['name'] == 'golang-bin':
+            return f"{rpm['version']}-{rpm['release']}"
+    for rpm in rpms:
+        if _GO_TOOLSET_PATTERN.fullmatch(rpm['name']):
+            return f"{rpm['version']}-{rpm['release']}.{rpm['arch']}"
+    return None
+
+
+class GolangVersionDetector:
+    """Detects the Go versions of many builds concurrently."""
+
+    def __init__(
+        self,
+        koji_session: Optional[koji.ClientSession] = None,
+        cache_dir: Optional[str] = None,
+        concurrency: int = 16,
+        arch: str = 'x86_64',
+    ):
+        """
+        :param koji_session: Brew session; a new one is created if None
+        :param cache_dir: Directory to cache versions in; defaults to golang-versions in the cache root
+        :param concurrency: Maximum number of build logs downloaded at the same time
+        :param arch: Arch of the buildroots, images and logs to inspect
+        """
+        self._koji_session = koji_session or koji.ClientSession(constants.BREW_HUB)
+        self._cache = file_cache.JsonFileCache(cache_dir or file_cache.cache_dir("golang-versions"))
+        self._concurrency = concurrency
+        self._arch = arch
+
+    def _load(self, nvr: NVR) -> Tuple[bool, Optional[str]]:
+        """:return: (whether the version of the build is cached, the cached version)"""
+        entry = self._cache.get('-'.join(nvr))
+        if not isinstance(entry, dict) or 'go_version' not in entry:
+            return False, None
+        return True, entry['go_version']
+
+    def _store(self, nvr: NVR, go_version: Optional[str]):
+        self._cache.put('-'.join(nvr), {'go_version': go_version})
+
+    def _multicall(self, method: str, calls: List[Tuple[tuple, Dict]]) -> List[Any]:
+        """Call a Koji method once per (args, kwargs) in one request; failed calls return None"""
+        with self._koji_session.multicall(strict=False) as m:
+            tasks = [getattr(m, method)(*args, **kwargs) for args, kwargs in calls]
+        results = []
+        for task in tasks:
+            try:
+                results.append(task.result)
+            except koji.GenericError as e:
+                _LOGGER.debug("%s failed: %s", method, e)
+                results.append(None)
+        return results
+
+    def _recorded_versions(self, nvrs: List[NVR], image: bool) -> Dict[NVR, Optional[str]]:
+        """
+        Read Go versions from the RPMs Brew recorded for builds: the buildroot listing of RPM builds,
+        or the RPMs installed in the images of container builds.
+        :return: NVR -> Go version, or None if there is no Go compiler; builds without records are left out
+        """
+        builds = self._multicall('getBuild', [(('-'.join(nvr),), {}) for nvr in nvrs])
+        found = [(nvr, build) for nvr, build in zip(nvrs, builds) if build]
+        listing_calls = []
+        if image:
+            archive_lists = self._multicall(
+                'listArchives', [((), {'buildID': b['id'], 'type': 'image'}) for _, b in found]
+            )
+            for (nvr, _), archives in zip(found, archive_lists):
+                archive = next(
+                    (
+                        a
+                        for a in archives or []
+                        if ((a.get('extra') or {}).get('image') or {}).get('arch') == self._arch
+                    ),
+                    None,
+                )
+                if archive:
+                    listing_calls.append((nvr, 'listRPMs', ((), {'imageID': archive['id']})))
+        else:
+            rpm_lists = self._multicall('listRPMs', [((), {'buildID': b['id']}) for _, b in found])
+            for (nvr, _), rpms in zip(found, rpm_lists):
+                # The buildroot the binary RPMs were built in; the source RPM is built without build dependencies
+                rpms = sorted(
+                    (r for r in rpms or [] if r['arch'] != 'src' and r['buildroot_id']),
+                    key=lambda r: r['arch'] != self._arch,
+                )
+                if rpms:
+                    listing_calls.append((nvr, 'getBuildrootListing', ((rpms[0]['buildroot_id'],), {})))
+
+        versions = {}
+        for method in {method for _, method, _ in listing_calls}:
+            calls = [(nvr, call) for nvr, m, call in listing_calls if m == method]
+            for (nvr, _), listing in zip(calls, self._multicall(method, [call for _, call in calls])):
+                if listing is not None:
+                    versions[nvr] = golang_in_rpms(listing)
+        return versions
+
+    @staticmethod
+    def _go_version_in_line(line: bytes) -> Optional[str]:
+        try:
+            return util.get_golang_version_from_build_log(line.decode(errors='replace'))
+        except AttributeError:
+            return None
+
+    async def _logged_version(self, session: aiohttp.ClientSession, nvr: NVR, url: str) -> Tuple[bool, Optional[str]]:
+        """
+        Stream a build log until the line naming the Go compiler.
+        :return: (whether the log could be read, the Go version or None if the log doesn't name one)
+        """
+        _LOGGER.debug("Reading %s", url)
+        try:
+            async with session.get(url) as resp:
+                if resp.status != 200:
+                    _LOGGER.debug("Could not get build log for %s: HTTP %s", nvr, resp.status)
+                    return False, None
+                # Split lines ourselves: log lines can be longer than StreamReader.readline() allows
+                pending = b''
+                async for data in resp.content.iter_chunked(1 << 16):
+                    lines = (pending + data).split(b'\n')
+                    pending = lines.pop()
+                    for line in lines:
+                        go_version = self._go_version_in_line(line)
+                        if go_version:
+                            return True, go_version
+                go_version = self._go_version_in_line(pending)
+                if go_version:
+                    return True, go_version
+        except (aiohttp.ClientError, asyncio.TimeoutError) as e:
+            _LOGGER.debug("Could not read build log for %s: %s", nvr, e)
+            return False, None
+        return True, None
+
+    async def detect(self, nvrs: Iterable[NVR], image: bool = False) -> Dict[NVR, Optional[str]]:
+        """
+        Detect the Go versions of builds.
+        :param nvrs: The builds
+        :param image: Whether the builds are container builds (Go builder images) instead of RPM builds
+        :return: NVR -> Go version, or None if it couldn't be determined
+        """
+        nvrs = list(dict.fromkeys(tuple(nvr) for nvr in nvrs))
+        versions: Dict[NVR, Optional[str]] = {}
+        for nvr in nvrs:
+            cached, go_version = self._load(nvr)
+            if cached:
+                versions[nvr] = go_version
+        missing = [nvr for nvr in nvrs if nvr not in versions]
+        if missing:
+            try:
+                recorded = await exectools.to_thread(self._recorded_versions, missing, image)
+            except Exception as e:
+                _LOGGER.warning("Couldn't read the RPMs Brew recorded for %s builds: %s", len(missing), e)
+                recorded = {}
+            for nvr, go_version in recorded.items():
+                versions[nvr] = go_version
+                self._store(nvr, go_version)
+
+        missing = [nvr for nvr in nvrs if nvr not in versions]
+        if missing:
+            _LOGGER.info("Reading build logs of %s builds without recorded buildroots", len(missing))
+            log_url = brew.nvr_arch_log_url if image else brew.nvr_root_log_url
+            semaphore = asyncio.Semaphore(self._concurrency)
+
+            async def _detect(session, nvr):
+                async with semaphore:
+                    read, go_version = await self._logged_version(session, nvr, log_url(*nvr, arch=self._arch))
+                if read:
+                    self._store(nvr, go_version)
+                versions[nvr] = go_version
+
+            connector = aiohttp.TCPConnector(limit=self._concurrency, ssl=ssl.create_default_context())
+            async with aiohttp.ClientSession(
+                connector=connector, timeout=aiohttp.ClientTimeout(total=60 * 10)
+            ) as session:
+                await asyncio.gather(*(_detect(session, nvr) for nvr in missing))
+        return versions
@@ -0,0 +1,294 @@
+"""
+Resolve many Konflux builds and custom resources at once.
+
+Build records are fetched from the Konflux DB with one query per search window for all builds that weren't
+found in newer windows, instead of one query per build. Snapshots, Components and Releases are listed once per
+kind (optionally with a label selector) instead of being fetched one by one, and Releases are waited for with one
+shared watch.
+"""
+
+import asyncio
+import datetime
+from typing import Dict, Iterable, List, Optional, Sequence
+
+from artcommonlib import exectools, logutil
+from artcommonlib import util as art_util
+from artcommonlib.konflux.konflux_build_record import Engine, KonfluxBuildOutcome, KonfluxRecord
+from artcommonlib.konflux.konflux_db import DEFAULT_SEARCH_DAYS, DEFAULT_SEARCH_WINDOW, KonfluxDb
+from doozerlib.backend.konflux_client import (
+    API_VERSION,
+    KIND_COMPONENT,
+    KIND_RELEASE,
+    KIND_SNAPSHOT,
+    KonfluxClient,
+)
+from kubernetes import watch
+from kubernetes.dynamic import exceptions, resource
+
+LOGGER = logutil.get_logger(__name__)
+
+# Reasons of the `Released` condition of a Release that is still being processed
+_RELEASE_IN_PROGRESS_REASONS = {"Unknown", "Not Found", "Progressing"}
+
+# Maximum time a single watch request is kept open, so that lost connections are noticed
+_WATCH_TIMEOUT_SECONDS = 5 * 60
+
+# Label of the application a Release belongs to
+_APPLICATION_LABEL = "appstudio.openshift.io/application"
+
+
+def release_finished(release_obj) -> bool:
+    """:return: Whether a Release finished processing, successfully or not"""
+    try:
+        condition = art_util.KubeCondition.find_condition(release_obj, 'Released')
+    except AttributeError:  # status takes some time to appear
+        return False
+    return bool(condition) and condition.reason not in _RELEASE_IN_PROGRESS_REASONS
+
+
+class KonfluxResolver:
+    """Fetches build records and custom resources in bulk, caching what it fetched."""
+
+    def __init__(
+        self,
+        konflux_client: Optional[KonfluxClient] = None,
+        konflux_db: Optional[KonfluxDb] = None,
+        namespace: Optional[str] = None,
+    ):
+        """
+        :param konflux_client: Client of the Konflux cluster; only needed to look up custom resources
+        :param konflux_db: Konflux DB bound to the table to look up build records in; only needed for build records
+        :param namespace: Namespace of custom resources; defaults to the default namespace of konflux_client
+        """
+        self.konflux_client = konflux_client
+        self.konflux_db = konflux_db
+        self.namespace = namespace or (konflux_client.default_namespace if konflux_client else None)
+        # NVR -> build record
+        self._records: Dict[str, KonfluxRecord] = {}
+        # (kind, label selector) -> name -> object
+        self._objects: Dict[tuple, Dict[str, resource.ResourceField]] = {}
+
+    async def _search(self, where: Dict, key: str, values: Sequence[str]) -> Dict[str, KonfluxRecord]:
+        """Search build records matching `where` and any of `values` in column `key`, newest first.
+        Windows are searched from the newest to the oldest, each only for the values no record was found for yet,
+        and each returns at most the newest record of every value.
+        :return: value -> the newest record with that value
+        """
+        found = {}
+        remaining = list(values)
+        end_search = datetime.datetime.now(tz=datetime.timezone.utc)
+        start_search = end_search - datetime.timedelta(days=DEFAULT_SEARCH_DAYS)
+        end_window = end_search
+        while remaining and end_window > start_search:
+            start_window = max(end_window - datetime.timedelta(days=DEFAULT_SEARCH_WINDOW), start_search)
+            records = self.konflux_db.search_builds_by_fields(
+                start_search=start_window,
+                end_search=end_window,
+                window_size=DEFAULT_SEARCH_WINDOW,
+                where={**where, key: remaining},
+                first_per=key,
+            )
+            async for record in records:
+                found.setdefault(getattr(record, key), record)
+            remaining = [value for value in remaining if value not in found]
+            end_window = start_window
+        return found
+
+    async def get_build_records(
+        self,
+        nvrs: Iterable[str],
+        outcome: KonfluxBuildOutcome = KonfluxBuildOutcome.SUCCESS,
+        where: Optional[Dict] = None,
+        strict: bool = True,
+    ) -> List[Optional[KonfluxRecord]]:
+        """Bulk version of KonfluxDb.get_build_records_by_nvrs.
+        :param nvrs: NVRs of the builds
+        :param outcome: The outcome of the builds
+        :param where: Additional fields to filter the build records on
+        :param strict: If True, raise an IOError if any build record is not found
+        :return: The build record of each NVR in the same order, or None for builds that weren't found
+        """
+        nvrs = list(nvrs)
+        where = dict(where or {})
+        if "nvr" in where or "outcome" in where:
+            raise ValueError("'nvr' and 'outcome' fields are reserved and should not be used in the 'where' parameter")
+        where["outcome"] = str(outcome)
+        missing = list(dict.fromkeys(nvr for nvr in nvrs if nvr not in self._records))
+        if missing:
+            LOGGER.info("Fetching %s build records from Konflux DB", len(missing))
+            self._records.update(await self._search(where, "nvr", missing))
+        not_found = [nvr for nvr in nvrs if nvr not in self._records]
+        if not_found and strict:
+            raise IOError(f"Failed to fetch NVRs from Konflux DB: {', '.join(not_found)}")
+        return [self._records.get(nvr) for nvr in nvrs]
+
+    async def get_latest_builds(
+        self,
+        names: Iterable[str],
+        group: str,
+        outcome: KonfluxBuildOutcome = KonfluxBuildOutcome.SUCCESS,
+        assembly: Optional[str] = None,
+        engine: Optional[Engine] = None,
+    ) -> List[Optional[KonfluxRecord]]:
+        """Bulk version of KonfluxDb.get_latest_builds.
+        :param names: Component names
+        :param group: e.g. 'openshift-4.18'
+        :param outcome: Outcome of the builds
+        :param assembly: Assembly name; if omitted any assembly is matched
+        :param engine: Build engine; if omitted any engine is matched
+        :return: The latest build of each component in the same order, or None for components without builds
+        """
+        names = list(names)
+        where = {"group": group, "outcome": str(outcome)}
+        if assembly:
+            where["assembly"] = assembly
+        if engine:
+            where["engine"] = str(engine)
+        LOGGER.info("Fetching latest builds of %s components from Konflux DB", len(names))
+        found = await self._search(where, "name", list(dict.fromkeys(names)))
+        return [found.get(name) for name in names]
+
+    async def list_objects(self, kind: str, label_selector: Optional[str] = None) -> Dict[str, resource.ResourceField]:
+        """List custom resources of a kind in the namespace with one request.
+        :return: name -> object
+        """
+        key = (kind, label_selector)
+        if key not in self._objects:
+            api = await self.konflux_client._get_api(API_VERSION, kind)
+            LOGGER.debug("Listing %s objects in namespace %s (%s)", kind, self.namespace, label_selector or "all")
+            result = await exectools.to_thread(api.get, namespace=self.namespace, label_selector=label_selector)
+            self._objects[key] = {obj.metadata.name: obj for obj in result.items}
+        return self._objects[key]
+
+    async def get_objects(
+        self, kind: str, names: Iterable[str], label_selector: Optional[str] = None
+    ) -> List[resource.ResourceField]:
+        """Get custom resources of a kind by name, listing them all with one request.
+        :raises ValueError: If any of them doesn't exist
+        """
+        objects = await self.list_objects(kind, label_selector)
+        names = list(names)
+        missing = [name for name in names if name not in objects]
+        if missing:
+            raise ValueError(f"{kind} not found in namespace {self.namespace}: {', '.join(missing)}")
+        return [objects[name] for name in names]
+
+    async def get_components(self, application: str) -> Dict[str, resource.ResourceField]:
+        """:return: name -> Component of an application"""
+        components = await self.list_objects(KIND_COMPONENT)
+        return {name: obj for name, obj in components.items() if obj.spec.application == application}
+
+    async def get_snapshots(self, names: Iterable[str]) -> List[resource.ResourceField]:
+        return await self.get_objects(KIND_SNAPSHOT, names)
+
+    async def wait_for_releases(
+        self,
+        names: Iterable[str],
+        timeout: datetime.timedelta,
+        label_selector: Optional[str] = None,
+    ) -> Dict[str, resource.ResourceInstance]:
+        """Wait for Releases to finish processing, watching all of them with one watch.
+        :param names: Names of the Releases
+        :param timeout: Maximum time to wait; Releases are only looked up once if 0
+        :param label_selector: Only watch Releases with these labels. If omitted, a single Release is watched by name,
+            and several are watched by the applications they belong to, so that other Releases in the namespace
+            aren't listed and watched
+        :return: name -> the last seen state of each Release that exists; Releases that didn't finish in time
+            are included in their last seen state
+        """
+        names = list(dict.fromkeys(names))
+        api = await self.konflux_client._get_api(API_VERSION, KIND_RELEASE)
+
+        if self.konflux_client.dry_run:
+            await asyncio.sleep(3)
+            LOGGER.info("[DRY RUN] Would have waited for Releases %s to complete", ", ".join(names))
+            return {
+                name: resource.ResourceInstance(
+                    self.konflux_client.dyn_client,
+                    {
+                        "metadata": {"name": name, "namespace": self.namespace},
+                        "apiVersion": API_VERSION,
+                        "kind": KIND_RELEASE,
+                        "status": {"conditions": [{"type": "Released", "status": "True", "reason": "Succeeded"}]},
+                    },
+                )
+                for name in names
+            }
+
+        def _inner():
+            deadline = datetime.datetime.now() + timeout
+            releases: Dict[str, resource.ResourceInstance] = {}
+            pending = set(names)
+            watcher = watch.Watch()
+            selectors = {"label_selector": label_selector}
+            if label_selector is None and len(names) == 1:
+                selectors = {"field_selector": f"metadata.name={names[0]}"}
+            elif label_selector is None:
+                selectors = {"label_selector": self._release_label_selector(api, names)}
+                if not selectors["label_selector"]:
+                    LOGGER.warning("None of the Releases exist in namespace %s", self.namespace)
+                    return releases
+
+            def _update(obj: resource.ResourceInstance):
+                name = obj.metadata.name
+                if name not in pending:
+                    return
+                releases[name] = obj
+                if release_finished(obj):
+                    LOGGER.info("Release %s finished", name)
+                    pending.discard(name)
+
+            def _list() -> str:
+                """Update Releases with their current state; return the resource version to watch from"""
+                listing = api.get(namespace=self.namespace, **selectors)
+                for item in listing.items:
+                    _update(resource.ResourceInstance(api, item.to_dict()))
+                return listing.metadata.resourceVersion
+
+            resource_version = _list()
+            while pending:
+                remaining = (deadline - datetime.datetime.now()).total_seconds()
+                if remaining <= 0:
+                    LOGGER.info("Timeout reached. Releases still in progress: %s", ", ".join(sorted(pending)))
+                    break
+                LOGGER.info("Waiting for %s Releases: %s", len(pending), ", ".join(sorted(pending)))
+                try:
+                    for event in watcher.stream(
+                        api.get,
+                        namespace=self.namespace,
+                        resource_version=resource_version,
+                        serialize=False,
+                        timeout_seconds=max(1, int(min(remaining, _WATCH_TIMEOUT_SECONDS))),
+                        **selectors,
+                    ):
+                        obj = resource.ResourceInstance(api, event["object"])
+                        resource_version = obj.metadata.resourceVersion
+                        _update(obj)
+                        if not pending:
+                            watcher.stop()
+                            break
+                except exceptions.ApiException as e:
+                    if e.status != 410:
+                        raise
+                    # The resource version is too old to watch from
+                    LOGGER.debug("Watch expired, listing Releases again")
+                    resource_version = _list()
+            return releases
+
+        return await exectools.to_thread(_inner)
+
+    def _release_label_selector(self, api, names: List[str]) -> Optional[str]:
+        """:return: A label selector matching the applications of the given Releases that exist;
+            None if none of them exist
+        :raises ValueError: If a Release doesn't belong to an application
+        """
+        applications = set()
+        for name in names:
+            for release in api.get(namespace=self.namespace, field_selector=f"metadata.name={name}").items:
+                application = (release.metadata.labels or {}).get(_APPLICATION_LABEL)
+                if not application:
+                    raise ValueError(f"Release {name} has no {_APPLICATION_LABEL} label; pass a label selector")
+                applications.add(application)
+        if not applications:
+            return None
+        return f"{_APPLICATION_LABEL} in ({','.join(sorted(applications))})"
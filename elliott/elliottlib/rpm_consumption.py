@@ -0,0 +1,91 @@
+"""
+A local SQLite index of the source RPMs installed in image builds, shared by the elliott commands run on a host.
+
+Image builds never change, so what an image build installed only needs to be looked up once: from the RPMs
+listed for its archives in Brew, or from the installed packages recorded for it in the Konflux DB (which come
+from its SBOM). Later runs only look up image builds that completed since, and find-unconsumed-rpms becomes a
+set difference between tagged RPM builds and the index.
+"""
+
+import json
+import os
+import sqlite3
+import threading
+import time
+from typing import Dict, Iterable, List
+
+from artcommonlib import logutil
+
+from elliottlib import constants
+
+logger = logutil.get_logger(__name__)
+
+# Bump when the format of indexed image builds changes
+_SCHEMA_VERSION = 1
+
+
+class ConsumptionIndex:
+    """Source RPM NVRs installed in each image build, stored in an SQLite database."""
+
+    def __init__(self, path: str = ":memory:"):
+        """
+        :param path: Path of the database; the index only lives as long as the process if omitted
+        """
+        self.path = path
+        self._lock = threading.Lock()
+        self._db = sqlite3.connect(path, timeout=60, check_same_thread=False, isolation_level=None)
+        with self._lock:
+            self._db.execute("PRAGMA journal_mode=WAL")
+            self._db.execute(
+                f"""
+                CREATE TABLE IF NOT EXISTS image_rpms_v{_SCHEMA_VERSION} (
+                    image_nvr TEXT PRIMARY KEY, rpm_nvrs TEXT, indexed REAL
+                )
+                """
+            )
+
+    def get(self, image_nvrs: Iterable[str]) -> Dict[str, List[str]]:
+        """
+        :param image_nvrs: NVRs of image builds
+        :return: image NVR -> source RPM NVRs installed in it, for the image builds that are indexed
+        """
+        image_nvrs = list(dict.fromkeys(image_nvrs))
+        result = {}
+        with self._lock:
+            # Stay well below SQLite's limit of host parameters in a query
+            for start in range(0, len(image_nvrs), 500):
+                chunk = image_nvrs[start : start + 500]
+                rows = self._db.execute(
+                    f"SELECT image_nvr, rpm_nvrs FROM image_rpms_v{_SCHEMA_VERSION} "
+                    f"WHERE image_nvr IN ({', '.join('?' * len(chunk))})",
+                    chunk,
+                )
+                result.update((image_nvr, json.loads(rpm_nvrs)) for image_nvr, rpm_nvrs in rows)
+        return result
+
+    def add(self, consumption: Dict[str, Iterable[str]]):
+        """
+        Index image builds.
+        :param consumption: image NVR -> source RPM NVRs installed in it
+        """
+        now = time.time()
+        rows = [(image_nvr, json.dumps(sorted(set(rpm_nvrs))), now) for image_nvr, rpm_nvrs in consumption.items()]
+        with self._lock:
+            self._db.executemany(
+                f"INSERT OR REPLACE INTO image_rpms_v{_SCHEMA_VERSION} (image_nvr, rpm_nvrs, indexed) VALUES (?, ?, ?)",
+                rows,
+            )
+
+
+def default_index() -> ConsumptionIndex:
+    """
+    :return: The index in the directory named by ART_RPM_CONSUMPTION_INDEX_DIR;
+        an index that only lives as long as the process if the variable isn't set
+    """
+    index_dir = os.environ.get(constants.RPM_CONSUMPTION_INDEX_DIR_ENV)
+    if not index_dir:
+        return ConsumptionIndex()
+    os.makedirs(index_dir, exist_ok=True)
+    path = os.path.join(index_dir, "rpm_consumption.sqlite")
+    logger.debug("Using RPM consumption index %s", path)
+    return ConsumptionIndex(path)
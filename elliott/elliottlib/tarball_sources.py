@@ -1,12 +1,14 @@
 import collections
+import hashlib
 import os
+import re
 import tarfile
-from io import BytesIO
+from concurrent.futures import FIRST_COMPLETED, ProcessPoolExecutor, wait
 from urllib.parse import urldefrag
 
 import errata_tool
 import pygit2
-from artcommonlib import logutil
+from artcommonlib import file_cache, logutil
 from future.standard_library import install_aliases
 
 install_aliases()
@@ -25,6 +27,8 @@ TARBALL_IGNORES = {
 
 LOGGER = logutil.get_logger(__name__)
 
+_FULL_COMMIT_HASH = re.compile(r"[0-9a-f]{40}")
+
 BuildWithProductVersion = collections.namedtuple("BuildWithProductVersion", ["nvr", "product", "product_version"])
 
 
@@ -64,6 +68,39 @@ def find_builds_from_advisory(advisory_number, components):
     return filtered_builds
 
 
+def _fetch_commit(repo, source_commit_hash, force_fetch=False):
+    # pylint: disable=no-member
+    """Fetch a commit from the origin remote of a repo.
+
+    Only the commit itself is fetched (a shallow fetch by hash) if the server allows it;
+    otherwise all objects and refs are.
+    """
+    origin = repo.remotes["origin"]  # type: pygit2.Remote
+    if not force_fetch and _FULL_COMMIT_HASH.fullmatch(source_commit_hash):
+        LOGGER.info("Fetching commit {}...".format(source_commit_hash))
+        try:
+            origin.fetch([source_commit_hash], depth=1)
+            return
+        except (pygit2.GitError, TypeError) as e:  # TypeError: pygit2 < 1.15 doesn't support depth
+            LOGGER.info("Couldn't fetch commit {} alone: {}".format(source_commit_hash, e))
+    LOGGER.info("Fetching latest objects and refs...")
+    origin.fetch()
+
+
+class _BlobReader(object):
+    """A file object reading the content of a blob in chunks, without copying all of it"""
+
+    def __init__(self, blob):
+        self._data = memoryview(blob)
+        self._offset = 0
+
+    def read(self, size=-1):
+        end = len(self._data) if size is None or size < 0 else self._offset + size
+        chunk = self._data[self._offset : end].tobytes()
+        self._offset += len(chunk)
+        return chunk
+
+
 def generate_tarball_source(tarball_file, prefix, local_repo_path, source_url, force_fetch=False):
     # pylint: disable=no-member
     # TODO: fix pylint false positives for pygit2
@@ -73,7 +110,7 @@ def generate_tarball_source(tarball_file, prefix, local_repo_path, source_url, f
 
     :param tarball_file: File object to write the tarball into
     :param prefix: Prepend a prefix (usually a directory) to files placed in the tarball.
-    :param local_repo_path: Clone the remote repository into this local directory.
+    :param local_repo_path: Fetch the commit from the remote repository into this local directory.
     :param source_url: Remote source repo url and commit hash seperated by `#`.
     :param force_fetch: Force download objects and refs from another repository
     """
@@ -102,11 +139,13 @@ def generate_tarball_source(tarball_file, prefix, local_repo_path, source_url, f
             except KeyError:
                 fetch = True
         if fetch:
-            LOGGER.info("Fetching latest objects and refs...")
-            repo.remotes["origin"].fetch()
+            _fetch_commit(repo, source_commit_hash, force_fetch)
     else:
-        LOGGER.info("Cloning from {}...".format(source_repo_url))
-        repo = pygit2.clone_repository(source_repo_url, local_repo_path)
+        # Rather than cloning the whole repo, only fetch the commit we need
+        LOGGER.info("Initializing local Git repo {} for {}...".format(local_repo_path, source_repo_url))
+        repo = pygit2.init_repository(local_repo_path)
+        repo.remotes.create("origin", source_repo_url)
+        _fetch_commit(repo, source_commit_hash)
 
     if not git_commit:
         git_commit = repo.revparse_single(source_commit_hash).peel(pygit2.Commit)
@@ -148,9 +187,140 @@ def generate_tarball_source(tarball_file, prefix, local_repo_path, source_url, f
                         info.linkname = blob.data.decode("utf-8")
                         info.mode = 0o777  # symlinks get placeholder
                         info.size = 0
+                        archive.addfile(info)
                     else:
                         info.mode = entry.filemode
                         info.size = blob.size
-                    archive.addfile(info, BytesIO(blob.data))
+                        # Large blobs are copied into the archive in chunks
+                        archive.addfile(info, _BlobReader(blob))
                     LOGGER.debug("Added {}".format(full_name))
     tarball_file.flush()  # important to write to a temp file
+
+
+class TarballManifest(object):
+    """Records which tarballs in a directory are complete, so that an interrupted run can resume
+    and tarballs of the same source are reused across advisories and runs.
+    """
+
+    FILENAME = "manifest.json"
+
+    def __init__(self, tarball_dir):
+        """
+        :param tarball_dir: Directory the tarballs and the manifest are stored in
+        """
+        self.tarball_dir = tarball_dir
+        self.path = os.path.join(tarball_dir, self.FILENAME)
+        self._entries = file_cache.read_json(self.path) or {}
+
+    @staticmethod
+    def key(job):
+        """:return: The key of the tarball of a TarballJob; tarballs with the same content have the same key"""
+        return hashlib.sha256("{}\0{}".format(job.source_url, job.prefix).encode()).hexdigest()
+
+    def tarball_path(self, key):
+        return os.path.join(self.tarball_dir, key + ".tar.gz")
+
+    def get(self, key):
+        """:return: Path of the complete tarball with the given key, or None"""
+        entry = self._entries.get(key)
+        path = self.tarball_path(key)
+        if not entry or not os.path.isfile(path) or os.path.getsize(path) != entry["size"]:
+            return None
+        return path
+
+    def add(self, key, job):
+        """Record that the tarball with the given key is complete"""
+        self._entries[key] = {
+            "prefix": job.prefix,
+            "source_url": job.source_url,
+            "size": os.path.getsize(self.tarball_path(key)),
+        }
+        file_cache.write_json(self.path, self._entries, indent=2, sort_keys=True)
+
+
+# A tarball to generate: files of the commit in source_url, placed under prefix.
+# Sources of the same repo_name are fetched into the same local repo.
+TarballJob = collections.namedtuple("TarballJob", ["prefix", "repo_name", "source_url"])
+
+
+def _generate_tarball(local_repo_path, prefix, source_url, tarball_path):
+    """Generate a tarball of a source; run in a worker process.
+
+    :param local_repo_path: Local repo to fetch the source into
+    :param prefix: Directory to put the files of the source under in the tarball
+    :param source_url: Source URL with the commit as fragment
+    :param tarball_path: Path to write the tarball to; nothing is written there if generation fails
+    """
+    with file_cache.atomic_write(tarball_path, "wb") as f:
+        generate_tarball_source(f, prefix, local_repo_path, source_url)
+
+
+def generate_tarball_sources(jobs, working_dir, max_workers=None):
+    """Generate tarball sources for many builds in parallel.
+
+    Compressing tarballs is CPU-bound, so tarballs of different repos are generated in separate processes.
+    Tarballs of the same repo are generated one after another, sharing the local repo.
+    Complete tarballs are recorded in a TarballManifest in the working directory and are not generated again.
+
+    :param jobs: TarballJobs
+    :param working_dir: Directory to keep local repos and generated tarballs in
+    :param max_workers: Maximum number of worker processes; defaults to the number of CPUs
+    :return: a dict with TarballJobs as keys and paths of their tarballs as values
+    """
+    tarball_dir = os.path.join(working_dir, "tarballs")
+    os.makedirs(tarball_dir, exist_ok=True)
+    manifest = TarballManifest(tarball_dir)
+
+    tarballs = {}
+    pending = collections.OrderedDict()  # key -> jobs generating the same tarball
+    for job in jobs:
+        key = manifest.key(job)
+        path = manifest.get(key)
+        if path:
+            LOGGER.info("Reusing tarball source for {} generated before.".format(job.source_url))
+            tarballs[job] = path
+        else:
+            pending.setdefault(key, []).append(job)
+    if not pending:
+        return tarballs
+
+    repo_keys = collections.OrderedDict()  # repo name -> keys of tarballs to generate from it
+    for key, same_jobs in pending.items():
+        repo_keys.setdefault(same_jobs[0].repo_name, []).append(key)
+
+    failed_repos = []
+    with ProcessPoolExecutor(max_workers=max_workers) as executor:
+        futures = {}
+
+        def _submit_next(repo_name):
+            # Tarballs of the same repo share the local repo, so they are generated one after another
+            key = repo_keys[repo_name].pop(0)
+            job = pending[key][0]
+            local_repo_path = os.path.join(working_dir, "repos", repo_name)
+            future = executor.submit(
+                _generate_tarball, local_repo_path, job.prefix, job.source_url, manifest.tarball_path(key)
+            )
+            futures[future] = (repo_name, key)
+
+        for repo_name in repo_keys:
+            _submit_next(repo_name)
+        while futures:
+            done, _ = wait(futures, return_when=FIRST_COMPLETED)
+            for future in done:
+                repo_name, key = futures.pop(future)
+                try:
+                    future.result()
+                except Exception as e:
+                    # Keep recording tarballs of other repos, so that a rerun only generates what is missing
+                    LOGGER.error("Failed to generate tarball sources from repo {}: {}".format(repo_name, e))
+                    failed_repos.append(repo_name)
+                    continue
+                # Record each tarball as soon as it is complete, so that it survives a failure or interruption
+                manifest.add(key, pending[key][0])
+                for job in pending[key]:
+                    tarballs[job] = manifest.tarball_path(key)
+                if repo_keys[repo_name]:
+                    _submit_next(repo_name)
+    if failed_repos:
+        raise IOError("Failed to generate tarball sources from repos: {}".format(", ".join(sorted(failed_repos))))
+    return tarballs
@@ -16,8 +16,7 @@ from artcommonlib.format_util import green_prefix, green_print, red_prefix
 from artcommonlib.logutil import get_logger
 from errata_tool import Erratum
 
-from elliottlib import brew
-from elliottlib.exceptions import BrewBuildException
+from elliottlib import brew, golang_version
 
 # -----------------------------------------------------------------------------
 # Constants and defaults
@@ -387,13 +386,18 @@ def get_golang_container_nvrs(nvrs: List[Tuple[str, str, str]], logger) -> Dict[
     :return: a dict mapping go version string to a list of nvrs built from that go version
     """
     all_build_objs = brew.get_build_objects(['{}-{}-{}'.format(*n) for n in nvrs])
+    builds = [((build['name'], build['version'], build['release']), build) for build in all_build_objs]
+    # Go versions of builder images are detected from their content; do all of them at once
+    builder_nvrs = [
+        nvr for nvr, _ in builds if nvr[0] == 'openshift-golang-builder-container' or 'go-toolset' in nvr[0]
+    ]
+    builder_go_versions = golang_builder_versions(builder_nvrs, logger) if builder_nvrs else {}
     go_nvr_map = {}
-    for build in all_build_objs:
+    for nvr, build in builds:
         go_version = None
-        nvr = (build['name'], build['version'], build['release'])
         name = nvr[0]
         if name == 'openshift-golang-builder-container' or 'go-toolset' in name:
-            go_version = golang_builder_version(nvr, logger)
+            go_version = builder_go_versions.get(nvr)
             if not go_version:
                 raise ValueError(f'Cannot find go version for {name}')
             if go_version not in go_nvr_map:
@@ -423,41 +427,26 @@ def get_golang_container_nvrs(nvrs: List[Tuple[str, str, str]], logger) -> Dict[
     return go_nvr_map
 
 
-def golang_builder_version(nvr, logger):
-    go_version = None
-    try:
-        build_log = brew.get_nvr_arch_log(*nvr)
-    except BrewBuildException:
-        logger.debug(f'Could not brew log for {nvr}')
-    else:
-        try:
-            go_version = get_golang_version_from_build_log(build_log)
-        except AttributeError:
-            logger.debug(f'Could not find Go version in build log for {nvr}')
-    return go_version
+def golang_builder_versions(nvrs, logger) -> Dict[Tuple[str, str, str], Optional[str]]:
+    """:return: a dict mapping each (name, version, release) of a Go builder image to the Go version it provides"""
+    go_versions = exectools.run_coroutine(golang_version.GolangVersionDetector().detect(nvrs, image=True))
+    for nvr in nvrs:
+        if not go_versions.get(nvr):
+            logger.debug(f'Could not find Go version for {nvr}')
+    return go_versions
 
 
-def get_golang_rpm_nvrs(nvrs, logger):
+async def get_golang_rpm_nvrs_async(nvrs, logger):
+    # what we build in brew as openshift
+    # is called openshift-hyperkube in rhcos
+    nvrs = [('openshift', nvr[1], nvr[2]) if nvr[0] == 'openshift-hyperkube' else tuple(nvr) for nvr in nvrs]
+    go_versions = await golang_version.GolangVersionDetector().detect(nvrs)
+
     go_nvr_map = {}
     for nvr in nvrs:
-        go_version = None
-        # what we build in brew as openshift
-        # is called openshift-hyperkube in rhcos
-        if nvr[0] == 'openshift-hyperkube':
-            n = 'openshift'
-            nvr = (n, nvr[1], nvr[2])
-
-        try:
-            root_log = brew.get_nvr_root_log(*nvr)
-        except BrewBuildException:
-            logger.debug(f'Could not find brew log for {nvr}')
-        else:
-            try:
-                go_version = get_golang_version_from_build_log(root_log)
-            except AttributeError:
-                logger.debug(f'Could not find go version in root log for {nvr}')
-
+        go_version = go_versions.get(nvr)
         if not go_version:
+            logger.debug(f'Could not find go version for {nvr}')
             continue
 
         if go_version not in go_nvr_map:
@@ -466,6 +455,10 @@ def get_golang_rpm_nvrs(nvrs, logger):
     return go_nvr_map
 
 
+def get_golang_rpm_nvrs(nvrs, logger):
+    return exectools.run_coroutine(get_golang_rpm_nvrs_async(nvrs, logger))
+
+
 def pretty_print_nvrs_go(go_nvr_map, report=False):
     for go_version in sorted(go_nvr_map.keys()):
         nvrs = go_nvr_map[go_version]
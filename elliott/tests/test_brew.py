@@ -16,6 +16,8 @@ class TestBrew(unittest.TestCase):
     def setUp(self):
         # Disable waits on retries
         errata.get_brew_build.retry.wait = wait_none()
+        # Don't reuse the pooled Errata Tool session of another test
+        errata._thread_local.__dict__.clear()
 
     def test_build_attached_to_open_erratum(self):
         """We can tell if a build is attached to any open erratum"""
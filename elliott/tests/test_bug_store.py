@@ -0,0 +1,180 @@
+import os
+import re
+import tempfile
+import time
+import unittest
+import xmlrpc.client
+from unittest import mock
+
+from elliottlib import bug_store, constants
+from elliottlib.bug_store import BugStore
+from elliottlib.bzutil import BugzillaBugTracker, JIRABugTracker
+from flexmock import flexmock
+from jira import Issue
+
+OPTIONS = {
+    'server': 'https://jira.example.com',
+    'rest_path': 'api',
+    'rest_api_version': '2',
+    'agile_rest_path': 'agile',
+    'agile_rest_api_version': '1.0',
+}
+
+
+class FakeJIRA:
+    """An in-process JIRA that understands the queries JIRABugTracker sends."""
+
+    _options = OPTIONS
+    _session = None
+
+    def __init__(self):
+        self.issues = {}
+        self.queries = []
+
+    def set_status(self, key, status, updated=None):
+        self.issues[key] = {'status': status, 'updated': updated or time.time()}
+
+    def fields(self):
+        return []
+
+    def search_issues(self, jql, maxResults=0, fields=None):
+        self.queries.append(jql)
+        now = time.time()
+        results = []
+        for key, issue in sorted(self.issues.items()):
+            if not key.startswith(re.search(r'project=(\S+)', jql).group(1) + '-'):
+                continue
+            keys = re.search(r'issue in \(([^)]*)\)', jql)
+            if keys and key not in keys.group(1).split(','):
+                continue
+            statuses = re.search(r'status in \(([^)]*)\)', jql)
+            if statuses and f'"{issue["status"]}"' not in statuses.group(1).split(','):
+                continue
+            minutes = re.search(r'updated >= "-(\d+)m"', jql)
+            if minutes and issue['updated'] < now - int(minutes.group(1)) * 60:
+                continue
+            raw = {'key': key, 'fields': {'status': {'name': issue['status']}}}
+            results.append(Issue(OPTIONS, None, raw=raw))
+        return results
+
+
+class TestJIRABugStore(unittest.TestCase):
+    def setUp(self):
+        tmpdir = tempfile.TemporaryDirectory()
+        self.addCleanup(tmpdir.cleanup)
+        patcher = mock.patch.dict(os.environ, {constants.BUG_STORE_DIR_ENV: tmpdir.name})
+        patcher.start()
+        self.addCleanup(patcher.stop)
+        self.addCleanup(bug_store._stores.clear)
+
+        self.jira = FakeJIRA()
+        an_hour_ago = time.time() - 3600
+        for i, status in enumerate(['ON_QA', 'MODIFIED', 'NEW', 'VERIFIED'], start=1):
+            self.jira.set_status(f'OCPBUGS-{i}', status, an_hour_ago)
+        flexmock(JIRABugTracker).should_receive('login').and_return(self.jira)
+
+    def _tracker(self, max_age):
+        tracker = JIRABugTracker({'project': 'OCPBUGS', 'target_release': ['4.16.z']})
+        tracker._store.max_age = max_age
+        return tracker
+
+    def test_repeated_searches_are_answered_locally(self):
+        tracker = self._tracker(max_age=300)
+        bugs = tracker.search(['ON_QA', 'MODIFIED'])
+        self.assertEqual(sorted(b.id for b in bugs), ['OCPBUGS-1', 'OCPBUGS-2'])
+        self.assertEqual(sorted(b.status for b in bugs), ['MODIFIED', 'ON_QA'])
+        self.assertEqual(len(self.jira.queries), 1)
+
+        # Another tracker in the same process, e.g. of the next pipeline step, shares the store
+        bugs = self._tracker(max_age=300).search(['ON_QA', 'MODIFIED'])
+        self.assertEqual(sorted(b.id for b in bugs), ['OCPBUGS-1', 'OCPBUGS-2'])
+        self.assertEqual(len(self.jira.queries), 1)
+
+        self.assertEqual([b.id for b in tracker.get_bugs(['OCPBUGS-1'])], ['OCPBUGS-1'])
+        self.assertEqual(len(self.jira.queries), 1)
+        self.assertEqual([b.status for b in tracker.get_bugs(['OCPBUGS-3'])], ['NEW'])
+        self.assertEqual(len(self.jira.queries), 2)
+
+    def test_searches_are_synced_incrementally(self):
+        tracker = self._tracker(max_age=0)
+        tracker.search(['ON_QA', 'MODIFIED'])
+        self.jira.set_status('OCPBUGS-1', 'VERIFIED')
+        self.jira.set_status('OCPBUGS-3', 'MODIFIED')
+        self.jira.set_status('OCPBUGS-5', 'ON_QA')
+        self.jira.queries.clear()
+
+        bugs = tracker.search(['ON_QA', 'MODIFIED'])
+        self.assertEqual(
+            sorted((b.id, b.status) for b in bugs),
+            [('OCPBUGS-2', 'MODIFIED'), ('OCPBUGS-3', 'MODIFIED'), ('OCPBUGS-5', 'ON_QA')],
+        )
+        # Only bugs that changed recently were asked for
+        self.assertEqual(len(self.jira.queries), 2)
+        self.assertTrue(all('updated >= "-' in query for query in self.jira.queries))
+
+        # Unchanged bugs are confirmed instead of fetched again
+        self.jira.queries.clear()
+        self.assertEqual(tracker.get_bugs(['OCPBUGS-2'])[0].status, 'MODIFIED')
+        self.assertEqual(len(self.jira.queries), 1)
+        self.assertRegex(self.jira.queries[0], r'^project=OCPBUGS and issue in \(OCPBUGS-2\) and updated >= "-\d+m"$')
+
+    def test_changed_bugs_are_fetched_again(self):
+        tracker = self._tracker(max_age=300)
+        bug = tracker.get_bugs(['OCPBUGS-1'])[0]
+        flexmock(tracker).should_receive('_update_bug_status').replace_with(
+            lambda bugid, status: self.jira.set_status(bugid, status)
+        )
+        flexmock(tracker).should_receive('add_comment')
+        tracker.update_bug_status(bug, 'VERIFIED')
+        self.assertEqual(tracker.get_bugs(['OCPBUGS-1'])[0].status, 'VERIFIED')
+
+
+class TestBugStore(unittest.TestCase):
+    def test_bugzilla_timestamps(self):
+        with tempfile.TemporaryDirectory() as tmpdir:
+            store = BugStore(os.path.join(tmpdir, 'bugs.sqlite'))
+            raw = {'id': 1, 'creation_time': xmlrpc.client.DateTime('20240101T00:00:00')}
+            bugs = store.get_bugs(
+                'bugzilla', 'id,creation_time', ['1'], lambda ids, since: set(), lambda ids: {'1': raw}
+            )
+            self.assertEqual(bugs, {'1': raw})
+            bugs = store.get_bugs('bugzilla', 'id,creation_time', ['1'], lambda ids, since: set(), lambda ids: {})
+            self.assertEqual(bugs['1']['creation_time'].value, '20240101T00:00:00')
+            store.close()
+
+    def test_stored_bugs_are_checked_for_changes_by_id(self):
+        with tempfile.TemporaryDirectory() as tmpdir:
+            store = BugStore(os.path.join(tmpdir, 'bugs.sqlite'), max_age=0)
+            # e.g. a flaw bug, which isn't in the product the tracker searches for changes
+            store.get_bugs('bugzilla', '*', ['1', '2'], None, lambda ids: {i: {'id': i, 'v': 1} for i in ids})
+            changed_among = mock.Mock(return_value={'2'})
+            bugs = store.get_bugs(
+                'bugzilla', '*', ['1', '2'], changed_among, lambda ids: {i: {'id': i, 'v': 2} for i in ids}
+            )
+            self.assertEqual(bugs, {'1': {'id': '1', 'v': 1}, '2': {'id': '2', 'v': 2}})
+            self.assertEqual(changed_among.call_args.args[0], ['1', '2'])
+            store.close()
+
+    def test_bugzilla_changed_bugs_are_looked_up_by_id(self):
+        client = mock.Mock()
+        client.query.return_value = [flexmock(id=2)]
+        flexmock(BugzillaBugTracker).should_receive('login').and_return(client)
+        tracker = BugzillaBugTracker({'server': 'bugzilla.example.com', 'product': 'OpenShift Container Platform'})
+        self.assertEqual(tracker._store_changed_among(['1', '2'], time.time()), {'2'})
+        query = client.query.call_args.args[0]
+        # Not limited to the tracker's product
+        self.assertEqual((query['id'], 'product' in query), ([1, 2], False))
+
+    def test_bugzilla_searches_without_fields_store_ids(self):
+        client = mock.Mock()
+        client.getbugs.return_value = []
+        flexmock(BugzillaBugTracker).should_receive('login').and_return(client)
+        tracker = BugzillaBugTracker({'server': 'bugzilla.example.com', 'product': 'OpenShift Container Platform'})
+        tracker._store = mock.Mock()
+        tracker._store.search.return_value = {}
+        tracker._search(flexmock(fields=[]))
+        _, fields, _, _, _, fetch_ids = tracker._store.search.call_args.args
+        # Searches without fields only return the ids of bugs
+        self.assertEqual(fields, 'id')
+        fetch_ids(['1'])
+        self.assertEqual(client.getbugs.call_args.kwargs['include_fields'], ['id'])
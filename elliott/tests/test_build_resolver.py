@@ -0,0 +1,110 @@
+from types import SimpleNamespace
+from unittest import IsolatedAsyncioTestCase, TestCase
+from unittest.mock import AsyncMock, MagicMock, patch
+
+from aiohttp import ClientResponseError
+from elliottlib import brew, exceptions
+from elliottlib.build_resolver import BuildResolver
+
+
+class FakeKoji:
+    """Answers getBuild multicalls from a dict and records the builds asked for in each multicall."""
+
+    def __init__(self, builds):
+        self.builds = builds
+        self.multicalls = []
+
+    def multicall(self, strict=False):
+        koji = self
+        calls = []
+        koji.multicalls.append(calls)
+
+        class _Multicall:
+            def __enter__(self):
+                return self
+
+            def __exit__(self, *args):
+                pass
+
+            def getBuild(self, id_or_nvr):
+                calls.append(id_or_nvr)
+                return SimpleNamespace(result=koji.builds.get(id_or_nvr))
+
+        return _Multicall()
+
+
+class TestGetBuildObjects(TestCase):
+    def test_get_build_objects(self):
+        builds = {
+            f'foo-1.0-{i}': {'id': i, 'nvr': f'foo-1.0-{i}', 'name': 'foo', 'version': '1.0', 'release': str(i)}
+            for i in range(5)
+        }
+        koji = FakeKoji(builds)
+        resolver = BuildResolver()
+        nvrs = list(builds) + ['bar-1.0-1']
+
+        with patch.object(brew, 'MULTICALL_CHUNK_SIZE', 2):
+            actual = resolver.get_build_objects(nvrs, koji)
+        self.assertEqual(actual, list(builds.values()) + [None])
+        self.assertEqual([len(calls) for calls in koji.multicalls], [2, 2, 2])
+
+        # callers may change what they get back
+        actual[0]['_tags'] = {'tag'}
+        koji.multicalls.clear()
+        self.assertEqual(resolver.get_build_objects(['foo-1.0-0', 3], koji), [builds['foo-1.0-0'], builds['foo-1.0-3']])
+        self.assertEqual(koji.multicalls, [])
+
+        # builds that weren't found are asked for again
+        koji.builds['bar-1.0-1'] = {'id': 9, 'nvr': 'bar-1.0-1'}
+        self.assertEqual(resolver.get_build_objects(['bar-1.0-1'], koji), [koji.builds['bar-1.0-1']])
+        self.assertEqual(koji.multicalls, [['bar-1.0-1']])
+
+
+class TestErrataBuilds(IsolatedAsyncioTestCase):
+    def setUp(self):
+        self.api = MagicMock()
+        self.api.__aenter__.return_value = self.api
+        self.api.__aexit__ = AsyncMock(return_value=False)
+        self.api.get_brew_build = AsyncMock(
+            side_effect=lambda nvr: {'id': 1, 'nvr': nvr, 'rpms_signed': nvr in self.signed, 'all_errata': []}
+        )
+        self.signed = {'foo-1.0-1'}
+        patcher = patch('elliottlib.build_resolver.AsyncErrataAPI', return_value=self.api)
+        patcher.start()
+        self.addCleanup(patcher.stop)
+
+    async def test_get_brew_builds(self):
+        resolver = BuildResolver()
+        nvrps = [
+            ('foo', '1.0', '1', 'OSE-4.17-RHEL-9'),
+            ('foo', '1.0', '1', 'OSE-4.17-RHEL-8'),
+            ('bar', '2.0', '1', None),
+        ]
+        builds = await resolver.get_brew_builds(nvrps)
+        self.assertEqual(
+            [(b.nvr, b.product_version) for b in builds],
+            [('foo-1.0-1', 'OSE-4.17-RHEL-9'), ('foo-1.0-1', 'OSE-4.17-RHEL-8'), ('bar-2.0-1', None)],
+        )
+        self.assertEqual(self.api.get_brew_build.await_count, 2)
+
+        await resolver.get_brew_builds(nvrps)
+        self.assertEqual(self.api.get_brew_build.await_count, 2)
+
+    async def test_unknown_build(self):
+        self.api.get_brew_build.side_effect = ClientResponseError(None, (), status=404, message="Not Found")
+        with self.assertRaisesRegex(exceptions.BrewBuildException, "bar-2.0-1: Not Found"):
+            await BuildResolver().get_errata_builds(['bar-2.0-1'])
+
+    async def test_builds_signed(self):
+        resolver = BuildResolver()
+        self.assertEqual(
+            await resolver.builds_signed(['foo-1.0-1', 'bar-2.0-1']), {'foo-1.0-1': True, 'bar-2.0-1': False}
+        )
+
+        # signed builds are not asked about again, unsigned builds are
+        self.api.get_brew_build.reset_mock()
+        self.signed.add('bar-2.0-1')
+        self.assertEqual(
+            await resolver.builds_signed(['foo-1.0-1', 'bar-2.0-1']), {'foo-1.0-1': True, 'bar-2.0-1': True}
+        )
+        self.api.get_brew_build.assert_awaited_once_with('bar-2.0-1')
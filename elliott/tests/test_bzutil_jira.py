@@ -1,6 +1,11 @@
+import os
+import tempfile
 import unittest
+from unittest import mock
 
+from artcommonlib import file_cache
 from elliottlib.bzutil import JIRABugTracker
+from elliottlib.errata_async import AdvisoryAttachmentIndex
 from flexmock import flexmock
 
 
@@ -61,6 +66,63 @@ class TestJIRABugTracker(unittest.TestCase):
         jira._client = client
         jira.add_comment(bug.id, 'comment', private=True)
 
+    def test_get_bugs_requests_only_needed_fields(self):
+        client = flexmock()
+        flexmock(client).should_receive("fields").and_return([{"name": "Target Version", "id": "customfield_1"}])
+        flexmock(JIRABugTracker).should_receive("login").and_return(client)
+        jira = JIRABugTracker({"project": "OCPBUGS"})
+        self.assertEqual(jira.field_target_version, "customfield_1")
+
+        queries = []
+
+        def search_issues(query, maxResults, fields):
+            queries.append(query)
+            self.assertIn("customfield_1", fields)
+            self.assertNotIn("comment", fields)
+            keys = query.split("issue in (")[1].rstrip(")").split(",")
+            return [flexmock(key=key) for key in keys]
+
+        client.search_issues = search_issues
+        jira.JIRA_BUG_BATCH_SIZE = 2
+        bug_ids = [f"OCPBUGS-{i}" for i in range(5)]
+        bugs = jira.get_bugs(bug_ids)
+        self.assertEqual([bug.id for bug in bugs], bug_ids)
+        self.assertEqual(len(queries), 3)
+
+    def test_field_ids_are_cached_on_disk(self):
+        client = flexmock()
+        client.should_receive("fields").and_return([{"name": "Severity", "id": "customfield_2"}]).once()
+        flexmock(JIRABugTracker).should_receive("login").and_return(client)
+        with (
+            tempfile.TemporaryDirectory() as tmpdir,
+            mock.patch.dict(os.environ, {file_cache.CACHE_DIR_ENV: tmpdir}),
+        ):
+            JIRABugTracker({"server": "https://issues.example.com"})
+            jira = JIRABugTracker({"server": "https://issues.example.com"})
+        self.assertEqual(jira.field_severity, "customfield_2")
+
+
+class TestJIRABugTrackerAsync(unittest.IsolatedAsyncioTestCase):
+    @mock.patch("elliottlib.bzutil.AsyncErrataAPI")
+    async def test_filter_attached_bugs_with_index(self, AsyncErrataAPI):
+        client = flexmock()
+        flexmock(client).should_receive("fields").and_return([])
+        flexmock(JIRABugTracker).should_receive("login").and_return(client)
+        jira = JIRABugTracker({})
+        bugs = [flexmock(id="OCPBUGS-1"), flexmock(id="OCPBUGS-2"), flexmock(id="OCPBUGS-3")]
+        index = AdvisoryAttachmentIndex({1: {"bugzilla": [], "jira": ["OCPBUGS-2"]}})
+        # Bugs that aren't in the index may be attached to advisories it doesn't cover, e.g. shipped ones
+        api = AsyncErrataAPI.return_value
+        api.get_advisories_for_jira = mock.AsyncMock(
+            side_effect=lambda key, **_: [{"id": 2}] if key == "OCPBUGS-3" else []
+        )
+        api.close = mock.AsyncMock()
+        attached = await jira.filter_attached_bugs(bugs, index)
+        self.assertEqual(attached, [bugs[1], bugs[2]])
+        self.assertEqual(
+            [call.args[0] for call in api.get_advisories_for_jira.await_args_list], ["OCPBUGS-1", "OCPBUGS-3"]
+        )
+
 
 if __name__ == '__main__':
     unittest.main()
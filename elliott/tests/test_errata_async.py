@@ -1,10 +1,16 @@
+import asyncio
 import base64
+import os
+import tempfile
 from unittest import IsolatedAsyncioTestCase
 from unittest.mock import ANY, AsyncMock, Mock, patch
 
+import aiohttp
+from aiohttp import ClientResponseError
+from artcommonlib import file_cache
 from artcommonlib.rpm_utils import parse_nvr
 from elliottlib import constants
-from elliottlib.errata_async import AsyncErrataAPI, AsyncErrataUtils
+from elliottlib.errata_async import AdvisoryAttachmentIndex, AsyncErrataAPI, AsyncErrataUtils
 
 
 class TestAsyncErrataAPI(IsolatedAsyncioTestCase):
@@ -139,6 +145,82 @@ class TestAsyncErrataAPI(IsolatedAsyncioTestCase):
         )
         self.assertEqual(actual, [{'id': 1}, {'id': 2}, {'id': 3}, {'id': 4}, {'id': 5}])
 
+    @patch("aiohttp.ClientSession", autospec=True)
+    @patch("elliottlib.errata_async.AsyncErrataAPI._send_request", autospec=True)
+    async def test_cached_responses_are_invalidated_by_writes(self, _send_request: Mock, ClientSession: Mock):
+        api = AsyncErrataAPI("https://errata.example.com")
+        _send_request.return_value = {"result": "fake"}
+        await asyncio.gather(api.get_advisory(1), api.get_advisory(1), api.get_builds(2))
+        await api.get_advisories_for_jira("OCPBUGS-1")
+        self.assertEqual(_send_request.await_count, 3)
+
+        await api.change_batch_for_advisory(1, 42)
+        await asyncio.gather(api.get_advisory(1), api.get_builds(2), api.get_advisories_for_jira("OCPBUGS-1"))
+        # advisory 1 and the advisories of OCPBUGS-1 were fetched again, the builds of advisory 2 weren't
+        self.assertEqual(_send_request.await_count, 6)
+        _send_request.assert_any_await(ANY, "POST", "/api/v1/erratum/1/change_batch", True, json={"batch_id": 42})
+
+    @patch("asyncio.sleep", new_callable=AsyncMock)
+    @patch("aiohttp.ClientSession", autospec=True)
+    @patch("elliottlib.errata_async.AsyncErrataAPI._send_request", autospec=True)
+    async def test_failed_reads_are_retried(self, _send_request: Mock, ClientSession: Mock, _):
+        api = AsyncErrataAPI("https://errata.example.com")
+        not_found = ClientResponseError(Mock(), (), status=404)
+        _send_request.side_effect = [aiohttp.ServerDisconnectedError(), {"result": "fake"}, not_found]
+        self.assertEqual(await api.get_advisory(1), {"result": "fake"})
+        with self.assertRaises(ClientResponseError):
+            await api.get_advisory(2)
+        self.assertEqual(_send_request.await_count, 3)
+
+        # failures aren't cached
+        _send_request.side_effect = None
+        _send_request.return_value = {"result": "fake"}
+        self.assertEqual(await api.get_advisory(2), {"result": "fake"})
+
+
+class TestAdvisoryAttachmentIndex(IsolatedAsyncioTestCase):
+    @staticmethod
+    def _advisory(bz_ids, jira_ids):
+        return {"bugs": {"bugs": [{"bug": {"id": i}} for i in bz_ids]}, "jira_issues": {"idsfixed": jira_ids}}
+
+    @patch("aiohttp.ClientSession", autospec=True)
+    @patch("elliottlib.errata_async.AsyncErrataAPI._make_request", autospec=True)
+    async def test_build(self, _make_request: Mock, ClientSession: Mock):
+        advisories = {
+            "/api/v1/erratum/1": self._advisory([10], ["OCPBUGS-1", "OCPBUGS-2"]),
+            "/api/v1/erratum/2": self._advisory([], ["OCPBUGS-2"]),
+        }
+
+        async def _request(_, method, path, params=None):
+            if path == "/api/v1/erratum/search":
+                return {"data": [{"id": 1}, {"id": 2}] if dict(params)["page[number]"] == 1 else []}
+            return advisories[path]
+
+        _make_request.side_effect = _request
+        api = AsyncErrataAPI("https://errata.example.com")
+        with (
+            tempfile.TemporaryDirectory() as tmpdir,
+            patch.dict(os.environ, {file_cache.CACHE_DIR_ENV: tmpdir}),
+        ):
+            index = await AdvisoryAttachmentIndex.build(api, "RHOSE", states=["QE", "NEW_FILES"])
+            self.assertEqual(index.advisories_for("jira", "OCPBUGS-2"), {1, 2})
+            self.assertEqual(index.advisories_for("bugzilla", 10), {1})
+            self.assertTrue(index.is_attached("jira", "OCPBUGS-1"))
+            self.assertFalse(index.is_attached("jira", "OCPBUGS-3"))
+            self.assertFalse(index.is_attached("bugzilla", "OCPBUGS-1"))
+            _make_request.assert_any_await(
+                ANY,
+                "GET",
+                "/api/v1/erratum/search",
+                params=[("product[]", "RHOSE"), ("status[]", "QE"), ("status[]", "NEW_FILES"), ("page[number]", 2)],
+            )
+            self.assertEqual(_make_request.await_count, 4)
+
+            # another run uses the cached index
+            cached = await AdvisoryAttachmentIndex.build(api, "RHOSE", states=["QE", "NEW_FILES"])
+            self.assertEqual(cached.advisories_for("jira", "OCPBUGS-2"), {1, 2})
+            self.assertEqual(_make_request.await_count, 4)
+
 
 class TestAsyncErrataUtils(IsolatedAsyncioTestCase):
     @patch("elliottlib.errata_async.AsyncErrataAPI", autospec=True)
@@ -35,9 +35,10 @@ class TestFindBugsMode(unittest.TestCase):
 
 
 class FindBugsSweepTestCase(unittest.IsolatedAsyncioTestCase):
+    @patch('elliottlib.cli.find_bugs_sweep_cli.get_attachment_index')
     @patch('elliottlib.bzutil.JIRABugTracker.filter_attached_bugs')
     @patch('elliottlib.cli.find_bugs_sweep_cli.FindBugsSweep.search')
-    def test_find_bugs_sweep_report_jira(self, search_mock, jira_filter_mock):
+    def test_find_bugs_sweep_report_jira(self, search_mock, jira_filter_mock, _):
         # jira mocks
         jira_bug = flexmock(
             id='OCPBUGS-1',
@@ -96,8 +97,9 @@ class FindBugsSweepTestCase(unittest.IsolatedAsyncioTestCase):
             t = "\n".join(traceback.format_exception(exc_type, exc_value, exc_traceback))
             self.fail(t)
 
+    @patch('elliottlib.cli.find_bugs_sweep_cli.get_attachment_index')
     @patch('elliottlib.bzutil.JIRABugTracker.filter_attached_bugs')
-    def test_find_bugs_sweep_advisory_jira(self, jira_filter_mock):
+    def test_find_bugs_sweep_advisory_jira(self, jira_filter_mock, _):
         runner = CliRunner()
         bugs = [
             flexmock(
@@ -133,8 +135,9 @@ class FindBugsSweepTestCase(unittest.IsolatedAsyncioTestCase):
             t = "\n".join(traceback.format_exception(exc_type, exc_value, exc_traceback))
             self.fail(t)
 
+    @patch('elliottlib.cli.find_bugs_sweep_cli.get_attachment_index')
     @patch('elliottlib.bzutil.JIRABugTracker.filter_attached_bugs')
-    def test_find_bugs_sweep_advisory_type(self, jira_filter_mock):
+    def test_find_bugs_sweep_advisory_type(self, jira_filter_mock, _):
         runner = CliRunner()
         bugs = [flexmock(id='OCPBUGS-1')]
 
@@ -163,8 +166,9 @@ class FindBugsSweepTestCase(unittest.IsolatedAsyncioTestCase):
             t = "\n".join(traceback.format_exception(exc_type, exc_value, exc_traceback))
             self.fail(t)
 
+    @patch('elliottlib.cli.find_bugs_sweep_cli.get_attachment_index')
     @patch('elliottlib.bzutil.JIRABugTracker.filter_attached_bugs')
-    def test_find_bugs_sweep_default_advisories(self, jira_filter_mock):
+    def test_find_bugs_sweep_default_advisories(self, jira_filter_mock, _):
         runner = CliRunner()
         image_bugs = [flexmock(id=1), flexmock(id=2)]
         rpm_bugs = [flexmock(id=3), flexmock(id=4)]
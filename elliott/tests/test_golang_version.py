@@ -0,0 +1,122 @@
+import tempfile
+from types import SimpleNamespace
+from unittest import IsolatedAsyncioTestCase, TestCase
+from unittest.mock import MagicMock, patch
+
+from elliottlib.golang_version import GolangVersionDetector, golang_in_rpms
+
+GOLANG_BIN = {'name': 'golang-bin', 'version': '1.22.7', 'release': '1.el9_5', 'arch': 'x86_64'}
+
+ROOT_LOG = b"""DEBUG util.py:446:  Installing:
+DEBUG util.py:446:   gcc                      x86_64  11.5.0-2.el9        build  32 M
+DEBUG util.py:446:   golang-bin               x86_64  1.21.13-4.el9_4     build  60 M
+"""
+
+
+class FakeKoji:
+    """Answers Koji multicalls from dicts of canned results."""
+
+    def __init__(self, builds, rpms, buildroots):
+        self.results = {
+            'getBuild': lambda nvr: builds.get(nvr),
+            'listRPMs': lambda buildID: rpms.get(buildID, []),
+            'getBuildrootListing': lambda buildroot_id: buildroots[buildroot_id],
+        }
+        self.calls = []
+
+    def multicall(self, strict=False):
+        koji = self
+
+        class _Multicall:
+            def __enter__(self):
+                return self
+
+            def __exit__(self, *args):
+                pass
+
+            def __getattr__(self, method):
+                def _call(*args, **kwargs):
+                    koji.calls.append(method)
+                    return SimpleNamespace(result=koji.results[method](*args, **kwargs))
+
+                return _call
+
+        return _Multicall()
+
+
+class FakeContent:
+    def __init__(self, data):
+        self.data = data
+
+    async def iter_chunked(self, size):
+        for start in range(0, len(self.data), 16):
+            yield self.data[start : start + 16]
+
+
+class FakeResponse:
+    def __init__(self, status, data=b''):
+        self.status = status
+        self.content = FakeContent(data)
+
+    async def __aenter__(self):
+        return self
+
+    async def __aexit__(self, *args):
+        pass
+
+
+class TestGolangInRPMs(TestCase):
+    def test_golang_in_rpms(self):
+        self.assertEqual(golang_in_rpms([{'name': 'gcc'}, GOLANG_BIN]), '1.22.7-1.el9_5')
+        toolset = {'name': 'go-toolset-1.14-golang', 'version': '1.14.9', 'release': '2.el7', 'arch': 'x86_64'}
+        self.assertEqual(golang_in_rpms([toolset]), '1.14.9-2.el7.x86_64')
+        self.assertIsNone(golang_in_rpms([{'name': 'gcc'}]))
+
+
+class TestGolangVersionDetector(IsolatedAsyncioTestCase):
+    async def test_detect(self):
+        koji = FakeKoji(
+            builds={'podman-4.9.4-1.el9': {'id': 1}, 'cri-o-1.30.0-1.el9': {'id': 2}},
+            rpms={
+                1: [
+                    {'arch': 'src', 'buildroot_id': 10},
+                    {'arch': 'x86_64', 'buildroot_id': 11},
+                ],
+                # no buildroot recorded
+                2: [{'arch': 'x86_64', 'buildroot_id': None}],
+            },
+            buildroots={11: [{'name': 'gcc', 'version': '11', 'release': '1', 'arch': 'x86_64'}, GOLANG_BIN]},
+        )
+        session = MagicMock()
+        session.get.return_value = FakeResponse(200, ROOT_LOG)
+        session.__aenter__.return_value = session
+        nvrs = [('podman', '4.9.4', '1.el9'), ('cri-o', '1.30.0', '1.el9'), ('runc', '1.1.0', '1.el9')]
+
+        with tempfile.TemporaryDirectory() as cache_dir, patch('aiohttp.ClientSession', return_value=session):
+            versions = await GolangVersionDetector(koji, cache_dir).detect(nvrs)
+            self.assertEqual(
+                versions,
+                {nvrs[0]: '1.22.7-1.el9_5', nvrs[1]: '1.21.13-4.el9_4', nvrs[2]: '1.21.13-4.el9_4'},
+            )
+            self.assertIn(
+                '/rhel-9/packages/cri-o/1.30.0/1.el9/data/logs/x86_64/root.log', session.get.call_args_list[0][0][0]
+            )
+
+            # versions never change, so they are only detected once
+            koji.calls.clear()
+            session.get.reset_mock()
+            session.get.return_value = FakeResponse(404)
+            self.assertEqual(await GolangVersionDetector(koji, cache_dir).detect(nvrs), versions)
+            self.assertEqual(koji.calls, [])
+            session.get.assert_not_called()
+
+    async def test_unreadable_logs_are_not_cached(self):
+        koji = FakeKoji(builds={}, rpms={}, buildroots={})
+        session = MagicMock()
+        session.get.return_value = FakeResponse(404)
+        session.__aenter__.return_value = session
+        nvr = ('runc', '1.1.0', '1.el9')
+        with tempfile.TemporaryDirectory() as cache_dir, patch('aiohttp.ClientSession', return_value=session):
+            self.assertEqual(await GolangVersionDetector(koji, cache_dir).detect([nvr]), {nvr: None})
+            session.get.return_value = FakeResponse(200, ROOT_LOG)
+            self.assertEqual(await GolangVersionDetector(koji, cache_dir).detect([nvr]), {nvr: '1.21.13-4.el9_4'})
@@ -5,6 +5,7 @@ from artcommonlib.model import Model
 from doozerlib.backend.konflux_client import API_VERSION, KIND_APPLICATION, KIND_RELEASE, KIND_RELEASE_PLAN
 from elliottlib.cli.konflux_release_cli import CreateReleaseCli
 from elliottlib.cli.konflux_release_watch_cli import WatchReleaseCli
+from elliottlib.konflux_resolver import KonfluxResolver
 from elliottlib.shipment_model import (
     Data,
     Environments,
@@ -43,7 +44,7 @@ class TestWatchReleaseCli(IsolatedAsyncioTestCase):
 
         release = "test-release-prod"
         cli = WatchReleaseCli(
-            release=release,
+            releases=[release],
             runtime=self.runtime,
             konflux_config=self.konflux_config,
             timeout=0,
@@ -67,10 +68,11 @@ class TestWatchReleaseCli(IsolatedAsyncioTestCase):
                 ],
             },
         }
-        self.konflux_client.wait_for_release.return_value = Model(release)
-
-        status = await cli.run()
-        self.assertEqual(status, True)
+        with patch.object(
+            KonfluxResolver, 'wait_for_releases', return_value={release['metadata']['name']: Model(release)}
+        ):
+            status = await cli.run()
+        self.assertEqual(status, {release['metadata']['name']: True})
 
     @patch("doozerlib.backend.konflux_client.KonfluxClient.from_kubeconfig")
     @patch("elliottlib.runtime.Runtime")
@@ -80,7 +82,7 @@ class TestWatchReleaseCli(IsolatedAsyncioTestCase):
 
         release = "test-release-prod"
         cli = WatchReleaseCli(
-            release=release,
+            releases=[release],
             runtime=self.runtime,
             konflux_config=self.konflux_config,
             timeout=0,
@@ -104,10 +106,11 @@ class TestWatchReleaseCli(IsolatedAsyncioTestCase):
                 ],
             },
         }
-        self.konflux_client.wait_for_release.return_value = Model(release)
-
-        status = await cli.run()
-        self.assertEqual(status, False)
+        with patch.object(
+            KonfluxResolver, 'wait_for_releases', return_value={release['metadata']['name']: Model(release)}
+        ):
+            status = await cli.run()
+        self.assertEqual(status, {release['metadata']['name']: False})
 
     @patch("doozerlib.backend.konflux_client.KonfluxClient.from_kubeconfig")
     @patch("elliottlib.runtime.Runtime")
@@ -117,7 +120,7 @@ class TestWatchReleaseCli(IsolatedAsyncioTestCase):
 
         release = "test-release-prod"
         cli = WatchReleaseCli(
-            release=release,
+            releases=[release],
             runtime=self.runtime,
             konflux_config=self.konflux_config,
             timeout=0,
@@ -141,10 +144,11 @@ class TestWatchReleaseCli(IsolatedAsyncioTestCase):
                 ],
             },
         }
-        self.konflux_client.wait_for_release.return_value = Model(release)
-
-        status = await cli.run()
-        self.assertEqual(status, False)
+        with patch.object(
+            KonfluxResolver, 'wait_for_releases', return_value={release['metadata']['name']: Model(release)}
+        ):
+            status = await cli.run()
+        self.assertEqual(status, {release['metadata']['name']: False})
 
 
 class TestCreateReleaseCli(IsolatedAsyncioTestCase):
@@ -0,0 +1,209 @@
+import datetime
+from types import SimpleNamespace
+from unittest import IsolatedAsyncioTestCase
+from unittest.mock import AsyncMock, MagicMock, patch
+
+from artcommonlib.konflux.konflux_build_record import Engine, KonfluxBuildOutcome
+from doozerlib.backend.konflux_client import KIND_COMPONENT, KIND_RELEASE
+from elliottlib.konflux_resolver import KonfluxResolver, release_finished
+from kubernetes.dynamic import resource
+
+
+class FakeKonfluxDb:
+    """An in-memory Konflux DB; each search covers one window of start times and yields records newest first."""
+
+    def __init__(self, records):
+        self.records = records
+        self.queries = []
+
+    async def search_builds_by_fields(self, start_search, end_search, where=None, first_per=None, **_):
+        self.queries.append(where)
+
+        def _matches(record):
+            if not start_search <= record.start_time < end_search:
+                return False
+            for key, value in where.items():
+                actual = str(getattr(record, key))
+                if actual not in value if isinstance(value, list) else actual != value:
+                    return False
+            return True
+
+        seen = set()
+        for record in self.records:
+            if not _matches(record) or (first_per and getattr(record, first_per) in seen):
+                continue
+            if first_per:
+                seen.add(getattr(record, first_per))
+            yield record
+
+
+class FakeApi:
+    """A fake dynamic client API of one kind; get() lists objects."""
+
+    def __init__(self, objects, resource_version="1"):
+        self.objects = objects
+        self.resource_version = resource_version
+        self.calls = []
+
+    def get(self, **kwargs):
+        self.calls.append(kwargs)
+        objects = self.objects
+        if kwargs.get('field_selector'):
+            name = kwargs['field_selector'].removeprefix('metadata.name=')
+            objects = [obj for obj in objects if obj['metadata']['name'] == name]
+        return resource.ResourceInstance(
+            None,
+            {
+                'apiVersion': 'v1',
+                'kind': 'List',
+                'items': objects,
+                'metadata': {'resourceVersion': self.resource_version},
+            },
+        )
+
+
+def _record(name, nvr, days_ago, outcome='success', group='openshift-4.18', engine='konflux'):
+    start_time = datetime.datetime.now(tz=datetime.timezone.utc) - datetime.timedelta(days=days_ago)
+    record = SimpleNamespace(
+        nvr=nvr, outcome=outcome, group=group, engine=engine, assembly='stream', start_time=start_time
+    )
+    record.name = name
+    return record
+
+
+def _release(name, reason=None, resource_version="1", application="openshift-4-18"):
+    release = {
+        "apiVersion": "appstudio.redhat.com/v1alpha1",
+        "kind": "Release",
+        "metadata": {
+            "name": name,
+            "resourceVersion": resource_version,
+            "labels": {"appstudio.openshift.io/application": application},
+        },
+        "status": {},
+    }
+    if reason:
+        status = "True" if reason == "Succeeded" else "False"
+        release["status"]["conditions"] = [{"type": "Released", "status": status, "reason": reason}]
+    return release
+
+
+class TestBuildRecords(IsolatedAsyncioTestCase):
+    def setUp(self):
+        # newest first
+        self.records = [
+            _record('foo', 'foo-1.0-3', 1),
+            _record('bar', 'bar-1.0-2', 2, outcome='failure'),
+            _record('bar', 'bar-1.0-1', 50),
+            _record('foo', 'foo-1.0-2', 120),
+            _record('baz', 'baz-1.0-1', 200, engine='brew'),
+            _record('foo', 'foo-1.0-1', 300),
+        ]
+        self.db = FakeKonfluxDb(self.records)
+
+    async def test_get_build_records(self):
+        resolver = KonfluxResolver(konflux_db=self.db)
+        records = await resolver.get_build_records(
+            ['foo-1.0-2', 'bar-1.0-1', 'foo-1.0-2'], where={'group': 'openshift-4.18'}
+        )
+        self.assertEqual(records, [self.records[3], self.records[2], self.records[3]])
+        # all builds are looked up with one query per window, which only looks for builds not found yet and
+        # stops once they are all found
+        self.assertEqual([query['nvr'] for query in self.db.queries], [['foo-1.0-2', 'bar-1.0-1'], ['foo-1.0-2']])
+
+        # found builds are cached
+        self.assertEqual(await resolver.get_build_records(['bar-1.0-1']), [self.records[2]])
+        self.assertEqual(len(self.db.queries), 2)
+
+    async def test_get_build_records_not_found(self):
+        resolver = KonfluxResolver(konflux_db=self.db)
+        with self.assertRaisesRegex(IOError, 'bar-1.0-2, foo-1.0-9'):
+            await resolver.get_build_records(['foo-1.0-1', 'bar-1.0-2', 'foo-1.0-9'])
+        self.assertEqual(
+            await resolver.get_build_records(['foo-1.0-1', 'foo-1.0-9'], strict=False), [self.records[5], None]
+        )
+        with self.assertRaises(ValueError):
+            await resolver.get_build_records(['foo-1.0-1'], where={'outcome': 'failure'})
+
+    async def test_get_latest_builds(self):
+        resolver = KonfluxResolver(konflux_db=self.db)
+        builds = await resolver.get_latest_builds(
+            ['foo', 'bar', 'baz'], group='openshift-4.18', assembly='stream', engine=Engine.KONFLUX
+        )
+        self.assertEqual(builds, [self.records[0], self.records[2], None])
+        where = {
+            'group': 'openshift-4.18',
+            'outcome': str(KonfluxBuildOutcome.SUCCESS),
+            'assembly': 'stream',
+            'engine': 'konflux',
+        }
+        # baz has no Konflux builds, so it is looked for in every window
+        self.assertEqual(
+            self.db.queries,
+            [{**where, 'name': ['foo', 'bar', 'baz']}] + [{**where, 'name': ['baz']}] * 3,
+        )
+
+
+class TestCustomResources(IsolatedAsyncioTestCase):
+    def setUp(self):
+        self.apis = {}
+        self.konflux_client = MagicMock(default_namespace='test-namespace', dry_run=False)
+        self.konflux_client._get_api = AsyncMock(side_effect=lambda api_version, kind: self.apis[kind])
+
+    async def test_get_components(self):
+        self.apis[KIND_COMPONENT] = FakeApi(
+            [
+                {'metadata': {'name': 'ose-4-18-foo'}, 'spec': {'application': 'openshift-4-18'}},
+                {'metadata': {'name': 'ose-4-17-foo'}, 'spec': {'application': 'openshift-4-17'}},
+            ]
+        )
+        resolver = KonfluxResolver(self.konflux_client)
+        self.assertEqual(list(await resolver.get_components('openshift-4-18')), ['ose-4-18-foo'])
+        self.assertEqual(list(await resolver.get_components('openshift-4-17')), ['ose-4-17-foo'])
+        self.assertEqual(self.apis[KIND_COMPONENT].calls, [{'namespace': 'test-namespace', 'label_selector': None}])
+
+        with self.assertRaisesRegex(ValueError, 'ose-4-16-foo'):
+            await resolver.get_objects(KIND_COMPONENT, ['ose-4-18-foo', 'ose-4-16-foo'])
+
+    async def test_wait_for_releases(self):
+        self.apis[KIND_RELEASE] = FakeApi(
+            [
+                _release('done', 'Succeeded'),
+                _release('pending', 'Progressing'),
+                _release('other', application='openshift-4-17'),
+            ],
+            "10",
+        )
+        events = [
+            {'type': 'MODIFIED', 'object': _release('other', 'Succeeded', "11")},
+            {'type': 'MODIFIED', 'object': _release('pending', 'Failed', "12")},
+        ]
+        watcher = MagicMock()
+        watcher.stream.return_value = iter(events)
+        resolver = KonfluxResolver(self.konflux_client)
+
+        with patch('elliottlib.konflux_resolver.watch.Watch', return_value=watcher):
+            releases = await resolver.wait_for_releases(['done', 'pending'], datetime.timedelta(hours=1))
+
+        self.assertEqual(sorted(releases), ['done', 'pending'])
+        self.assertTrue(release_finished(releases['pending']))
+        self.assertEqual(releases['pending'].status.conditions[0].reason, 'Failed')
+        # one watch of all releases, from the listed state
+        watcher.stream.assert_called_once()
+        self.assertEqual(watcher.stream.call_args.kwargs['resource_version'], "10")
+        # only Releases of the applications of the watched ones are listed and watched
+        selector = 'appstudio.openshift.io/application in (openshift-4-18)'
+        self.assertEqual(self.apis[KIND_RELEASE].calls[-1], {'namespace': 'test-namespace', 'label_selector': selector})
+        self.assertEqual(watcher.stream.call_args.kwargs['label_selector'], selector)
+
+    async def test_wait_for_releases_without_waiting(self):
+        self.apis[KIND_RELEASE] = FakeApi([_release('pending', 'Progressing')])
+        resolver = KonfluxResolver(self.konflux_client)
+        with patch('elliottlib.konflux_resolver.watch.Watch') as watch:
+            releases = await resolver.wait_for_releases(['pending'], datetime.timedelta(0))
+            watch.return_value.stream.assert_not_called()
+        self.assertFalse(release_finished(releases['pending']))
+        # a single Release is looked up by name
+        self.assertEqual(
+            self.apis[KIND_RELEASE].calls, [{'namespace': 'test-namespace', 'field_selector': 'metadata.name=pending'}]
+        )
@@ -0,0 +1,79 @@
+import os
+import tempfile
+import unittest
+from unittest import mock
+
+from artcommonlib.konflux.konflux_build_record import KonfluxBuildRecord
+from elliottlib import constants, rpm_consumption
+from elliottlib.build_resolver import BuildResolver
+from elliottlib.cli.find_unconsumed_rpms import FindUnconsumedRpms
+from elliottlib.rpm_consumption import ConsumptionIndex
+
+
+class TestConsumptionIndex(unittest.TestCase):
+    def test_get_and_add(self):
+        index = ConsumptionIndex()
+        index.add({'foo-container-1.0-1': ['bash-5.1-2', 'bash-5.1-2', 'acl-2.3-1'], 'bar-container-1.0-1': []})
+        self.assertEqual(
+            index.get(['foo-container-1.0-1', 'bar-container-1.0-1', 'baz-container-1.0-1']),
+            {'foo-container-1.0-1': ['acl-2.3-1', 'bash-5.1-2'], 'bar-container-1.0-1': []},
+        )
+
+    def test_default_index(self):
+        with tempfile.TemporaryDirectory() as index_dir:
+            with mock.patch.dict(os.environ, {constants.RPM_CONSUMPTION_INDEX_DIR_ENV: index_dir}):
+                rpm_consumption.default_index().add({'foo-container-1.0-1': ['bash-5.1-2']})
+                # a later run finds what an earlier run indexed
+                self.assertEqual(
+                    rpm_consumption.default_index().get(['foo-container-1.0-1']),
+                    {'foo-container-1.0-1': ['bash-5.1-2']},
+                )
+
+        with mock.patch.dict(os.environ, {constants.RPM_CONSUMPTION_INDEX_DIR_ENV: ''}):
+            self.assertEqual(rpm_consumption.default_index().path, ':memory:')
+
+
+class TestGetImageRpmNvrs(unittest.TestCase):
+    def test_brew_and_konflux_builds(self):
+        archives = {
+            1: [{'id': 11, 'rpms': [{'build_id': 101}, {'build_id': 102}]}, {'id': 12, 'rpms': [{'build_id': 101}]}],
+            2: [{'id': 21, 'rpms': [{'build_id': 103}]}],
+        }
+        rpm_builds = {101: 'bash-5.1-2', 102: 'acl-2.3-1', 103: 'zlib-1.2-3'}
+        koji_api = mock.MagicMock()
+        konflux_build = KonfluxBuildRecord(
+            name='baz-container', version='1.0', release='1', installed_packages=['bash-5.1-2', 'jq-1.6-2']
+        )
+
+        def _list_archives_by_builds(build_ids, build_type, session):
+            return [archives[build_id] for build_id in build_ids]
+
+        def _get_build_objects(ids, session):
+            return [{'id': build_id, 'nvr': rpm_builds[build_id]} for build_id in ids]
+
+        resolver = BuildResolver()
+        with (
+            mock.patch.object(FindUnconsumedRpms, '_list_archives_by_builds', side_effect=_list_archives_by_builds),
+            mock.patch('elliottlib.cli.find_unconsumed_rpms.get_resolver', return_value=resolver),
+            mock.patch.object(resolver, 'get_build_objects', side_effect=_get_build_objects) as get_build_objects,
+        ):
+            actual = FindUnconsumedRpms._get_image_rpm_nvrs(
+                [{'id': 1, 'nvr': 'foo-container-1.0-1'}, konflux_build, {'id': 2, 'nvr': 'bar-container-1.0-1'}],
+                koji_api,
+            )
+
+        self.assertEqual(
+            {nvr: sorted(rpm_nvrs) for nvr, rpm_nvrs in actual.items()},
+            {
+                'baz-container-1.0-1': ['bash-5.1-2', 'jq-1.6-2'],
+                'foo-container-1.0-1': ['acl-2.3-1', 'bash-5.1-2'],
+                'bar-container-1.0-1': ['zlib-1.2-3'],
+            },
+        )
+        # each RPM build is looked up once for all images
+        get_build_objects.assert_called_once()
+        self.assertEqual(sorted(get_build_objects.call_args.args[0]), [101, 102, 103])
+
+
+if __name__ == '__main__':
+    unittest.main()
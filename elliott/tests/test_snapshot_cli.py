@@ -4,6 +4,7 @@ from unittest.mock import ANY, AsyncMock, MagicMock, Mock, patch
 from artcommonlib.model import Model
 from doozerlib.backend.konflux_client import API_VERSION, KIND_SNAPSHOT
 from elliottlib.cli.snapshot_cli import CreateSnapshotCli, GetSnapshotCli
+from elliottlib.konflux_resolver import KonfluxResolver
 
 
 class TestCreateSnapshotCli(IsolatedAsyncioTestCase):
@@ -57,7 +58,11 @@ class TestCreateSnapshotCli(IsolatedAsyncioTestCase):
         build_records[0].name = 'component1'
         build_records[1].name = 'component2'
 
-        with patch.object(CreateSnapshotCli, 'fetch_build_records', return_value=build_records):
+        components = {'ose-4-18-component1': MagicMock(), 'ose-4-18-component2': MagicMock()}
+        with (
+            patch.object(CreateSnapshotCli, 'fetch_build_records', return_value=build_records),
+            patch.object(KonfluxResolver, 'get_components', return_value=components) as get_components,
+        ):
             cli = CreateSnapshotCli(
                 runtime=self.runtime,
                 konflux_config=self.konflux_config,
@@ -70,6 +75,8 @@ class TestCreateSnapshotCli(IsolatedAsyncioTestCase):
 
             await cli.run()
 
+            # components are listed at once
+            get_components.assert_awaited_once_with('openshift-4-18')
             self.konflux_client._create.assert_called_once_with(
                 {
                     'apiVersion': 'appstudio.redhat.com/v1alpha1',
@@ -106,7 +113,6 @@ class TestCreateSnapshotCli(IsolatedAsyncioTestCase):
         mock_konflux_client_init.return_value = self.konflux_client
 
         mock_records = ['mock_row1', 'mock_row2']
-        self.runtime.konflux_db.get_build_records_by_nvrs = AsyncMock(return_value=mock_records)
         builds = ['openshift-v4.18.0-4.el9', 'openshift-clients-v4.18.0-4.el8']
 
         cli = CreateSnapshotCli(
@@ -119,9 +125,11 @@ class TestCreateSnapshotCli(IsolatedAsyncioTestCase):
             dry_run=self.dry_run,
         )
 
-        records = await cli.fetch_build_records()
+        cli.resolver = KonfluxResolver(konflux_db=self.runtime.konflux_db)
+        with patch.object(KonfluxResolver, 'get_build_records', return_value=mock_records) as get_build_records:
+            records = await cli.fetch_build_records()
         self.assertEqual(records, mock_records)
-        self.runtime.konflux_db.get_build_records_by_nvrs.assert_called_once_with(builds, where=ANY, strict=True)
+        get_build_records.assert_awaited_once_with(builds, where=ANY, strict=True)
 
 
 class TestGetSnapshotCli(IsolatedAsyncioTestCase):
@@ -153,7 +161,6 @@ class TestGetSnapshotCli(IsolatedAsyncioTestCase):
     async def test_run_happy_path(self, mock_runtime, mock_konflux_client_init, mock_oc_image_info):
         mock_runtime.return_value = self.runtime
         mock_konflux_client_init.return_value = self.konflux_client
-        self.runtime.konflux_db.get_build_records_by_nvrs = AsyncMock()
 
         snapshot = {
             'apiVersion': 'appstudio.redhat.com/v1alpha1',
@@ -198,7 +205,9 @@ class TestGetSnapshotCli(IsolatedAsyncioTestCase):
             snapshot='test-snapshot',
             dry_run=self.dry_run,
         )
-        actual_nvrs = await cli.run()
+        with patch.object(KonfluxResolver, 'get_build_records') as get_build_records:
+            actual_nvrs = await cli.run()
+        get_build_records.assert_awaited_once_with(expected_nvrs, where=ANY, strict=True)
         self.konflux_client._get.assert_called_once_with(API_VERSION, KIND_SNAPSHOT, 'test-snapshot')
         mock_oc_image_info.assert_called_once_with(
             "registry/image@sha256:digest1",
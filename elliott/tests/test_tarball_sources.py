@@ -1,12 +1,32 @@
 import json
+import os
+import tarfile
+import tempfile
 import unittest
 from unittest import mock
 
 import errata_tool
 import koji
+import pygit2
 from elliottlib import tarball_sources
 
 
+def _create_source_repo(path):
+    """Create a repo with one commit and return its source url"""
+    repo = pygit2.init_repository(path)
+    files = {"README.md": b"hello\n", "sources": b"ignored\n", "bin/big": os.urandom(1 << 20)}
+    builder = repo.TreeBuilder()
+    bin_builder = repo.TreeBuilder()
+    bin_builder.insert("big", repo.create_blob(files["bin/big"]), pygit2.GIT_FILEMODE_BLOB_EXECUTABLE)
+    builder.insert("bin", bin_builder.write(), pygit2.GIT_FILEMODE_TREE)
+    builder.insert("README.md", repo.create_blob(files["README.md"]), pygit2.GIT_FILEMODE_BLOB)
+    builder.insert("sources", repo.create_blob(files["sources"]), pygit2.GIT_FILEMODE_BLOB)
+    builder.insert("link", repo.create_blob(b"README.md"), pygit2.GIT_FILEMODE_LINK)
+    signature = pygit2.Signature("Test", "test@example.com")
+    commit = repo.create_commit("HEAD", signature, signature, "initial", builder.write(), [])
+    return "file://{}#{}".format(path, commit), files
+
+
 class TarballSourcesTestCase(unittest.TestCase):
     def test_find_builds_from_advisory(self):
         with (
@@ -105,6 +125,58 @@ class TarballSourcesTestCase(unittest.TestCase):
             actual = tarball_sources.find_builds_from_advisory(advisory.errata_id, ["logging-fluentd-container"])
             self.assertEqual(actual, expected)
 
+    def test_generate_tarball_sources(self):
+        with tempfile.TemporaryDirectory() as tmp:
+            source_url, files = _create_source_repo(os.path.join(tmp, "source"))
+            working_dir = os.path.join(tmp, "work")
+            jobs = [
+                tarball_sources.TarballJob("foo-1.0-1/", "foo", source_url),
+                # the same source rebuilt with a different release
+                tarball_sources.TarballJob("foo-1.0-2/", "foo", source_url),
+            ]
+
+            tarballs = tarball_sources.generate_tarball_sources(jobs, working_dir, max_workers=2)
+            with tarfile.open(tarballs[jobs[0]]) as archive:
+                self.assertEqual(
+                    sorted(archive.getnames()), ["foo-1.0-1/README.md", "foo-1.0-1/bin/big", "foo-1.0-1/link"]
+                )
+                self.assertEqual(archive.extractfile("foo-1.0-1/bin/big").read(), files["bin/big"])
+                self.assertEqual(archive.getmember("foo-1.0-1/bin/big").mode, 0o755)
+                self.assertEqual(archive.getmember("foo-1.0-1/link").linkname, "README.md")
+            with tarfile.open(tarballs[jobs[1]]) as archive:
+                self.assertIn("foo-1.0-2/README.md", archive.getnames())
+
+            # complete tarballs are reused, even if the repo is gone
+            with mock.patch("elliottlib.tarball_sources.ProcessPoolExecutor") as executor:
+                self.assertEqual(tarball_sources.generate_tarball_sources(jobs, working_dir), tarballs)
+                executor.assert_not_called()
+
+            # incomplete tarballs are generated again
+            with open(tarballs[jobs[1]], "ab") as f:
+                f.write(b"garbage")
+            mtime = os.path.getmtime(tarballs[jobs[0]])
+            self.assertEqual(tarball_sources.generate_tarball_sources(jobs, working_dir, max_workers=1), tarballs)
+            self.assertEqual(os.path.getmtime(tarballs[jobs[0]]), mtime)
+            with tarfile.open(tarballs[jobs[1]]) as archive:
+                self.assertIn("foo-1.0-2/README.md", archive.getnames())
+
+    def test_generate_tarball_sources_records_each_complete_tarball(self):
+        with tempfile.TemporaryDirectory() as tmp:
+            source_url, _ = _create_source_repo(os.path.join(tmp, "source"))
+            working_dir = os.path.join(tmp, "work")
+            jobs = [
+                tarball_sources.TarballJob("foo-1.0-1/", "foo", source_url),
+                # a commit that doesn't exist in the same repo
+                tarball_sources.TarballJob("foo-1.0-2/", "foo", source_url.split("#")[0] + "#" + "0" * 40),
+            ]
+            with self.assertRaises(IOError):
+                tarball_sources.generate_tarball_sources(jobs, working_dir, max_workers=1)
+
+            # the tarball that completed before the failure is reused
+            manifest = tarball_sources.TarballManifest(os.path.join(working_dir, "tarballs"))
+            self.assertIsNotNone(manifest.get(manifest.key(jobs[0])))
+            self.assertIsNone(manifest.get(manifest.key(jobs[1])))
+
 
 if __name__ == '__main__':
     unittest.main()
@@ -1,8 +1,11 @@
+import json
 from unittest import IsolatedAsyncioTestCase
-from unittest.mock import patch
+from unittest.mock import AsyncMock, patch
 
+import bugzilla
 import elliottlib.cli.verify_attached_bugs_cli as verify_attached_bugs_cli
 from click.testing import CliRunner
+from elliottlib.advisory_snapshot import AdvisorySnapshot, VerificationSnapshot
 from elliottlib.bzutil import BugzillaBugTracker, JIRABugTracker
 from elliottlib.cli.common import Runtime, cli
 from elliottlib.cli.verify_attached_bugs_cli import BugValidator
@@ -197,13 +200,20 @@ class VerifyAttachedBugs(IsolatedAsyncioTestCase):
         }
 
         advisory_id = 123
-        flexmock(BugValidator).should_receive("get_attached_bugs").with_args([advisory_id]).and_return(
-            {123: {bugs[0], bugs[1]}}
-        ).ordered()
-        flexmock(BugValidator).should_receive("_get_blocking_bugs_for").and_return(blocking_bugs_map).ordered()
+        snapshot = VerificationSnapshot(
+            advisories={
+                advisory_id: AdvisorySnapshot(
+                    advisory_id, 'RHBA', 'QE', [], {'jira': ['OCPBUGS-1', 'OCPBUGS-2'], 'bugzilla': []}
+                )
+            },
+            bugs={'jira': {b.id: b for b in bugs}, 'bugzilla': {}},
+        )
+        flexmock(BugValidator).should_receive("_get_blocking_bugs_for").and_return(blocking_bugs_map)
         flexmock(BugValidator).should_receive("verify_bugs_advisory_type")
 
-        result = runner.invoke(cli, ['-g', 'openshift-4.6', 'verify-attached-bugs', str(advisory_id)])
+        with patch.object(BugValidator, 'take_snapshot', return_value=snapshot) as take_snapshot:
+            result = runner.invoke(cli, ['-g', 'openshift-4.6', 'verify-attached-bugs', str(advisory_id)])
+        take_snapshot.assert_awaited_once_with([advisory_id], verify_flaws=False, check_multiple_advisories=True)
         # if result.exit_code != 0:
         #     exc_type, exc_value, exc_traceback = result.exc_info
         #     t = "\n".join(traceback.format_exception(exc_type, exc_value, exc_traceback))
@@ -242,8 +252,12 @@ class VerifyAttachedBugs(IsolatedAsyncioTestCase):
             flexmock(id="OCPBUGS-2", is_ocp_bug=lambda: True),
             flexmock(id="OCPBUGS-3", is_ocp_bug=lambda: True),
         ]
-        flexmock(BugValidator).should_receive("get_attached_bugs").and_return(
-            {1: {bugs[0]}, 2: {bugs[1]}, 3: {bugs[2]}},
+        snapshot = VerificationSnapshot(
+            advisories={
+                advisory_id: AdvisorySnapshot(advisory_id, 'RHBA', 'QE', [], {'jira': bug_ids, 'bugzilla': []})
+                for advisory_id, bug_ids in {1: ['OCPBUGS-1'], 2: ['OCPBUGS-2'], 3: ['OCPBUGS-3'], 4: []}.items()
+            },
+            bugs={'jira': {b.id: b for b in bugs}, 'bugzilla': {}},
         )
         flexmock(BugValidator).should_receive("validate").and_return()
         flexmock(verify_attached_bugs_cli).should_receive("categorize_bugs_by_type").and_return(
@@ -251,7 +265,8 @@ class VerifyAttachedBugs(IsolatedAsyncioTestCase):
             [],
         )
 
-        result = runner.invoke(cli, ['-g', 'openshift-4.6', '--assembly', '4.6.50', 'verify-attached-bugs'])
+        with patch.object(BugValidator, 'take_snapshot', return_value=snapshot):
+            result = runner.invoke(cli, ['-g', 'openshift-4.6', '--assembly', '4.6.50', 'verify-attached-bugs'])
         # if result.exit_code != 0:
         #     exc_type, exc_value, exc_traceback = result.exc_info
         #     t = "\n".join(traceback.format_exception(exc_type, exc_value, exc_traceback))
@@ -264,15 +279,17 @@ class VerifyAttachedBugs(IsolatedAsyncioTestCase):
 
 
 class TestBugValidator(IsolatedAsyncioTestCase):
-    async def test_get_attached_bugs_jira(self):
+    async def test_take_snapshot(self):
         runtime = Runtime()
-        advisory_id_1, advisory_id_2 = '123', '145'
+        advisory_id_1, advisory_id_2 = 123, 145
         bz_bugs = [1, 2, 3]
         bz_bug_map = {b: flexmock(id=b) for b in bz_bugs}
         jira_bugs = ['bug-1', 'bug-2', 'bug-3']
         jira_bug_map = {j: flexmock(id=j) for j in jira_bugs}
-        advisory_1_bugs = {"bugzilla": [bz_bugs[0]], "jira": [jira_bugs[0], jira_bugs[1]]}
-        advisory_2_bugs = {"bugzilla": [bz_bugs[1], bz_bugs[2]], "jira": [jira_bugs[2]]}
+        advisory_bugs = {
+            advisory_id_1: {"bugzilla": [bz_bugs[0]], "jira": [jira_bugs[0], jira_bugs[1]]},
+            advisory_id_2: {"bugzilla": [bz_bugs[1], bz_bugs[2]], "jira": [jira_bugs[2]]},
+        }
 
         flexmock(Runtime).should_receive("get_errata_config").and_return({})
         flexmock(JIRABugTracker).should_receive("get_config").and_return({'target_release': ['4.9.z']})
@@ -283,27 +300,99 @@ class TestBugValidator(IsolatedAsyncioTestCase):
         flexmock(BugzillaBugTracker).should_receive("login").and_return(None)
         flexmock(AsyncErrataAPI).should_receive("__init__").and_return(None)
 
-        flexmock(verify_attached_bugs_cli).should_receive("get_bug_ids").with_args(advisory_id_1).and_return(
-            advisory_1_bugs
-        )
-        flexmock(verify_attached_bugs_cli).should_receive("get_bug_ids").with_args(advisory_id_2).and_return(
-            advisory_2_bugs
-        )
-
+        # Each tracker is asked for the bugs of all advisories at once
         flexmock(JIRABugTracker).should_receive("get_bugs").with_args(set(jira_bugs), permissive=False).and_return(
             jira_bug_map.values()
-        )
+        ).once()
         flexmock(BugzillaBugTracker).should_receive("get_bugs").with_args(set(bz_bugs), permissive=False).and_return(
             bz_bug_map.values()
-        )
+        ).once()
 
         validator = BugValidator(runtime, True)
-        actual = validator.get_attached_bugs([advisory_id_1, advisory_id_2])
+        validator.errata_api = AsyncMock()
+        validator.errata_api.get_bug_ids.side_effect = lambda advisory_id: advisory_bugs[advisory_id]
+        validator.errata_api.get_advisory.return_value = {
+            "errata": {"rhsa": {"status": "QE"}},
+            "content": {"content": {"cve": "CVE-2099-1 CVE-2099-2"}},
+        }
+        # bug-2 is also attached to a shipped advisory, of any product
+        validator.errata_api.get_advisories_for_jira.side_effect = lambda key, **_: (
+            [{"id": advisory_id} for advisory_id, bug_ids in advisory_bugs.items() if key in bug_ids["jira"]]
+            + ([{"id": 100}] if key == "bug-2" else [])
+        )
+        validator.errata_api.get_advisories_for_bug.side_effect = lambda bug_id: [
+            {"id": advisory_id} for advisory_id, bug_ids in advisory_bugs.items() if bug_id in bug_ids["bugzilla"]
+        ]
+        snapshot = await validator.take_snapshot([advisory_id_1, advisory_id_2], check_multiple_advisories=True)
+        self.assertEqual(snapshot.advisories_of("jira", "bug-2"), [100, advisory_id_1])
+        self.assertEqual(snapshot.advisories_of("bugzilla", 3), [advisory_id_2])
         expected = {
             advisory_id_1: {jira_bug_map[jira_bugs[0]], jira_bug_map[jira_bugs[1]], bz_bug_map[bz_bugs[0]]},
             advisory_id_2: {jira_bug_map[jira_bugs[2]], bz_bug_map[bz_bugs[1]], bz_bug_map[bz_bugs[2]]},
         }
-        self.assertEqual(actual, expected)
+        self.assertEqual(snapshot.advisory_bugs(), expected)
+        self.assertEqual(snapshot.advisories[advisory_id_2].errata_type, "RHSA")
+        self.assertEqual(snapshot.advisories[advisory_id_2].cves, ["CVE-2099-1", "CVE-2099-2"])
+
+    def test_attached_flaws_problems_of_saved_snapshot(self):
+        tracker = {
+            'key': 'OCPBUGS-9',
+            'fields': {
+                'issuetype': {'name': 'Bug'},
+                'project': {'key': 'OCPBUGS'},
+                'labels': ['SecurityTracking', 'Security', 'pscomponent:foo', 'flaw:bz#100'],
+            },
+        }
+        flaw = {
+            'id': 100,
+            'product': 'Security Response',
+            'component': 'vulnerability',
+            'alias': ['CVE-2099-1'],
+            'keywords': [],
+            'whiteboard': '',
+        }
+        saved = {
+            "advisories": [
+                {
+                    "advisory_id": 1,
+                    "errata_type": "RHSA",
+                    "status": "QE",
+                    "cves": ["CVE-2099-1"],
+                    "bug_ids": {"jira": ["OCPBUGS-9"], "bugzilla": [100]},
+                    "builds": ["bar-1.0-1.el9", "foo-1.0-1.el9"],
+                    "cve_exclusions": {"CVE-2099-1": {}},
+                    "tracker_flaws": {"OCPBUGS-9": [100]},
+                    "first_fix_flaw_ids": [100],
+                    "go_nvr_map": None,
+                }
+            ],
+            "bugs": {"jira": [tracker], "bugzilla": [flaw]},
+            "flaws": [flaw],
+            "attachments": None,
+        }
+        jira_client = flexmock(_options={'server': 'https://jira.example.com'}, _session=None)
+        jira_client.should_receive("fields").and_return([])
+        flexmock(JIRABugTracker).should_receive("login").and_return(jira_client)
+        flexmock(BugzillaBugTracker).should_receive("login").and_return(bugzilla.Bugzilla(url=None))
+        bug_trackers = {'jira': JIRABugTracker({}), 'bugzilla': BugzillaBugTracker({})}
+
+        snapshot = VerificationSnapshot.from_dict(json.loads(json.dumps(saved)), bug_trackers)
+        self.assertEqual(json.loads(json.dumps(snapshot.to_dict())), saved)
+        self.assertEqual(
+            verify_attached_bugs_cli.attached_flaws_problems(snapshot, 1),
+            [
+                "On advisory 1, CVE-2099-1 is associated with Brew components bar without a tracker bug."
+                " You may need to explicitly exclude those Brew components from the CVE mapping or attach the "
+                "corresponding tracker bugs."
+            ],
+        )
+
+        snapshot.advisories[1].errata_type = "RHBA"
+        snapshot.advisories[1].cve_exclusions = {"CVE-2099-1": {"bar": 1}}
+        self.assertEqual(
+            verify_attached_bugs_cli.attached_flaws_problems(snapshot, 1),
+            ["Advisory 1 is of type RHBA but has first-fix flaw bugs {100}. It should be converted to RHSA."],
+        )
 
     async def test_get_blocking_bugs_for(self):
         runtime = Runtime()
@@ -4,7 +4,7 @@ import os
 from typing import List, Optional
 
 import openshift_client as octool
-from artcommonlib import exectools
+from artcommonlib import exectools, image_info_cache
 from tenacity import retry, stop_after_attempt
 
 from pyartcd.runtime import Runtime
@@ -14,6 +14,11 @@ logger = logging.getLogger(__name__)
 
 @retry(reraise=True, stop=stop_after_attempt(3))
 async def get_image_info(pullspec: str, raise_if_not_found: bool = False):
+    # Shares cache entries with doozer's oc_image_info_show_multiarch
+    cache = image_info_cache.get_cache()
+    info = cache.get("image-info", pullspec, ["--show-multiarch"])
+    if info is not None:
+        return info
     cmd = ["oc", "image", "info", "--show-multiarch", "-o", "json", "--", pullspec]
     env = os.environ.copy()
     env["GOTRACEBACK"] = "all"
@@ -31,11 +36,16 @@ async def get_image_info(pullspec: str, raise_if_not_found: bool = False):
             raise ValueError(f"Invalid multi-arch image info: {info}")
     elif not isinstance(info, dict):
         raise ValueError(f"Invalid image info: {info}")
+    cache.put("image-info", pullspec, ["--show-multiarch"], info)
     return info
 
 
 @retry(reraise=True, stop=stop_after_attempt(3))
 async def get_release_image_info(pullspec: str, raise_if_not_found: bool = False):
+    cache = image_info_cache.get_cache()
+    info = cache.get("release-info", pullspec)
+    if info is not None:
+        return info
     cmd = ["oc", "adm", "release", "info", "-o", "json", "--", pullspec]
     env = os.environ.copy()
     env["GOTRACEBACK"] = "all"
@@ -50,6 +60,7 @@ async def get_release_image_info(pullspec: str, raise_if_not_found: bool = False
     info = json.loads(stdout)
     if not isinstance(info, dict):
         raise ValueError(f"Invalid release info: {info}")
+    cache.put("release-info", pullspec, [], info)
     return info
 
 
@@ -25,7 +25,7 @@ from doozerlib.cli.release_gen_payload import (
     default_imagestream_namespace_base_name,
     payload_imagestream_namespace_and_name,
 )
-from elliottlib.errata import get_blocking_advisories, is_advisory_editable, push_cdn_stage, set_blocking_advisory
+from elliottlib.errata import push_cdn_stage, set_blocking_advisory
 from elliottlib.errata_async import AsyncErrataAPI
 from jira.resources import Issue
 from tenacity import retry, stop_after_attempt, wait_fixed
@@ -292,7 +292,7 @@ class PrepareReleasePipeline:
 
         if "advance" in advisories.keys():
             # Make sure that the advisory is in editable mode
-            if is_advisory_editable(advisories["advance"]):
+            if await self._errata_api.is_advisory_editable(advisories["advance"]):
                 # Set this as an 'advance' release
                 self.advance_release = True
 
@@ -309,7 +309,7 @@ class PrepareReleasePipeline:
                 raise IOError("prerelease and advance release cannot be set at the same time")
 
             # Make sure that the advisory is in editable mode
-            if is_advisory_editable(advisories["prerelease"]):
+            if await self._errata_api.is_advisory_editable(advisories["prerelease"]):
                 # Set this as an 'pre-release' release
                 self.pre_release = True
 
@@ -886,7 +886,7 @@ update JIRA accordingly, then notify QE and multi-arch QE for testing.""")
                 advisories[k] for k in (blocked_by[target_kind] & advisories.keys()) if advisories[k] > 0
             }
             _LOGGER.info(f"Setting blocking advisories ({expected_blocking}) for {target_advisory_id}")
-            blocking: Optional[List] = get_blocking_advisories(target_advisory_id)
+            blocking: Optional[List] = await self._errata_api.get_blocking_advisories(target_advisory_id)
             if blocking is None:
                 raise ValueError(f"Failed to fetch blocking advisories for {target_advisory_id} ")
             if expected_blocking.issubset(set(blocking)):
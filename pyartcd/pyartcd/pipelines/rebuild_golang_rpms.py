@@ -83,7 +83,7 @@ class RebuildGolangRPMsPipeline:
             if self.rpms:
                 rpms = [r for r in rpms if r['name'] in self.rpms]
             _LOGGER.info('Determining golang rpms and their build versions')
-            go_nvr_map = elliottutil.get_golang_rpm_nvrs(
+            go_nvr_map = await elliottutil.get_golang_rpm_nvrs_async(
                 [(n['name'], n['version'], n['release']) for n in rpms],
                 _LOGGER,
             )
@@ -12,14 +12,15 @@ from typing import BinaryIO, Dict, Iterable, List, Set, cast
 
 import aiofiles
 import aiohttp
-from artcommonlib import exectools
+from artcommonlib import exectools, image_info_cache
+from artcommonlib.registry_client import RegistryClient, RegistryError
 from artcommonlib.util import run_limited_unordered
 from cryptography import x509
 from cryptography.x509.oid import NameOID
 from tenacity import retry, stop_after_attempt, wait_random_exponential
 
 from pyartcd.exceptions import SignatoryServerError
-from pyartcd.oc import get_image_info, get_release_image_info
+from pyartcd.oc import get_release_image_info
 from pyartcd.umb_client import AsyncUMBClient
 
 _LOGGER = logging.getLogger(__name__)
@@ -283,27 +284,52 @@ class SigstoreSignatory:
         errors: Dict[str, Exception] = {}  # pullspec -> error when examining it
 
         need_examining: List[str] = list(pullspecs)
-        while need_examining:
-            args = [(ps, release_name) for ps in need_examining]
-            results = await run_limited_unordered(self._examine_pullspec, args, self.concurrency_limit)
-
-            need_examining = []
-            for next_signing, next_examining, next_errors in results:
-                need_signing.update(next_signing)
-                errors.update(next_errors)
-                for ps in next_examining:
-                    if ps not in seen:
-                        seen.add(ps)
-                        need_examining.append(ps)
+        # Inspect images over keep-alive connections rather than with an `oc image info` process each
+        async with RegistryClient(limit_per_host=self.concurrency_limit) as registry_client:
+            while need_examining:
+                args = [(ps, release_name, registry_client) for ps in need_examining]
+                results = await run_limited_unordered(self._examine_pullspec, args, self.concurrency_limit)
+
+                need_examining = []
+                for next_signing, next_examining, next_errors in results:
+                    need_signing.update(next_signing)
+                    errors.update(next_errors)
+                    for ps in next_examining:
+                        if ps not in seen:
+                            seen.add(ps)
+                            need_examining.append(ps)
 
         return need_signing, errors
 
-    async def _examine_pullspec(self, pullspec: str, release_name: str) -> (Set[str], Set[str], Dict[str, Exception]):
+    @retry(reraise=True, stop=stop_after_attempt(3))
+    async def get_image_info(self, pullspec: str, registry_client: RegistryClient):
+        """
+        Get the equivalent of `oc image info --show-multiarch` for a pullspec
+        :param registry_client: Open client to inspect the image with
+        :raises ValueError: If the image is not found
+        """
+        cache = image_info_cache.get_cache()
+        img_info = cache.get("image-info", pullspec, ["--show-multiarch"])
+        if img_info is not None:
+            return img_info
+        try:
+            img_info = await registry_client.image_info(pullspec, show_multiarch=True)
+        except RegistryError as e:
+            if e.status == 404:
+                raise ValueError(f"Image {pullspec} is not found.")
+            raise
+        cache.put("image-info", pullspec, ["--show-multiarch"], img_info)
+        return img_info
+
+    async def _examine_pullspec(
+        self, pullspec: str, release_name: str, registry_client: RegistryClient
+    ) -> (Set[str], Set[str], Dict[str, Exception]):
         """
         Determine what a pullspec is (single manifest, manifest list, release image) and
         recursively add it or its references. limit concurrency or we can run out of processes.
         :param pullspec: Pullspec to be signed
         :param release_name: Require any release images to have this release name
+        :param registry_client: Open client to inspect images with
         :return: pullspecs needing signing, pullspecs needing examining, and any discovery errors
         """
         need_signing: Set[str] = set()
@@ -311,7 +337,7 @@ class SigstoreSignatory:
         errors: Dict[str, Exception] = {}
 
         await asyncio.sleep(uniform(0, self.THROTTLE_DELAY))  # introduce jitter to avoid rate limits
-        img_info = await get_image_info(pullspec, True)
+        img_info = await self.get_image_info(pullspec, registry_client)
 
         if isinstance(img_info, list):  # pullspec is for a manifest list
             self._logger.info("%s is a manifest list", pullspec)
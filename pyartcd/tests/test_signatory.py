@@ -12,7 +12,7 @@ from cryptography.hazmat.primitives.asymmetric import rsa
 from cryptography.hazmat.primitives.serialization import Encoding
 from cryptography.x509.oid import NameOID
 
-from pyartcd.signatory import AsyncSignatory
+from pyartcd.signatory import AsyncSignatory, SigstoreSignatory
 
 
 class TestAsyncSignatory(IsolatedAsyncioTestCase):
@@ -288,3 +288,51 @@ class TestAsyncSignatory(IsolatedAsyncioTestCase):
             sig_file=sig_file,
         )
         self.assertEqual(sig_file.getvalue(), b'fake-signature')
+
+
+class TestSigstoreSignatory(IsolatedAsyncioTestCase):
+    @patch("pyartcd.signatory.image_info_cache.get_cache")
+    @patch("pyartcd.signatory.RegistryClient")
+    async def test_concurrent_discoveries_use_their_own_registry_client(
+        self, RegistryClient: MagicMock, get_cache: MagicMock
+    ):
+        get_cache.return_value.get.return_value = None
+        clients = []
+
+        def _client(**_):
+            client = MagicMock()
+            client.__aenter__.return_value = client
+            client.__aexit__.return_value = False
+
+            async def _image_info(pullspec, show_multiarch):
+                await asyncio.sleep(0.01)
+                # the discovery using this client must still be running
+                client.__aexit__.assert_not_called()
+                return {"config": {"config": {"Labels": {}}}}
+
+            client.image_info = AsyncMock(side_effect=_image_info)
+            clients.append(client)
+            return client
+
+        RegistryClient.side_effect = _client
+        signatory = SigstoreSignatory(
+            logger=MagicMock(),
+            dry_run=True,
+            signing_creds="creds",
+            signing_key_ids=["key"],
+            rekor_url="https://rekor.example.com",
+            concurrency_limit=10,
+            sign_release=True,
+            sign_components=True,
+            verify_release=False,
+        )
+        signatory.THROTTLE_DELAY = 0
+
+        results = await asyncio.gather(
+            signatory.discover_pullspecs(["example.com/a@sha256:1"], "4.18.1"),
+            signatory.discover_pullspecs(["example.com/b@sha256:2"], "4.18.1"),
+        )
+        self.assertEqual(results, [({"example.com/a@sha256:1"}, {}), ({"example.com/b@sha256:2"}, {})])
+        self.assertEqual(len(clients), 2)
+        for client in clients:
+            client.image_info.assert_awaited_once()